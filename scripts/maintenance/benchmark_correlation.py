@@ -0,0 +1,123 @@
+"""
+Benchmark per-candle correlation maintenance for a large pair universe.
+
+Compares the pandas paths the risk layer used to take on every candle with the
+shared ``StreamingCovariance`` engine:
+
+- matrix: ``returns.rolling(window).corr()`` panel (or, with ``--no-rolling``,
+  the cheaper ``returns.tail(window).corr()``) vs one engine update plus a
+  full ``submatrix()`` read
+- entry check: ``CorrelationManager.calculate_correlation`` for every open
+  position vs one ``correlations()`` row read
+
+Usage:
+    python scripts/maintenance/benchmark_correlation.py --pairs 300 --candles 50
+    python scripts/maintenance/benchmark_correlation.py --pairs 300 --no-rolling
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.risk.correlation import CorrelationManager
+from src.risk.covariance import StreamingCovariance
+
+
+def make_prices(n_rows: int, n_pairs: int) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    market = rng.normal(0, 0.01, (n_rows, 1))
+    returns = 0.6 * market + rng.normal(0, 0.01, (n_rows, n_pairs))
+    index = pd.date_range("2024-01-01", periods=n_rows, freq="h")
+    columns = [f"P{i}/USDT" for i in range(n_pairs)]
+    return pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)), index=index, columns=columns)
+
+
+def timed(fn, repeats: int) -> float:
+    """Mean milliseconds per call."""
+    start = time.perf_counter()
+    for i in range(repeats):
+        fn(i)
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming vs pandas correlation")
+    parser.add_argument("--pairs", type=int, default=300, help="Universe size")
+    parser.add_argument("--window", type=int, default=100, help="Rolling window (candles)")
+    parser.add_argument("--candles", type=int, default=20, help="Timed candles per path")
+    parser.add_argument("--open-positions", type=int, default=10, help="For the entry check")
+    parser.add_argument("--no-rolling", action="store_true", help="Use tail().corr() baseline")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    history = args.window + 1
+    prices = make_prices(history + args.candles, args.pairs)
+    returns = prices.pct_change()
+
+    # -- full matrix per candle ---------------------------------------------------------
+    def pandas_matrix(i):
+        frame = returns.iloc[i + 1 : history + i + 1]
+        if args.no_rolling:
+            frame.tail(args.window).corr()
+        else:
+            frame.rolling(args.window).corr()
+
+    covariance = StreamingCovariance(window=args.window)
+    covariance.update_frame(prices.iloc[:history])
+    rows = [row.to_dict() for _, row in prices.iloc[history:].iterrows()]
+
+    def streaming_matrix(i):
+        covariance.update(rows[i], prices.index[history + i])
+        covariance.submatrix()
+
+    pandas_label = "tail().corr()" if args.no_rolling else "rolling().corr()"
+    pandas_ms = timed(pandas_matrix, min(args.candles, 3 if not args.no_rolling else args.candles))
+    streaming_ms = timed(streaming_matrix, args.candles)
+
+    # -- entry check ---------------------------------------------------------------------
+    frames = {
+        symbol: prices[[symbol]].iloc[-history:].rename(columns={symbol: "close"})
+        for symbol in prices.columns
+    }
+    symbols = list(prices.columns)
+    open_pairs = symbols[1 : args.open_positions + 1]
+    manager = CorrelationManager(correlation_window=args.window, covariance=covariance)
+
+    def pandas_entry(i):
+        for pair in open_pairs:
+            manager.calculate_correlation(frames[symbols[0]], frames[pair])
+
+    def streaming_entry(i):
+        covariance.correlations(symbols[0], open_pairs)
+
+    entry_pandas_ms = timed(pandas_entry, args.candles)
+    entry_streaming_ms = timed(streaming_entry, args.candles)
+
+    print(
+        f"pairs: {args.pairs} | window: {args.window} | "
+        f"open positions: {args.open_positions} | pair correlations per matrix: "
+        f"{args.pairs * (args.pairs - 1) // 2:,}"
+    )
+    print(f"{'Path':<40} {'ms / candle':>12} {'speedup':>9}")
+    print(f"{'matrix: pandas ' + pandas_label:<40} {pandas_ms:>12.2f}")
+    print(
+        f"{'matrix: streaming update + submatrix':<40} {streaming_ms:>12.2f} "
+        f"{pandas_ms / streaming_ms:>8.0f}x"
+    )
+    print(f"{'entry check: pandas per position':<40} {entry_pandas_ms:>12.3f}")
+    print(
+        f"{'entry check: streaming row lookup':<40} {entry_streaming_ms:>12.3f} "
+        f"{entry_pandas_ms / entry_streaming_ms:>8.0f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
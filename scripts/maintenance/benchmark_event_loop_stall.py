@@ -0,0 +1,153 @@
+"""
+Measure event-loop stalls caused by order persistence on fills.
+
+A probe coroutine sleeps for ``--probe-ms`` in a loop and records how late it
+wakes up; any lateness is time the loop could not process tickers. Fills
+arrive every ``--fill-interval-ms`` and each one persists an order status
+update plus a trade/execution attribution record, either:
+
+- inline (before): synchronous SQLite/SQLAlchemy calls inside the coroutine,
+  as ``SmartOrderExecutor`` used to do, or
+- async (after): ``AsyncOrderLedger`` + ``AttributionService.*_async``, which
+  hand the work to writer threads behind bounded queues.
+
+Usage:
+    python scripts/maintenance/benchmark_event_loop_stall.py --fills 500
+    python scripts/maintenance/benchmark_event_loop_stall.py --synchronous FULL
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import create_engine
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.analysis.attribution import AttributionService
+from src.database.db_manager import Base, DatabaseManager
+from src.database.models import ExecutionRecord, TradeRecord
+from src.order_manager.order_ledger import AsyncOrderLedger, LedgerConfig, OrderLedger
+from src.order_manager.order_types import LimitOrder, OrderSide
+
+TRADE = {"symbol": "BTC/USDT", "side": "buy", "price": 50010.0, "amount": 0.01}
+METRICS = {"target_price": 50000.0, "slippage_pct": 0.02, "latency_ms": 35.0}
+
+
+def use_database(path: Path) -> None:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    DatabaseManager._engine, DatabaseManager._session_factory = engine, None
+
+
+def record_inline(trade_data: dict, metrics: dict) -> None:
+    """The previous blocking attribution write."""
+    with DatabaseManager.session() as session:
+        trade = TradeRecord(
+            symbol=trade_data["symbol"],
+            side=trade_data["side"],
+            entry_price=trade_data["price"],
+            amount=trade_data["amount"],
+        )
+        session.add(trade)
+        session.flush()
+        session.add(
+            ExecutionRecord(
+                trade_id=trade.id,
+                symbol=trade.symbol,
+                side=trade.side,
+                target_price=metrics["target_price"],
+                fill_price=trade.entry_price,
+                slippage_pct=metrics["slippage_pct"],
+                latency_ms=metrics["latency_ms"],
+            )
+        )
+
+
+async def probe(stop: asyncio.Event, interval: float, lags: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - start - interval))
+
+
+async def run(mode: str, args, tmp: Path) -> tuple[list[float], float]:
+    use_database(tmp / f"{mode}.db")
+    config = LedgerConfig(synchronous=args.synchronous)
+    if mode == "inline":
+        config = LedgerConfig(
+            journal_mode="DELETE",
+            synchronous=args.synchronous,
+            group_commit=False,
+            async_status_updates=False,
+            bloom_capacity=0,
+        )
+    ledger = OrderLedger(str(tmp / f"{mode}_orders.db"), config)
+    orders = [
+        LimitOrder(
+            order_id=f"o-{i}", symbol="BTC/USDT", side=OrderSide.BUY, quantity=0.01, price=5e4
+        )
+        for i in range(args.fills)
+    ]
+    for order in orders:
+        ledger.store_order(order)
+    async_ledger = AsyncOrderLedger(ledger)
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(stop, args.probe_ms / 1000, lags))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    for order in orders:
+        if mode == "inline":
+            ledger.update_order_status(order.order_id, "filled")
+            record_inline(TRADE, METRICS)
+        else:
+            await async_ledger.update_order_status(order.order_id, "filled")
+            await AttributionService.record_execution_async(TRADE, METRICS)
+        await asyncio.sleep(args.fill_interval_ms / 1000)
+    if mode == "async":
+        await async_ledger.flush()
+        await AttributionService.flush_async()
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+    await async_ledger.close()
+    AttributionService.shutdown()
+    return lags, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event-loop stall from order persistence")
+    parser.add_argument("--fills", type=int, default=500, help="Fills to persist")
+    parser.add_argument("--fill-interval-ms", type=float, default=1.0, help="Gap between fills")
+    parser.add_argument("--probe-ms", type=float, default=1.0, help="Probe sleep interval")
+    parser.add_argument("--synchronous", default="NORMAL", help="SQLite synchronous pragma")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    print(f"fills: {args.fills} | interval: {args.fill_interval_ms}ms | probe: {args.probe_ms}ms")
+    print(
+        f"{'Path':<8} {'p50 lag':>10} {'p99 lag':>10} {'max lag':>10} {'stalled':>10} {'wall':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("inline", "async"):
+            lags, elapsed = asyncio.run(run(mode, args, Path(tmp)))
+            lag_ms = np.array(lags) * 1e3
+            p50, p99 = np.percentile(lag_ms, [50, 99])
+            print(
+                f"{mode:<8} {p50:>8.2f}ms {p99:>8.2f}ms {lag_ms.max():>8.2f}ms "
+                f"{lag_ms.sum():>8.0f}ms {elapsed:>7.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark rolling Hurst: prefix-sum kernel vs. the per-window R/S loop.
+
+Generates a synthetic 5m close series (1 and 3 years by default) and times the
+legacy ``_rolling_hurst_loop`` (a fresh diff/log/cumsum/std per window), the
+prefix-sum ``calculate_hurst`` and its live mode (``last_n``), checking that
+the kernel reproduces the loop.
+
+Usage:
+    python scripts/maintenance/benchmark_hurst.py --years 1 3 --window 100 --last-n 1
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.utils.math_tools import HAVE_NUMBA, _rolling_hurst_loop, calculate_hurst
+
+BARS_PER_YEAR = 365 * 288  # 5m candles
+
+
+def make_close(n_bars: int, seed: int = 42) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.002, n_bars)))
+    return pd.Series(close, index=pd.date_range("2021-01-01", periods=n_bars, freq="5min"))
+
+
+def best_of(func, repeats: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rolling Hurst exponent")
+    parser.add_argument("--years", type=float, nargs="+", default=[1.0, 3.0])
+    parser.add_argument("--window", type=int, default=100, help="Hurst window in bars")
+    parser.add_argument("--last-n", type=int, default=1, help="Trailing values in live mode")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    # Compile both kernels before timing
+    warm = make_close(args.window * 3)
+    _rolling_hurst_loop(warm.values, args.window)
+    calculate_hurst(warm, args.window)
+
+    print(f"Numba: {HAVE_NUMBA} | window: {args.window} | live last_n: {args.last_n}")
+    print(
+        f"{'Data':<8} {'bars':>9} {'loop (s)':>10} {'prefix (s)':>11} {'speedup':>8} "
+        f"{'live (ms)':>10} {'max |diff|':>11}"
+    )
+    for years in args.years:
+        close = make_close(int(years * BARS_PER_YEAR))
+        values = close.values.astype(np.float64)
+
+        loop_s, expected = best_of(lambda v=values: _rolling_hurst_loop(v, args.window), 1)
+        prefix_s, hurst = best_of(lambda c=close: calculate_hurst(c, args.window), args.repeats)
+        live_s, _ = best_of(
+            lambda c=close: calculate_hurst(c, args.window, last_n=args.last_n), args.repeats
+        )
+        diff = np.nanmax(np.abs(hurst.values - expected))
+
+        print(
+            f"{f'{years:g}y 5m':<8} {len(close):>9,} {loop_s:>10.3f} {prefix_s:>11.3f} "
+            f"{loop_s / prefix_s:>7.1f}x {live_s * 1e3:>10.3f} {diff:>11.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
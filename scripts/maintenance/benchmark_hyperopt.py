@@ -0,0 +1,91 @@
+"""
+Benchmark the Optuna hyperparameter search at 1..N worker processes.
+
+Generates a synthetic feature matrix and runs the same trial budget of
+``HyperparameterOptimizer.optimize`` once per worker count, each against a
+fresh journal-file study, and reports wall-clock time, trials/s, pruned trials
+and the speedup over a single worker. Pruning is disabled by default so every
+run does the same amount of work; ``--prune`` measures the real nightly setup.
+
+Usage:
+    python scripts/maintenance/benchmark_hyperopt.py --workers 1 2 4 --trials 40
+    python scripts/maintenance/benchmark_hyperopt.py --model random_forest --prune
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import optuna
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.ml.training.hyperparameter_optimizer import (
+    HyperparameterOptimizer,
+    HyperparameterOptimizerConfig,
+)
+
+
+def make_data(n_rows: int, n_features: int, seed: int = 7) -> tuple[pd.DataFrame, pd.Series]:
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        rng.normal(size=(n_rows, n_features)), columns=[f"f{i}" for i in range(n_features)]
+    )
+    signal = X["f0"] + 0.5 * X["f1"] - 0.25 * X["f2"]
+    y = pd.Series((signal + rng.normal(0, 1.5, n_rows) > 0).astype(int))
+    return X, y
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel hyperparameter search")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--trials", type=int, default=40, help="Trial budget per run")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--features", type=int, default=40)
+    parser.add_argument("--splits", type=int, default=4, help="Time-series CV folds")
+    parser.add_argument("--model", default="xgboost")
+    parser.add_argument("--prune", action="store_true", help="Enable the median pruner")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    X, y = make_data(args.rows, args.features)
+
+    print(
+        f"Model: {args.model} | rows: {args.rows:,} | features: {args.features} | "
+        f"trials: {args.trials} | pruning: {args.prune}"
+    )
+    print(f"{'workers':>7} {'wall (s)':>9} {'trials/s':>9} {'pruned':>7} {'speedup':>8}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_workers in args.workers:
+            config = HyperparameterOptimizerConfig(
+                n_trials=args.trials,
+                timeout=None,
+                n_jobs=1,
+                n_workers=n_workers,
+                n_splits=args.splits,
+                # Single-threaded fits everywhere, so the speedup comes from processes
+                model_n_jobs=1,
+                storage=str(Path(tmp) / f"bench_{n_workers}.journal"),
+                study_name=f"bench_{n_workers}",
+                pruner_startup_trials=args.trials if not args.prune else 5,
+                optimize_for="accuracy",
+                save_best_model=False,
+                output_dir=tmp,
+            )
+            results = HyperparameterOptimizer(config).optimize(X, y, args.model)
+            wall = results["wall_time"]
+            baseline = baseline or wall
+            print(
+                f"{n_workers:>7} {wall:>9.2f} {args.trials / wall:>9.2f} "
+                f"{results['n_pruned']:>7} {baseline / wall:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
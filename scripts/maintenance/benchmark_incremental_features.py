@@ -0,0 +1,95 @@
+"""
+Benchmark per-candle feature latency: IncrementalFeatureEngineer vs. batch recompute.
+
+The batch path mirrors what a live strategy does today: recompute
+``_engineer_features`` over the trailing history every time a candle closes.
+The streaming path appends the same candles to a warmed-up
+``IncrementalFeatureEngineer`` and emits one row per candle.
+
+Usage:
+    python scripts/maintenance/benchmark_incremental_features.py --history 1000 --candles 200
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.ml.training.feature_engineering import FeatureConfig, FeatureEngineer
+from src.ml.training.incremental_features import IncrementalFeatureEngineer
+
+
+def make_ohlcv(n_bars: int, seed: int = 42) -> pd.DataFrame:
+    """Synthetic 5m OHLCV random walk."""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.002, n_bars)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, n_bars))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, n_bars))
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": rng.uniform(1, 10, n_bars),
+        },
+        index=pd.date_range("2021-01-01", periods=n_bars, freq="5min"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental feature engineering")
+    parser.add_argument("--history", type=int, default=1000, help="Candles of history per call")
+    parser.add_argument("--candles", type=int, default=200, help="Live candles to process")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    config = FeatureConfig()
+    df = make_ohlcv(args.history + args.candles)
+    live = df.iloc[args.history :]
+
+    engineer = FeatureEngineer(config)
+    batch_times = []
+    for i in range(args.history, len(df)):
+        start = time.perf_counter()
+        batch = engineer._engineer_features(df.iloc[i - args.history + 1 : i + 1])
+        batch_times.append(time.perf_counter() - start)
+
+    engine = IncrementalFeatureEngineer(config)
+    engine.warmup("BTC/USDT", df.iloc[: args.history])
+    stream_times = []
+    for timestamp, candle in zip(live.index, live.to_dict("records"), strict=True):
+        start = time.perf_counter()
+        row = engine.update("BTC/USDT", candle, timestamp)
+        stream_times.append(time.perf_counter() - start)
+
+    match = np.allclose(
+        batch.iloc[-1].to_numpy(dtype=float),
+        np.array(list(row.values()), dtype=float),
+        rtol=1e-7,
+        equal_nan=True,
+    )
+
+    batch_us = np.median(batch_times) * 1e6
+    stream_us = np.median(stream_times) * 1e6
+    print(f"History: {args.history:,} candles | live candles: {args.candles:,}")
+    print(f"{'Path':<28} {'median (us)':>12} {'p99 (us)':>10}")
+    print(
+        f"{'batch _engineer_features':<28} {batch_us:>12.1f} {np.percentile(batch_times, 99) * 1e6:>10.1f}"
+    )
+    print(
+        f"{'IncrementalFeatureEngineer':<28} {stream_us:>12.1f} {np.percentile(stream_times, 99) * 1e6:>10.1f}"
+    )
+    print(f"Speedup: {batch_us / max(stream_us, 1e-9):.1f}x | last row matches batch: {match}")
+
+
+if __name__ == "__main__":
+    main()
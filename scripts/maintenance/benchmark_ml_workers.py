@@ -0,0 +1,195 @@
+"""
+Benchmark end-to-end ML inference throughput through the Redis request queues.
+
+Clients submit single-row predictions through ``MLInferenceService`` (pipelined
+binary transport) and, separately, as legacy one-JSON-message-per-request
+pushes; ML workers drain ``ml:requests:{model}`` in batches and reply. Reports
+requests/s and client-side p50/p99 latency for both paths.
+
+By default the Redis stand-in is the in-process fake from ``tests/mocks`` and
+the workers are ``ModelServer`` tasks on one event loop, which measures the
+batching/serialization path without network or a server. With ``--redis-url``
+a real ``MLWorkerPool`` (one process per worker) is started against that
+server instead.
+
+Usage:
+    python scripts/maintenance/benchmark_ml_workers.py --requests 20000 --workers 2
+    python scripts/maintenance/benchmark_ml_workers.py --redis-url redis://localhost:6379
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import pickle
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sklearn.linear_model import LogisticRegression
+
+from src.ml.batch_inference import BatchInferenceConfig
+from src.ml.inference_service import MLInferenceService, MLModelConfig
+from src.ml.inference_transport import PipelinedInferenceTransport, TransportConfig
+from src.ml.model_loader import ModelLoader
+from src.ml.worker_pool import MLWorkerPool, ModelServer, WorkerPoolConfig
+
+MODEL = "bench_model"
+
+
+def publish_model(registry_dir: str, n_features: int) -> list[str]:
+    """Train a small classifier and promote it in a fresh registry."""
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(2000, n_features))
+    y = (X[:, 0] + 0.5 * X[:, 1] > 0).astype(int)
+    model = LogisticRegression().fit(X, y)
+
+    feature_names = [f"f{i}" for i in range(n_features)]
+    model_path = Path(registry_dir).parent / "bench_model.pkl"
+    with open(model_path, "wb") as f:
+        pickle.dump(model, f)
+    registry = ModelLoader(registry_dir).registry
+    registry.register_model(MODEL, str(model_path), version="v1", feature_names=feature_names)
+    registry.validate_model(MODEL, "v1")
+    registry.promote_to_production(MODEL, "v1")
+    return feature_names
+
+
+def make_rows(n: int, feature_names: list[str]) -> list[dict[str, float]]:
+    values = np.random.default_rng(1).normal(size=(n, len(feature_names)))
+    return [dict(zip(feature_names, row.tolist(), strict=True)) for row in values]
+
+
+async def bench_transport(service, rows, concurrency):
+    latencies = []
+
+    async def one(row):
+        start = time.perf_counter()
+        await service.predict(MODEL, row)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, len(rows), concurrency):
+        await asyncio.gather(*(one(row) for row in rows[i : i + concurrency]))
+    return time.perf_counter() - start, latencies
+
+
+async def bench_legacy(redis, rows, concurrency, result_key):
+    """One JSON message per request, replies collected from the shared results list."""
+    latencies = []
+    start = time.perf_counter()
+    for i in range(0, len(rows), concurrency):
+        sent = {}
+        pipe = redis.pipeline(transaction=False)
+        for row in rows[i : i + concurrency]:
+            request_id = str(uuid.uuid4())
+            sent[request_id] = time.perf_counter()
+            request = {"request_id": request_id, "features": row, "timestamp": time.time()}
+            pipe.lpush(f"ml:requests:{MODEL}", json.dumps(request))
+        await pipe.execute()
+        while sent:
+            reply = await redis.brpop([result_key], timeout=5)
+            if reply is None:
+                raise TimeoutError(f"{len(sent)} legacy requests unanswered")
+            sent_at = sent.pop(json.loads(reply[1])["request_id"], None)
+            if sent_at is not None:
+                latencies.append(time.perf_counter() - sent_at)
+    return time.perf_counter() - start, latencies
+
+
+def report(label, n, elapsed, latencies):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    print(f"{label:<26} {n / elapsed:>12,.0f} {p50:>10.2f} {p99:>10.2f}")
+
+
+async def run(args, registry_dir, feature_names):
+    transport_config = TransportConfig(mode=args.mode, block_seconds=0.05)
+    result_key = f"{transport_config.legacy_result_key}:bench"
+    transport_config.legacy_result_key = result_key
+    pool_config = WorkerPoolConfig(
+        models=[MODEL],
+        redis_url=args.redis_url or "redis://localhost:6379",
+        registry_dir=registry_dir,
+        n_workers=args.workers,
+        transport=transport_config,
+        batch=BatchInferenceConfig(warmup_rounds=1),
+    )
+
+    pool = None
+    servers = []
+    if args.redis_url:
+        import redis.asyncio as aioredis
+
+        redis = aioredis.from_url(args.redis_url, decode_responses=False)
+        await redis.delete(transport_config.request_key(MODEL), result_key)
+        pool = MLWorkerPool(pool_config)
+        pool.start()
+        await asyncio.sleep(args.startup_wait)
+    else:
+        from tests.mocks.fake_redis import FakeRedis
+
+        redis = FakeRedis()
+        servers = [ModelServer(redis, pool_config, f"bench-{i}") for i in range(args.workers)]
+        for server in servers:
+            await server.load_all()
+    tasks = [asyncio.create_task(server.worker.run()) for server in servers]
+
+    transport = PipelinedInferenceTransport(redis, config=transport_config, client_id="bench")
+    service = MLInferenceService(
+        models={MODEL: MLModelConfig(MODEL, "unused.pkl", feature_names, timeout_ms=5000)},
+        transport=transport,
+    )
+    rows = make_rows(args.requests, feature_names)
+    try:
+        await service.start()
+        await bench_transport(service, rows[: args.concurrency], args.concurrency)  # Warmup
+        transport_result = await bench_transport(service, rows, args.concurrency)
+        legacy_result = None
+        if args.mode == "list":  # Legacy requests are only ever LPUSHed
+            legacy_result = await bench_legacy(redis, rows, args.concurrency, result_key)
+    finally:
+        await service.stop()
+        for server in servers:
+            server.worker.stop()
+        await asyncio.gather(*tasks)
+        if pool is not None:
+            pool.stop()
+            await redis.aclose()
+
+    print(
+        f"Stand-in: {'redis ' + args.redis_url if args.redis_url else 'in-process fake Redis'} | "
+        f"workers: {args.workers} | requests: {args.requests:,} | concurrency: {args.concurrency}"
+    )
+    print(f"{'Path':<26} {'requests/s':>12} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    report("pipelined binary", args.requests, *transport_result)
+    if legacy_result is not None:
+        report("legacy JSON per request", args.requests, *legacy_result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ML worker pool end to end")
+    parser.add_argument("--requests", type=int, default=20000, help="Predictions per path")
+    parser.add_argument("--concurrency", type=int, default=500, help="In-flight requests")
+    parser.add_argument("--workers", type=int, default=2, help="Workers (tasks or processes)")
+    parser.add_argument("--features", type=int, default=32, help="Model input width")
+    parser.add_argument("--mode", choices=["list", "stream"], default="list")
+    parser.add_argument("--redis-url", default=None, help="Use a real Redis and worker processes")
+    parser.add_argument("--startup-wait", type=float, default=5.0, help="Seconds for spawn")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry_dir = str(Path(tmp) / "registry")
+        feature_names = publish_model(registry_dir, args.features)
+        asyncio.run(run(args, registry_dir, feature_names))
+
+
+if __name__ == "__main__":
+    main()
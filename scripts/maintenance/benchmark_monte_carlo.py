@@ -0,0 +1,87 @@
+"""
+Benchmark the CPU Monte Carlo engine against the legacy argsort shuffle.
+
+Simulates synthetic per-trade returns with ``MonteCarloEngine`` once per
+worker count and reports wall-clock time, paths/s and the speedup over a
+single worker. The legacy ``argsort`` loop is timed on a slice of the paths
+and extrapolated, since running it on a million paths takes minutes.
+
+Usage:
+    python scripts/maintenance/benchmark_monte_carlo.py --paths 1000000 --workers 1 8 16
+    python scripts/maintenance/benchmark_monte_carlo.py --method stationary --block-size 20
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.analysis.monte_carlo import METHODS, MonteCarloConfig, MonteCarloEngine
+
+
+def legacy_paths_per_sec(profits: np.ndarray, n_paths: int, chunk_size: int = 1000) -> float:
+    """Throughput of the previous argsort/cumprod CPU loop."""
+    start = time.perf_counter()
+    for i in range(0, n_paths, chunk_size):
+        idx = np.random.rand(min(chunk_size, n_paths - i), len(profits)).argsort(axis=1)
+        equity = np.cumprod(1 + profits[idx], axis=1)
+        peaks = np.maximum.accumulate(equity, axis=1)
+        np.max((peaks - equity) / peaks, axis=1)
+    return n_paths / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CPU Monte Carlo engine")
+    parser.add_argument("--paths", type=int, default=200_000)
+    parser.add_argument("--trades", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--method", choices=METHODS, default="permutation")
+    parser.add_argument("--block-size", type=int, default=20)
+    parser.add_argument("--legacy-paths", type=int, default=2000, help="0 skips the legacy run")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    profits = np.random.default_rng(7).normal(0.001, 0.01, args.trades)
+
+    # Compile (or load the cached) kernel outside the timed runs
+    MonteCarloEngine(MonteCarloConfig(iterations=8, method=args.method)).run(profits)
+
+    print(
+        f"Method: {args.method} | paths: {args.paths:,} | trades: {args.trades:,} | "
+        f"block size: {args.block_size}"
+    )
+    print(f"{'workers':>7} {'wall (s)':>9} {'paths/s':>11} {'speedup':>8}  p95 drawdown")
+    baseline = None
+    for n_workers in args.workers:
+        config = MonteCarloConfig(
+            iterations=args.paths,
+            method=args.method,
+            block_size=args.block_size,
+            n_workers=n_workers,
+            seed=42,
+        )
+        start = time.perf_counter()
+        result = MonteCarloEngine(config).run(profits)
+        wall = time.perf_counter() - start
+        baseline = baseline or wall
+        print(
+            f"{n_workers:>7} {wall:>9.2f} {args.paths / wall:>11,.0f} {baseline / wall:>7.2f}x"
+            f"  {result.max_drawdown.quantile(0.95):.4f}"
+        )
+
+    if args.legacy_paths:
+        rate = legacy_paths_per_sec(profits, args.legacy_paths)
+        legacy_wall = args.paths / rate
+        print(
+            f" legacy {legacy_wall:>9.2f} {rate:>11,.0f} {baseline / legacy_wall:>7.2f}x"
+            "  (extrapolated, 1 process)"
+        )
+
+
+if __name__ == "__main__":
+    main()
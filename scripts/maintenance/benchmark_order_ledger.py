@@ -0,0 +1,138 @@
+"""
+Benchmark OrderLedger throughput (orders/s, status updates/s, duplicate checks/s).
+
+Compares the tuned engine (persistent WAL connections, group-committed writes,
+Bloom/LRU duplicate front) against a replica of the original write path: one
+new connection per call, rollback journal with FULL sync, one commit per write
+and every ``is_duplicate`` answered by SQLite.
+
+The update phase mimics a chase-limit replacement storm: every stored order
+gets ``--updates`` status changes from ``--threads`` concurrent threads.
+
+Usage:
+    python scripts/maintenance/benchmark_order_ledger.py --orders 2000 --updates 10
+    python scripts/maintenance/benchmark_order_ledger.py --threads 8
+"""
+
+import argparse
+import logging
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.order_manager.order_ledger import LedgerConfig, OrderLedger
+from src.order_manager.order_types import LimitOrder, OrderSide
+
+STATUSES = ["open", "partially_filled", "open", "canceled", "pending"]
+
+
+class LegacyLedger(OrderLedger):
+    """Connection per call, as before the engine rework."""
+
+    def __init__(self, db_path: str):
+        config = LedgerConfig(
+            journal_mode="DELETE",
+            synchronous="FULL",
+            group_commit=False,
+            async_status_updates=False,
+            bloom_capacity=0,
+        )
+        super().__init__(db_path, config)
+
+    @contextmanager
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path, isolation_level="DEFERRED", check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA journal_mode = {self.config.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.config.synchronous}")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+def run_threads(n_threads: int, target, items: list) -> float:
+    chunks = [items[i::n_threads] for i in range(n_threads)]
+    threads = [threading.Thread(target=target, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def bench(ledger: OrderLedger, args) -> dict[str, float]:
+    orders = [
+        LimitOrder(
+            order_id=f"o-{i}", symbol="BTC/USDT", side=OrderSide.BUY, quantity=0.01, price=30000.0
+        )
+        for i in range(args.orders)
+    ]
+
+    def store(chunk):
+        for order in chunk:
+            ledger.store_order(order, idempotency_key=f"k-{order.order_id}")
+
+    def update(chunk):
+        for order_id, status in chunk:
+            ledger.update_order_status(order_id, status)
+
+    def check(chunk):
+        for key in chunk:
+            ledger.is_duplicate(key)
+
+    results = {"store orders/s": args.orders / run_threads(args.threads, store, orders)}
+
+    updates = [
+        (order.order_id, STATUSES[j % len(STATUSES)])
+        for j in range(args.updates)
+        for order in orders
+    ]
+    start = time.perf_counter()
+    run_threads(args.threads, update, updates)
+    ledger.flush()  # Count until the last update is committed
+    results["status updates/s"] = len(updates) / (time.perf_counter() - start)
+
+    keys = [f"k-o-{i}" for i in range(args.orders)] + [f"new-{i}" for i in range(args.orders)]
+    results["is_duplicate/s"] = len(keys) / run_threads(args.threads, check, keys)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the order ledger")
+    parser.add_argument("--orders", type=int, default=2000, help="Orders to store")
+    parser.add_argument("--updates", type=int, default=10, help="Status updates per order")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent writer threads")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = LegacyLedger(str(Path(tmp) / "legacy.db"))
+        legacy_results = bench(legacy, args)
+        legacy.close()
+
+        ledger = OrderLedger(str(Path(tmp) / "tuned.db"))
+        tuned_results = bench(ledger, args)
+        ledger.close()
+
+    print(f"orders: {args.orders:,} | updates/order: {args.updates} | threads: {args.threads}")
+    print(f"{'Operation':<20} {'legacy':>12} {'tuned':>12} {'speedup':>9}")
+    for name, legacy_rate in legacy_results.items():
+        rate = tuned_results[name]
+        print(f"{name:<20} {legacy_rate:>12,.0f} {rate:>12,.0f} {rate / legacy_rate:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,21 @@ Attribution Analysis & Persistence
 
 Handles the storage and retrieval of the "Truth" (Signals + Executions).
 Provides the bridge between runtime execution and post-trade analytics.
+
+Writes go through a ``DatabaseWriter`` (bounded queue + writer thread), so a
+fill never waits on the database in the caller's thread or event loop. Use
+the ``*_async`` variants from coroutines and ``flush``/``shutdown`` before
+exit; pending records are also committed at interpreter exit.
 """
 
 import logging
+from concurrent.futures import Future
 from datetime import datetime
 from typing import Any
 
 from src.database.db_manager import DatabaseManager
-from src.database.models import ExecutionRecord, SignalRecord, TradeRecord
+from src.database.models import ExecutionRecord, ShadowTradeRecord, SignalRecord, TradeRecord
+from src.database.write_queue import DatabaseWriter
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +29,55 @@ class AttributionService:
     Designed to be non-blocking and safe.
     """
 
+    _writer: DatabaseWriter | None = None
+
+    @classmethod
+    def writer(cls) -> DatabaseWriter:
+        """Shared write-behind queue (created on first use)."""
+        if cls._writer is None or cls._writer._closed:
+            cls._writer = DatabaseWriter(DatabaseManager.session, name="attribution-writer")
+        return cls._writer
+
+    @classmethod
+    def flush(cls, timeout: float | None = None) -> None:
+        """Block until every queued record is committed."""
+        if cls._writer is not None:
+            cls._writer.flush(timeout)
+
+    @classmethod
+    async def flush_async(cls) -> None:
+        if cls._writer is not None:
+            await cls._writer.flush_async()
+
+    @classmethod
+    def shutdown(cls, timeout: float | None = None) -> None:
+        """Commit queued records and stop the writer thread."""
+        if cls._writer is not None:
+            cls._writer.close(timeout)
+
     @staticmethod
+    def _signal_job(symbol: str, strategy: str, decision: Any):
+        def job(session) -> int:
+            record = SignalRecord(
+                symbol=symbol,
+                strategy_name=strategy,
+                signal_type=decision.signal,
+                regime=decision.regime,
+                model_confidence=decision.confidence,
+                rsi=decision.metadata.get("rsi"),
+                ema_200=decision.metadata.get("ema_200"),
+                close_price=decision.metadata.get("close"),
+                meta_data=decision.metadata,
+            )
+            session.add(record)
+            session.flush()  # Populate ID
+            return record.id
+
+        return job
+
+    @classmethod
     def record_signal(
+        cls,
         symbol: str,
         strategy: str,
         decision: Any,  # StructuredTradeDecision
@@ -31,84 +85,130 @@ class AttributionService:
         """
         Persist a signal. Returns signal_id.
         Should be called by the Strategy before order submission.
+        Waits for the commit (the ID is needed); see ``record_signal_async``.
         """
         try:
-            with DatabaseManager.session() as session:
-                record = SignalRecord(
-                    symbol=symbol,
-                    strategy_name=strategy,
-                    signal_type=decision.signal,
-                    regime=decision.regime,
-                    model_confidence=decision.confidence,
-                    rsi=decision.metadata.get("rsi"),
-                    ema_200=decision.metadata.get("ema_200"),
-                    close_price=decision.metadata.get("close"),
-                    meta_data=decision.metadata,
-                )
-                session.add(record)
-                session.flush()  # Populate ID
-                return record.id
+            return cls.writer().submit(cls._signal_job(symbol, strategy, decision)).result()
+        except Exception as e:
+            logger.error(f"Failed to record signal: {e}")
+            return None
+
+    @classmethod
+    async def record_signal_async(cls, symbol: str, strategy: str, decision: Any) -> int | None:
+        """Coroutine version of ``record_signal``; the event loop keeps running."""
+        try:
+            job = cls._signal_job(symbol, strategy, decision)
+            return await cls.writer().submit_async(job, wait=True)
         except Exception as e:
             logger.error(f"Failed to record signal: {e}")
             return None
 
     @staticmethod
+    def _execution_job(
+        trade_data: dict[str, Any],
+        execution_metrics: dict[str, Any],
+        signal_id: int | None,
+        attribution_metadata: dict | None,
+    ):
+        def job(session) -> int:
+            # 1. Create TradeRecord (Accounting)
+            trade = TradeRecord(
+                symbol=trade_data["symbol"],
+                exchange=trade_data.get("exchange", "unknown"),
+                side=trade_data["side"],
+                entry_price=trade_data["price"],
+                amount=trade_data["amount"],
+                entry_time=trade_data.get("time") or datetime.utcnow(),
+                strategy_name=trade_data.get("strategy", "unknown"),
+                meta_data=attribution_metadata,
+            )
+            session.add(trade)
+            session.flush()  # get ID
+
+            # 2. Link Signal if exists
+            if signal_id:
+                signal = session.get(SignalRecord, signal_id)
+                if signal:
+                    signal.trade_id = trade.id
+
+            # 3. Create ExecutionRecord (Engineering)
+            exec_rec = ExecutionRecord(
+                trade_id=trade.id,
+                symbol=trade.symbol,
+                side=trade.side,
+                target_price=execution_metrics.get("target_price"),
+                fill_price=trade.entry_price,
+                slippage_pct=execution_metrics.get("slippage_pct"),
+                latency_ms=execution_metrics.get("latency_ms"),
+                spread_at_fill=execution_metrics.get("spread_at_fill"),
+                meta_data=execution_metrics.get("meta_data"),
+            )
+            session.add(exec_rec)
+
+            logger.info(
+                f"Recorded Attribution for Trade {trade.id}: "
+                f"Slippage={exec_rec.slippage_pct or 0.0:.4f}%"
+            )
+            return trade.id
+
+        return job
+
+    @classmethod
     def record_execution(
+        cls,
         trade_data: dict[str, Any],
         execution_metrics: dict[str, Any],
         signal_id: int | None = None,
         attribution_metadata: dict | None = None,
-    ):
+    ) -> Future | None:
         """
         Record a completed trade and its execution metrics.
         Should be called by SmartOrderExecutor upon fill.
 
+        The record is queued for the writer thread; the returned future
+        resolves to the trade ID once it is committed.
+
         Args:
-            trade_data: {symbol, exchange, side, price, amount, strategy}
+            trade_data: {symbol, exchange, side, price, amount, strategy, time}
             execution_metrics: {target_price, slippage_pct, latency_ms, spread_at_fill}
             signal_id: Optional ID of the signal that triggered this trade
             attribution_metadata: Context metadata carried by SmartOrder
         """
         try:
-            with DatabaseManager.session() as session:
-                # 1. Create TradeRecord (Accounting)
-                trade = TradeRecord(
-                    symbol=trade_data["symbol"],
-                    exchange=trade_data.get("exchange", "unknown"),
-                    side=trade_data["side"],
-                    entry_price=trade_data["price"],
-                    amount=trade_data["amount"],
-                    entry_time=datetime.utcnow(),
-                    strategy_name=trade_data.get("strategy", "unknown"),
-                    meta_data=attribution_metadata,
-                )
-                session.add(trade)
-                session.flush()  # get ID
-
-                # 2. Link Signal if exists
-                if signal_id:
-                    signal = session.query(SignalRecord).get(signal_id)
-                    if signal:
-                        signal.trade_id = trade.id
-                        # If SignalRecord had a different strategy name, trust the one in signal?
-                        # Usually they match.
-
-                # 3. Create ExecutionRecord (Engineering)
-                exec_rec = ExecutionRecord(
-                    trade_id=trade.id,
-                    symbol=trade.symbol,
-                    side=trade.side,
-                    target_price=execution_metrics.get("target_price"),
-                    fill_price=trade.entry_price,
-                    slippage_pct=execution_metrics.get("slippage_pct"),
-                    latency_ms=execution_metrics.get("latency_ms"),
-                    spread_at_fill=execution_metrics.get("spread_at_fill"),
-                    meta_data=execution_metrics.get("meta_data"),
-                )
-                session.add(exec_rec)
-
-                logger.info(
-                    f"Recorded Attribution for Trade {trade.id}: Slippage={exec_rec.slippage_pct:.4f}%"
-                )
+            job = cls._execution_job(trade_data, execution_metrics, signal_id, attribution_metadata)
+            return cls.writer().submit(job)
         except Exception as e:
             logger.error(f"Failed to record execution attribution: {e}")
+            return None
+
+    @classmethod
+    async def record_execution_async(
+        cls,
+        trade_data: dict[str, Any],
+        execution_metrics: dict[str, Any],
+        signal_id: int | None = None,
+        attribution_metadata: dict | None = None,
+    ) -> Future | None:
+        """Coroutine version of ``record_execution`` (never blocks the event loop)."""
+        try:
+            job = cls._execution_job(trade_data, execution_metrics, signal_id, attribution_metadata)
+            return await cls.writer().submit_async(job)
+        except Exception as e:
+            logger.error(f"Failed to record execution attribution: {e}")
+            return None
+
+    @classmethod
+    async def record_shadow_trade_async(cls, record: dict[str, Any]) -> Future | None:
+        """Queue a ``ShadowTradeRecord`` built from ``record`` (column -> value)."""
+
+        def job(session) -> int:
+            shadow = ShadowTradeRecord(**record)
+            session.add(shadow)
+            session.flush()
+            return shadow.id
+
+        try:
+            return await cls.writer().submit_async(job)
+        except Exception as e:
+            logger.error(f"Failed to record shadow trade: {e}")
+            return None
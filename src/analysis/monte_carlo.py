@@ -4,10 +4,34 @@ GPU-Accelerated Monte Carlo Simulator
 
 High-performance simulation for strategy robustness testing.
 Uses CuPy for vectorized GPU operations and Numba for JIT-optimized kernels.
+
+The CPU engine (``MonteCarloEngine``) resamples the trade sequence per path
+with one of:
+
+- ``permutation``: reshuffle all trades (Fisher-Yates, O(n) per path)
+- ``bootstrap``: i.i.d. draws with replacement
+- ``block``: circular block bootstrap with fixed blocks of ``block_size``
+- ``stationary``: stationary bootstrap (geometric blocks, mean ``block_size``)
+
+Each path runs in a single fused pass over its trades (equity, peak, drawdown,
+underwater duration, ruin) and is summarized into mergeable histograms, so
+memory does not grow with the number of paths. Paths are split into chunks
+with independent seeded streams (``SeedSequence.spawn``), which makes results
+depend only on the seed and chunk size, not on how chunks are spread across
+worker processes.
+
+Usage:
+    engine = MonteCarloEngine(MonteCarloConfig(iterations=1_000_000, n_workers=-1))
+    result = engine.run(profits)
+    result.summary()
 """
 
 import logging
+import multiprocessing
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 import numpy as np
@@ -19,10 +43,629 @@ try:
 except ImportError:
     GPU_AVAILABLE = False
 
+# Try to import Numba for the path kernel
+try:
+    from numba import jit
+
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    # Dummy decorator if Numba is not present
+    def jit(signature_or_function=None, nopython=True, **kwargs):
+        def decorator(func):
+            return func
+
+        if callable(signature_or_function):
+            return signature_or_function
+        return decorator
+
 from src.utils.logger import log
 
 logger = logging.getLogger(__name__)
 
+METHODS = ("permutation", "bootstrap", "block", "stationary")
+
+# SplitMix64 constants (typed uint64 so Numba keeps the arithmetic unsigned)
+_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_S11 = np.uint64(11)
+_S27 = np.uint64(27)
+_S30 = np.uint64(30)
+_S31 = np.uint64(31)
+_S32 = np.uint64(32)
+_UNIT = 2.0**-53
+
+
+def _splitmix64(state):
+    """Advance SplitMix64 state(s); returns (new_state, 64-bit output)."""
+    state = state + _GAMMA
+    z = state
+    z = (z ^ (z >> _S30)) * _MIX1
+    z = (z ^ (z >> _S27)) * _MIX2
+    return state, z ^ (z >> _S31)
+
+
+_splitmix64_jit = jit(nopython=True)(_splitmix64)
+
+
+class StreamingQuantiles:
+    """
+    Fixed-range histogram with exact count, mean, std, min and max.
+
+    Quantiles are interpolated inside bins (error below one bin width) and
+    clamped to the exact min/max. Values outside ``[lo, hi)`` land in the edge
+    bins. Histograms with the same layout merge by adding counts, so per-chunk
+    and per-worker summaries combine without keeping any samples.
+
+    Args:
+        lo: Lower edge of the histogram (> -1 for ``log1p``)
+        hi: Upper edge of the histogram
+        bins: Number of bins
+        scale: ``linear``, ``log1p`` (bins uniform in log(1 + x), for returns)
+            or ``integer`` (unit bins from ``lo``; quantiles are exact)
+    """
+
+    def __init__(self, lo: float, hi: float, bins: int = 4096, scale: str = "linear"):
+        if scale not in ("linear", "log1p", "integer"):
+            raise ValueError(f"Unknown scale: {scale}")
+        if scale == "integer":
+            bins = int(np.ceil(hi - lo))
+            hi = lo + bins
+        elif scale == "log1p":
+            if lo <= -1:
+                raise ValueError("log1p scale needs lo > -1")
+            lo, hi = np.log1p(lo), np.log1p(hi)
+        if not (np.isfinite(lo) and np.isfinite(hi) and hi > lo) or bins < 1:
+            raise ValueError(f"Invalid histogram range [{lo}, {hi}) with {bins} bins")
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.bins = int(bins)
+        self.scale = scale
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+        axis = np.log1p(values) if self.scale == "log1p" else values
+        width = (self.hi - self.lo) / self.bins
+        idx = np.clip(np.floor((axis - self.lo) / width), 0, self.bins - 1).astype(np.int64)
+        self.counts += np.bincount(idx, minlength=self.bins)
+
+        # Chan et al. parallel update of mean and sum of squared deviations
+        n, mean = len(values), float(values.mean())
+        m2 = float(((values - mean) ** 2).sum()) if np.isfinite(mean) else np.nan
+        self._combine(n, mean, m2)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: "StreamingQuantiles") -> None:
+        """Add the counts and moments of a histogram with the same layout."""
+        if (other.lo, other.hi, other.bins, other.scale) != (
+            self.lo,
+            self.hi,
+            self.bins,
+            self.scale,
+        ):
+            raise ValueError("Cannot merge histograms with different layouts")
+        self.counts += other.counts
+        if other.count:
+            self._combine(other.count, other.mean, other._m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def _combine(self, n: int, mean: float, m2: float) -> None:
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta**2 * self.count * n / total
+        self.count = total
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self._m2 / self.count)) if self.count else float("nan")
+
+    def quantile(self, q: float | np.ndarray) -> float | np.ndarray:
+        """Estimate the q-quantile(s), q in [0, 1]."""
+        if not self.count:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        q = np.asarray(q, dtype=np.float64)
+        cdf = np.cumsum(self.counts)
+        target = np.clip(q, 0.0, 1.0) * self.count
+        width = (self.hi - self.lo) / self.bins
+        if self.scale == "integer":
+            # Smallest value whose cumulative count reaches the target
+            k = np.searchsorted(cdf, np.maximum(target, 1), side="left")
+            values = self.lo + k * width
+        else:
+            k = np.minimum(np.searchsorted(cdf, target, side="left"), self.bins - 1)
+            before = np.where(k > 0, cdf[k - 1], 0)
+            frac = np.clip((target - before) / np.maximum(self.counts[k], 1), 0.0, 1.0)
+            values = self.lo + (k + frac) * width
+            if self.scale == "log1p":
+                values = np.expm1(values)
+        values = np.clip(values, self.min, self.max)
+        return float(values) if values.ndim == 0 else values
+
+
+@jit(nopython=True, inline="always")
+def _track(t, r, cum, peak, worst, peak_t, longest, ruin_t, ruin_log):
+    """Add one log return and update peak, worst drawdown, underwater run and ruin."""
+    cum += r
+    if cum >= peak:
+        peak = cum
+        peak_t = t + 1
+    else:
+        dd = cum - peak
+        if dd < worst:
+            worst = dd
+        if ruin_t < 0 and dd <= ruin_log:
+            ruin_t = t + 1
+        if t + 1 - peak_t > longest:
+            longest = t + 1 - peak_t
+    return cum, peak, worst, peak_t, longest, ruin_t
+
+
+@jit(nopython=True, cache=True)
+def _simulate_paths_numba(
+    log_returns, seeds, method, block_size, ruin_log, max_dd, growth, duration, ruin_at, curves
+):
+    """Resample and summarize one path per seed in a single fused pass (Numba)."""
+    n = len(log_returns)
+    bound = np.uint64(n)
+    restart = 1.0 / block_size
+    buf = np.empty(n)
+    for p in range(len(seeds)):
+        state = seeds[p]
+        keep = p < curves.shape[0]
+        cum = 0.0
+        peak = 0.0
+        worst = 0.0
+        peak_t = 0
+        longest = 0
+        ruin_t = -1
+
+        # One loop per method keeps the resampling branch out of the hot loop
+        if method == 0:
+            buf[:] = log_returns
+            for t in range(n):
+                # Fisher-Yates from the back: slot i takes a uniform pick of buf[0..i]
+                # and is never read again, so only the picked slot needs refilling
+                i = n - 1 - t
+                state, z = _splitmix64_jit(state)
+                j = np.int64(((z >> _S32) * np.uint64(i + 1)) >> _S32)
+                r = buf[j]
+                buf[j] = buf[i]
+                cum, peak, worst, peak_t, longest, ruin_t = _track(
+                    t, r, cum, peak, worst, peak_t, longest, ruin_t, ruin_log
+                )
+                if keep:
+                    curves[p, t] = cum
+        elif method == 1:
+            for t in range(n):
+                state, z = _splitmix64_jit(state)
+                r = log_returns[np.int64(((z >> _S32) * bound) >> _S32)]
+                cum, peak, worst, peak_t, longest, ruin_t = _track(
+                    t, r, cum, peak, worst, peak_t, longest, ruin_t, ruin_log
+                )
+                if keep:
+                    curves[p, t] = cum
+        else:
+            pos = 0
+            for t in range(n):
+                state, z = _splitmix64_jit(state)
+                if method == 2:
+                    new_block = t % block_size == 0
+                else:
+                    new_block = t == 0 or np.float64(z >> _S11) * _UNIT < restart
+                    state, z = _splitmix64_jit(state)
+                if new_block:
+                    pos = np.int64(((z >> _S32) * bound) >> _S32)
+                else:
+                    pos += 1
+                    if pos == n:
+                        pos = 0
+                cum, peak, worst, peak_t, longest, ruin_t = _track(
+                    t, log_returns[pos], cum, peak, worst, peak_t, longest, ruin_t, ruin_log
+                )
+                if keep:
+                    curves[p, t] = cum
+
+        max_dd[p] = -np.expm1(worst)
+        growth[p] = cum
+        duration[p] = longest
+        ruin_at[p] = ruin_t
+
+
+def _simulate_paths_numpy(
+    log_returns, seeds, method, block_size, ruin_log, max_dd, growth, duration, ruin_at, curves
+):
+    """Same paths as the Numba kernel, stepping all paths of a chunk together (NumPy)."""
+    n = len(log_returns)
+    m = len(seeds)
+    bound = np.uint64(n)
+    rows = np.arange(m)
+    state = seeds.copy()
+    buf = np.tile(log_returns, (m, 1)) if method == 0 else None
+    pos = np.zeros(m, dtype=np.int64)
+    cum = np.zeros(m)
+    peak = np.zeros(m)
+    worst = np.zeros(m)
+    peak_t = np.zeros(m, dtype=np.int64)
+    longest = np.zeros(m, dtype=np.int64)
+    ruin_t = np.full(m, -1, dtype=np.int64)
+    n_curves = curves.shape[0]
+
+    for t in range(n):
+        if method == 0:
+            i = n - 1 - t
+            state, z = _splitmix64(state)
+            j = (((z >> _S32) * np.uint64(i + 1)) >> _S32).astype(np.int64)
+            r = buf[rows, j]
+            buf[rows, j] = buf[rows, i]
+        elif method == 1:
+            state, z = _splitmix64(state)
+            r = log_returns[(((z >> _S32) * bound) >> _S32).astype(np.int64)]
+        else:
+            state, z = _splitmix64(state)
+            if method == 2:
+                new_block = np.full(m, t % block_size == 0)
+            else:
+                new_block = (t == 0) | ((z >> _S11).astype(np.float64) * _UNIT < 1.0 / block_size)
+                state, z = _splitmix64(state)
+            start = (((z >> _S32) * bound) >> _S32).astype(np.int64)
+            pos = np.where(new_block, start, (pos + 1) % n)
+            r = log_returns[pos]
+
+        cum += r
+        at_peak = cum >= peak
+        peak = np.where(at_peak, cum, peak)
+        peak_t = np.where(at_peak, t + 1, peak_t)
+        dd = np.where(at_peak, 0.0, cum - peak)
+        np.minimum(worst, dd, out=worst)
+        ruin_t[(ruin_t < 0) & ~at_peak & (dd <= ruin_log)] = t + 1
+        np.maximum(longest, t + 1 - peak_t, out=longest)
+        if n_curves:
+            curves[:, t] = cum[:n_curves]
+
+    max_dd[:] = -np.expm1(worst)
+    growth[:] = cum
+    duration[:] = longest
+    ruin_at[:] = ruin_t
+
+
+@dataclass
+class MonteCarloConfig:
+    """Configuration for the CPU Monte Carlo engine."""
+
+    iterations: int = 10000
+    initial_capital: float = 10000.0
+
+    # Drawdown (fraction of the running peak) that counts as ruin
+    ruin_threshold: float = 0.5
+
+    # Resampling: permutation, bootstrap, block, stationary
+    method: str = "permutation"
+    block_size: int = 20  # Block length (block) or mean block length (stationary)
+
+    # Parallelism: worker processes over chunks (-1 = all cores)
+    n_workers: int = 1
+    chunk_size: int = 4096  # Paths per chunk (one seeded stream each)
+    seed: Optional[int] = None
+
+    # Summary resolution and kept paths
+    quantile_bins: int = 4096
+    keep_paths: int = 0  # Equity curves kept for plotting (from the first chunk)
+
+    use_numba: Optional[bool] = None  # Force the Numba kernel or NumPy path (default: auto)
+
+
+@dataclass
+class MonteCarloResult:
+    """Streaming summary of a Monte Carlo run."""
+
+    iterations: int
+    n_trades: int
+    method: str
+    initial_capital: float
+    ruin_threshold: float
+    max_drawdown: StreamingQuantiles  # Max drawdown per path (fraction of peak)
+    returns: StreamingQuantiles  # Total return per path
+    drawdown_duration: StreamingQuantiles  # Longest underwater stretch per path (trades)
+    time_to_ruin: StreamingQuantiles  # Trades until ruin, ruined paths only
+    equity_curves: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    duration_sec: float = 0.0
+
+    @property
+    def n_ruined(self) -> int:
+        return self.time_to_ruin.count
+
+    @property
+    def probability_of_ruin(self) -> float:
+        """Fraction of paths whose drawdown reached ``ruin_threshold``."""
+        return self.n_ruined / self.iterations if self.iterations else 0.0
+
+    def merge(self, other: "MonteCarloResult") -> None:
+        self.iterations += other.iterations
+        self.max_drawdown.merge(other.max_drawdown)
+        self.returns.merge(other.returns)
+        self.drawdown_duration.merge(other.drawdown_duration)
+        self.time_to_ruin.merge(other.time_to_ruin)
+        if other.equity_curves.size and not self.equity_curves.size:
+            self.equity_curves = other.equity_curves
+
+    def summary(self, quantiles: tuple = (0.05, 0.5, 0.95, 0.99)) -> Dict[str, Any]:
+        """Flat dictionary of distribution statistics (counts, method name, floats)."""
+        out: Dict[str, Any] = {
+            "iterations": self.iterations,
+            "n_trades": self.n_trades,
+            "method": self.method,
+            "mean_max_drawdown": float(self.max_drawdown.mean),
+            "mean_return": float(self.returns.mean),
+            "std_return": self.returns.std,
+            "mean_drawdown_duration": float(self.drawdown_duration.mean),
+            "probability_of_ruin": self.probability_of_ruin,
+            "median_time_to_ruin": float(self.time_to_ruin.quantile(0.5)),
+        }
+        for q in quantiles:
+            tag = f"p{q * 100:g}"
+            out[f"{tag}_max_drawdown"] = float(self.max_drawdown.quantile(q))
+            out[f"{tag}_return"] = float(self.returns.quantile(q))
+            out[f"{tag}_drawdown_duration"] = float(self.drawdown_duration.quantile(q))
+        return out
+
+
+def _run_chunks(
+    log_returns: np.ndarray,
+    seed_sequences: List[np.random.SeedSequence],
+    sizes: List[int],
+    config: MonteCarloConfig,
+    layout: Dict[str, Any],
+) -> MonteCarloResult:
+    """Simulate a batch of chunks and fold them into one result (worker entry point)."""
+    method = METHODS.index(config.method)
+    ruin_log = float(np.log1p(-config.ruin_threshold)) if config.ruin_threshold < 1 else -np.inf
+    use_numba = HAVE_NUMBA if config.use_numba is None else config.use_numba
+    kernel = _simulate_paths_numba if use_numba else _simulate_paths_numpy
+    n = len(log_returns)
+
+    result = _empty_result(n, config, layout)
+    for seq, size in zip(seed_sequences, sizes):
+        seeds = seq.generate_state(size, dtype=np.uint64)
+        max_dd = np.empty(size)
+        growth = np.empty(size)
+        duration = np.empty(size, dtype=np.int64)
+        ruin_at = np.empty(size, dtype=np.int64)
+        # Sample equity curves come from the first chunk, whichever worker runs it
+        keep = layout["keep"] if seq.spawn_key == layout["first_key"] else 0
+        curves = np.zeros((min(keep, size), n))
+
+        kernel(
+            log_returns,
+            seeds,
+            method,
+            config.block_size,
+            ruin_log,
+            max_dd,
+            growth,
+            duration,
+            ruin_at,
+            curves,
+        )
+
+        result.iterations += size
+        result.max_drawdown.update(max_dd)
+        result.returns.update(np.expm1(growth))
+        result.drawdown_duration.update(duration)
+        result.time_to_ruin.update(ruin_at[ruin_at > 0])
+        if len(curves):
+            start = np.zeros((len(curves), 1))
+            result.equity_curves = config.initial_capital * np.exp(np.hstack([start, curves]))
+    return result
+
+
+def _empty_result(
+    n_trades: int, config: MonteCarloConfig, layout: Dict[str, Any]
+) -> MonteCarloResult:
+    lo, hi = layout["growth_range"]
+    return MonteCarloResult(
+        iterations=0,
+        n_trades=n_trades,
+        method=config.method,
+        initial_capital=config.initial_capital,
+        ruin_threshold=config.ruin_threshold,
+        max_drawdown=StreamingQuantiles(0.0, 1.0, config.quantile_bins),
+        returns=StreamingQuantiles(np.expm1(lo), np.expm1(hi), config.quantile_bins, "log1p"),
+        drawdown_duration=StreamingQuantiles(0, n_trades + 1, scale="integer"),
+        time_to_ruin=StreamingQuantiles(1, n_trades + 1, scale="integer"),
+    )
+
+
+class MonteCarloEngine:
+    """
+    CPU Monte Carlo engine for trade-sequence resampling.
+
+    Every path gets its own SplitMix64 stream seeded from its chunk's
+    ``SeedSequence``; paths are reduced to max drawdown, total return, longest
+    drawdown duration and time to ruin on the fly and only histograms are kept.
+    """
+
+    def __init__(self, config: Optional[MonteCarloConfig] = None):
+        self.config = config or MonteCarloConfig()
+        if self.config.method not in METHODS:
+            raise ValueError(f"Unknown method {self.config.method!r}; use one of {METHODS}")
+        if self.config.block_size < 1:
+            raise ValueError("block_size must be >= 1")
+
+    def _growth_range(self, log_returns: np.ndarray) -> tuple:
+        """Histogram range for total log growth, wide enough for any realistic path."""
+        n = len(log_returns)
+        finite = log_returns[np.isfinite(log_returns)]
+        if not len(finite):
+            return -1.0, 1.0
+        center = n * float(finite.mean())
+        # Block resampling can inflate the variance of the sum up to block_size times
+        spread = 1 if self.config.method in ("permutation", "bootstrap") else self.config.block_size
+        half = 10.0 * float(finite.std()) * np.sqrt(n * spread)
+        lo = max(center - half, n * float(finite.min()))
+        hi = min(center + half, n * float(finite.max()))
+        pad = 1e-9 * max(1.0, abs(center))
+        # Keep the edges representable after expm1 (growth beyond e**±30 lands in edge bins)
+        return max(lo - pad, -30.0), min(hi + pad, 30.0)
+
+    def run(self, profits: np.ndarray) -> MonteCarloResult:
+        """
+        Simulate ``config.iterations`` resampled trade sequences.
+
+        Args:
+            profits: Per-trade returns as fractions (0.01 = +1%); NaNs are dropped
+
+        Returns:
+            MonteCarloResult with streaming distribution summaries
+        """
+        config = self.config
+        start_time = time.time()
+        profits = np.asarray(profits, dtype=np.float64)
+        profits = profits[~np.isnan(profits)]
+        if len(profits) == 0:
+            raise ValueError("No trades to simulate")
+        # A trade losing everything ends the path at zero equity
+        log_returns = np.log1p(np.maximum(profits, -1.0))
+        n = len(log_returns)
+
+        sizes = [
+            min(config.chunk_size, config.iterations - i)
+            for i in range(0, config.iterations, config.chunk_size)
+        ]
+        seqs = np.random.SeedSequence(config.seed).spawn(len(sizes))
+        layout = {
+            "growth_range": self._growth_range(log_returns),
+            "keep": config.keep_paths,
+            "first_key": seqs[0].spawn_key if seqs else None,
+        }
+
+        n_workers = (os.cpu_count() or 1) if config.n_workers == -1 else config.n_workers
+        n_workers = max(1, min(n_workers, len(sizes)))
+        if n_workers == 1:
+            result = _run_chunks(log_returns, seqs, sizes, config, layout)
+        else:
+            result = _empty_result(n, config, layout)
+            # Contiguous batches keep the merge order (and the result) deterministic
+            batches = np.array_split(np.arange(len(sizes)), n_workers)
+            # Spawn, not fork: forking a parent with live BLAS/OpenMP threads can deadlock
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(n_workers, mp_context=context) as pool:
+                futures = [
+                    pool.submit(
+                        _run_chunks,
+                        log_returns,
+                        [seqs[i] for i in batch],
+                        [sizes[i] for i in batch],
+                        config,
+                        layout,
+                    )
+                    for batch in batches
+                ]
+                for future in futures:
+                    result.merge(future.result())
+
+        result.duration_sec = time.time() - start_time
+        log.info(
+            "monte_carlo_cpu_complete",
+            iterations=result.iterations,
+            n_trades=n,
+            method=config.method,
+            workers=n_workers,
+            duration_sec=f"{result.duration_sec:.4f}s",
+        )
+        return result
+
+
+class MonteCarloSimulator:
+    """
+    Monte Carlo robustness check for backtest trades (CPU engine).
+
+    Args:
+        trades_df: Trades with a ``profit_ratio`` column
+        iterations: Number of simulated trade sequences
+        initial_capital: Starting equity
+        max_drawdown_limit: Drawdown that counts as ruin
+        **kwargs: Further MonteCarloConfig fields (method, block_size, n_workers, seed, ...)
+    """
+
+    def __init__(
+        self,
+        trades_df: pd.DataFrame,
+        iterations: int = 1000,
+        initial_capital: float = 10000.0,
+        max_drawdown_limit: float = 0.5,
+        **kwargs,
+    ):
+        self.profits = trades_df["profit_ratio"].to_numpy(dtype=np.float64)
+        kwargs.setdefault("keep_paths", min(iterations, 100))
+        self.config = MonteCarloConfig(
+            iterations=iterations,
+            initial_capital=initial_capital,
+            ruin_threshold=max_drawdown_limit,
+            **kwargs,
+        )
+        self.result: Optional[MonteCarloResult] = None
+
+    @property
+    def all_equity_curves(self) -> np.ndarray:
+        """Sample of simulated equity curves (``keep_paths`` rows)."""
+        return self.result.equity_curves if self.result is not None else np.empty((0, 0))
+
+    def run(self) -> MonteCarloResult:
+        self.result = MonteCarloEngine(self.config).run(self.profits)
+        return self.result
+
+    def get_summary(self) -> Dict[str, float]:
+        if self.result is None:
+            self.run()
+        result = self.result
+        assert result is not None
+        return {
+            "iterations": float(result.iterations),
+            "probability_of_ruin": result.probability_of_ruin * 100,
+            "mean_max_drawdown": float(result.max_drawdown.mean),
+            "median_max_drawdown": float(result.max_drawdown.quantile(0.5)),
+            "95th_percentile_drawdown": float(result.max_drawdown.quantile(0.95)),
+            "99th_percentile_drawdown": float(result.max_drawdown.quantile(0.99)),
+            "mean_return": float(result.returns.mean),
+            "5th_percentile_return": float(result.returns.quantile(0.05)),
+            "95th_percentile_drawdown_duration": float(result.drawdown_duration.quantile(0.95)),
+            "median_time_to_ruin": float(result.time_to_ruin.quantile(0.5)),
+        }
+
+    def plot_equity_curves(
+        self, num_curves_to_plot: int = 100, output_path: str = "monte_carlo.png"
+    ) -> None:
+        import matplotlib.pyplot as plt
+
+        curves = self.all_equity_curves
+        plt.figure(figsize=(10, 6))
+        for curve in curves[:num_curves_to_plot]:
+            plt.plot(curve, color="gray", alpha=0.1)
+        if len(curves):
+            plt.plot(np.median(curves, axis=0), color="blue", linewidth=2, label="Median")
+        plt.title(f"Monte Carlo Equity Paths ({self.config.method})")
+        plt.xlabel("Trade")
+        plt.ylabel("Equity")
+        plt.grid(True, alpha=0.3)
+        plt.legend()
+        plt.savefig(output_path, dpi=150)
+        plt.close()
+
+
 class GPUMonteCarloSimulator:
     """
     GPU-accelerated Monte Carlo simulator for strategy backtest results.
@@ -58,8 +701,12 @@ class GPUMonteCarloSimulator:
         # Re-arrange profits based on indices
         shuffled_profits = profits_gpu[indices]
         
-        # Vectorized Pnl calculation
-        equity_curves = cp.cumprod(1 + shuffled_profits, axis=1) * self.initial_capital
+        # Vectorized Pnl calculation; paths start at the initial capital so a losing
+        # first trade counts as drawdown, as in the CPU engine
+        start = cp.ones((self.iterations, 1))
+        equity_curves = (
+            cp.hstack([start, cp.cumprod(1 + shuffled_profits, axis=1)]) * self.initial_capital
+        )
         
         # Calculate Max Drawdown for each iteration
         peaks = cp.maximum.accumulate(equity_curves, axis=1)
@@ -82,39 +729,19 @@ class GPUMonteCarloSimulator:
         return self._format_results()
 
     def _run_cpu(self):
-        """Vectorized CPU fallback using NumPy."""
-        start_time = time.time()
-        n_trades = len(self.profits)
-        
-        # Memory-efficient chunked execution if iterations are high
-        chunk_size = 1000
-        all_max_dd = []
-        all_returns = []
-        
-        for i in range(0, self.iterations, chunk_size):
-            actual_chunk = min(chunk_size, self.iterations - i)
-            
-            # Vectorized shuffle (sort random floats)
-            idx = np.random.rand(actual_chunk, n_trades).argsort(axis=1)
-            shuffled = self.profits[idx]
-            
-            equity = np.cumprod(1 + shuffled, axis=1) * self.initial_capital
-            peaks = np.maximum.accumulate(equity, axis=1)
-            max_dd = np.max((peaks - equity) / peaks, axis=1)
-            final_ret = (equity[:, -1] - self.initial_capital) / self.initial_capital
-            
-            all_max_dd.extend(max_dd)
-            all_returns.extend(final_ret)
-            
-        self.max_drawdowns = np.array(all_max_dd)
-        self.returns = np.array(all_returns)
-        
-        duration = time.time() - start_time
-        log.info("monte_carlo_cpu_complete", 
-                 iterations=self.iterations, 
-                 duration_sec=f"{duration:.4f}s")
-        
-        return self._format_results()
+        """CPU fallback using the streaming Monte Carlo engine."""
+        config = MonteCarloConfig(
+            iterations=self.iterations, initial_capital=self.initial_capital, ruin_threshold=0.5
+        )
+        self.results = MonteCarloEngine(config).run(self.profits)
+        return {
+            "mean_drawdown": self.results.max_drawdown.mean,
+            "95th_drawdown": self.results.max_drawdown.quantile(0.95),
+            "99th_drawdown": self.results.max_drawdown.quantile(0.99),
+            "mean_return": self.results.returns.mean,
+            "std_return": self.results.returns.std,
+            "prob_ruin": self.results.probability_of_ruin * 100,
+        }
 
     def _format_results(self) -> Dict[str, Any]:
         return {
@@ -11,19 +11,40 @@ Key Features:
 - Correct handling of Take Profit / Stop Loss / Time Exits
 - Conservative execution assumptions (SL hits before TP in ambiguous cases)
 - Fast iteration using Numpy
+- Batched parameter sweeps (many pairs x many TP/SL/holding combinations per call)
+  through a Numba-compiled kernel with a vectorized NumPy fallback
 """
 
 import logging
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
 from typing import Any
 
 import pandas as pd
 import numpy as np
 
+# Try to import Numba for the compiled batch kernel
+try:
+    from numba import jit, prange
+
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    # Dummy decorator if Numba is not present
+    def jit(signature_or_function=None, nopython=True, **kwargs):
+        def decorator(func):
+            return func
+
+        if callable(signature_or_function):
+            return signature_or_function
+        return decorator
+
+    prange = range
+
 try:
     import cudf
-    from numba import jit
-    CUDA_AVAILABLE = True
+    CUDA_AVAILABLE = HAVE_NUMBA
 except ImportError:
     CUDA_AVAILABLE = False
 
@@ -60,6 +81,430 @@ class Trade:
     holding_bars: int
 
 
+@dataclass
+class BatchBacktestResult:
+    """
+    Per-combination metrics of a batched backtest.
+
+    Metric arrays have shape (n_keys, n_params): row j is the signal column
+    ``keys[j]``, column k is the parameter set
+    ``(take_profit[k], stop_loss[k], max_holding_bars[k])``.
+    """
+
+    keys: list[str]
+    take_profit: np.ndarray
+    stop_loss: np.ndarray
+    max_holding_bars: np.ndarray
+    final_capital: np.ndarray
+    total_return: np.ndarray
+    num_trades: np.ndarray
+    win_rate: np.ndarray  # NaN when no trades
+    profit_factor: np.ndarray  # inf when there are no losing trades
+    max_drawdown: np.ndarray  # <= 0, same convention as the WFO summary
+    sharpe_ratio: np.ndarray
+    trades: dict[tuple[str, int], pd.DataFrame] | None = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Flatten into a long DataFrame with one row per combination."""
+        n_keys, n_params = self.final_capital.shape
+        return pd.DataFrame(
+            {
+                "key": np.repeat(np.asarray(self.keys, dtype=object), n_params),
+                "param_index": np.tile(np.arange(n_params), n_keys),
+                "take_profit": np.tile(self.take_profit, n_keys),
+                "stop_loss": np.tile(self.stop_loss, n_keys),
+                "max_holding_bars": np.tile(self.max_holding_bars, n_keys),
+                "final_capital": self.final_capital.ravel(),
+                "total_return": self.total_return.ravel(),
+                "num_trades": self.num_trades.ravel(),
+                "win_rate": self.win_rate.ravel(),
+                "profit_factor": self.profit_factor.ravel(),
+                "max_drawdown": self.max_drawdown.ravel(),
+                "sharpe_ratio": self.sharpe_ratio.ravel(),
+            }
+        )
+
+
+# Exit reason codes used by the compiled kernels (index into EXIT_REASONS)
+EXIT_REASONS = ("stop_loss", "take_profit", "time_limit", "end_of_data")
+
+# Columns of a kernel trade log row
+_TRADE_LOG_FIELDS = 9  # entry_idx, exit_idx, entry, exit, qty, gross, net, fees, reason
+
+# Columns of a kernel metrics row
+_N_METRICS = 7  # final_capital, num_trades, wins, gross_profit, gross_loss, max_dd, sharpe
+
+
+@jit(nopython=True)
+def _simulate_combination(
+    opens,
+    highs,
+    lows,
+    closes,
+    signals,
+    n_bars,
+    take_profit,
+    stop_loss,
+    max_holding_bars,
+    initial_capital,
+    fee_rate,
+    slippage_rate,
+    position_size_pct,
+    bars_per_year,
+    trade_log,
+):
+    """
+    Simulate one (series, parameter set) combination.
+
+    Mirrors ``VectorizedBacktester.run`` bar for bar, but streams the equity
+    curve into drawdown / Sharpe accumulators instead of materialising it.
+    Trades are written to ``trade_log`` only when it has rows.
+    """
+    record = trade_log.shape[0] > 0
+    current_capital = initial_capital
+
+    in_position = False
+    entry_price = 0.0
+    entry_idx = 0
+    quantity = 0.0
+
+    num_trades = 0
+    wins = 0
+    gross_profit = 0.0
+    gross_loss = 0.0
+
+    # Equity-curve accumulators. The last point can be overwritten by the
+    # end-of-data exit, so it is held back and committed after the loop.
+    peak = initial_capital
+    max_dd = 0.0
+    prev_equity = initial_capital
+    ret_count = 0
+    ret_mean = 0.0
+    ret_m2 = 0.0
+    pending_equity = initial_capital
+
+    for i in range(n_bars - 1):
+        if in_position:
+            tp_price = entry_price * (1 + take_profit)
+            sl_price = entry_price * (1 - stop_loss)
+            reason = -1
+            exit_price = 0.0
+
+            if lows[i] <= sl_price:
+                exit_price = sl_price * (1 - slippage_rate)
+                reason = 0
+            elif highs[i] >= tp_price:
+                exit_price = tp_price * (1 - slippage_rate)
+                reason = 1
+            elif (i - entry_idx) >= max_holding_bars:
+                exit_price = closes[i] * (1 - slippage_rate)
+                reason = 2
+
+            if reason >= 0:
+                exit_fee = (quantity * exit_price) * fee_rate
+                gross_payout = quantity * exit_price
+                current_capital += gross_payout - exit_fee
+                gross_pnl = (exit_price - entry_price) * quantity
+                total_fees = (quantity * entry_price * fee_rate) + exit_fee
+                net_pnl = gross_pnl - total_fees
+                if record:
+                    trade_log[num_trades, 0] = entry_idx
+                    trade_log[num_trades, 1] = i
+                    trade_log[num_trades, 2] = entry_price
+                    trade_log[num_trades, 3] = exit_price
+                    trade_log[num_trades, 4] = quantity
+                    trade_log[num_trades, 5] = gross_pnl
+                    trade_log[num_trades, 6] = net_pnl
+                    trade_log[num_trades, 7] = total_fees
+                    trade_log[num_trades, 8] = reason
+                num_trades += 1
+                if net_pnl > 0:
+                    wins += 1
+                    gross_profit += net_pnl
+                else:
+                    gross_loss -= net_pnl
+                in_position = False
+                quantity = 0.0
+
+        if not in_position:
+            if signals[i] == 1:
+                entry_idx = i + 1
+                entry_price = opens[entry_idx] * (1 + slippage_rate)
+                position_cost = current_capital * position_size_pct
+                quantity = position_cost / (entry_price * (1 + fee_rate))
+                cost_outflow = quantity * entry_price
+                entry_fee = cost_outflow * fee_rate
+                current_capital -= cost_outflow + entry_fee
+                in_position = True
+
+        if in_position:
+            if entry_idx > i:
+                total_equity = current_capital + (quantity * entry_price)
+            else:
+                total_equity = current_capital + quantity * closes[i]
+        else:
+            total_equity = current_capital
+
+        if i < n_bars - 2:
+            if total_equity > peak:
+                peak = total_equity
+            dd = (total_equity - peak) / peak
+            if dd < max_dd:
+                max_dd = dd
+            r = total_equity / prev_equity - 1.0
+            ret_count += 1
+            delta = r - ret_mean
+            ret_mean += delta / ret_count
+            ret_m2 += delta * (r - ret_mean)
+            prev_equity = total_equity
+        else:
+            pending_equity = total_equity
+
+    if in_position:
+        i = n_bars - 1
+        exit_price = closes[i] * (1 - slippage_rate)
+        exit_fee = (quantity * exit_price) * fee_rate
+        current_capital += (quantity * exit_price) - exit_fee
+        gross_pnl = (exit_price - entry_price) * quantity
+        total_fees = (quantity * entry_price * fee_rate) + exit_fee
+        net_pnl = gross_pnl - total_fees
+        if record:
+            trade_log[num_trades, 0] = entry_idx
+            trade_log[num_trades, 1] = i
+            trade_log[num_trades, 2] = entry_price
+            trade_log[num_trades, 3] = exit_price
+            trade_log[num_trades, 4] = quantity
+            trade_log[num_trades, 5] = gross_pnl
+            trade_log[num_trades, 6] = net_pnl
+            trade_log[num_trades, 7] = total_fees
+            trade_log[num_trades, 8] = 3
+        num_trades += 1
+        if net_pnl > 0:
+            wins += 1
+            gross_profit += net_pnl
+        else:
+            gross_loss -= net_pnl
+        pending_equity = current_capital
+
+    if n_bars >= 2:
+        if pending_equity > peak:
+            peak = pending_equity
+        dd = (pending_equity - peak) / peak
+        if dd < max_dd:
+            max_dd = dd
+        r = pending_equity / prev_equity - 1.0
+        ret_count += 1
+        delta = r - ret_mean
+        ret_mean += delta / ret_count
+        ret_m2 += delta * (r - ret_mean)
+
+    sharpe = 0.0
+    if ret_count > 1:
+        std = np.sqrt(ret_m2 / (ret_count - 1))
+        if std > 0:
+            sharpe = ret_mean / std * np.sqrt(bars_per_year)
+
+    return current_capital, num_trades, wins, gross_profit, gross_loss, max_dd, sharpe
+
+
+@jit(nopython=True, parallel=True)
+def _run_batch_numba(
+    opens,
+    highs,
+    lows,
+    closes,
+    signals,
+    lengths,
+    take_profit,
+    stop_loss,
+    max_holding_bars,
+    initial_capital,
+    fee_rate,
+    slippage_rate,
+    position_size_pct,
+    bars_per_year,
+):
+    """Run every (series, parameter set) combination in parallel."""
+    n_keys = opens.shape[0]
+    n_params = take_profit.shape[0]
+    out = np.zeros((n_keys * n_params, _N_METRICS))
+    no_log = np.empty((0, _TRADE_LOG_FIELDS))
+
+    for c in prange(n_keys * n_params):
+        j = c // n_params
+        k = c % n_params
+        res = _simulate_combination(
+            opens[j],
+            highs[j],
+            lows[j],
+            closes[j],
+            signals[j],
+            lengths[j],
+            take_profit[k],
+            stop_loss[k],
+            max_holding_bars[k],
+            initial_capital,
+            fee_rate,
+            slippage_rate,
+            position_size_pct,
+            bars_per_year,
+            no_log,
+        )
+        out[c, 0] = res[0]
+        out[c, 1] = res[1]
+        out[c, 2] = res[2]
+        out[c, 3] = res[3]
+        out[c, 4] = res[4]
+        out[c, 5] = res[5]
+        out[c, 6] = res[6]
+
+    return out
+
+
+def _run_batch_numpy(
+    opens,
+    highs,
+    lows,
+    closes,
+    signals,
+    lengths,
+    take_profit,
+    stop_loss,
+    max_holding_bars,
+    initial_capital,
+    fee_rate,
+    slippage_rate,
+    position_size_pct,
+    bars_per_year,
+):
+    """
+    Pure-NumPy fallback for ``_run_batch_numba``.
+
+    Loops over bars once and advances the state of all combinations with
+    vectorized masks, so the interpreter cost is O(n_bars) instead of
+    O(n_bars * n_combinations).
+    """
+    n_keys, max_bars = opens.shape
+    n_params = take_profit.shape[0]
+    n_comb = n_keys * n_params
+
+    key_idx = np.repeat(np.arange(n_keys), n_params)
+    tp = np.tile(take_profit, n_keys)
+    sl = np.tile(stop_loss, n_keys)
+    mhb = np.tile(max_holding_bars, n_keys)
+    n_bars = lengths[key_idx]
+
+    capital = np.full(n_comb, initial_capital, dtype=np.float64)
+    in_position = np.zeros(n_comb, dtype=bool)
+    entry_price = np.zeros(n_comb)
+    entry_idx = np.zeros(n_comb, dtype=np.int64)
+    quantity = np.zeros(n_comb)
+
+    num_trades = np.zeros(n_comb, dtype=np.int64)
+    wins = np.zeros(n_comb, dtype=np.int64)
+    gross_profit = np.zeros(n_comb)
+    gross_loss = np.zeros(n_comb)
+
+    peak = capital.copy()
+    max_dd = np.zeros(n_comb)
+    prev_equity = capital.copy()
+    ret_count = np.zeros(n_comb, dtype=np.int64)
+    ret_mean = np.zeros(n_comb)
+    ret_m2 = np.zeros(n_comb)
+    pending_equity = capital.copy()
+
+    def close_trades(mask, exit_price):
+        exit_fee = (quantity[mask] * exit_price) * fee_rate
+        gross_payout = quantity[mask] * exit_price
+        capital[mask] += gross_payout - exit_fee
+        gross_pnl = (exit_price - entry_price[mask]) * quantity[mask]
+        total_fees = (quantity[mask] * entry_price[mask] * fee_rate) + exit_fee
+        net_pnl = gross_pnl - total_fees
+        won = net_pnl > 0
+        num_trades[mask] += 1
+        wins[mask] += won
+        gross_profit[mask] += np.where(won, net_pnl, 0.0)
+        gross_loss[mask] -= np.where(won, 0.0, net_pnl)
+        in_position[mask] = False
+        quantity[mask] = 0.0
+
+    def commit_equity(mask, equity):
+        np.maximum(peak, np.where(mask, equity, peak), out=peak)
+        dd = np.where(mask, (equity - peak) / peak, 0.0)
+        np.minimum(max_dd, dd, out=max_dd)
+        r = equity / prev_equity - 1.0
+        ret_count[mask] += 1
+        delta = np.where(mask, r - ret_mean, 0.0)
+        ret_mean[mask] += delta[mask] / ret_count[mask]
+        ret_m2[mask] += delta[mask] * (r[mask] - ret_mean[mask])
+        prev_equity[mask] = equity[mask]
+
+    for i in range(max_bars - 1):
+        active = i < n_bars - 1
+        if not active.any():
+            break
+
+        low = lows[key_idx, i]
+        high = highs[key_idx, i]
+        close = closes[key_idx, i]
+
+        holding = in_position & active
+        if holding.any():
+            tp_price = entry_price * (1 + tp)
+            sl_price = entry_price * (1 - sl)
+            hit_sl = holding & (low <= sl_price)
+            hit_tp = holding & ~hit_sl & (high >= tp_price)
+            hit_time = holding & ~hit_sl & ~hit_tp & ((i - entry_idx) >= mhb)
+            exiting = hit_sl | hit_tp | hit_time
+            if exiting.any():
+                exit_price = np.where(hit_sl, sl_price, np.where(hit_tp, tp_price, close))
+                close_trades(exiting, exit_price[exiting] * (1 - slippage_rate))
+
+        entering = active & ~in_position & (signals[key_idx, i] == 1)
+        if entering.any():
+            entry_idx[entering] = i + 1
+            entry_price[entering] = opens[key_idx[entering], i + 1] * (1 + slippage_rate)
+            position_cost = capital[entering] * position_size_pct
+            quantity[entering] = position_cost / (entry_price[entering] * (1 + fee_rate))
+            cost_outflow = quantity[entering] * entry_price[entering]
+            entry_fee = cost_outflow * fee_rate
+            capital[entering] -= cost_outflow + entry_fee
+            in_position[entering] = True
+
+        total_equity = np.where(
+            in_position,
+            np.where(
+                entry_idx > i,
+                capital + (quantity * entry_price),
+                capital + quantity * close,
+            ),
+            capital,
+        )
+
+        commit_equity(active & (i < n_bars - 2), total_equity)
+        last = active & (i == n_bars - 2)
+        pending_equity[last] = total_equity[last]
+
+    open_at_end = in_position.copy()
+    if open_at_end.any():
+        last_close = closes[key_idx, np.maximum(n_bars - 1, 0)]
+        close_trades(open_at_end, last_close[open_at_end] * (1 - slippage_rate))
+        pending_equity[open_at_end] = capital[open_at_end]
+
+    commit_equity(n_bars >= 2, pending_equity)
+
+    sharpe = np.zeros(n_comb)
+    has_std = ret_count > 1
+    std = np.zeros(n_comb)
+    std[has_std] = np.sqrt(ret_m2[has_std] / (ret_count[has_std] - 1))
+    has_std &= std > 0
+    sharpe[has_std] = ret_mean[has_std] / std[has_std] * np.sqrt(bars_per_year)
+
+    return np.column_stack(
+        [capital, num_trades, wins, gross_profit, gross_loss, max_dd, sharpe]
+    ).astype(np.float64)
+
+
 class VectorizedBacktester:
     """
     Backtester that iterates through signals and simulates trade lifecycles.
@@ -238,6 +683,205 @@ class VectorizedBacktester:
             / self.config.initial_capital,
         }
 
+    def run_batch(
+        self,
+        signals: pd.DataFrame,
+        ohlcv: pd.DataFrame | Mapping[str, pd.DataFrame],
+        take_profit: Any = None,
+        stop_loss: Any = None,
+        max_holding_bars: Any = None,
+        return_trades: bool = False,
+        bars_per_year: float = 365 * 288,
+        use_numba: bool | None = None,
+    ) -> BatchBacktestResult:
+        """
+        Backtest many signal columns against many parameter sets in one pass.
+
+        Every signal column is simulated once per parameter set with exactly
+        the same execution model as ``run``. Fees, slippage, capital and
+        position sizing come from ``self.config``.
+
+        Args:
+            signals: Signal matrix (1=Buy), one column per pair or signal variant.
+            ohlcv: Either one OHLCV DataFrame shared by all columns, or a mapping
+                from column name to that column's OHLCV DataFrame.
+            take_profit: Scalar or 1-D array of take-profit levels.
+            stop_loss: Scalar or 1-D array of stop-loss levels.
+            max_holding_bars: Scalar or 1-D array of holding limits.
+                The three parameter arrays are broadcast against each other;
+                use ``parameter_grid`` for a full cartesian sweep.
+            return_trades: Also build the per-combination trade DataFrames.
+            bars_per_year: Annualisation factor for the Sharpe ratio.
+            use_numba: Force the compiled kernel (True) or the NumPy fallback
+                (False). Defaults to the kernel when Numba is installed.
+
+        Returns:
+            BatchBacktestResult with (n_columns, n_params) metric arrays.
+        """
+        cfg = self.config
+        params = (
+            (take_profit, cfg.take_profit, np.float64),
+            (stop_loss, cfg.stop_loss, np.float64),
+            (max_holding_bars, cfg.max_holding_bars, np.int64),
+        )
+        tp, sl, mhb = np.broadcast_arrays(
+            *(
+                np.atleast_1d(np.asarray(default if value is None else value, dtype=dtype))
+                for value, default, dtype in params
+            )
+        )
+        if tp.ndim != 1:
+            raise ValueError("Parameter arrays must be scalars or 1-D")
+        tp, sl, mhb = np.ascontiguousarray(tp), np.ascontiguousarray(sl), np.ascontiguousarray(mhb)
+
+        keys, indexes, arrays, lengths = self._prepare_batch_inputs(signals, ohlcv)
+        opens, highs, lows, closes, sig_values = arrays
+        n_keys, n_params = len(keys), len(tp)
+
+        if use_numba is None:
+            use_numba = HAVE_NUMBA
+        kernel_args = (
+            cfg.initial_capital,
+            cfg.fee_rate,
+            cfg.slippage_rate,
+            cfg.position_size_pct,
+            float(bars_per_year),
+        )
+
+        trades = None
+        if return_trades:
+            # Opt-in path: one kernel call per combination with a trade log
+            metrics = np.zeros((n_keys * n_params, _N_METRICS))
+            trades = {}
+            for j in range(n_keys):
+                trade_log = np.zeros((max(int(lengths[j]), 1), _TRADE_LOG_FIELDS))
+                for k in range(n_params):
+                    res = _simulate_combination(
+                        opens[j], highs[j], lows[j], closes[j], sig_values[j], lengths[j],
+                        tp[k], sl[k], mhb[k], *kernel_args, trade_log,
+                    )
+                    metrics[j * n_params + k] = res
+                    trades[(keys[j], k)] = self._trade_log_to_frame(
+                        trade_log[: int(res[1])], indexes[j]
+                    )
+        elif use_numba:
+            metrics = _run_batch_numba(
+                opens, highs, lows, closes, sig_values, lengths, tp, sl, mhb, *kernel_args
+            )
+        else:
+            metrics = _run_batch_numpy(
+                opens, highs, lows, closes, sig_values, lengths, tp, sl, mhb, *kernel_args
+            )
+
+        shape = (n_keys, n_params)
+        final_capital = metrics[:, 0].reshape(shape)
+        num_trades = metrics[:, 1].astype(np.int64).reshape(shape)
+        wins = metrics[:, 2].reshape(shape)
+        gross_profit = metrics[:, 3].reshape(shape)
+        gross_loss = metrics[:, 4].reshape(shape)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            win_rate = np.where(num_trades > 0, wins / num_trades, np.nan)
+            profit_factor = np.where(
+                gross_loss > 0,
+                gross_profit / gross_loss,
+                np.where(gross_profit > 0, np.inf, 0.0),
+            )
+
+        return BatchBacktestResult(
+            keys=keys,
+            take_profit=tp,
+            stop_loss=sl,
+            max_holding_bars=mhb,
+            final_capital=final_capital,
+            total_return=(final_capital - cfg.initial_capital) / cfg.initial_capital,
+            num_trades=num_trades,
+            win_rate=win_rate,
+            profit_factor=profit_factor,
+            max_drawdown=metrics[:, 5].reshape(shape),
+            sharpe_ratio=metrics[:, 6].reshape(shape),
+            trades=trades,
+        )
+
+    @staticmethod
+    def parameter_grid(
+        take_profit: Any, stop_loss: Any, max_holding_bars: Any
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Cartesian product of parameter values, flattened for ``run_batch``."""
+        tp, sl, mhb = np.meshgrid(
+            np.asarray(take_profit, dtype=np.float64),
+            np.asarray(stop_loss, dtype=np.float64),
+            np.asarray(max_holding_bars, dtype=np.int64),
+            indexing="ij",
+        )
+        return tp.ravel(), sl.ravel(), mhb.ravel()
+
+    @staticmethod
+    def _prepare_batch_inputs(
+        signals: pd.DataFrame, ohlcv: pd.DataFrame | Mapping[str, pd.DataFrame]
+    ) -> tuple[list[str], list[pd.Index], tuple[np.ndarray, ...], np.ndarray]:
+        """Align each signal column with its OHLCV and pack into padded 2-D arrays."""
+        if isinstance(signals, pd.Series):
+            signals = signals.to_frame(signals.name if signals.name is not None else 0)
+
+        keys = list(signals.columns)
+        if not keys:
+            raise ValueError("Signal matrix has no columns")
+
+        indexes = []
+        for key in keys:
+            frame = ohlcv if isinstance(ohlcv, pd.DataFrame) else ohlcv.get(key)
+            if frame is None:
+                raise ValueError(f"No OHLCV data for signal column {key!r}")
+            common_idx = signals.index.intersection(frame.index)
+            if len(common_idx) == 0:
+                raise ValueError(f"Signals and OHLCV for {key!r} have no overlapping timestamps")
+            indexes.append(common_idx)
+
+        lengths = np.array([len(idx) for idx in indexes], dtype=np.int64)
+        max_bars = int(lengths.max())
+        opens, highs, lows, closes = (np.zeros((len(keys), max_bars)) for _ in range(4))
+        sig_values = np.zeros((len(keys), max_bars))
+
+        for j, (key, idx) in enumerate(zip(keys, indexes)):
+            frame = ohlcv if isinstance(ohlcv, pd.DataFrame) else ohlcv[key]
+            aligned = frame.loc[idx]
+            n = len(idx)
+            opens[j, :n] = aligned["open"].to_numpy(dtype=np.float64)
+            highs[j, :n] = aligned["high"].to_numpy(dtype=np.float64)
+            lows[j, :n] = aligned["low"].to_numpy(dtype=np.float64)
+            closes[j, :n] = aligned["close"].to_numpy(dtype=np.float64)
+            sig_values[j, :n] = np.nan_to_num(
+                signals[key].loc[idx].to_numpy(dtype=np.float64), nan=0.0
+            )
+
+        return keys, indexes, (opens, highs, lows, closes, sig_values), lengths
+
+    @staticmethod
+    def _trade_log_to_frame(trade_log: np.ndarray, index: pd.Index) -> pd.DataFrame:
+        """Convert a kernel trade log into the same DataFrame layout as ``run``."""
+        columns = [f.name for f in fields(Trade)]
+        if len(trade_log) == 0:
+            return pd.DataFrame(columns=columns)
+        entry_idx = trade_log[:, 0].astype(np.int64)
+        exit_idx = trade_log[:, 1].astype(np.int64)
+        return pd.DataFrame(
+            {
+                "entry_time": index[entry_idx],
+                "exit_time": index[exit_idx],
+                "entry_price": trade_log[:, 2],
+                "exit_price": trade_log[:, 3],
+                "quantity": trade_log[:, 4],
+                "direction": 1,
+                "gross_pnl": trade_log[:, 5],
+                "net_pnl": trade_log[:, 6],
+                "fees": trade_log[:, 7],
+                "exit_reason": [EXIT_REASONS[int(r)] for r in trade_log[:, 8]],
+                "holding_bars": exit_idx - entry_idx,
+            },
+            columns=columns,
+        )
+
     def _create_numba_backtester(self):
         @jit(nopython=True)
         def run_backtest_numba(opens, highs, lows, closes, sig_values, initial_capital, fee_rate, slippage_rate, take_profit, stop_loss, max_holding_bars, position_size_pct):
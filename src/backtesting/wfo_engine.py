@@ -16,7 +16,11 @@ License: MIT
 """
 
 import logging
+import multiprocessing
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass
+from multiprocessing import shared_memory
 from typing import Any
 
 import numpy as np
@@ -39,10 +43,110 @@ class WFOConfig:
     quick_mode: bool = True
     n_trials: int = 50
 
+    # Parallel execution
+    n_jobs: int = 1  # > 1 runs folds (of all pairs) in a process pool
+    seed: int = 42  # Fold i is seeded with seed + i in both serial and parallel mode
+    max_pending_folds: int | None = None  # Folds in flight at once (default: 2 * n_jobs)
+
+
+@dataclass
+class WFOFold:
+    """Train/test window of a single walk-forward fold."""
+
+    index: int
+    train_start: pd.Timestamp
+    train_end: pd.Timestamp
+    test_start: pd.Timestamp
+    test_end: pd.Timestamp
+
+    @property
+    def label(self) -> str:
+        return f"{self.test_start.date()}_{self.test_end.date()}"
+
+
+@dataclass
+class _SharedFrameSpec:
+    """Picklable description of a DataFrame packed into one shared-memory block."""
+
+    shm_name: str
+    n_rows: int
+    columns: list[tuple[str, str, int]]  # (name, dtype, byte offset)
+    index_offset: int
+    index_name: Any
+    tz: str | None
+    freq: str | None
+
+
+def _share_frame(df: pd.DataFrame) -> tuple[shared_memory.SharedMemory, _SharedFrameSpec]:
+    """Copy the index and numeric columns of ``df`` into a shared-memory block."""
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise ValueError("Parallel WFO requires a DatetimeIndex")
+    non_numeric = [c for c in df.columns if not (pd.api.types.is_numeric_dtype(df[c]))]
+    if non_numeric:
+        raise ValueError(f"Parallel WFO supports numeric columns only, got: {non_numeric}")
+
+    n_rows = len(df)
+    arrays = [("__index__", df.index.asi8)]
+    arrays += [(col, df[col].to_numpy()) for col in df.columns]
+
+    # 8-byte aligned layout: [index | col0 | col1 | ...]
+    layout, offset = [], 0
+    for name, values in arrays:
+        layout.append((name, values, offset))
+        offset += -(-values.nbytes // 8) * 8
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+    for _, values, start in layout:
+        np.ndarray(values.shape, values.dtype, buffer=shm.buf, offset=start)[:] = values
+
+    spec = _SharedFrameSpec(
+        shm_name=shm.name,
+        n_rows=n_rows,
+        columns=[(name, values.dtype.str, start) for name, values, start in layout[1:]],
+        index_offset=layout[0][2],
+        index_name=df.index.name,
+        tz=str(df.index.tz) if df.index.tz is not None else None,
+        freq=df.index.freqstr,
+    )
+    return shm, spec
+
+
+def _frame_from_shared(spec: _SharedFrameSpec, start: int, stop: int) -> pd.DataFrame:
+    """Rebuild rows ``[start, stop)`` of a shared frame (copied out of the block)."""
+    shm = shared_memory.SharedMemory(name=spec.shm_name)
+    try:
+        buf = shm.buf
+        index_values = np.ndarray((spec.n_rows,), np.int64, buffer=buf, offset=spec.index_offset)
+        index = pd.DatetimeIndex(index_values[start:stop].copy().view("M8[ns]"), name=spec.index_name)
+        if spec.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(spec.tz)
+        if spec.freq is not None:
+            index.freq = spec.freq
+
+        columns = {
+            name: np.ndarray((spec.n_rows,), np.dtype(dtype), buffer=buf, offset=offset)[start:stop].copy()
+            for name, dtype, offset in spec.columns
+        }
+        del buf
+        return pd.DataFrame(columns, index=index)
+    finally:
+        shm.close()
+
+
+def _run_fold_worker(
+    engine: "WFOEngine", spec: _SharedFrameSpec, start: int, stop: int, pair: str, fold: WFOFold
+) -> dict[str, Any] | None:
+    """Process-pool entry point: run one fold on a window of shared OHLCV data."""
+    return engine._run_fold(_frame_from_shared(spec, start, stop), pair, fold)
+
 
 class WFOEngine:
     """
     Orchestrates Walk-Forward Optimization.
+
+    Folds are independent, so with ``WFOConfig.n_jobs > 1`` they run in a
+    process pool. OHLCV data is shipped to workers through shared memory and
+    fold results are stitched in fold order, so the output matches serial mode.
     """
 
     def __init__(self, wfo_config: WFOConfig, backtest_config: BacktestConfig):
@@ -50,6 +154,28 @@ class WFOEngine:
         self.backtest_config = backtest_config
         self.backtester = VectorizedBacktester(backtest_config)
 
+    def split_folds(self, data: pd.DataFrame) -> list[WFOFold]:
+        """Walk-forward train/test windows over ``data``."""
+        cfg = self.wfo_config
+        start_date = data.index.min()
+        end_date = data.index.max()
+
+        folds = []
+        fold_start = start_date
+        while fold_start + pd.Timedelta(days=cfg.train_days + cfg.test_days) <= end_date:
+            train_end = fold_start + pd.Timedelta(days=cfg.train_days)
+            folds.append(
+                WFOFold(
+                    index=len(folds),
+                    train_start=fold_start,
+                    train_end=train_end,
+                    test_start=train_end,
+                    test_end=train_end + pd.Timedelta(days=cfg.test_days),
+                )
+            )
+            fold_start += pd.Timedelta(days=cfg.step_days)
+        return folds
+
     def run(self, data: pd.DataFrame, pair: str) -> dict[str, Any]:
         """
         Run the Walk-Forward Optimization.
@@ -61,113 +187,186 @@ class WFOEngine:
         Returns:
             A dictionary with aggregated results and fold-by-fold details.
         """
+        if self.wfo_config.n_jobs > 1:
+            return self.run_many({pair: data})[pair]
+
         logger.info("=" * 70)
         logger.info(f"🚀 Starting Walk-Forward Optimization for {pair}")
         logger.info("=" * 70)
 
-        all_trades = []
-        all_equity_curves = []
-        fold_results = []
+        outcomes = [self._run_fold(data, pair, fold) for fold in self.split_folds(data)]
+        return self._aggregate(data, outcomes)
 
-        start_date = data.index.min()
-        end_date = data.index.max()
+    def run_many(self, datasets: dict[str, pd.DataFrame]) -> dict[str, dict[str, Any]]:
+        """
+        Run Walk-Forward Optimization for several pairs.
 
-        fold_start = start_date
-        while (
-            fold_start + pd.Timedelta(days=self.wfo_config.train_days + self.wfo_config.test_days)
-            <= end_date
-        ):
-            train_start = fold_start
-            train_end = train_start + pd.Timedelta(days=self.wfo_config.train_days)
-            test_start = train_end
-            test_end = test_start + pd.Timedelta(days=self.wfo_config.test_days)
-
-            train_data = data.loc[train_start:train_end]
-            test_data = data.loc[test_start:test_end]
-
-            logger.info("-" * 70)
-            logger.info(
-                f"Fold: Train {train_start.date()} - {train_end.date()} | Test {test_start.date()} - {test_end.date()}"
-            )
+        With ``n_jobs > 1`` the folds of all pairs share one process pool.
 
-            # 1. Train the model on the training data for this fold
-            pipeline = MLTrainingPipeline(
-                quick_mode=self.wfo_config.quick_mode
-            )
-            
-            if self.wfo_config.optimize_hyperparams:
-                pipeline.config.training.hyperopt_trials = self.wfo_config.n_trials
-                
-            # Use the new train_on_data API
-            train_result = pipeline.train_on_data(
-                train_data, 
-                pair, 
-                optimize=self.wfo_config.optimize_hyperparams
-            )
+        Args:
+            datasets: Mapping of pair -> full historical dataset
 
-            if not train_result.get("success"):
-                logger.warning(f"Skipping fold due to training failure for {pair}: {train_result.get('reason')}")
-                fold_start += pd.Timedelta(days=self.wfo_config.step_days)
-                continue
-
-            model = train_result.get("model")
-            used_features = train_result.get("features")
-
-            # 2. Generate signals using the trained model
-            try:
-                # Feature engineering on test data
-                # Ideally we should use the fitted pipeline from train_on_data but MLPipeline 
-                # abstracts it. For WFO we need consistent transformation.
-                # Assuming engineer is stateless or we re-init. 
-                # NOTE: For strict WFO, scaling params should be from train set.
-                # The current pipeline.engineer might not be fitted if train_on_data used internal engineer.
-                # Let's rely on train_on_data's engineer state if exposed, or fallback.
-                
-                # IMPORTANT: pipeline.engineer matches the one used in train_on_data
-                feature_engineer = pipeline.engineer 
-                prepared_test_data = feature_engineer.prepare_data(test_data.copy())
-                # Note: transform_scaler_and_selector requires fitting. 
-                # train_on_data fits it. So we can transform here.
-                processed_test_data = feature_engineer.transform_scaler_and_selector(prepared_test_data)
-
-                # Align indexes to avoid mismatches
-                common_index = test_data.index.intersection(processed_test_data.index)
-                
-                # Filter for the exact features the model needs
-                # Also, ensure all required features are present in the processed test data
-                missing_features = set(used_features) - set(processed_test_data.columns)
-                if missing_features:
-                    raise ValueError(f"Missing features in test data: {missing_features}")
-
-                X_test = processed_test_data.loc[common_index][used_features]
-
-                predictions = model.predict(X_test)
-                signals = pd.Series(predictions, index=X_test.index)
-            except Exception as e:
-                logger.error(f"Error generating signals for fold: {e}", exc_info=True)
-                fold_start += pd.Timedelta(days=self.wfo_config.step_days)
-                continue
-
-            # 3. Run the backtester on the out-of-sample test data
-            results = self.backtester.run(signals, test_data)
-
-            if not results["trades"].empty:
-                all_trades.append(results["trades"])
-                all_equity_curves.append(results["equity_curve"])
-                fold_results.append(
-                    {
-                        "fold": f"{test_start.date()}_{test_end.date()}",
-                        "num_trades": len(results["trades"]),
-                        "return": results["total_return"],
-                    }
-                )
-                logger.info(
-                    f"  ✅ Fold completed: {len(results['trades'])} trades, Return: {results['total_return']:.2%}"
-                )
-            else:
-                logger.info("  No trades in this fold.")
+        Returns:
+            Mapping of pair -> result dictionary (same format as ``run``)
+        """
+        if self.wfo_config.n_jobs <= 1:
+            return {pair: self.run(data, pair) for pair, data in datasets.items()}
+
+        folds = {pair: self.split_folds(data) for pair, data in datasets.items()}
+        outcomes: dict[str, list[dict[str, Any] | None]] = {
+            pair: [None] * len(pair_folds) for pair, pair_folds in folds.items()
+        }
+        tasks = [(pair, fold) for pair, pair_folds in folds.items() for fold in pair_folds]
+        logger.info(
+            f"🚀 Starting parallel Walk-Forward Optimization: {len(tasks)} folds, "
+            f"{len(datasets)} pairs, {self.wfo_config.n_jobs} workers"
+        )
+
+        shared: dict[str, tuple[shared_memory.SharedMemory, _SharedFrameSpec]] = {}
+        try:
+            for pair, data in datasets.items():
+                shared[pair] = _share_frame(data)
+
+            max_pending = self.wfo_config.max_pending_folds or 2 * self.wfo_config.n_jobs
+            # Spawned workers: forking a parent with live numba/BLAS threads can deadlock
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(self.wfo_config.n_jobs, mp_context=context) as pool:
+                pending = {}
+                queue = iter(tasks)
+                while True:
+                    # Bounded submission keeps only a few fold windows in flight
+                    for pair, fold in queue:
+                        index = datasets[pair].index
+                        start = index.searchsorted(fold.train_start, side="left")
+                        stop = index.searchsorted(fold.test_end, side="right")
+                        future = pool.submit(
+                            _run_fold_worker, self, shared[pair][1], start, stop, pair, fold
+                        )
+                        pending[future] = (pair, fold)
+                        if len(pending) >= max_pending:
+                            break
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pair, fold = pending.pop(future)
+                        outcomes[pair][fold.index] = future.result()
+        finally:
+            for shm, _ in shared.values():
+                shm.close()
+                shm.unlink()
+
+        return {pair: self._aggregate(datasets[pair], outcomes[pair]) for pair in datasets}
+
+    def _seed_fold(self, fold: WFOFold) -> None:
+        seed = self.wfo_config.seed + fold.index
+        random.seed(seed)
+        np.random.seed(seed)
+
+    def _run_fold(self, data: pd.DataFrame, pair: str, fold: WFOFold) -> dict[str, Any] | None:
+        """Train, predict and backtest one fold. Returns None if the fold produced no trades."""
+        self._seed_fold(fold)
+
+        train_data = data.loc[fold.train_start : fold.train_end]
+        test_data = data.loc[fold.test_start : fold.test_end]
+
+        logger.info("-" * 70)
+        logger.info(
+            f"Fold: Train {fold.train_start.date()} - {fold.train_end.date()} | Test {fold.test_start.date()} - {fold.test_end.date()}"
+        )
+
+        signals = self._generate_signals(train_data, test_data, pair)
+        if signals is None:
+            return None
+
+        # 3. Run the backtester on the out-of-sample test data
+        results = self.backtester.run(signals, test_data)
 
-            fold_start += pd.Timedelta(days=self.wfo_config.step_days)
+        if results["trades"].empty:
+            logger.info("  No trades in this fold.")
+            return None
+
+        logger.info(
+            f"  ✅ Fold completed: {len(results['trades'])} trades, Return: {results['total_return']:.2%}"
+        )
+        return {
+            "fold": fold.label,
+            "num_trades": len(results["trades"]),
+            "return": results["total_return"],
+            "trades": results["trades"],
+            "equity_curve": results["equity_curve"],
+        }
+
+    def _generate_signals(
+        self, train_data: pd.DataFrame, test_data: pd.DataFrame, pair: str
+    ) -> pd.Series | None:
+        """Train on the fold's training window and predict the test window."""
+        # 1. Train the model on the training data for this fold
+        pipeline = MLTrainingPipeline(
+            quick_mode=self.wfo_config.quick_mode
+        )
+        
+        if self.wfo_config.optimize_hyperparams:
+            pipeline.config.training.hyperopt_trials = self.wfo_config.n_trials
+            
+        # Use the new train_on_data API
+        train_result = pipeline.train_on_data(
+            train_data, 
+            pair, 
+            optimize=self.wfo_config.optimize_hyperparams
+        )
+
+        if not train_result.get("success"):
+            logger.warning(f"Skipping fold due to training failure for {pair}: {train_result.get('reason')}")
+            return None
+
+        model = train_result.get("model")
+        used_features = train_result.get("features")
+
+        # 2. Generate signals using the trained model
+        try:
+            # Feature engineering on test data
+            # Ideally we should use the fitted pipeline from train_on_data but MLPipeline 
+            # abstracts it. For WFO we need consistent transformation.
+            # Assuming engineer is stateless or we re-init. 
+            # NOTE: For strict WFO, scaling params should be from train set.
+            # The current pipeline.engineer might not be fitted if train_on_data used internal engineer.
+            # Let's rely on train_on_data's engineer state if exposed, or fallback.
+            
+            # IMPORTANT: pipeline.engineer matches the one used in train_on_data
+            feature_engineer = pipeline.engineer 
+            prepared_test_data = feature_engineer.prepare_data(test_data.copy())
+            # Note: transform_scaler_and_selector requires fitting. 
+            # train_on_data fits it. So we can transform here.
+            processed_test_data = feature_engineer.transform_scaler_and_selector(prepared_test_data)
+
+            # Align indexes to avoid mismatches
+            common_index = test_data.index.intersection(processed_test_data.index)
+            
+            # Filter for the exact features the model needs
+            # Also, ensure all required features are present in the processed test data
+            missing_features = set(used_features) - set(processed_test_data.columns)
+            if missing_features:
+                raise ValueError(f"Missing features in test data: {missing_features}")
+
+            X_test = processed_test_data.loc[common_index][used_features]
+
+            predictions = model.predict(X_test)
+            return pd.Series(predictions, index=X_test.index)
+        except Exception as e:
+            logger.error(f"Error generating signals for fold: {e}", exc_info=True)
+            return None
+
+    def _aggregate(
+        self, data: pd.DataFrame, outcomes: list[dict[str, Any] | None]
+    ) -> dict[str, Any]:
+        """Stitch fold outcomes (in fold order) into the final WFO result."""
+        completed = [outcome for outcome in outcomes if outcome is not None]
+        all_trades = [outcome["trades"] for outcome in completed]
+        all_equity_curves = [outcome["equity_curve"] for outcome in completed]
+        fold_results = [
+            {key: outcome[key] for key in ("fold", "num_trades", "return")} for outcome in completed
+        ]
 
         if not all_trades:
             logger.warning("No trades were executed in the entire Walk-Forward Optimization.")
@@ -4,6 +4,7 @@ Stoic Citadel - Data Pipeline Module
 
 Provides unified interface for:
 - Loading OHLCV data (CSV, Feather, JSON)
+- Month-partitioned Arrow OHLCV store with range-pruned reads
 - Downloading historical data
 - Async data fetching (ccxt.async_support)
 - Data validation and integrity checks
@@ -21,7 +22,8 @@ Usage:
 """
 
 from .downloader import download_data
-from .loader import get_ohlcv, load_csv, load_feather
+from .loader import DataLoader, get_ohlcv, load_csv, load_feather
+from .ohlcv_store import OHLCVStore
 from .validator import check_data_integrity, validate_ohlcv
 
 
@@ -42,7 +44,9 @@ def __getattr__(name):
 __all__ = [
     "AsyncDataFetcher",
     "AsyncOrderExecutor",
+    "DataLoader",
     "FetcherConfig",
+    "OHLCVStore",
     "check_data_integrity",
     "download_data",
     "fetch_ohlcv_async",
@@ -23,7 +23,7 @@ import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import pandas as pd
 
@@ -48,6 +48,9 @@ try:
 except ImportError:
     TENACITY_AVAILABLE = False
 
+if TYPE_CHECKING:
+    from src.data.ohlcv_store import OHLCVStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -359,6 +362,7 @@ class AsyncDataFetcher:
         timeframe: str,
         start_date: datetime,
         end_date: datetime | None = None,
+        store: "OHLCVStore | None" = None,
     ) -> pd.DataFrame:
         """
         Fetch historical OHLCV data across multiple API calls.
@@ -370,6 +374,7 @@ class AsyncDataFetcher:
             timeframe: Candle timeframe
             start_date: Start datetime
             end_date: End datetime (defaults to now)
+            store: Partitioned OHLCV store to append the fetched candles to
 
         Returns:
             Combined DataFrame with all historical data
@@ -433,6 +438,9 @@ class AsyncDataFetcher:
             f"from {start_date} to {end_date}"
         )
 
+        if store is not None:
+            store.append(symbol, timeframe, combined, exchange=self.config.exchange)
+
         return combined
 
     def _timeframe_to_ms(self, timeframe: str) -> int:
@@ -13,15 +13,63 @@ from typing import Any
 import pandas as pd
 
 from src.config import config
+from src.data.ohlcv_store import TIME_COLUMN, OHLCVStore, TimeLike, normalize_ohlcv, to_utc
 
 logger = logging.getLogger(__name__)
 
 class DataLoader:
     """Unified data loader for trading data."""
 
-    def __init__(self, data_dir: str | None = None):
+    def __init__(self, data_dir: str | None = None, store_dir: str | None = None):
         cfg = config()
         self.data_dir = Path(data_dir or cfg.paths.data_dir)
+        self.store = OHLCVStore(store_dir or self.data_dir / "store")
+
+    def load(
+        self,
+        pair: str,
+        timeframe: str,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: list[str] | None = None,
+        exchange: str = "binance",
+    ) -> pd.DataFrame:
+        """
+        Load candles in ``[start, end]`` indexed by UTC ``date``.
+
+        Reads from the partitioned store (only the overlapping months and the
+        requested columns). Pairs not migrated yet fall back to the legacy
+        single-file layout, filtered after loading.
+
+        Args:
+            pair: Trading pair (e.g. "BTC/USDT")
+            timeframe: Candle timeframe
+            start: Inclusive lower bound (naive values are UTC)
+            end: Inclusive upper bound (naive values are UTC)
+            columns: Columns to return (default: all)
+            exchange: Exchange name
+
+        Returns:
+            DataFrame with DatetimeIndex named ``date``
+        """
+        if self.store.partitions(pair, timeframe, exchange):
+            return self.store.load(pair, timeframe, start, end, columns, exchange)
+
+        logger.warning(
+            f"{pair} {timeframe} not in partitioned store, reading legacy file "
+            f"(run DataLoader.import_to_store to migrate)"
+        )
+        df = normalize_ohlcv(self.load_pair_data(pair, timeframe, exchange))
+        df = df.set_index(TIME_COLUMN)
+        df = df.loc[to_utc(start) : to_utc(end)]
+        return df if columns is None else df[columns]
+
+    def import_to_store(
+        self, pair: str, timeframe: str, exchange: str = "binance", format: str = "feather"
+    ) -> int:
+        """Copy a legacy single-file dataset into the partitioned store."""
+        df = self.load_pair_data(pair, timeframe, exchange, format)
+        return self.store.append(pair, timeframe, df, exchange)
 
     def load_pair_data(
         self,
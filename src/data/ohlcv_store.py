@@ -0,0 +1,250 @@
+"""
+Partitioned OHLCV Store
+=======================
+
+Columnar on-disk layout for historical candles with range-pruned reads.
+
+Layout:
+    <root>/<exchange>/<PAIR_SLUG>/<timeframe>/<YYYY-MM>.arrow
+
+Each monthly partition is an uncompressed Arrow IPC file sorted by ``date``.
+Reads only open the partitions overlapping the requested window, map them into
+memory, project the requested columns and slice rows by binary search on the
+sorted ``date`` column, so a date window never materializes the full history.
+
+Writes are append-only: new candles are merged into the affected monthly
+partitions (later values win on duplicate timestamps) and each partition is
+replaced atomically, so concurrent readers never see a partial file.
+
+Usage:
+    store = OHLCVStore("user_data/data/store")
+    store.append("BTC/USDT", "5m", df)
+    df = store.load("BTC/USDT", "5m", start="2024-01-01", end="2024-03-01",
+                    columns=["close", "volume"])
+"""
+
+import logging
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import TypeAlias
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+TIME_COLUMN = "date"
+
+TimeLike: TypeAlias = str | datetime | pd.Timestamp | None
+
+
+def to_utc(value: TimeLike) -> pd.Timestamp | None:
+    """Normalize a time bound to a UTC timestamp (naive values are taken as UTC)."""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+def normalize_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """Flatten to a sorted, de-duplicated frame with a UTC ``date`` column."""
+    if TIME_COLUMN in df.columns:
+        frame = df.reset_index(drop=True)
+    elif isinstance(df.index, pd.DatetimeIndex):
+        frame = df.copy()
+        frame.index.name = TIME_COLUMN
+        frame = frame.reset_index()
+    elif "timestamp" in df.columns:
+        frame = df.rename(columns={"timestamp": TIME_COLUMN}).reset_index(drop=True)
+    else:
+        raise ValueError("OHLCV data needs a DatetimeIndex or a 'date'/'timestamp' column")
+
+    dates = pd.to_datetime(frame[TIME_COLUMN])
+    frame[TIME_COLUMN] = (
+        dates.dt.tz_localize("UTC") if dates.dt.tz is None else dates.dt.tz_convert("UTC")
+    ).astype("datetime64[ns, UTC]")
+    return frame.drop_duplicates(subset=TIME_COLUMN, keep="last").sort_values(
+        TIME_COLUMN, ignore_index=True
+    )
+
+
+class OHLCVStore:
+    """Month-partitioned Arrow store for OHLCV candles."""
+
+    def __init__(self, root: str | Path, default_exchange: str = "binance"):
+        self.root = Path(root)
+        self.default_exchange = default_exchange
+
+    def _series_dir(self, pair: str, timeframe: str, exchange: str | None) -> Path:
+        pair_slug = pair.replace("/", "_").replace(":", "_")
+        return self.root / (exchange or self.default_exchange) / pair_slug / timeframe
+
+    def partitions(
+        self,
+        pair: str,
+        timeframe: str,
+        exchange: str | None = None,
+        start: TimeLike = None,
+        end: TimeLike = None,
+    ) -> list[Path]:
+        """Monthly partition files overlapping ``[start, end]``, oldest first."""
+        series_dir = self._series_dir(pair, timeframe, exchange)
+        if not series_dir.exists():
+            return []
+
+        start_ts, end_ts = to_utc(start), to_utc(end)
+        start_month = start_ts.strftime("%Y-%m") if start_ts is not None else None
+        end_month = end_ts.strftime("%Y-%m") if end_ts is not None else None
+
+        # YYYY-MM file names sort chronologically
+        paths = []
+        for path in sorted(series_dir.glob("*.arrow")):
+            month = path.stem
+            if start_month and month < start_month:
+                continue
+            if end_month and month > end_month:
+                continue
+            paths.append(path)
+        return paths
+
+    def load_table(
+        self,
+        pair: str,
+        timeframe: str,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: list[str] | None = None,
+        exchange: str | None = None,
+    ) -> pa.Table:
+        """
+        Load candles as an Arrow table without copying partition buffers.
+
+        Args:
+            pair: Trading pair (e.g. "BTC/USDT")
+            timeframe: Candle timeframe
+            start: Inclusive lower bound (naive values are UTC)
+            end: Inclusive upper bound (naive values are UTC)
+            columns: Columns to read besides ``date`` (default: all)
+            exchange: Exchange name (default: store default)
+
+        Returns:
+            Arrow table sorted by ``date``
+        """
+        start_ts, end_ts = to_utc(start), to_utc(end)
+        read_columns = (
+            None if columns is None else [TIME_COLUMN, *(c for c in columns if c != TIME_COLUMN)]
+        )
+
+        tables = []
+        for path in self.partitions(pair, timeframe, exchange, start_ts, end_ts):
+            table = feather.read_table(path, columns=read_columns, memory_map=True)
+            dates = table.column(TIME_COLUMN).to_numpy()
+            lo = 0 if start_ts is None else np.searchsorted(dates, start_ts.to_datetime64(), "left")
+            hi = (
+                len(dates)
+                if end_ts is None
+                else np.searchsorted(dates, end_ts.to_datetime64(), "right")
+            )
+            if hi > lo:
+                tables.append(table.slice(lo, hi - lo))
+
+        if not tables:
+            return self._empty_table(columns)
+        return pa.concat_tables(tables)
+
+    def load(
+        self,
+        pair: str,
+        timeframe: str,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: list[str] | None = None,
+        exchange: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load candles in ``[start, end]`` as a DataFrame indexed by UTC ``date``.
+
+        See ``load_table`` for arguments.
+        """
+        table = self.load_table(pair, timeframe, start, end, columns, exchange)
+        return table.to_pandas().set_index(TIME_COLUMN)
+
+    def time_range(
+        self, pair: str, timeframe: str, exchange: str | None = None
+    ) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+        """First and last stored candle time, or None if nothing is stored."""
+        paths = self.partitions(pair, timeframe, exchange)
+        if not paths:
+            return None
+        first = feather.read_table(paths[0], columns=[TIME_COLUMN], memory_map=True)
+        last = feather.read_table(paths[-1], columns=[TIME_COLUMN], memory_map=True)
+        dates_first = first.column(TIME_COLUMN)
+        dates_last = last.column(TIME_COLUMN)
+        return (
+            pd.Timestamp(dates_first[0].as_py()),
+            pd.Timestamp(dates_last[len(dates_last) - 1].as_py()),
+        )
+
+    def append(
+        self, pair: str, timeframe: str, df: pd.DataFrame, exchange: str | None = None
+    ) -> int:
+        """
+        Append candles, merging into existing monthly partitions.
+
+        Args:
+            pair: Trading pair
+            timeframe: Candle timeframe
+            df: Candles with a DatetimeIndex or a ``date``/``timestamp`` column
+            exchange: Exchange name (default: store default)
+
+        Returns:
+            Number of input rows written
+        """
+        frame = normalize_ohlcv(df)
+        if frame.empty:
+            return 0
+
+        series_dir = self._series_dir(pair, timeframe, exchange)
+        series_dir.mkdir(parents=True, exist_ok=True)
+
+        months = frame[TIME_COLUMN].dt.strftime("%Y-%m")
+        for month, chunk in frame.groupby(months, sort=True):
+            path = series_dir / f"{month}.arrow"
+            if path.exists():
+                existing = feather.read_table(path, memory_map=True).to_pandas()
+                if existing[TIME_COLUMN].iloc[-1] < chunk[TIME_COLUMN].iloc[0]:
+                    chunk = pd.concat([existing, chunk], ignore_index=True)
+                else:
+                    chunk = (
+                        pd.concat([existing, chunk], ignore_index=True)
+                        .drop_duplicates(subset=TIME_COLUMN, keep="last")
+                        .sort_values(TIME_COLUMN, ignore_index=True)
+                    )
+            self._write_partition(path, chunk)
+
+        logger.info(f"Stored {len(frame)} candles for {pair} {timeframe} in {series_dir}")
+        return len(frame)
+
+    @staticmethod
+    def _empty_table(columns: list[str] | None) -> pa.Table:
+        names = [TIME_COLUMN, *(columns if columns is not None else OHLCV_COLUMNS)]
+        fields = [pa.field(TIME_COLUMN, pa.timestamp("ns", tz="UTC"))]
+        fields += [pa.field(name, pa.float64()) for name in names[1:]]
+        return pa.Table.from_pylist([], schema=pa.schema(fields))
+
+    @staticmethod
+    def _write_partition(path: Path, frame: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            feather.write_feather(table, tmp, compression="uncompressed")
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
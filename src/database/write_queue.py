@@ -0,0 +1,205 @@
+"""
+Database Write Queue
+====================
+
+Moves SQLAlchemy writes off latency-critical threads and event loops.
+
+Producers enqueue write jobs (callables that receive a session) on a bounded
+queue. A single writer thread drains it and commits each batch in one
+session. A job's future resolves only after its batch is committed, so
+callers that need durability can wait for it while everyone else returns
+immediately. If a batch fails to commit, its jobs are retried one per
+session so a single bad record cannot drop its neighbours.
+
+Usage:
+    writer = DatabaseWriter(DatabaseManager.session)
+    writer.submit(lambda session: session.add(record))   # from any thread
+    await writer.submit_async(job)                        # from a coroutine
+    writer.close()                                        # commits pending writes
+"""
+
+import asyncio
+import atexit
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from contextlib import AbstractContextManager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+WriteJob = Callable[[Any], Any]
+
+_FLUSH = object()
+_STOP = object()
+
+
+class DatabaseWriter:
+    """
+    Bounded write-behind queue with a dedicated writer thread.
+
+    Args:
+        session_factory: Returns a context manager yielding a session that
+            commits on exit (e.g. ``DatabaseManager.session``)
+        max_queue_size: Pending jobs before producers get backpressure
+        max_batch_size: Jobs committed per session
+        name: Writer thread name (also used in logs)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AbstractContextManager],
+        max_queue_size: int = 10_000,
+        max_batch_size: int = 256,
+        name: str = "db-writer",
+    ):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.name = name
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.stats = {"submitted": 0, "committed": 0, "failed": 0, "batches": 0}
+
+    @property
+    def depth(self) -> int:
+        """Jobs waiting to be written."""
+        return self._queue.qsize()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            self.stats["submitted"] += 1
+
+    def submit(self, job: WriteJob, timeout: float | None = None) -> Future:
+        """
+        Queue ``job``; blocks while the queue is full.
+
+        Raises:
+            queue.Full: If ``timeout`` elapses before there is room
+        """
+        future: Future = Future()
+        self._ensure_started()
+        self._queue.put((job, future), timeout=timeout)
+        return future
+
+    async def submit_async(self, job: WriteJob, wait: bool = False) -> Any:
+        """
+        Queue ``job`` from a coroutine without ever blocking the event loop.
+
+        A full queue is waited for on the default executor. With ``wait`` the
+        call returns the job's result once it is committed; otherwise it
+        returns the job's future.
+        """
+        future: Future = Future()
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((job, future))
+        except queue.Full:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._queue.put, (job, future))
+        if wait:
+            return await asyncio.wrap_future(future)
+        return future
+
+    def _barrier(self) -> Future:
+        future: Future = Future()
+        with self._lock:
+            running = self._thread is not None and not self._closed
+        if not running:
+            future.set_result(None)
+            return future
+        self._queue.put((_FLUSH, future))
+        return future
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until every job queued so far is committed."""
+        self._barrier().result(timeout)
+
+    async def flush_async(self) -> None:
+        """Coroutine version of ``flush``."""
+        future = await asyncio.get_running_loop().run_in_executor(None, self._barrier)
+        await asyncio.wrap_future(future)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Commit everything queued, then stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put((_STOP, None))
+        thread.join(timeout)
+        atexit.unregister(self.close)
+        logger.info(f"{self.name} closed: {self.stats}")
+
+    # -- writer thread --------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            batch, marker = [], None
+            item = self._queue.get()
+            while True:
+                job, future = item
+                if job is _FLUSH or job is _STOP:
+                    marker = item
+                    break
+                batch.append(item)
+                if len(batch) >= self.max_batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._commit(batch)
+            if marker is not None:
+                job, future = marker
+                if job is _STOP:
+                    self._drain()
+                    return
+                future.set_result(None)
+
+    def _drain(self) -> None:
+        """Write jobs that arrived behind the stop marker."""
+        batch = []
+        while True:
+            try:
+                job, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is _FLUSH:
+                future.set_result(None)
+            elif job is not _STOP:
+                batch.append((job, future))
+        for i in range(0, len(batch), self.max_batch_size):
+            self._commit(batch[i : i + self.max_batch_size])
+
+    def _commit(self, batch: list[tuple[WriteJob, Future]]) -> None:
+        try:
+            with self.session_factory() as session:
+                results = [job(session) for job, _ in batch]
+        except Exception as e:
+            if len(batch) > 1:
+                for item in batch:  # Isolate the failing job
+                    self._commit([item])
+                return
+            self.stats["failed"] += 1
+            logger.error(f"{self.name}: write failed: {e}")
+            batch[0][1].set_exception(e)
+            return
+
+        self.stats["committed"] += len(batch)
+        self.stats["batches"] += 1
+        for (_, future), result in zip(batch, results, strict=True):
+            future.set_result(result)
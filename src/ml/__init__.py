@@ -1,5 +1,6 @@
 """ML Inference Service Module."""
 
+from .batch_inference import BatchInferenceConfig, BatchInferenceEngine, FeatureSchema
 from .calibration import ProbabilityCalibrator
 from .feature_store import (
     MockFeatureStore,
@@ -14,25 +15,40 @@ from .inference_service import (
     PredictionRequest,
     PredictionResult,
 )
+from .inference_transport import InferenceWorker, PipelinedInferenceTransport, TransportConfig
 from .meta_learning import MetaLearningConfig, MetaLearningEnsemble
 from .online_learner import OnlineLearner, OnlineLearningConfig, load_model, save_model
+from .prediction_cache import PredictionCache, PredictionKeyBuilder, RedisPredictionTier
 from .redis_client import RedisMLClient
+from .worker_pool import MLWorkerPool, ModelServer, WorkerPoolConfig
 
 __all__ = [
+    "BatchInferenceConfig",
+    "BatchInferenceEngine",
+    "FeatureSchema",
+    "InferenceWorker",
     "MLInferenceService",
     "MLModelConfig",
+    "MLWorkerPool",
     "MetaLearningConfig",
     "MetaLearningEnsemble",
     "MockFeatureStore",
+    "ModelServer",
     "OnlineLearner",
     "OnlineLearningConfig",
     "OptimizedInferenceService",
+    "PipelinedInferenceTransport",
+    "PredictionCache",
+    "PredictionKeyBuilder",
     "PredictionRequest",
     "PredictionResult",
     "ProbabilityCalibrator",
     "RedisFeatureStore",
     "RedisMLClient",
+    "RedisPredictionTier",
     "TradingFeatureStore",
+    "TransportConfig",
+    "WorkerPoolConfig",
     "create_feature_store",
     "load_model",
     "save_model",
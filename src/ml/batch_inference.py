@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+In-Process Batch Inference Engine
+=================================
+
+Runs model inference inside the trading process, without the Redis round
+trip of ``MLInferenceService``.
+
+Per registered model the engine keeps:
+- a fixed ``FeatureSchema`` (feature order never depends on dict ordering)
+- a preallocated float32 input buffer of ``max_batch_size`` rows
+- latency and batch-size histograms
+
+Two entry points share the same buffers:
+- ``predict_batch`` / ``predict_many``: synchronous, one batched model call
+  for many rows (e.g. the latest candle of 100+ pairs)
+- ``predict``: async single-row requests coalesced into micro-batches that
+  flush when the batch is full or its deadline expires; with an adaptive
+  window a lone request is flushed immediately when no further request is
+  expected within ``max_wait_ms``
+
+Usage:
+    engine = BatchInferenceEngine()
+    engine.register_model("xgb_v3", model, feature_names)  # warms up
+    probs = engine.predict_batch("xgb_v3", features_by_row)
+    results = engine.predict_many("xgb_v3", {"BTC/USDT": {...}, "ETH/USDT": {...}})
+    result = await engine.predict("xgb_v3", {"rsi": 41.2, ...})
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, TypeAlias
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring.latency import LatencyHistogram
+
+from .inference_service import PredictionResult
+
+# Try to import metrics exporter
+try:
+    from src.monitoring.metrics_exporter import get_exporter
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+Rows: TypeAlias = Sequence[Mapping[str, float]] | pd.DataFrame | np.ndarray
+
+
+class FeatureSchema:
+    """Fixed feature order of a model; converts rows to matrices in that order."""
+
+    def __init__(self, feature_names: Sequence[str], strict: bool = False):
+        if not feature_names:
+            raise ValueError("Feature schema needs at least one feature")
+        if len(set(feature_names)) != len(feature_names):
+            raise ValueError("Feature schema contains duplicate names")
+        self.names = tuple(feature_names)
+        self.strict = strict
+        self._getter = itemgetter(*self.names)
+        self.missing = 0  # Features filled with NaN because a row lacked them
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def row_values(self, row: Mapping[str, float]) -> Sequence[float]:
+        """Values of ``row`` in schema order (NaN for missing features unless strict)."""
+        try:
+            values = self._getter(row)
+        except KeyError:
+            missing = [name for name in self.names if name not in row]
+            if self.strict:
+                raise KeyError(f"Missing features: {missing}") from None
+            self.missing += len(missing)
+            return [row.get(name, math.nan) for name in self.names]
+        return (values,) if len(self.names) == 1 else values
+
+    def fill(self, out: np.ndarray, rows: Sequence[Mapping[str, float]]) -> None:
+        """Write ``rows`` into the first ``len(rows)`` rows of ``out``."""
+        for i, row in enumerate(rows):
+            out[i] = self.row_values(row)
+
+    def to_matrix(self, rows: Rows) -> np.ndarray:
+        """Rows (mappings, DataFrame or array) as a new float32 matrix in schema order."""
+        if isinstance(rows, pd.DataFrame):
+            missing = [name for name in self.names if name not in rows.columns]
+            if missing:
+                if self.strict:
+                    raise KeyError(f"Missing features: {missing}")
+                self.missing += len(missing) * len(rows)
+            return rows.reindex(columns=list(self.names)).to_numpy(dtype=np.float32)
+        if isinstance(rows, np.ndarray):
+            matrix = np.asarray(rows, dtype=np.float32)
+            if matrix.ndim != 2 or matrix.shape[1] != len(self.names):
+                raise ValueError(
+                    f"Expected an (n, {len(self.names)}) array, got shape {matrix.shape}"
+                )
+            return matrix
+        matrix = np.empty((len(rows), len(self.names)), dtype=np.float32)
+        self.fill(matrix, rows)
+        return matrix
+
+
+def _predict_fn(model: Any) -> Callable[[np.ndarray], Any]:
+    """Adapt an ONNX session, a sklearn-like model or a callable to ``X -> scores``."""
+    if hasattr(model, "get_inputs") and hasattr(model, "run"):
+        input_name = model.get_inputs()[0].name
+
+        def run_onnx(X: np.ndarray) -> Any:
+            outputs = model.run(None, {input_name: X})
+            # Classifiers export (label, probabilities); probabilities may be a list of dicts
+            scores = outputs[1] if len(outputs) > 1 else outputs[0]
+            if isinstance(scores, list) and scores and isinstance(scores[0], dict):
+                scores = [row.get(1, list(row.values())[-1]) for row in scores]
+            return scores
+
+        return run_onnx
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba
+    if hasattr(model, "predict"):
+        return model.predict
+    if callable(model):
+        return model
+    raise TypeError(f"Unsupported model type: {type(model).__name__}")
+
+
+def _positive_scores(raw: Any, n: int) -> np.ndarray:
+    """Reduce model output to one float64 score per row (class-1 probability if 2-D)."""
+    scores = np.asarray(raw, dtype=np.float64)
+    if scores.ndim == 2:
+        scores = scores[:, 1] if scores.shape[1] > 1 else scores[:, 0]
+    scores = scores.reshape(-1)
+    if len(scores) != n:
+        raise ValueError(f"Model returned {len(scores)} scores for {n} rows")
+    # Copy: the model may return a view of the reused input buffer
+    return scores.copy()
+
+
+@dataclass
+class BatchInferenceConfig:
+    """Configuration for the in-process batch inference engine."""
+
+    max_batch_size: int = 256  # Rows per model call (input buffer size)
+    max_wait_ms: float = 2.0  # Deadline for a micro-batch, measured from its first request
+    adaptive_window: bool = True  # Flush lone requests when no other request is expected
+    interarrival_alpha: float = 0.2  # EWMA weight for request inter-arrival time
+    warmup_rounds: int = 3
+    warmup_batch_sizes: tuple[int, ...] | None = None  # Default: 1, 8, 64, max_batch_size
+    buy_threshold: float = 0.6
+    sell_threshold: float = 0.4
+    strict_features: bool = False  # Raise on missing features instead of NaN-filling
+
+
+class _ModelSlot:
+    """Per-model state: schema, input buffer, pending micro-batch and statistics."""
+
+    def __init__(self, name: str, model: Any, schema: FeatureSchema, max_batch_size: int):
+        self.name = name
+        self.model = model
+        self.predict = _predict_fn(model)
+        self.schema = schema
+        self.buffer = np.zeros((max_batch_size, len(schema)), dtype=np.float32)
+        self.lock = threading.Lock()  # Buffer is shared by the sync and async paths
+
+        # Pending micro-batch: (features, future, enqueued_at)
+        self.pending: list[tuple[Mapping[str, float], asyncio.Future, float]] = []
+        self.timer: asyncio.TimerHandle | None = None
+        self.last_arrival: float | None = None
+        self.interarrival: float | None = None
+
+        self.latency = LatencyHistogram()  # Model call per batch
+        self.request_latency = LatencyHistogram()  # Queueing + model call per async request
+        self.batch_sizes = np.zeros(max_batch_size + 1, dtype=np.int64)
+        self.flushes = {"size": 0, "deadline": 0, "immediate": 0}
+        self.rows = 0
+        self.errors = 0
+
+    def batch_size_summary(self) -> dict[str, Any]:
+        batches = int(self.batch_sizes.sum())
+        if batches == 0:
+            return {"batches": 0, "mean": 0.0, "p50": 0, "p99": 0, "max": 0}
+        cumulative = np.cumsum(self.batch_sizes)
+        sizes = np.arange(len(self.batch_sizes))
+        return {
+            "batches": batches,
+            "mean": float((sizes * self.batch_sizes).sum() / batches),
+            "p50": int(cumulative.searchsorted(0.5 * batches)),
+            "p99": int(cumulative.searchsorted(0.99 * batches)),
+            "max": int(np.flatnonzero(self.batch_sizes)[-1]),
+        }
+
+
+class BatchInferenceEngine:
+    """
+    In-process inference with fixed feature schemas and adaptive micro-batching.
+
+    Inference runs synchronously on the caller's thread (or, for ``predict``,
+    on the event loop when the micro-batch flushes), so it is meant for models
+    whose batch call takes well under a millisecond to a few milliseconds.
+    """
+
+    def __init__(self, config: BatchInferenceConfig | None = None):
+        self.config = config or BatchInferenceConfig()
+        self._models: dict[str, _ModelSlot] = {}
+        self._metrics = get_exporter() if METRICS_AVAILABLE else None
+
+    # =========================================================================
+    # Model Management
+    # =========================================================================
+
+    def register_model(
+        self,
+        name: str,
+        model: Any,
+        feature_names: Sequence[str] | None = None,
+        warmup: bool = True,
+    ) -> FeatureSchema:
+        """
+        Register (or replace) a model.
+
+        Args:
+            name: Model name used in predict calls
+            model: ONNX ``InferenceSession``, sklearn-like model or callable
+            feature_names: Feature order the model was trained on
+                (default: ``model.feature_names_in_``)
+            warmup: Run warmup batches before returning
+
+        Returns:
+            The model's feature schema
+        """
+        if feature_names is None:
+            feature_names = getattr(model, "feature_names_in_", None)
+            if feature_names is None:
+                raise ValueError(f"Model {name} has no feature_names_in_; pass feature_names")
+            feature_names = list(feature_names)
+
+        schema = FeatureSchema(feature_names, strict=self.config.strict_features)
+        slot = _ModelSlot(name, model, schema, self.config.max_batch_size)
+        previous = self._models.get(name)
+        if previous is not None and previous.pending:
+            self._flush(previous, "immediate")
+        if warmup:
+            self._warmup(slot)
+        self._models[name] = slot
+        logger.info(f"Registered model {name} for batch inference ({len(schema)} features)")
+        return schema
+
+    def unregister_model(self, name: str) -> None:
+        slot = self._models.pop(name, None)
+        if slot is not None and slot.pending:
+            self._flush(slot, "immediate")
+
+    def schema(self, name: str) -> FeatureSchema:
+        return self._slot(name).schema
+
+    @property
+    def models(self) -> list[str]:
+        return list(self._models)
+
+    def _slot(self, name: str) -> _ModelSlot:
+        slot = self._models.get(name)
+        if slot is None:
+            raise KeyError(f"Model not registered: {name}")
+        return slot
+
+    def _warmup(self, slot: _ModelSlot) -> None:
+        """Run real batches of several sizes so lazy allocations happen before trading."""
+        max_batch = self.config.max_batch_size
+        sizes = self.config.warmup_batch_sizes or (1, 8, 64, max_batch)
+        sizes = sorted({min(max(1, size), max_batch) for size in sizes})
+
+        start = time.perf_counter()
+        with slot.lock:
+            slot.buffer[:] = 0.0
+            for _ in range(self.config.warmup_rounds):
+                for size in sizes:
+                    _positive_scores(slot.predict(slot.buffer[:size]), size)
+        logger.info(
+            f"Warmed up model {slot.name}: {self.config.warmup_rounds} rounds of "
+            f"batch sizes {sizes} in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    # =========================================================================
+    # Synchronous Batched Inference
+    # =========================================================================
+
+    def predict_batch(self, name: str, rows: Rows) -> np.ndarray:
+        """
+        Score many rows with one model call per ``max_batch_size`` rows.
+
+        Args:
+            name: Registered model name
+            rows: Feature mappings, a DataFrame or an (n, n_features) array
+
+        Returns:
+            float64 array with one score (class-1 probability) per row
+        """
+        slot = self._slot(name)
+        n = len(rows)
+        if n == 0:
+            return np.empty(0, dtype=np.float64)
+
+        max_batch = self.config.max_batch_size
+        matrix = None if _is_mapping_rows(rows) else slot.schema.to_matrix(rows)
+        scores = np.empty(n, dtype=np.float64)
+        for lo in range(0, n, max_batch):
+            hi = min(lo + max_batch, n)
+            with slot.lock:
+                if matrix is None:
+                    slot.schema.fill(slot.buffer, rows[lo:hi])
+                else:
+                    slot.buffer[: hi - lo] = matrix[lo:hi]
+                scores[lo:hi] = self._run(slot, hi - lo)
+        return scores
+
+    def predict_many(
+        self, name: str, features_by_key: Mapping[Any, Mapping[str, float]]
+    ) -> dict[Any, PredictionResult]:
+        """
+        Score one feature row per key (e.g. per pair) in a single batched call.
+
+        Returns:
+            ``PredictionResult`` per key
+        """
+        keys = list(features_by_key)
+        start = time.perf_counter()
+        scores = self.predict_batch(name, [features_by_key[key] for key in keys])
+        latency_ms = (time.perf_counter() - start) * 1000 / max(1, len(keys))
+        now = time.time()
+        return {
+            key: self._result(name, f"{name}_{key}", score, latency_ms, now)
+            for key, score in zip(keys, scores.tolist(), strict=True)
+        }
+
+    def _run(self, slot: _ModelSlot, n: int) -> np.ndarray:
+        """Score the first ``n`` buffer rows (caller holds ``slot.lock``)."""
+        start = time.perf_counter()
+        try:
+            scores = _positive_scores(slot.predict(slot.buffer[:n]), n)
+        except Exception:
+            slot.errors += 1
+            raise
+        latency = time.perf_counter() - start
+
+        slot.latency.record(latency)
+        slot.batch_sizes[n] += 1
+        slot.rows += n
+        if self._metrics is not None:
+            self._metrics.record_ml_inference(latency * 1000)
+        return scores
+
+    # =========================================================================
+    # Async Micro-Batching
+    # =========================================================================
+
+    async def predict(self, name: str, features: Mapping[str, float]) -> PredictionResult:
+        """Score one row; concurrent requests for a model share a batched model call."""
+        slot = self._slot(name)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        now = time.perf_counter()
+
+        if slot.last_arrival is not None:
+            gap = now - slot.last_arrival
+            alpha = self.config.interarrival_alpha
+            slot.interarrival = (
+                gap if slot.interarrival is None else alpha * gap + (1 - alpha) * slot.interarrival
+            )
+        slot.last_arrival = now
+        slot.pending.append((features, future, now))
+
+        if len(slot.pending) >= self.config.max_batch_size:
+            self._flush(slot, "size")
+        elif self._expect_no_company(slot):
+            self._flush(slot, "immediate")
+        elif slot.timer is None:
+            slot.timer = loop.call_later(
+                self.config.max_wait_ms / 1000, self._flush, slot, "deadline"
+            )
+        return await future
+
+    def _expect_no_company(self, slot: _ModelSlot) -> bool:
+        """True if waiting is unlikely to add another request before the deadline."""
+        if not self.config.adaptive_window:
+            return False
+        if slot.interarrival is None:
+            return False
+        return slot.interarrival * 1000 > self.config.max_wait_ms
+
+    def _flush(self, slot: _ModelSlot, reason: str) -> None:
+        """Run the pending micro-batch of ``slot`` and resolve its futures."""
+        if slot.timer is not None:
+            slot.timer.cancel()
+            slot.timer = None
+        pending, slot.pending = slot.pending, []
+        if not pending:
+            return
+        slot.flushes[reason] += 1
+
+        try:
+            with slot.lock:
+                slot.schema.fill(slot.buffer, [item[0] for item in pending])
+                scores = self._run(slot, len(pending)).tolist()
+        except Exception as e:
+            logger.error(f"Batch inference failed for {slot.name}: {e}")
+            for _, future, _ in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        done = time.perf_counter()
+        now = time.time()
+        for (_, future, enqueued_at), score in zip(pending, scores, strict=True):
+            slot.request_latency.record(done - enqueued_at)
+            if not future.done():
+                result = self._result(
+                    slot.name,
+                    f"{slot.name}_{time.time_ns()}",
+                    score,
+                    (done - enqueued_at) * 1000,
+                    now,
+                )
+                future.set_result(result)
+
+    def flush(self, name: str | None = None) -> None:
+        """Flush pending micro-batches now (one model, or all)."""
+        for slot in [self._slot(name)] if name is not None else list(self._models.values()):
+            self._flush(slot, "immediate")
+
+    def _result(
+        self, name: str, request_id: str, score: float, latency_ms: float, timestamp: float
+    ) -> PredictionResult:
+        if score > self.config.buy_threshold:
+            signal = "buy"
+        elif score < self.config.sell_threshold:
+            signal = "sell"
+        else:
+            signal = "hold"
+        return PredictionResult(
+            request_id=request_id,
+            model_name=name,
+            prediction=score,
+            probability=score,
+            signal=signal,
+            confidence=abs(score - 0.5) * 2,
+            latency_ms=latency_ms,
+            timestamp=timestamp,
+        )
+
+    # =========================================================================
+    # Statistics
+    # =========================================================================
+
+    def get_model_stats(self, name: str) -> dict[str, Any]:
+        slot = self._slot(name)
+        return {
+            "features": len(slot.schema),
+            "rows": slot.rows,
+            "errors": slot.errors,
+            "missing_features": slot.schema.missing,
+            "pending": len(slot.pending),
+            "flushes": dict(slot.flushes),
+            "interarrival_ms": (slot.interarrival or 0.0) * 1000,
+            "latency": slot.latency.summary(),
+            "request_latency": slot.request_latency.summary(),
+            "batch_size": slot.batch_size_summary(),
+        }
+
+    def get_stats(self) -> dict[str, Any]:
+        return {name: self.get_model_stats(name) for name in self._models}
+
+    def reset_stats(self) -> None:
+        for slot in self._models.values():
+            slot.latency.reset()
+            slot.request_latency.reset()
+            slot.batch_sizes[:] = 0
+            slot.flushes = dict.fromkeys(slot.flushes, 0)
+            slot.rows = 0
+            slot.errors = 0
+            slot.schema.missing = 0
+
+
+def _is_mapping_rows(rows: Rows) -> bool:
+    return not isinstance(rows, pd.DataFrame | np.ndarray)
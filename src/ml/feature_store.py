@@ -26,11 +26,14 @@ License: MIT
 """
 
 import asyncio
+import hashlib
+import json
 import logging
+import struct
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 import pandas as pd
@@ -68,8 +71,6 @@ except ImportError as e:
 
 # Try to import Redis, but provide fallback if not available
 try:
-    import pickle
-
     import redis
 
     REDIS_AVAILABLE = True
@@ -77,7 +78,10 @@ except ImportError:
     REDIS_AVAILABLE = False
     logging.warning("Redis not available. Install with: pip install redis")
     redis = None
-    pickle = None
+
+if TYPE_CHECKING:
+    from src.ml.training.feature_engineering import FeatureConfig
+    from src.ml.training.incremental_features import IncrementalFeatureEngineer
 
 logger = logging.getLogger(__name__)
 
@@ -747,12 +751,82 @@ class MockFeatureStore(TradingFeatureStore):
         return df
 
 
+def _numeric(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class FeatureVectorCodec:
+    """
+    Compact binary encoding of feature rows.
+
+    A row is a fixed-order float32 vector prefixed by its schema ID:
+    ``b"FV1" | schema_id (8 bytes) | n (uint32) | n x float32``. The schema (the
+    ordered feature names) is hashed into the ID, so writers and readers agree
+    on column order without shipping names with every value. Unlike pickle,
+    decoding never executes code. Non-numeric values are stored as NaN.
+    """
+
+    MAGIC = b"FV1"
+    _HEADER = struct.Struct("<3s8sI")
+
+    def __init__(self, resolve_schema: Any = None):
+        self._schemas: dict[bytes, tuple[str, ...]] = {}
+        self._resolve_schema = resolve_schema  # schema_id -> names (e.g. from Redis)
+
+    @staticmethod
+    def schema_id(names: list[str] | tuple[str, ...]) -> bytes:
+        return hashlib.blake2b("\x1f".join(names).encode(), digest_size=8).digest()
+
+    def register(self, names: list[str] | tuple[str, ...]) -> bytes:
+        schema_id = self.schema_id(names)
+        self._schemas[schema_id] = tuple(names)
+        return schema_id
+
+    def schema(self, schema_id: bytes) -> tuple[str, ...]:
+        names = self._schemas.get(schema_id)
+        if names is None and self._resolve_schema is not None:
+            resolved = self._resolve_schema(schema_id)
+            if resolved:
+                names = self._schemas[schema_id] = tuple(resolved)
+        if names is None:
+            raise KeyError(f"Unknown feature schema {schema_id.hex()}")
+        return names
+
+    def encode(self, names: list[str] | tuple[str, ...], values: Any) -> bytes:
+        row = np.array([_numeric(v) for v in values], dtype=np.float32)
+        return self.encode_matrix(names, row.reshape(1, -1))[0]
+
+    def encode_matrix(self, names: list[str] | tuple[str, ...], matrix: np.ndarray) -> list[bytes]:
+        """Encode every row of a (rows, len(names)) matrix."""
+        matrix = np.ascontiguousarray(matrix, dtype="<f4")
+        if matrix.shape[1] != len(names):
+            raise ValueError(f"{matrix.shape[1]} values for {len(names)} features")
+        header = self._HEADER.pack(self.MAGIC, self.register(names), len(names))
+        return [header + row.tobytes() for row in matrix]
+
+    def decode(self, data: bytes) -> tuple[tuple[str, ...], np.ndarray]:
+        magic, schema_id, n = self._HEADER.unpack_from(data)
+        if magic != self.MAGIC:
+            raise ValueError("Not an encoded feature vector")
+        values = np.frombuffer(data, dtype="<f4", count=n, offset=self._HEADER.size)
+        return self.schema(schema_id), values
+
+
+def _timestamp_key(timestamp: Any) -> str:
+    return timestamp.isoformat() if isinstance(timestamp, datetime) else str(timestamp)
+
+
 class RedisFeatureStore(MockFeatureStore):
     """
     Redis-backed Feature Store.
 
     This class provides the same interface as MockFeatureStore but uses
-    Redis for feature caching instead of in-memory dict.
+    Redis for feature caching instead of in-memory dict. Rows are stored with
+    ``FeatureVectorCodec``; multi-key reads use MGET, multi-key writes one
+    pipeline, and invalidation UNLINK (freed in the background by Redis).
 
     Usage:
         # Initialize Redis feature store
@@ -764,8 +838,23 @@ class RedisFeatureStore(MockFeatureStore):
             # Calculate features
             features = calculate_features(df)
             store.set_features("BTC/USDT", "2024-01-01 12:00", features)
+
+        # Bulk paths
+        store.materialize_dataframe("BTC/USDT", features_df)
+        rows = store.get_online_features_many(["BTC/USDT", "ETH/USDT"], now)
+        store.clear_redis_cache("BTC/USDT")
+
+        # Streaming features: indicator state lives in Redis next to the rows
+        store.update_features_incremental("BTC/USDT", new_candles_df)
+        latest = store.get_features_many(["BTC/USDT", "ETH/USDT"], "latest")
+        report = store.check_incremental_consistency("BTC/USDT", full_history_df)
     """
 
+    SCHEMA_KEY = "feature_schemas"  # Outside "features:*", survives invalidation
+    KEY_PREFIX = "features"
+    STATE_PREFIX = "feature_state"  # Indicator state, also outside "features:*"
+    LATEST = "latest"
+
     def __init__(
         self,
         host: str = "localhost",
@@ -776,6 +865,8 @@ class RedisFeatureStore(MockFeatureStore):
         redis_url: str | None = None,
         enable_caching: bool = True,
         cache_ttl_hours: int = 1,
+        pipeline_chunk_size: int = 5000,
+        feature_config: "FeatureConfig | None" = None,
     ):
         """
         Initialize Redis Feature Store.
@@ -789,6 +880,8 @@ class RedisFeatureStore(MockFeatureStore):
             redis_url: Redis URL (alternative to host/port/db)
             enable_caching: Enable feature caching for faster access
             cache_ttl_hours: TTL for cached features in hours
+            pipeline_chunk_size: Max commands per pipeline round trip in bulk operations
+            feature_config: Feature pipeline used by ``update_features_incremental``
         """
         # Call parent constructor
         super().__init__(config_path, redis_url, enable_caching, cache_ttl_hours)
@@ -799,9 +892,16 @@ class RedisFeatureStore(MockFeatureStore):
             raise ImportError("Redis is not available. Please install with: pip install redis")
 
         # Initialize Redis connection
-        self.redis = redis.Redis(host=host, port=port, db=db, password=password, decode_responses=False)
-        self.pickle = pickle
+        self.redis = redis.Redis(
+            host=host, port=port, db=db, password=password, decode_responses=False
+        )
+        self.codec = FeatureVectorCodec(resolve_schema=self._fetch_schema)
         self.ttl = cache_ttl_hours * 3600  # Convert hours to seconds
+        self.pipeline_chunk_size = pipeline_chunk_size
+        self._published_schemas: set[bytes] = set()
+        self.feature_config = feature_config
+        self._engine: IncrementalFeatureEngineer | None = None
+        self._last_candle: dict[str, pd.Timestamp | None] = {}
 
         # Test connection
         try:
@@ -811,77 +911,314 @@ class RedisFeatureStore(MockFeatureStore):
             logger.error(f"Failed to connect to Redis: {e}")
             raise
 
-    def get_features(self, symbol: str, timestamp: str) -> dict | None:
+    # -- encoding ----------------------------------------------------------------
+
+    def _fetch_schema(self, schema_id: bytes) -> list[str] | None:
+        data = self.redis.hget(self.SCHEMA_KEY, schema_id.hex())
+        return json.loads(data) if data else None
+
+    def _publish_schema(self, pipe: Any, names: tuple[str, ...]) -> None:
+        """Queue the schema on ``pipe`` the first time this process writes it."""
+        schema_id = self.codec.register(names)
+        if schema_id not in self._published_schemas:
+            pipe.hset(self.SCHEMA_KEY, schema_id.hex(), json.dumps(list(names)))
+            self._published_schemas.add(schema_id)
+
+    def _decode_dict(self, data: bytes) -> dict[str, float]:
+        names, values = self.codec.decode(data)
+        return dict(zip(names, values.tolist(), strict=True))
+
+    def _feature_key(self, symbol: str, timestamp: Any) -> str:
+        return f"{self.KEY_PREFIX}:{symbol}:{_timestamp_key(timestamp)}"
+
+    def _state_key(self, symbol: str) -> str:
+        return f"{self.STATE_PREFIX}:{symbol}"
+
+    # -- simple key-value interface ------------------------------------------------
+
+    def get_features(self, symbol: str, timestamp: str | datetime) -> dict | None:
         """
         Get cached features from Redis.
 
         Args:
             symbol: Trading symbol (e.g., "BTC/USDT")
-            timestamp: Feature timestamp as string
+            timestamp: Feature timestamp (string, or datetime stored via isoformat)
 
         Returns:
             Dictionary of features if found, None otherwise
         """
-        key = f"features:{symbol}:{timestamp}"
         try:
-            data = self.redis.get(key)
+            data = self.redis.get(self._feature_key(symbol, timestamp))
             if data:
-                return self.pickle.loads(data)
+                return self._decode_dict(data)
         except Exception as e:
             logger.error(f"Error getting features from Redis: {e}")
         return None
 
-    def set_features(self, symbol: str, timestamp: str, features: dict):
+    def get_features_many(
+        self, symbols: list[str], timestamp: str | datetime
+    ) -> dict[str, dict | None]:
+        """Get cached features of several symbols with a single MGET."""
+        try:
+            values = self.redis.mget([self._feature_key(s, timestamp) for s in symbols])
+        except Exception as e:
+            logger.error(f"Error getting features from Redis: {e}")
+            return dict.fromkeys(symbols)
+        return {
+            symbol: self._decode_dict(value) if value else None
+            for symbol, value in zip(symbols, values, strict=True)
+        }
+
+    def set_features(self, symbol: str, timestamp: str | datetime, features: dict):
         """
         Cache features in Redis.
 
         Args:
             symbol: Trading symbol
-            timestamp: Feature timestamp as string
-            features: Dictionary of features to cache
+            timestamp: Feature timestamp
+            features: Dictionary of numeric features to cache
         """
-        key = f"features:{symbol}:{timestamp}"
+        names = tuple(features)
+        key = self._feature_key(symbol, timestamp)
         try:
-            self.redis.setex(key, self.ttl, self.pickle.dumps(features))
+            if self.codec.schema_id(names) not in self._published_schemas:
+                pipe = self.redis.pipeline(transaction=False)
+                self._publish_schema(pipe, names)
+                pipe.execute()
+            value = self.codec.encode(names, list(features.values()))
+            self.redis.setex(key, self.ttl, value)
             logger.debug(f"Cached features for {symbol} at {timestamp}")
         except Exception as e:
             logger.error(f"Error caching features in Redis: {e}")
 
-    def update_features_incremental(self, symbol: str, new_ohlcv: pd.DataFrame):
+    # -- bulk materialization --------------------------------------------------------
+
+    def _queue_rows(
+        self, pipe: Any, symbol: str, df: pd.DataFrame, columns: list[str], ttl: int
+    ) -> int:
+        """Queue one SET per row of ``df`` on ``pipe``, flushing every chunk."""
+        names = tuple(columns)
+        matrix = df[columns].to_numpy(dtype=np.float32, na_value=np.nan)
+        values = self.codec.encode_matrix(names, matrix)
+        self._publish_schema(pipe, names)
+        for i, (ts, value) in enumerate(zip(df.index, values, strict=True), 1):
+            pipe.set(self._feature_key(symbol, ts), value, ex=ttl)
+            if i % self.pipeline_chunk_size == 0:
+                pipe.execute()
+        return len(values)
+
+    def materialize_dataframe(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        feature_columns: list[str] | None = None,
+        ttl: int | None = None,
+    ) -> int:
+        """
+        Write every row of ``df`` (indexed by timestamp) as one feature vector.
+
+        The frame is converted to a float32 matrix once and all SET commands go
+        out in pipelined round trips of ``pipeline_chunk_size`` commands.
+
+        Args:
+            symbol: Trading symbol
+            df: Features, one row per timestamp (DatetimeIndex or timestamp labels)
+            feature_columns: Columns to store (default: all numeric columns)
+            ttl: Key TTL in seconds (default: the store TTL)
+
+        Returns:
+            Number of rows written
+        """
+        if df.empty:
+            return 0
+        columns = feature_columns or list(df.select_dtypes(include="number").columns)
+        pipe = self.redis.pipeline(transaction=False)
+        written = self._queue_rows(pipe, symbol, df, columns, self.ttl if ttl is None else ttl)
+        pipe.execute()
+        logger.debug(f"Materialized {written} feature rows for {symbol}")
+        return written
+
+    # -- incremental features --------------------------------------------------------
+
+    @property
+    def engine(self) -> "IncrementalFeatureEngineer":
+        """Streaming feature engine (created on first use)."""
+        if self._engine is None:
+            from src.ml.training.incremental_features import IncrementalFeatureEngineer
+
+            self._engine = IncrementalFeatureEngineer(self.feature_config)
+        return self._engine
+
+    def _load_states(self, symbols: list[str]) -> None:
+        """Pull persisted indicator state of symbols not yet in memory (one pipeline)."""
+        missing = [s for s in symbols if s not in self._last_candle]
+        if not missing:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for symbol in missing:
+            pipe.hgetall(self._state_key(symbol))
+        for symbol, stored in zip(missing, pipe.execute(), strict=True):
+            self.engine.reset(symbol)
+            self._last_candle[symbol] = None
+            if not stored:
+                continue
+            try:
+                self.engine.import_state(symbol, stored[b"engine"])
+                self._last_candle[symbol] = pd.Timestamp(stored[b"last_candle"].decode())
+            except Exception as e:
+                self.engine.reset(symbol)
+                logger.warning(f"Discarding feature state of {symbol}, rebuilding: {e}")
+
+    def _advance(self, symbol: str, candles: pd.DataFrame) -> pd.DataFrame:
+        """Feed candles newer than the stored state; return rows past warmup."""
+        engine = self.engine
+        last = self._last_candle[symbol]
+        fresh = candles
+        if last is not None:
+            index = pd.DatetimeIndex(candles.index)
+            if last.tzinfo is None and index.tz is not None:
+                last = last.tz_localize(index.tz)
+            elif last.tzinfo is not None and index.tz is None:
+                last = last.tz_convert(None)
+            fresh = candles[index > last]
+
+        rows, timestamps = [], []
+        for timestamp, candle in zip(fresh.index, fresh.to_dict("records"), strict=True):
+            warm = engine.is_warm(symbol)  # Row matches the batch pipeline
+            row = engine.update(symbol, candle, timestamp)
+            if warm:
+                rows.append(row)
+                timestamps.append(timestamp)
+        if len(fresh):
+            self._last_candle[symbol] = pd.Timestamp(fresh.index[-1])
+        return pd.DataFrame(rows, index=pd.Index(timestamps))
+
+    def update_features_incremental_many(
+        self, candles: dict[str, pd.DataFrame]
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Advance the streaming features of many symbols with their new candles.
+
+        Indicator state (EMAs, Wilder RSI/ATR averages, Bollinger and rolling
+        windows, MACD) is kept per symbol in ``feature_state:{symbol}`` and
+        advanced in O(1) per candle by ``IncrementalFeatureEngineer``; nothing
+        is recomputed from history. States missing from memory are read in one
+        pipeline; feature rows, the ``latest`` row and the new state of every
+        symbol are written back in another. Candles at or before the last one
+        already processed are skipped, so replays are harmless.
+
+        Rows are written only once a symbol has seen ``engine.warmup_period``
+        candles, from which point they equal the batch pipeline.
+
+        Args:
+            candles: Symbol -> new OHLCV candles (chronological DatetimeIndex)
+
+        Returns:
+            Symbol -> DataFrame of the feature rows written
+        """
+        self._load_states(list(candles))
+        pipe = self.redis.pipeline(transaction=False)
+        written = {}
+        for symbol, new_ohlcv in candles.items():
+            rows = self._advance(symbol, new_ohlcv)
+            written[symbol] = rows
+            if not rows.empty:
+                columns = list(rows.select_dtypes(include=["number", "bool"]).columns)
+                self._queue_rows(pipe, symbol, rows, columns, self.ttl)
+                latest = rows.iloc[[-1]].set_axis([self.LATEST])
+                self._queue_rows(pipe, symbol, latest, columns, self.ttl)
+            state = self.engine.export_state(symbol)
+            if state is not None:
+                pipe.hset(
+                    self._state_key(symbol),
+                    mapping={
+                        "engine": state,
+                        "last_candle": self._last_candle[symbol].isoformat(),
+                    },
+                )
+        pipe.execute()
+        return written
+
+    def update_features_incremental(self, symbol: str, new_ohlcv: pd.DataFrame) -> pd.DataFrame:
         """
         Incrementally update features in the store using only new candles.
         Avoids full historical recalculation.
+
+        Returns:
+            The feature rows written (empty while warming up or on failure)
         """
         if not self._initialized:
             self.initialize()
 
         try:
-            # 1. Get the last known features from store/cache
-            # (In a real implementation, we'd fetch the latest timestamp from Redis)
-            logger.info(f"Performing incremental update for {symbol} with {len(new_ohlcv)} new candles")
-            
-            # 2. Calculate features only for new windows
-            # This is a mock: in production, we'd use technical indicators 
-            # that support incremental updates (e.g., EMA)
-            for idx, row in new_ohlcv.iterrows():
-                # Simulate feature calculation
-                feat_dict = {"close": row['close'], "volume": row['volume']}
-                self.write_features(symbol, idx, feat_dict)
-                
-            logger.info(f"Successfully updated {len(new_ohlcv)} feature sets incrementally.")
-            
+            logger.info(
+                f"Performing incremental update for {symbol} with {len(new_ohlcv)} new candles"
+            )
+            rows = self.update_features_incremental_many({symbol: new_ohlcv})[symbol]
+            logger.info(f"Successfully updated {len(rows)} feature sets incrementally.")
+            return rows
         except Exception as e:
             logger.error(f"Incremental update failed for {symbol}: {e}")
+            # In-memory state may be ahead of Redis now; reload it on the next call
+            self._last_candle.pop(symbol, None)
+            return pd.DataFrame()
 
-    def clear_cache(self):
-        """Clear all cached features from Redis."""
-        try:
-            # Use scan_iter to find all feature keys
-            for key in self.redis.scan_iter("features:*"):
-                self.redis.delete(key)
-            logger.info("Cleared all cached features from Redis")
-        except Exception as e:
-            logger.error(f"Error clearing Redis cache: {e}")
+    def reset_feature_state(self, symbol: str) -> None:
+        """Forget the indicator state of ``symbol`` (memory and Redis)."""
+        self.engine.reset(symbol)
+        self._last_candle.pop(symbol, None)
+        self.redis.unlink(self._state_key(symbol))
+
+    def check_incremental_consistency(
+        self, symbol: str, ohlcv: pd.DataFrame, rtol: float = 1e-5, atol: float = 1e-6
+    ) -> dict[str, Any]:
+        """
+        Compare the stored streaming rows with a batch recompute.
+
+        Args:
+            symbol: Trading symbol
+            ohlcv: The full candle history the stream has consumed for ``symbol``
+                (the stationarity transform accumulates from the first candle)
+            rtol: Relative tolerance (rows are stored as float32)
+            atol: Absolute tolerance
+
+        Returns:
+            Report with rows checked/missing, max abs error per mismatching
+            column and an overall ``consistent`` flag
+        """
+        from src.ml.training.feature_engineering import FeatureEngineer
+
+        engineer = FeatureEngineer(self.engine.config)
+        batch = engineer._engineer_features(engineer._apply_stationarity_transformation(ohlcv))
+        batch = batch.iloc[self.engine.warmup_period :]
+
+        stored = self.redis.mget([self._feature_key(symbol, ts) for ts in batch.index])
+        missing, errors = 0, {}
+        for (_, expected), data in zip(batch.iterrows(), stored, strict=True):
+            if not data:
+                missing += 1
+                continue
+            names, values = self.codec.decode(data)
+            reference = expected.reindex(list(names)).to_numpy(dtype=np.float64, na_value=np.nan)
+            reference = reference.astype(np.float32).astype(np.float64)
+            values = values.astype(np.float64)
+            bad = ~np.isclose(values, reference, rtol=rtol, atol=atol, equal_nan=True)
+            for j in np.flatnonzero(bad):
+                diff = float(np.nan_to_num(abs(values[j] - reference[j]), nan=np.inf))
+                errors[names[j]] = max(errors.get(names[j], 0.0), diff)
+
+        report = {
+            "symbol": symbol,
+            "rows_checked": len(batch) - missing,
+            "rows_missing": missing,
+            "mismatched_columns": errors,
+            "consistent": not errors and len(batch) > missing,
+        }
+        if errors:
+            logger.warning(f"Incremental features of {symbol} diverge from batch: {errors}")
+        return report
+
+    # -- online features -------------------------------------------------------------
 
     def _get_cache_key(
         self, symbol: str, timestamp: datetime, feature_list: list[str] | None = None
@@ -890,11 +1227,28 @@ class RedisFeatureStore(MockFeatureStore):
         # Convert datetime to string for consistency with Redis keys
         timestamp_str = timestamp.isoformat()
         if feature_list:
-            features_hash = hash(tuple(sorted(feature_list)))
+            # Stable across processes, unlike hash() of a tuple of strings
+            features_hash = self.codec.schema_id(tuple(sorted(feature_list))).hex()
         else:
             features_hash = "all"
 
-        return f"features:{symbol}:{timestamp_str}:{features_hash}"
+        return f"{self.KEY_PREFIX}:{symbol}:{timestamp_str}:{features_hash}"
+
+    def _features_frame(self, symbol: str, timestamp: datetime, data: bytes) -> pd.DataFrame:
+        names, values = self.codec.decode(data)
+        df = pd.DataFrame(values.reshape(1, -1).astype(np.float64), columns=list(names))
+        df["symbol_id"] = symbol
+        df["timestamp"] = timestamp
+        return df
+
+    def _cache_frames(self, frames: dict[str, pd.DataFrame]) -> None:
+        """Write freshly computed feature frames (cache key -> frame) in one pipeline."""
+        pipe = self.redis.pipeline(transaction=False)
+        for key, frame in frames.items():
+            names = tuple(c for c in frame.columns if c not in ("symbol_id", "timestamp"))
+            self._publish_schema(pipe, names)
+            pipe.set(key, self.codec.encode(names, frame.iloc[0][list(names)]), ex=self.ttl)
+        pipe.execute()
 
     def get_online_features(
         self, symbol: str, timestamp: datetime, feature_list: list[str] | None = None
@@ -904,52 +1258,94 @@ class RedisFeatureStore(MockFeatureStore):
 
         Overrides MockFeatureStore.get_online_features to use Redis instead of dict.
         """
+        return self.get_online_features_many([symbol], timestamp, feature_list)
+
+    def get_online_features_many(
+        self, symbols: list[str], timestamp: datetime, feature_list: list[str] | None = None
+    ) -> pd.DataFrame:
+        """
+        Get online features of several symbols in one round trip.
+
+        Cached rows come from a single MGET; misses are computed and written back
+        in a single pipeline.
+
+        Returns:
+            DataFrame with one row per symbol, in the order of ``symbols``
+        """
         if not self._initialized:
             self.initialize()
 
-        # Generate cache key
-        cache_key = self._get_cache_key(symbol, timestamp, feature_list)
-
-        # Check Redis cache first
+        keys = [self._get_cache_key(symbol, timestamp, feature_list) for symbol in symbols]
+        cached: list[bytes | None] = [None] * len(keys)
         if self.enable_caching:
             try:
-                data = self.redis.get(cache_key)
-                if data:
-                    cached_features = self.pickle.loads(data)
-                    # Check if cache is still valid (based on TTL in Redis)
-                    logger.debug(f"Redis cache hit for {symbol} at {timestamp}")
-                    return cached_features
+                values = list(self.redis.mget(keys))
+                if len(values) != len(keys):
+                    raise ValueError(f"MGET returned {len(values)} values for {len(keys)} keys")
+                cached = values
             except Exception as e:
                 logger.error(f"Error reading from Redis cache: {e}")
 
-        # Generate mock features (fallback to parent implementation)
-        mock_features = self._generate_mock_features(symbol, timestamp, feature_list)
-
-        # Cache the result in Redis
-        if self.enable_caching:
+        frames = []
+        computed: dict[str, pd.DataFrame] = {}
+        for symbol, key, data in zip(symbols, keys, cached, strict=True):
+            if data:
+                try:
+                    frames.append(self._features_frame(symbol, timestamp, data))
+                    continue
+                except Exception as e:
+                    logger.warning(f"Discarding undecodable cache entry {key}: {e}")
+            # Generate mock features (fallback to parent implementation)
+            frame = self._generate_mock_features(symbol, timestamp, feature_list)
+            computed[key] = frame
+            frames.append(frame)
+
+        if computed and self.enable_caching:
             try:
-                self.redis.setex(cache_key, self.ttl, self.pickle.dumps(mock_features))
-                logger.debug(f"Cached features in Redis for {symbol}")
+                self._cache_frames(computed)
             except Exception as e:
                 logger.error(f"Error caching in Redis: {e}")
 
-        return mock_features
+        logger.debug(f"Online features: {len(symbols) - len(computed)}/{len(symbols)} cached")
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    # -- invalidation ---------------------------------------------------------------
+
+    def invalidate_features(self, symbol: str, timestamps: list[Any]) -> int:
+        """UNLINK the stored rows of ``symbol`` at ``timestamps``; returns keys removed."""
+        keys = [self._feature_key(symbol, ts) for ts in timestamps]
+        removed = 0
+        for i in range(0, len(keys), self.pipeline_chunk_size):
+            removed += self.redis.unlink(*keys[i : i + self.pipeline_chunk_size])
+        return removed
 
     def clear_cache(self):
         """Clear Redis cache (overrides parent method)."""
         super().clear_cache()  # Clear in-memory cache
         self.clear_redis_cache()
 
-    def clear_redis_cache(self):
-        """Clear only Redis cache."""
+    def clear_redis_cache(self, symbol: str | None = None) -> int:
+        """
+        Clear cached features from Redis (all symbols, or one).
+
+        Keys are collected with SCAN and removed with batched UNLINK, so the
+        memory is reclaimed by Redis in the background instead of blocking it.
+        """
+        pattern = f"{self.KEY_PREFIX}:{symbol}:*" if symbol else f"{self.KEY_PREFIX}:*"
+        count = 0
         try:
-            count = 0
-            for key in self.redis.scan_iter("features:*"):
-                self.redis.delete(key)
-                count += 1
+            batch = []
+            for key in self.redis.scan_iter(match=pattern, count=self.pipeline_chunk_size):
+                batch.append(key)
+                if len(batch) >= self.pipeline_chunk_size:
+                    count += self.redis.unlink(*batch)
+                    batch = []
+            if batch:
+                count += self.redis.unlink(*batch)
             logger.info(f"Cleared {count} cached features from Redis")
         except Exception as e:
             logger.error(f"Error clearing Redis cache: {e}")
+        return count
 
     def health_check(self) -> dict[str, Any]:
         """Check Redis feature store health."""
@@ -958,7 +1354,7 @@ class RedisFeatureStore(MockFeatureStore):
             redis_info = self.redis.info()
 
             # Get cache stats
-            cache_keys = list(self.redis.scan_iter("features:*"))
+            cache_keys = list(self.redis.scan_iter(f"{self.KEY_PREFIX}:*"))
 
             return {
                 "status": "healthy",
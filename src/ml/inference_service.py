@@ -11,20 +11,30 @@ Architecture:
 
 This decouples inference from trading, preventing missed signals.
 
+The workers consuming the request queues live in ``src/ml/worker_pool.py``.
+
 Author: Stoic Citadel Team
 License: MIT
 """
 
 import asyncio
+import dataclasses
 import json
 import logging
+import math
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
 import numpy as np
 
+from .prediction_cache import PredictionCache, PredictionKeyBuilder, RedisPredictionTier
+
+if TYPE_CHECKING:
+    from .batch_inference import FeatureSchema
+    from .inference_transport import PipelinedInferenceTransport
+
 # Try to import metrics exporter
 try:
     from src.monitoring.metrics_exporter import get_exporter
@@ -124,6 +134,7 @@ class MLModelConfig:
     timeout_ms: int = 100  # Max wait time for prediction
     cache_ttl_seconds: int = 60  # Cache predictions for 1 minute
     batch_size: int = 32
+    model_version: str = "1"  # Part of the cache key; bump when the model file changes
 
     def to_dict(self) -> dict[str, Any]:
         """Convert config to dictionary."""
@@ -135,6 +146,7 @@ class MLModelConfig:
             "timeout_ms": self.timeout_ms,
             "cache_ttl_seconds": self.cache_ttl_seconds,
             "batch_size": self.batch_size,
+            "model_version": self.model_version,
         }
 
 
@@ -192,6 +204,9 @@ class MLInferenceService:
         redis_url: str = "redis://localhost:6379",
         models: dict[str, MLModelConfig] | None = None,
         max_cache_size: int = 1000,
+        cache_tier: RedisPredictionTier | None = None,
+        cache_quantization: float = 1e-4,
+        transport: "PipelinedInferenceTransport | None" = None,
     ) -> None:
         """
         Initialize ML Inference Service with dependency injection.
@@ -200,13 +215,24 @@ class MLInferenceService:
             redis_client: Redis client instance (implements IRedisClient).
             redis_url: Redis URL (used only if redis_client is not provided).
             models: Model configurations.
+            max_cache_size: Max entries in the in-process prediction cache.
+            cache_tier: Optional shared second cache tier (multi-process workers).
+            cache_quantization: Feature quantization step for cache keys.
+            transport: Pipelined binary transport; replaces per-request LPUSH/BRPOP.
         """
         self.redis_url = redis_url
         self.models = models or {}
         self._redis = redis_client
         self._running = False
-        self._prediction_cache: dict[str, PredictionResult] = {}
-        self._max_cache_size = max_cache_size
+        self._prediction_cache = PredictionCache(max_size=max_cache_size, default_ttl=60.0)
+        self._cache_tier = cache_tier
+        self._cache_quantization = cache_quantization
+        self._key_builders: dict[str, PredictionKeyBuilder] = {}
+        self._transport = transport
+        self._background_tasks: set[asyncio.Task] = set()
+        if transport is not None:
+            for name, model_config in self.models.items():
+                transport.register_schema(name, model_config.feature_columns)
         self._pending_requests: dict[str, asyncio.Future] = {}
         self._stats = {
             "total_requests": 0,
@@ -224,6 +250,8 @@ class MLInferenceService:
         """Initialize service and connect to Redis."""
         try:
             # Create Redis client if not provided
+            if self._redis is None and self._transport is not None:
+                self._redis = self._transport.redis
             if self._redis is None:
                 import redis.asyncio as redis
 
@@ -240,17 +268,28 @@ class MLInferenceService:
             self._running = True
 
             # Start background tasks
-            asyncio.create_task(self._result_listener())
-            asyncio.create_task(self._cache_cleanup())
+            if self._transport is not None:
+                await self._transport.start()
+            else:
+                self._spawn(self._result_listener())
+            self._spawn(self._cache_cleanup())
 
             logger.info("ML Inference Service started with DI")
         except Exception as e:
             logger.error(f"Failed to start ML Inference Service: {e}")
             raise
 
+    def _spawn(self, coro: Any) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
     async def stop(self) -> None:
         """Gracefully shutdown service."""
         self._running = False
+        if self._transport is not None:
+            await self._transport.stop()
         # Only close Redis connection if we created it
         if self._redis and not hasattr(self, "_external_redis"):
             await self._redis.close()
@@ -276,53 +315,52 @@ class MLInferenceService:
         self._stats["total_requests"] += 1
         start_time = time.time()
 
-        # Check cache first
+        # Check cache first (in-process, then shared tier)
+        model_config = self.models.get(model_name)
+        cache_ttl = model_config.cache_ttl_seconds if model_config else 60
         cache_key = self._get_cache_key(model_name, features)
-        if cache_key in self._prediction_cache:
-            cached = self._prediction_cache[cache_key]
+        cached = await self._get_cached(cache_key, cache_ttl)
+        if cached is not None:
             self._stats["cache_hits"] += 1
-            cached.cached = True
-            return cached
+            return dataclasses.replace(cached, cached=True)
 
         # Create request
         request = PredictionRequest(
             request_id=f"{model_name}_{time.time_ns()}", model_name=model_name, features=features
         )
-
-        # Create future for result
-        future = asyncio.get_event_loop().create_future()
-        self._pending_requests[request.request_id] = future
+        default_timeout = model_config.timeout_ms if model_config else 100
+        timeout = timeout_ms or default_timeout
 
         try:
-            # Send to Redis queue
-            if self._redis:
-                await self._redis.lpush(
-                    f"ml:requests:{model_name}",
-                    json.dumps(
-                        {
-                            "request_id": request.request_id,
-                            "features": request.features,
-                            "timestamp": request.timestamp,
-                        }
-                    ),
-                )
+            if self._transport is not None:
+                # Coalesced, pipelined send; the transport fails the future at the deadline
+                _, reply = self._transport.submit(model_name, features, timeout / 1000.0)
+                result = await reply
+            else:
+                # Create future for result
+                future = asyncio.get_event_loop().create_future()
+                self._pending_requests[request.request_id] = future
 
-            # Wait for result with timeout
-            model_config = self.models.get(model_name)
-            default_timeout = model_config.timeout_ms if model_config else 100
-            timeout = timeout_ms or default_timeout
+                # Send to Redis queue
+                if self._redis:
+                    await self._redis.lpush(
+                        f"ml:requests:{model_name}",
+                        json.dumps(
+                            {
+                                "request_id": request.request_id,
+                                "features": request.features,
+                                "timestamp": request.timestamp,
+                            }
+                        ),
+                    )
 
-            result = await asyncio.wait_for(future, timeout=timeout / 1000.0)
+                # Wait for result with timeout
+                result = await asyncio.wait_for(future, timeout=timeout / 1000.0)
 
-            # Cache result with size limit
-            if len(self._prediction_cache) >= self._max_cache_size:
-                # Remove oldest (by timestamp)
-                oldest_key = min(
-                    self._prediction_cache.keys(), key=lambda k: self._prediction_cache[k].timestamp
-                )
-                self._prediction_cache.pop(oldest_key)
-
-            self._prediction_cache[cache_key] = result
+            # Cache result (LRU eviction when full)
+            self._prediction_cache.set(cache_key, result, cache_ttl)
+            if self._cache_tier is not None:
+                await self._cache_tier.set(cache_key, dataclasses.asdict(result), cache_ttl)
 
             # Update stats
             latency = (time.time() - start_time) * 1000
@@ -351,6 +389,21 @@ class MLInferenceService:
         finally:
             self._pending_requests.pop(request.request_id, None)
 
+    async def _get_cached(self, cache_key: str, cache_ttl: float) -> PredictionResult | None:
+        """Look up the in-process cache, then the shared tier (promoting hits to L1)."""
+        cached = self._prediction_cache.get(cache_key)
+        if cached is None and self._cache_tier is not None:
+            entry = await self._cache_tier.get_with_ttl(cache_key)
+            if entry is not None:
+                shared, remaining = entry
+                cached = PredictionResult(**shared)
+                # Keep the shared entry's expiry instead of restarting the TTL (whole
+                # seconds, so L1 keeps a bounded number of per-TTL expiry queues)
+                ttl = min(cache_ttl, math.floor(remaining))
+                if ttl > 0:
+                    self._prediction_cache.set(cache_key, cached, ttl)
+        return cached
+
     async def predict_batch(
         self, model_name: str, features_list: list[dict[str, float]]
     ) -> list[PredictionResult]:
@@ -386,16 +439,8 @@ class MLInferenceService:
                         result_data = json.loads(data)
                         request_id = result_data["request_id"]
 
-                        # FIX: Clean up stale pending requests to prevent memory leak
-                        now = time.time()
-                        stale_ids = [
-                            rid
-                            for rid, fut in self._pending_requests.items()
-                            if now - float(rid.split("_")[-1]) / 1e9 > 30
-                        ]
-                        for sid in stale_ids:
-                            self._pending_requests.pop(sid, None)
-
+                        # predict() removes its own entry on result, timeout or error,
+                        # so no stale-entry scan is needed here
                         if request_id in self._pending_requests:
                             prediction_result = PredictionResult(
                                 request_id=request_id,
@@ -416,29 +461,33 @@ class MLInferenceService:
                 await asyncio.sleep(0.1)
 
     async def _cache_cleanup(self) -> None:
-        """Periodically clean expired cache entries."""
+        """Periodically drop expired cache entries and export cache metrics."""
         while self._running:
             try:
-                current_time = time.time()
-                expired_keys = [
-                    key
-                    for key, result in self._prediction_cache.items()
-                    if current_time - result.timestamp > 60  # 60s default TTL
-                ]
-                for key in expired_keys:
-                    del self._prediction_cache[key]
-
-                await asyncio.sleep(30)  # Check every 30 seconds
+                # Only touches expired entries, so it can run often
+                self._prediction_cache.purge_expired()
+                self._prediction_cache.export_metrics()
+                if self._cache_tier is not None:
+                    self._cache_tier.export_metrics()
+
+                await asyncio.sleep(5)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Cache cleanup error: {e}")
 
     def _get_cache_key(self, model_name: str, features: dict[str, float]) -> str:
-        """Generate cache key from features."""
-        # Round features for cache key (allow small variations)
-        rounded = {k: round(v, 4) for k, v in sorted(features.items())}
-        return f"{model_name}:{hash(frozenset(rounded.items()))}"
+        """Generate cache key from quantized features and the model version."""
+        builder = self._key_builders.get(model_name)
+        model_config = self.models.get(model_name)
+        if builder is None:
+            builder = PredictionKeyBuilder(
+                model_config.feature_columns if model_config else None,
+                step=self._cache_quantization,
+            )
+            self._key_builders[model_name] = builder
+        version = model_config.model_version if model_config else "0"
+        return builder.build(model_name, version, features)
 
     def _get_fallback_prediction(
         self, request: PredictionRequest, start_time: float
@@ -467,6 +516,8 @@ class MLInferenceService:
         return {
             **self._stats,
             "cache_size": len(self._prediction_cache),
+            "cache": self._prediction_cache.get_stats(),
+            "cache_tier": self._cache_tier.get_stats() if self._cache_tier else None,
             "pending_requests": len(self._pending_requests),
             "cache_hit_rate": (
                 self._stats["cache_hits"] / max(1, int(self._stats["total_requests"]))
@@ -494,11 +545,6 @@ class MLInferenceService:
         }
 
 
-# ... (OptimizedInferenceService and Worker classes would follow similar professionalization)
-# Note: For brevity in this turn, I am assuming the file is truncated here or I should update the rest too.
-# The user asked to scan ALL files, but since I can only overwrite, I must be careful not to delete the rest of the file.
-# The previous read_file showed OptimizedInferenceService and MLWorker. I must include them.
-
 
 class OptimizedInferenceService(MLInferenceService):
     """
@@ -528,6 +574,7 @@ class OptimizedInferenceService(MLInferenceService):
         self._onnx_sessions: dict[str, Any] = {}
         self._batch_queue: dict[str, list[tuple[PredictionRequest, asyncio.Future]]] = {}
         self._batch_timer: asyncio.Task | None = None
+        self._feature_schemas: dict[str, FeatureSchema] = {}
 
         if self.use_onnx:
             logger.info("ONNX Runtime optimization enabled")
@@ -586,8 +633,7 @@ class OptimizedInferenceService(MLInferenceService):
             return await super().predict_batch(model_name, features_list)
 
         batch_size = len(features_list)
-        feature_arrays = [np.array([list(f.values())], dtype=np.float32) for f in features_list]
-        X_batch = np.vstack(feature_arrays)
+        X_batch = self._feature_schema(model_name).to_matrix(features_list)
 
         start_time = time.time()
         try:
@@ -618,6 +664,16 @@ class OptimizedInferenceService(MLInferenceService):
             logger.error(f"ONNX batch prediction error: {e}")
             return await super().predict_batch(model_name, features_list)
 
+    def _feature_schema(self, model_name: str) -> "FeatureSchema":
+        """Feature order of ``model_name`` from its configured ``feature_columns``."""
+        from .batch_inference import FeatureSchema
+
+        schema = self._feature_schemas.get(model_name)
+        if schema is None:
+            schema = FeatureSchema(self.models[model_name].feature_columns)
+            self._feature_schemas[model_name] = schema
+        return schema
+
     async def _get_onnx_session(self, model_name: str) -> Any:
         """Get or create ONNX session for model."""
         if model_name in self._onnx_sessions:
@@ -630,12 +686,20 @@ class OptimizedInferenceService(MLInferenceService):
         model_path = Path(model_config.model_path)
         onnx_path = model_path.with_suffix(".onnx")
 
-        try:
-            session = ort.InferenceSession(str(onnx_path))
-            self._onnx_sessions[model_name] = session
-            return session
-        except Exception:
-            return None
+        session = None
+        if not onnx_path.exists():
+            logger.warning(
+                f"No ONNX artifact for {model_name} at {onnx_path} "
+                "(compile it with ModelRegistry.compile_model); using standard inference"
+            )
+        else:
+            try:
+                session = ort.InferenceSession(str(onnx_path))
+            except Exception as e:
+                logger.warning(f"Failed to load ONNX model {onnx_path}: {e}")
+        # Cache misses too, so the fallback does not retry (and log) on every batch
+        self._onnx_sessions[model_name] = session
+        return session
 
     async def _process_batches_periodically(self) -> None:
         """Periodically process batches."""
@@ -688,10 +752,24 @@ class OptimizedInferenceService(MLInferenceService):
                 future.set_result(self._get_fallback_prediction(request, time.time()))
 
     async def _warmup_models(self) -> None:
-        """Warm up models."""
-        # Simplified warmup logic
-        pass
-
+        """Run zero-filled batches through every ONNX session before serving."""
+        if not self.use_onnx:
+            return
+        for model_name, model_config in self.models.items():
+            session = await self._get_onnx_session(model_name)
+            if session is None:
+                continue
+            input_name = session.get_inputs()[0].name
+            start = time.perf_counter()
+            try:
+                for size in sorted({1, max(1, self.default_batch_size)}):
+                    X = np.zeros((size, len(model_config.feature_columns)), dtype=np.float32)
+                    for _ in range(3):
+                        session.run(None, {input_name: X})
+            except Exception as e:
+                logger.warning(f"Warmup failed for model {model_name}: {e}")
+                continue
+            logger.info(
+                f"Warmed up model {model_name} in {(time.perf_counter() - start) * 1000:.1f}ms"
+            )
 
-# Note: MLWorker class is omitted for brevity but should be included in a real refactor.
-# I will only update the main Service classes here to save space and demonstrate the task.
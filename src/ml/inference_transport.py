@@ -0,0 +1,715 @@
+#!/usr/bin/env python3
+"""
+Pipelined Redis Inference Transport
+===================================
+
+Request/response transport between ``MLInferenceService`` clients and ML
+workers that keeps Redis round trips per batch, not per request.
+
+Client side (``PipelinedInferenceTransport``):
+- requests submitted in the same event-loop iteration (e.g. an
+  ``asyncio.gather`` over 100+ symbols) are coalesced per model into one
+  binary message, and all models are sent in one pipeline
+- each client has its own reply list, drained with BRPOP + RPOP COUNT
+- pending futures are expired from a heap-ordered deadline index with a
+  single timer, instead of rescanning every pending request
+
+Worker side (``InferenceWorker``): reads request batches from per-model
+lists (``mode="list"``) or from per-model Redis Streams through a consumer
+group (``mode="stream"``), drops rows whose deadline has passed, scores all
+rows of one read with a single ``BatchInferenceEngine`` call per model and
+pipelines the replies. In list mode it also answers the single-request JSON
+messages that ``MLInferenceService`` sends without a transport (replies go
+to ``ml:results``).
+
+Stream mode is at-least-once: an entry is XACKed only after it was answered,
+expired or dead-lettered. Entries left pending by a failed model call or a
+crashed worker are reclaimed with a periodic XAUTOCLAIM sweep once idle for
+``claim_idle_ms``; malformed entries, and entries delivered
+``max_deliveries`` times, move to a per-model dead-letter stream.
+
+Messages carry a small header plus raw NumPy arrays (float32 features,
+float64 scores), packed with msgpack when installed and with a JSON header
+frame otherwise.
+
+Usage:
+    transport = PipelinedInferenceTransport(redis, {"m": feature_columns})
+    service = MLInferenceService(models=models, transport=transport)
+
+    worker = InferenceWorker(redis, engine, ["m"])
+    await worker.run()
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import struct
+import time
+import uuid
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .batch_inference import BatchInferenceEngine, FeatureSchema
+from .inference_service import PredictionResult
+
+# msgpack for compact binary headers (optional)
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_MSGPACK_FRAME = b"M"
+_JSON_FRAME = b"J"
+
+
+# =============================================================================
+# Codec
+# =============================================================================
+
+
+def encode_message(header: dict[str, Any], arrays: Mapping[str, np.ndarray]) -> bytes:
+    """Pack a header dict and NumPy arrays into one binary message."""
+    if MSGPACK_AVAILABLE:
+        packed = {
+            name: [array.dtype.str, list(array.shape), np.ascontiguousarray(array).tobytes()]
+            for name, array in arrays.items()
+        }
+        return _MSGPACK_FRAME + msgpack.packb({"h": header, "a": packed}, use_bin_type=True)
+
+    meta, blobs, offset = [], [], 0
+    for name, array in arrays.items():
+        blob = np.ascontiguousarray(array).tobytes()
+        meta.append([name, array.dtype.str, list(array.shape), offset, len(blob)])
+        blobs.append(blob)
+        offset += len(blob)
+    head = json.dumps({"h": header, "a": meta}, separators=(",", ":")).encode()
+    return b"".join([_JSON_FRAME, struct.pack("<I", len(head)), head, *blobs])
+
+
+def decode_message(data: bytes) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """Inverse of ``encode_message``; arrays are read-only views on ``data``."""
+    frame, body = data[:1], memoryview(data)[1:]
+    if frame == _MSGPACK_FRAME:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Received a msgpack message but msgpack is not installed")
+        message = msgpack.unpackb(body, raw=False)
+        arrays = {
+            name: np.frombuffer(blob, dtype=np.dtype(dtype)).reshape(shape)
+            for name, (dtype, shape, blob) in message["a"].items()
+        }
+        return message["h"], arrays
+    if frame == _JSON_FRAME:
+        (head_len,) = struct.unpack_from("<I", body)
+        message = json.loads(bytes(body[4 : 4 + head_len]))
+        blobs = body[4 + head_len :]
+        arrays = {
+            name: np.frombuffer(blobs[offset : offset + size], dtype=np.dtype(dtype)).reshape(shape)
+            for name, dtype, shape, offset, size in message["a"]
+        }
+        return message["h"], arrays
+    raise ValueError(f"Unknown message frame: {frame!r}")
+
+
+@dataclass
+class TransportConfig:
+    """Redis key layout and batching limits shared by clients and workers."""
+
+    mode: str = "list"  # "list" (LPUSH/BRPOP) or "stream" (XADD + consumer groups)
+    request_prefix: str = "ml:requests:"  # List mode: one request list per model
+    stream_prefix: str = "ml:stream:"  # Stream mode: one stream per model
+    reply_prefix: str = "ml:replies:"  # One reply list per client
+    consumer_group: str = "ml-workers"
+    stream_maxlen: int = 100_000  # Approximate XADD MAXLEN
+    reply_ttl_seconds: int = 60  # Reply lists of dead clients expire
+    max_batch_size: int = 1024  # Rows per request message
+    read_count: int = 64  # Messages drained per read round trip
+    block_seconds: float = 1.0  # BRPOP / XREADGROUP block timeout (float needs Redis >= 6)
+    legacy_result_key: str = "ml:results"  # Reply list of JSON requests (no transport)
+    legacy_max_age_seconds: float = 5.0  # Older JSON requests are dropped unanswered
+    claim_idle_ms: int = 30_000  # Stream mode: reclaim entries left unacked this long
+    claim_interval_seconds: float = 5.0  # Stream mode: XAUTOCLAIM sweep interval
+    max_deliveries: int = 5  # Stream mode: dead-letter entries delivered this often
+    dead_letter_prefix: str = "ml:dead:"  # Stream mode: one dead-letter stream per model
+
+    def __post_init__(self):
+        if self.mode not in ("list", "stream"):
+            raise ValueError(f"Unknown transport mode: {self.mode}")
+
+    def request_key(self, model_name: str) -> str:
+        prefix = self.stream_prefix if self.mode == "stream" else self.request_prefix
+        return f"{prefix}{model_name}"
+
+    def dead_letter_key(self, model_name: str) -> str:
+        return f"{self.dead_letter_prefix}{model_name}"
+
+
+# =============================================================================
+# Client
+# =============================================================================
+
+
+class PipelinedInferenceTransport:
+    """Client side: coalesces requests, pipelines sends and resolves replies."""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        feature_columns: Mapping[str, Sequence[str]] | None = None,
+        config: TransportConfig | None = None,
+        client_id: str | None = None,
+    ):
+        """
+        Args:
+            redis_client: ``redis.asyncio`` client created with ``decode_responses=False``
+            feature_columns: Feature order per model
+            config: Key layout and limits
+            client_id: Unique client name (default: random)
+        """
+        self._redis = redis_client
+        self.config = config or TransportConfig()
+        self.client_id = client_id or uuid.uuid4().hex[:12]
+        self.reply_key = f"{self.config.reply_prefix}{self.client_id}"
+        self._schemas = {
+            name: FeatureSchema(cols) for name, cols in (feature_columns or {}).items()
+        }
+
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._outgoing: dict[str, list[tuple[int, Mapping[str, float], float]]] = {}
+        self._flush_scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+        self._listener: asyncio.Task | None = None
+        self._running = False
+
+        # Deadline index: (monotonic deadline, request id), one timer for the earliest
+        self._deadlines: list[tuple[float, int]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_at = float("inf")
+
+        self._stats = {
+            "requests": 0,
+            "messages_sent": 0,
+            "pipelines": 0,
+            "replies": 0,
+            "expired": 0,
+            "late_replies": 0,
+            "send_errors": 0,
+        }
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "PipelinedInferenceTransport":
+        import redis.asyncio as redis
+
+        return cls(redis.from_url(url, decode_responses=False), **kwargs)
+
+    @property
+    def redis(self) -> Any:
+        return self._redis
+
+    def register_schema(self, model_name: str, feature_columns: Sequence[str]) -> None:
+        self._schemas[model_name] = FeatureSchema(feature_columns)
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._listener = asyncio.create_task(self._listen())
+        logger.info(f"Inference transport {self.client_id} started ({self.config.mode} mode)")
+
+    async def stop(self) -> None:
+        self._running = False
+        for task in [self._listener, *self._tasks]:
+            if task is not None:
+                task.cancel()
+        if self._timer is not None:
+            self._timer.cancel()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Inference transport stopped"))
+        self._pending.clear()
+        self._deadlines.clear()
+
+    # =========================================================================
+    # Requests
+    # =========================================================================
+
+    def submit(
+        self, model_name: str, features: Mapping[str, float], timeout_s: float
+    ) -> tuple[str, asyncio.Future]:
+        """
+        Queue one request; it is sent with the others of this loop iteration.
+
+        Returns:
+            (request id, future resolving to a ``PredictionResult`` or raising
+            ``asyncio.TimeoutError`` once the deadline passes)
+        """
+        if model_name not in self._schemas:
+            raise KeyError(f"No feature schema registered for model {model_name}")
+        loop = asyncio.get_running_loop()
+        request_id = next(self._ids)
+        future = loop.create_future()
+        self._pending[request_id] = future
+
+        deadline = time.monotonic() + timeout_s
+        self._outgoing.setdefault(model_name, []).append(
+            (request_id, features, time.time() + timeout_s)
+        )
+        heapq.heappush(self._deadlines, (deadline, request_id))
+        if deadline < self._timer_at:
+            self._arm_timer(loop, deadline)
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._schedule_flush)
+        self._stats["requests"] += 1
+        return f"{model_name}_{self.client_id}_{request_id}", future
+
+    def _schedule_flush(self) -> None:
+        self._flush_scheduled = False
+        task = asyncio.get_running_loop().create_task(self._flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self) -> None:
+        """Send all queued requests in one pipeline (one message per model batch)."""
+        outgoing, self._outgoing = self._outgoing, {}
+        if not outgoing:
+            return
+
+        pipe = self._redis.pipeline(transaction=False)
+        sent_ids: list[int] = []
+        sent_at = time.time()
+        for model_name, requests in outgoing.items():
+            schema = self._schemas[model_name]
+            key = self.config.request_key(model_name)
+            for lo in range(0, len(requests), self.config.max_batch_size):
+                chunk = requests[lo : lo + self.config.max_batch_size]
+                message = encode_message(
+                    {
+                        "c": self.reply_key,
+                        "m": model_name,
+                        "ids": [r[0] for r in chunk],
+                        "t": sent_at,
+                    },
+                    {
+                        "x": schema.to_matrix([r[1] for r in chunk]),
+                        "deadline": np.array([r[2] for r in chunk], dtype=np.float64),
+                    },
+                )
+                if self.config.mode == "stream":
+                    pipe.xadd(
+                        key, {"p": message}, maxlen=self.config.stream_maxlen, approximate=True
+                    )
+                else:
+                    pipe.lpush(key, message)
+                sent_ids.extend(r[0] for r in chunk)
+                self._stats["messages_sent"] += 1
+
+        try:
+            await pipe.execute()
+            self._stats["pipelines"] += 1
+        except Exception as e:
+            self._stats["send_errors"] += 1
+            logger.error(f"Failed to send inference requests: {e}")
+            for request_id in sent_ids:
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+
+    # =========================================================================
+    # Deadlines
+    # =========================================================================
+
+    def _arm_timer(self, loop: asyncio.AbstractEventLoop, deadline: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_at = deadline
+        self._timer = loop.call_at(
+            loop.time() + max(0.0, deadline - time.monotonic()), self._expire
+        )
+
+    def _expire(self) -> None:
+        """Fail pending futures whose deadline has passed; O(log n) per request."""
+        self._timer, self._timer_at = None, float("inf")
+        now = time.monotonic()
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, request_id = heapq.heappop(deadlines)
+            future = self._pending.pop(request_id, None)
+            if future is not None and not future.done():
+                future.set_exception(
+                    asyncio.TimeoutError(f"Inference request {request_id} timed out")
+                )
+                self._stats["expired"] += 1
+        # Drop index entries of requests that were already answered
+        while deadlines and deadlines[0][1] not in self._pending:
+            heapq.heappop(deadlines)
+        if deadlines:
+            self._arm_timer(asyncio.get_running_loop(), deadlines[0][0])
+
+    # =========================================================================
+    # Replies
+    # =========================================================================
+
+    async def _listen(self) -> None:
+        while self._running:
+            try:
+                item = await self._redis.brpop([self.reply_key], timeout=self.config.block_seconds)
+                if item is None:
+                    continue
+                messages = [item[1]]
+                more = await self._redis.rpop(self.reply_key, self.config.read_count)
+                if more:
+                    messages.extend(more)
+                for message in messages:
+                    self._resolve(message)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Inference reply listener error: {e}")
+                await asyncio.sleep(0.5)
+
+    def _resolve(self, message: bytes) -> None:
+        header, arrays = decode_message(message)
+        now = time.time()
+        model_name = header["m"]
+        predictions = arrays["prediction"].tolist()
+        probabilities = arrays["probability"].tolist()
+        confidences = arrays["confidence"].tolist()
+        for i, request_id in enumerate(header["ids"]):
+            future = self._pending.pop(request_id, None)
+            if future is None or future.done():
+                self._stats["late_replies"] += 1
+                continue
+            future.set_result(
+                PredictionResult(
+                    request_id=f"{model_name}_{self.client_id}_{request_id}",
+                    model_name=model_name,
+                    prediction=predictions[i],
+                    probability=probabilities[i],
+                    signal=header["signals"][i],
+                    confidence=confidences[i],
+                    latency_ms=(now - header["t"]) * 1000,
+                    timestamp=now,
+                )
+            )
+            self._stats["replies"] += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "pending": len(self._pending),
+            "deadline_index": len(self._deadlines),
+        }
+
+
+# =============================================================================
+# Worker
+# =============================================================================
+
+
+class InferenceWorker:
+    """Worker side: consumes request batches, scores them and pipelines replies."""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        engine: BatchInferenceEngine,
+        models: Sequence[str],
+        config: TransportConfig | None = None,
+        consumer_name: str | None = None,
+    ):
+        self._redis = redis_client
+        self.engine = engine
+        self.models = list(models)
+        self.config = config or TransportConfig()
+        self.consumer_name = consumer_name or f"worker-{uuid.uuid4().hex[:8]}"
+        self._keys = {self.config.request_key(name): name for name in self.models}
+        self._groups_ready = False
+        self._running = False
+        self._next_claim = 0.0
+        self._stats = {
+            "messages": 0,
+            "batches": 0,
+            "rows": 0,
+            "expired_rows": 0,
+            "errors": 0,
+            "claimed": 0,
+            "dead_lettered": 0,
+        }
+
+    async def run(self) -> None:
+        self._running = True
+        logger.info(f"Inference worker {self.consumer_name} serving {self.models}")
+        while self._running:
+            try:
+                await self.process_once()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error(f"Inference worker error: {e}")
+                await asyncio.sleep(0.5)
+
+    def stop(self) -> None:
+        self._running = False
+
+    async def _ensure_groups(self) -> None:
+        if self._groups_ready:
+            return
+        for key in self._keys:
+            try:
+                await self._redis.xgroup_create(
+                    key, self.config.consumer_group, id="0", mkstream=True
+                )
+            except Exception as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self._groups_ready = True
+
+    async def _read(self) -> list[tuple[str, Any, bytes]]:
+        """One read round trip: [(request key, stream entry id or None, message)]."""
+        if self.config.mode == "stream":
+            await self._ensure_groups()
+            if time.monotonic() >= self._next_claim:
+                self._next_claim = time.monotonic() + self.config.claim_interval_seconds
+                claimed = await self._claim_idle()
+                if claimed:
+                    return claimed
+            response = await self._redis.xreadgroup(
+                self.config.consumer_group,
+                self.consumer_name,
+                dict.fromkeys(self._keys, ">"),
+                count=self.config.read_count,
+                block=int(self.config.block_seconds * 1000),
+            )
+            return [
+                (_text(stream), entry_id, _payload(fields))
+                for stream, entries in response or []
+                for entry_id, fields in entries
+            ]
+
+        item = await self._redis.brpop(list(self._keys), timeout=self.config.block_seconds)
+        if item is None:
+            return []
+        key = _text(item[0])
+        batches = [(key, None, item[1])]
+        more = await self._redis.rpop(key, self.config.read_count)
+        batches.extend((key, None, message) for message in more or [])
+        return batches
+
+    async def _claim_idle(self) -> list[tuple[str, Any, bytes]]:
+        """
+        Take over entries left unacked by a crashed consumer or a failed model call.
+
+        Entries already delivered ``max_deliveries`` times are dead-lettered instead.
+        """
+        config = self.config
+        batches, dead = [], []
+        for key in self._keys:
+            response = await self._redis.xautoclaim(
+                key,
+                config.consumer_group,
+                self.consumer_name,
+                min_idle_time=config.claim_idle_ms,
+                start_id="0-0",
+                count=config.read_count,
+            )
+            # Entries trimmed from the stream come back without fields (Redis 6.2)
+            entries = [(entry_id, fields) for entry_id, fields in response[1] if fields]
+            if not entries:
+                continue
+            self._stats["claimed"] += len(entries)
+            pending = await self._redis.xpending_range(
+                key,
+                config.consumer_group,
+                min=entries[0][0],
+                max=entries[-1][0],
+                count=config.read_count,
+                consumername=self.consumer_name,
+            )
+            deliveries = {_text(p["message_id"]): p["times_delivered"] for p in pending}
+            for entry_id, fields in entries:
+                if deliveries.get(_text(entry_id), 0) > config.max_deliveries:
+                    dead.append((key, entry_id, _payload(fields)))
+                else:
+                    batches.append((key, entry_id, _payload(fields)))
+
+        if dead:
+            logger.error(f"Dead-lettering {len(dead)} inference requests after repeated failures")
+            pipe = self._redis.pipeline(transaction=False)
+            for key, entry_id, message in dead:
+                self._dead_letter(pipe, key, entry_id, message, "max deliveries exceeded")
+            await pipe.execute()
+        return batches
+
+    def _dead_letter(self, pipe: Any, key: str, entry_id: Any, message: bytes, error: str) -> None:
+        """Queue moving one stream entry to its model's dead-letter stream (and acking it)."""
+        pipe.xadd(
+            self.config.dead_letter_key(self._keys[key]),
+            {"p": message, "id": entry_id, "error": error},
+            maxlen=self.config.stream_maxlen,
+            approximate=True,
+        )
+        pipe.xack(key, self.config.consumer_group, entry_id)
+        self._stats["dead_lettered"] += 1
+
+    async def process_once(self) -> int:
+        """Read and answer one round of request messages; returns messages handled."""
+        batches = await self._read()
+        if not batches:
+            return 0
+
+        by_model: dict[str, list[int]] = {}
+        for i, (key, _, _) in enumerate(batches):
+            by_model.setdefault(self._keys[key], []).append(i)
+
+        pipe = self._redis.pipeline(transaction=False)
+        reply_keys = set()
+        acks: dict[str, list] = {}
+        for model_name, positions in by_model.items():
+            replies, status = self._score(model_name, [batches[i][2] for i in positions])
+            for reply_key, payload in replies:
+                pipe.lpush(reply_key, payload)
+                reply_keys.add(reply_key)
+            for i, outcome in zip(positions, status, strict=True):
+                key, entry_id, message = batches[i]
+                # Unanswered entries stay pending and are retried by the claim sweep
+                if entry_id is None or outcome == "failed":
+                    continue
+                if outcome == "malformed":
+                    self._dead_letter(pipe, key, entry_id, message, "malformed request")
+                else:
+                    acks.setdefault(key, []).append(entry_id)
+        for reply_key in reply_keys - {self.config.legacy_result_key}:
+            pipe.expire(reply_key, self.config.reply_ttl_seconds)
+        for key, ids in acks.items():
+            pipe.xack(key, self.config.consumer_group, *ids)
+        await pipe.execute()
+        return len(batches)
+
+    def _decode(self, model_name: str, message: bytes, now: float) -> tuple[dict, np.ndarray]:
+        """Decode a binary batch or a legacy JSON request into (header, live feature rows)."""
+        if message[:1] == b"{":
+            # Single request in the JSON format of MLInferenceService without a transport
+            request = json.loads(message)
+            X = self.engine.schema(model_name).to_matrix([request["features"]])
+            live = now - request.get("timestamp", now) < self.config.legacy_max_age_seconds
+            header = {"legacy": True, "ids": [request["request_id"]], "t": request.get("timestamp")}
+            self._stats["expired_rows"] += int(not live)
+            return header, X if live else X[:0]
+
+        header, arrays = decode_message(message)
+        live = arrays["deadline"] > now
+        if not live.all():
+            self._stats["expired_rows"] += int((~live).sum())
+            header["ids"] = [i for i, ok in zip(header["ids"], live.tolist(), strict=True) if ok]
+        return header, arrays["x"][live]
+
+    def _score(
+        self, model_name: str, messages: list[bytes]
+    ) -> tuple[list[tuple[str, bytes]], list[str]]:
+        """
+        Score all rows of ``messages`` with one model call.
+
+        Returns the replies to push and one outcome per message: "scored",
+        "expired" (no live rows), "malformed" or "failed" (model call raised).
+        """
+        now = time.time()
+        parts = []
+        status = []
+        for message in messages:
+            self._stats["messages"] += 1
+            try:
+                header, X = self._decode(model_name, message, now)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.error(f"Malformed inference request for {model_name}: {e}")
+                status.append("malformed")
+                continue
+            if len(X):
+                parts.append((header, X))
+                status.append("scored")
+            else:
+                status.append("expired")
+        if not parts:
+            return [], status
+
+        try:
+            scores = self.engine.predict_batch(model_name, np.concatenate([X for _, X in parts]))
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"Inference failed for {model_name}: {e}")
+            return [], ["failed" if outcome == "scored" else outcome for outcome in status]
+        self._stats["rows"] += len(scores)
+        self._stats["batches"] += 1
+
+        config = self.engine.config
+        signals = np.where(
+            scores > config.buy_threshold,
+            "buy",
+            np.where(scores < config.sell_threshold, "sell", "hold"),
+        ).tolist()
+        confidence = np.abs(scores - 0.5) * 2
+
+        replies, offset = [], 0
+        for header, X in parts:
+            lo, hi = offset, offset + len(X)
+            offset = hi
+            if header.get("legacy"):
+                sent_at = header["t"] or now
+                reply = {
+                    "request_id": header["ids"][0],
+                    "model_name": model_name,
+                    "prediction": float(scores[lo]),
+                    "probability": float(scores[lo]),
+                    "signal": signals[lo],
+                    "confidence": float(confidence[lo]),
+                    "latency_ms": (time.time() - sent_at) * 1000,
+                }
+                replies.append((self.config.legacy_result_key, json.dumps(reply).encode()))
+                continue
+            reply = encode_message(
+                {
+                    "m": model_name,
+                    "ids": header["ids"],
+                    "signals": signals[lo:hi],
+                    "t": header["t"],
+                },
+                {
+                    "prediction": scores[lo:hi],
+                    "probability": scores[lo:hi],
+                    "confidence": confidence[lo:hi],
+                },
+            )
+            replies.append((header["c"], reply))
+        return replies, status
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**self._stats, "consumer": self.consumer_name, "mode": self.config.mode}
+
+
+def _text(value: str | bytes) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _payload(fields: Mapping) -> bytes:
+    """Request message of a stream entry (field names are bytes unless decoded)."""
+    return fields[b"p"] if b"p" in fields else fields["p"]
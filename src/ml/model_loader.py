@@ -13,7 +13,8 @@ from typing import Any
 
 from src.config import config
 from src.ml.training.feature_engineering import FeatureEngineer
-from src.ml.training.model_registry import ModelRegistry
+from src.ml.training.model_compiler import load_compiled
+from src.ml.training.model_registry import ModelMetadata, ModelRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,41 @@ class ModelLoader:
         self.registry = ModelRegistry(registry_dir or str(config().paths.models_dir / "registry"))
         self.models_cache = {}
 
+    def load_production_model(
+        self, model_name: str, compiled: bool = True
+    ) -> tuple[Any | None, ModelMetadata | None]:
+        """
+        Load the current production model of ``model_name`` (uncached).
+
+        Args:
+            model_name: Registered model name
+            compiled: Prefer the compiled artifact (Treelite / ONNX / native) if one
+                was recorded; falls back to the pickle if it cannot be loaded
+
+        Returns:
+            (model, metadata), or (None, None) if there is no loadable production model
+        """
+        metadata = self.registry.get_production_model(model_name)
+        if not metadata:
+            return None, None
+        if compiled and metadata.compiled_path:
+            try:
+                model = load_compiled(
+                    metadata.compiled_path, metadata.compiled_backend, metadata.feature_names
+                )
+                return model, metadata
+            except Exception as e:
+                logger.warning(
+                    f"Compiled {metadata.compiled_backend} artifact of {model_name} "
+                    f"v{metadata.version} unusable, loading pickle: {e}"
+                )
+        try:
+            with open(metadata.model_path, "rb") as f:
+                return pickle.load(f), metadata
+        except Exception as e:
+            logger.error(f"Failed to load {model_name} v{metadata.version}: {e}")
+            return None, None
+
     def load_model_for_pair(
         self, pair: str
     ) -> tuple[Any | None, FeatureEngineer | None, list[str]]:
@@ -44,15 +80,15 @@ class ModelLoader:
             return self.models_cache[model_name]
 
         # Get production model metadata
-        metadata = self.registry.get_production_model(model_name)
-        if not metadata:
+        if not self.registry.get_production_model(model_name):
             logger.warning(f"No production model found for {pair}")
             return None, None, []
 
         try:
             # Load Model
-            with open(metadata.model_path, "rb") as f:
-                model = pickle.load(f)
+            model, metadata = self.load_production_model(model_name)
+            if model is None:
+                return None, None, []
 
             # Load Feature Engineer
             # Metadata path: user_data/models/BTC_USDT_20230101_120000.pkl
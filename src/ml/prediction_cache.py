@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Prediction Cache
+================
+
+Two-tier cache for model predictions.
+
+L1 (``PredictionCache``) is an in-process LRU + TTL map with O(1) get, set
+and eviction:
+- an ``OrderedDict`` keeps recency order; the least recently used entry is
+  evicted when the cache is full
+- expiry queues (one per distinct TTL, so each is ordered by expiry time)
+  let ``purge_expired`` drop only the expired entries instead of scanning
+  the whole cache; expired entries are also dropped lazily on ``get``
+
+L2 (``RedisPredictionTier``, optional) shares predictions between worker
+processes through Redis ``GET`` / ``SET PX``. Entries carry their wall-clock
+expiry, so a hit promoted to L1 keeps only the TTL it has left.
+
+Keys come from ``PredictionKeyBuilder``: features are read in a fixed order,
+quantized to a per-feature step (so jitter below the step maps to the same
+key; buckets saturate at the int64 range) and hashed with BLAKE2b, which is
+stable across processes unlike ``hash()``. The model version is part of the key, so a model swap never
+serves predictions of the previous model.
+
+Usage:
+    keys = PredictionKeyBuilder(feature_columns, step=1e-4)
+    cache = PredictionCache(max_size=10_000, default_ttl=60)
+    key = keys.build("trend_classifier", "v3", features)
+    result = cache.get(key)
+    if result is None:
+        result = ...
+        cache.set(key, result)
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+import hashlib
+import json
+import logging
+import math
+import struct
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+# Try to import metrics exporter
+try:
+    from src.monitoring.metrics_exporter import get_exporter
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Quantized value used for NaN / inf features (cannot collide with a finite bucket)
+_NON_FINITE = -(2**63)
+# Finite buckets saturate here so huge value/step ratios still pack as int64
+_MAX_BUCKET = 2**63 - 1
+
+
+class PredictionKeyBuilder:
+    """Builds process-stable cache keys from quantized features."""
+
+    def __init__(
+        self,
+        feature_names: Sequence[str] | None = None,
+        step: float = 1e-4,
+        steps: Mapping[str, float] | None = None,
+    ):
+        """
+        Args:
+            feature_names: Fixed feature order (default: sorted names of each row)
+            step: Quantization step applied to every feature
+            steps: Per-feature step overrides (e.g. coarser for volume features)
+        """
+        if step <= 0 or any(s <= 0 for s in (steps or {}).values()):
+            raise ValueError("Quantization steps must be positive")
+        self.feature_names = tuple(feature_names) if feature_names else None
+        self.step = step
+        self.steps = dict(steps or {})
+
+    def quantize(self, name: str, value: float) -> int:
+        if not math.isfinite(value):
+            return _NON_FINITE
+        scaled = value / self.steps.get(name, self.step) + 0.5
+        if abs(scaled) >= _MAX_BUCKET:  # Also catches value/step overflowing to inf
+            return _MAX_BUCKET if scaled > 0 else -_MAX_BUCKET
+        return math.floor(scaled)
+
+    def build(self, model_name: str, model_version: str, features: Mapping[str, float]) -> str:
+        names = self.feature_names or sorted(features)
+        buckets = [self.quantize(name, float(features.get(name, math.nan))) for name in names]
+        digest = hashlib.blake2b(struct.pack(f"<{len(buckets)}q", *buckets), digest_size=16)
+        if self.feature_names is None:
+            # Without a schema the names are part of the identity
+            digest.update("\0".join(names).encode())
+        return f"{model_name}:{model_version}:{digest.hexdigest()}"
+
+
+class PredictionCache:
+    """In-process LRU + TTL cache with O(1) operations."""
+
+    def __init__(self, max_size: int = 1000, default_ttl: float = 60.0, name: str = "l1"):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.name = name
+        # key -> (value, expires_at)
+        self._entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        # ttl -> deque of (expires_at, key) in insertion order (monotonic per ttl)
+        self._expiry: dict[float, deque[tuple[float, str]]] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._exported = dict.fromkeys(self._stats, 0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return default
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return default
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.monotonic()
+        expires_at = now + ttl
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+        else:
+            self._purge_some(now)
+            if len(entries) >= self.max_size:
+                entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        entries[key] = (value, expires_at)
+
+        queue = self._expiry.get(ttl)
+        if queue is None:
+            queue = self._expiry[ttl] = deque()
+        queue.append((expires_at, key))
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._expiry.clear()
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries; cost is proportional to the number expired."""
+        return self._purge_some(time.monotonic(), limit=None)
+
+    def _purge_some(self, now: float, limit: int | None = 2) -> int:
+        """Pop expired queue heads (at most ``limit`` per queue) and their live entries."""
+        purged = 0
+        entries = self._entries
+        for ttl, queue in list(self._expiry.items()):
+            popped = 0
+            while queue and queue[0][0] <= now and (limit is None or popped < limit):
+                expires_at, key = queue.popleft()
+                popped += 1
+                entry = entries.get(key)
+                # Skip queue records superseded by a later set() of the same key
+                if entry is not None and entry[1] == expires_at:
+                    del entries[key]
+                    self._stats["expirations"] += 1
+                    purged += 1
+            if not queue:
+                del self._expiry[ttl]
+            elif len(queue) > 2 * self.max_size:
+                self._compact(ttl, queue)
+        return purged
+
+    def _compact(self, ttl: float, queue: deque[tuple[float, str]]) -> None:
+        """Drop queue records for keys that were overwritten or evicted."""
+        entries = self._entries
+        self._expiry[ttl] = deque(
+            (expires_at, key)
+            for expires_at, key in queue
+            if (entry := entries.get(key)) is not None and entry[1] == expires_at
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+        }
+
+    def export_metrics(self) -> None:
+        """Push counter deltas since the last export to the metrics exporter."""
+        if not METRICS_AVAILABLE:
+            return
+        deltas = {key: value - self._exported[key] for key, value in self._stats.items()}
+        self._exported = dict(self._stats)
+        try:
+            get_exporter().record_prediction_cache(self.name, deltas, len(self._entries))
+        except Exception as e:
+            logger.warning(f"Failed to export prediction cache metrics: {e}")
+
+
+class RedisPredictionTier:
+    """
+    Optional shared second tier backed by Redis.
+
+    Values are JSON-serializable dicts; entries expire server-side after the TTL
+    and also store their wall-clock expiry (see ``get_with_ttl``).
+    The client must provide async ``get(key)`` and ``set(key, value, px=ms)``.
+    """
+
+    def __init__(self, redis_client: Any, prefix: str = "ml:prediction_cache:"):
+        self._redis = redis_client
+        self.prefix = prefix
+        self._stats = {"hits": 0, "misses": 0, "errors": 0}
+        self._exported = dict.fromkeys(self._stats, 0)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        entry = await self.get_with_ttl(key)
+        return None if entry is None else entry[0]
+
+    async def get_with_ttl(self, key: str) -> tuple[dict[str, Any], float] | None:
+        """Return ``(value, seconds until expiry)`` or None on a miss."""
+        try:
+            raw = await self._redis.get(self.prefix + key)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Prediction cache tier read failed: {e}")
+            return None
+        if raw is None:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        entry = json.loads(raw)
+        return entry["value"], max(entry["expires_at"] - time.time(), 0.0)
+
+    async def set(self, key: str, value: dict[str, Any], ttl: float) -> None:
+        entry = {"value": value, "expires_at": time.time() + ttl}
+        try:
+            await self._redis.set(self.prefix + key, json.dumps(entry), px=int(ttl * 1000))
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Prediction cache tier write failed: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        return dict(self._stats)
+
+    def export_metrics(self) -> None:
+        if not METRICS_AVAILABLE:
+            return
+        deltas = {key: value - self._exported[key] for key, value in self._stats.items()}
+        self._exported = dict(self._stats)
+        try:
+            get_exporter().record_prediction_cache("redis", deltas)
+        except Exception as e:
+            logger.warning(f"Failed to export prediction cache metrics: {e}")
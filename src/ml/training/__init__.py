@@ -24,6 +24,21 @@ def __getattr__(name):
 
         return locals()[name]
 
+    if name in ("FeatureCache", "FeatureCacheConfig"):
+        from src.ml.training.feature_cache import FeatureCache, FeatureCacheConfig
+
+        return locals()[name]
+
+    if name == "IncrementalFeatureEngineer":
+        from src.ml.training.incremental_features import IncrementalFeatureEngineer
+
+        return IncrementalFeatureEngineer
+
+    if name == "StudyDataset":
+        from src.ml.training.study_dataset import StudyDataset
+
+        return StudyDataset
+
     if name in ("ModelTrainer", "TrainingConfig"):
         from src.ml.training.model_trainer import (
             ModelTrainer,
@@ -84,15 +99,19 @@ __all__ = [
     "DynamicBarrierLabeler",
     "Experiment",
     "ExperimentTracker",
+    "FeatureCache",
+    "FeatureCacheConfig",
     "FeatureConfig",
     "FeatureEngineer",
     "FeatureSelectionConfig",
     "FeatureSelector",
+    "IncrementalFeatureEngineer",
     "ModelMetadata",
     "ModelRegistry",
     "ModelStatus",
     "ModelTrainer",
     "RecursiveFeatureEliminator",
+    "StudyDataset",
     "TrainingConfig",
     "TripleBarrierConfig",
     "TripleBarrierLabeler",
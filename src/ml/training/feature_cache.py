@@ -0,0 +1,299 @@
+"""
+Persistent Feature Cache
+========================
+
+Content-addressed on-disk cache for engineered features.
+
+Entries are keyed by the raw data hash (``src.data.loader.get_data_hash``) and
+a fingerprint of the feature configuration plus the feature code version, so
+identical inputs are reused across processes (WFO folds, nightly hyperopt,
+``MLTrainingPipeline``) while any change in data, config or code misses.
+
+Storage:
+- One uncompressed Arrow IPC file per entry, read back memory-mapped so
+  concurrent processes share the OS page cache
+- A small JSON sidecar per entry with the index range used for superset lookups
+  (opt-in: slicing is only correct for features that depend on the row alone,
+  not on rolling windows, lags or fills over the whole frame)
+- Size-bounded LRU eviction based on last access time
+
+Usage:
+    cache = FeatureCache(FeatureCacheConfig(cache_dir="user_data/cache/features"))
+    features = cache.get(df, fingerprint)
+    if features is None:
+        features = compute(df)
+        cache.put(df, fingerprint, features)
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.data.loader import get_data_hash
+
+logger = logging.getLogger(__name__)
+
+# Raw input columns that must agree before a cached superset is sliced
+_RAW_COLUMNS = ("open", "high", "low", "close", "volume")
+_FREQ_KEY = b"stoic_citadel.index_freq"
+
+
+@dataclass
+class FeatureCacheConfig:
+    """Configuration for the persistent feature cache."""
+
+    cache_dir: str | Path = "user_data/cache/features"
+    max_size_mb: float = 2048.0  # LRU eviction threshold for the whole directory
+    memory_map: bool = True  # Map entries instead of buffered reads (shared page cache)
+    # Serve a date range by slicing a cached superset. Only valid for row-local
+    # features; windowed features differ near the slice start, so keep it off for them
+    allow_superset: bool = False
+
+
+class FeatureCache:
+    """
+    Size-bounded, content-addressed Arrow cache for feature DataFrames.
+
+    Safe to share between processes: entries are written to a temp file and
+    atomically renamed, and readers only ever see complete files.
+    """
+
+    def __init__(self, config: FeatureCacheConfig | None = None):
+        self.config = config or FeatureCacheConfig()
+        self.cache_dir = Path(self.config.cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.superset_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(data_hash: str, fingerprint: str) -> str:
+        return f"{fingerprint}-{data_hash}"
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.arrow", self.cache_dir / f"{key}.json"
+
+    def get(
+        self,
+        data: pd.DataFrame,
+        fingerprint: str,
+        data_hash: str | None = None,
+        allow_superset: bool = True,
+    ) -> pd.DataFrame | None:
+        """
+        Look up cached features for ``data``.
+
+        Args:
+            data: Raw input DataFrame the features were computed from
+            fingerprint: Hash of feature config + code version
+            data_hash: Precomputed ``get_data_hash(data)`` (optional)
+            allow_superset: Also try slicing a cached entry covering a wider range
+                (still requires ``config.allow_superset``)
+
+        Returns:
+            Cached features or None on a miss
+        """
+        data_hash = data_hash or get_data_hash(data)
+        data_path, _ = self._paths(self.make_key(data_hash, fingerprint))
+
+        if data_path.exists():
+            features = self._read(data_path)
+            if features is not None:
+                self.hits += 1
+                logger.info(f"Feature cache hit ({len(features)} rows)")
+                return features
+
+        if allow_superset and self.config.allow_superset:
+            features = self._get_from_superset(data, fingerprint)
+            if features is not None:
+                self.superset_hits += 1
+                logger.info(f"Feature cache hit via superset slice ({len(features)} rows)")
+                return features
+
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        data: pd.DataFrame,
+        fingerprint: str,
+        features: pd.DataFrame,
+        data_hash: str | None = None,
+    ) -> Path:
+        """Store ``features`` computed from ``data`` and evict old entries if needed."""
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        data_hash = data_hash or get_data_hash(data)
+        key = self.make_key(data_hash, fingerprint)
+        data_path, meta_path = self._paths(key)
+
+        table = pa.Table.from_pandas(features, preserve_index=True)
+        freq = getattr(features.index, "freqstr", None)
+        if freq:
+            # Arrow's pandas metadata does not keep the index frequency
+            table = table.replace_schema_metadata({**table.schema.metadata, _FREQ_KEY: freq})
+        self._atomic_write(
+            data_path, lambda tmp: feather.write_feather(table, tmp, compression="uncompressed")
+        )
+
+        index = features.index
+        is_datetime = isinstance(index, pd.DatetimeIndex) and index.is_monotonic_increasing
+        meta = {
+            "key": key,
+            "fingerprint": fingerprint,
+            "data_hash": data_hash,
+            "rows": len(features),
+            "start": index[0].isoformat() if is_datetime and len(index) else None,
+            "end": index[-1].isoformat() if is_datetime and len(index) else None,
+            "created": time.time(),
+        }
+        self._atomic_write(meta_path, lambda tmp: Path(tmp).write_text(json.dumps(meta)))
+
+        logger.info(
+            f"Cached {len(features)} feature rows ({data_path.stat().st_size / 1e6:.1f} MB)"
+        )
+        self._evict()
+        return data_path
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        for path in self.cache_dir.glob("*.arrow"):
+            self._remove(path)
+
+    def stats(self) -> dict[str, Any]:
+        entries = list(self.cache_dir.glob("*.arrow"))
+        return {
+            "entries": len(entries),
+            "size_mb": sum(self._size(p) for p in entries) / 1e6,
+            "hits": self.hits,
+            "superset_hits": self.superset_hits,
+            "misses": self.misses,
+        }
+
+    def _read(self, path: Path) -> pd.DataFrame | None:
+        import pyarrow.feather as feather
+
+        try:
+            table = feather.read_table(path, memory_map=self.config.memory_map)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable feature cache entry {path.name}: {e}")
+            self._remove(path)
+            return None
+
+        # Touch for LRU ordering across processes
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        # Consolidated blocks: per-column blocks make every later column insert slow
+        features = table.to_pandas()
+
+        freq = (table.schema.metadata or {}).get(_FREQ_KEY)
+        if freq and isinstance(features.index, pd.DatetimeIndex):
+            features.index.freq = freq.decode()
+        return features
+
+    def _get_from_superset(self, data: pd.DataFrame, fingerprint: str) -> pd.DataFrame | None:
+        index = data.index
+        if (
+            not isinstance(index, pd.DatetimeIndex)
+            or index.empty
+            or not index.is_monotonic_increasing
+        ):
+            return None
+
+        start, end = index[0], index[-1]
+        for meta in self._entries(fingerprint):
+            if meta["start"] is None:
+                continue
+            entry_start, entry_end = pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+            if (entry_start.tz is None) != (start.tz is None):
+                continue
+            if entry_start > start or entry_end < end:
+                continue
+
+            data_path, _ = self._paths(meta["key"])
+            cached = self._read(data_path) if data_path.exists() else None
+            if cached is None:
+                continue
+
+            lo = cached.index.searchsorted(start, side="left")
+            hi = cached.index.searchsorted(end, side="right")
+            sliced = cached.iloc[lo:hi]
+            if self._same_raw_data(sliced, data):
+                return sliced
+        return None
+
+    @staticmethod
+    def _same_raw_data(cached: pd.DataFrame, data: pd.DataFrame) -> bool:
+        # Cleaning may drop leading rows of the superset, never rows in the middle
+        if cached.empty or not data.index[data.index >= cached.index[0]].equals(cached.index):
+            return False
+        columns = [c for c in _RAW_COLUMNS if c in data.columns and c in cached.columns]
+        if not columns:
+            return False
+        return np.array_equal(
+            cached[columns].to_numpy(dtype=float),
+            data[columns].iloc[len(data) - len(cached) :].to_numpy(dtype=float),
+            equal_nan=True,
+        )
+
+    def _entries(self, fingerprint: str) -> list[dict[str, Any]]:
+        entries = []
+        for meta_path in self.cache_dir.glob(f"{fingerprint}-*.json"):
+            try:
+                entries.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                continue
+        # Smallest covering superset first (cheapest to map and slice)
+        return sorted(entries, key=lambda m: m.get("rows", 0))
+
+    def _evict(self) -> None:
+        max_bytes = self.config.max_size_mb * 1e6
+        entries = []
+        for path in self.cache_dir.glob("*.arrow"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            logger.info(f"Evicted feature cache entry {path.name} ({size / 1e6:.1f} MB)")
+
+    def _atomic_write(self, path: Path, writer) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            writer(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
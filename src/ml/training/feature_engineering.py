@@ -5,20 +5,43 @@ Feature Engineering Pipeline
 Transform raw OHLCV data into ML-ready features.
 """
 
+import hashlib
+import inspect
+import json
 import logging
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
+from functools import cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import joblib
 import numpy as np
 import pandas as pd
 
 from src.config import config
+from src.data.loader import get_data_hash
+from src.utils.indicator_graph import IndicatorGraph
+
+if TYPE_CHECKING:
+    from src.ml.training.feature_cache import FeatureCache
 
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _code_version(cls: type) -> str:
+    """Hash of the source files defining ``cls`` and its bases (feature code version)."""
+    digest = hashlib.sha256()
+    for klass in cls.__mro__:
+        try:
+            source_file = inspect.getsourcefile(klass)
+        except TypeError:  # builtins such as object
+            continue
+        if source_file:
+            digest.update(Path(source_file).read_bytes())
+    return digest.hexdigest()[:16]
+
+
 @dataclass
 class FeatureConfig:
     """Configuration for feature engineering."""
@@ -174,12 +197,19 @@ class FeatureEngineer:
         engineer.save_scaler("models/scaler.joblib")
     """
 
-    def __init__(self, config_obj: FeatureConfig | None = None):
+    def __init__(
+        self,
+        config_obj: FeatureConfig | None = None,
+        feature_cache: "FeatureCache | None" = None,
+        indicator_graph: IndicatorGraph | None = None,
+    ):
         """
         Initialize feature engineer.
 
         Args:
             config_obj: Feature engineering configuration
+            feature_cache: Persistent feature cache (defaults to user_data/cache/features)
+            indicator_graph: Indicator graph shared with the strategy for the same pair
         """
         self.config = config_obj or FeatureConfig()
         self.feature_names: list[str] = []
@@ -188,7 +218,8 @@ class FeatureEngineer:
         self._scaled_feature_cols: list[str] = []
         self._fractional_differentiator = None
         self._stationarity_applied = False
-        self._feature_cache = {}
+        self._feature_cache = feature_cache
+        self.indicator_graph = indicator_graph if indicator_graph is not None else IndicatorGraph()
 
     def prepare_data(self, df: pd.DataFrame, use_cache: bool = True) -> pd.DataFrame:
         """
@@ -196,11 +227,16 @@ class FeatureEngineer:
         Does NOT remove correlated features or scale.
         Safe to call on full dataset if you split afterwards.
         """
-        if use_cache:
-            cache_key = hash(tuple(df.index))
-            if cache_key in self._feature_cache:
+        feature_cache = self._get_feature_cache() if use_cache else None
+        if feature_cache is not None:
+            data_hash = get_data_hash(df)
+            fingerprint = self.cache_fingerprint()
+            # Exact range only: rolling windows, lags and ffill/bfill run over the
+            # whole frame, so a slice of a wider cached range is not a fresh result
+            cached = feature_cache.get(df, fingerprint, data_hash=data_hash, allow_superset=False)
+            if cached is not None:
                 logger.info("Using cached features")
-                return self._feature_cache[cache_key]
+                return cached
 
         logger.info(f"Preparing features from {len(df)} rows")
 
@@ -213,11 +249,33 @@ class FeatureEngineer:
         # AGGRESSIVE CLEANING: Replace inf with NaN and drop all NaN rows
         result = self._apply_aggressive_cleaning(result)
 
-        if use_cache:
-            self._feature_cache[cache_key] = result
+        if feature_cache is not None:
+            try:
+                feature_cache.put(df, fingerprint, result, data_hash=data_hash)
+            except Exception as e:
+                logger.warning(f"Failed to write feature cache: {e}")
 
         return result
 
+    def cache_fingerprint(self) -> str:
+        """Hash of the feature config and feature code version (cache key component)."""
+        payload = json.dumps(asdict(self.config), sort_keys=True, default=str)
+        payload += _code_version(type(self)) + _code_version(IndicatorGraph)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def _get_feature_cache(self) -> "FeatureCache | None":
+        """Persistent feature cache, created on first use."""
+        if self._feature_cache is None:
+            from src.ml.training.feature_cache import FeatureCache, FeatureCacheConfig
+
+            try:
+                cache_dir = config().paths.user_data_dir / "cache" / "features"
+                self._feature_cache = FeatureCache(FeatureCacheConfig(cache_dir=cache_dir))
+            except Exception as e:
+                logger.warning(f"Feature cache unavailable, computing without it: {e}")
+                self._feature_cache = False
+        return self._feature_cache or None
+
     def fit_scaler_and_selector(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Fit scaler and feature selector on TRAINING data.
@@ -742,12 +800,13 @@ class FeatureEngineer:
             df[f"price_momentum_{period}"] = df["close"] / df["close"].shift(period) - 1
 
         # Rolling statistics
+        view = self.indicator_graph.bind(df)
         for window in [5, 10, 20]:
-            df[f"close_rolling_mean_{window}"] = df["close"].rolling(window).mean()
-            df[f"close_rolling_std_{window}"] = df["close"].rolling(window).std()
-            df[f"close_rolling_min_{window}"] = df["close"].rolling(window).min()
-            df[f"close_rolling_max_{window}"] = df["close"].rolling(window).max()
-            df[f"volume_rolling_mean_{window}"] = df["volume"].rolling(window).mean()
+            df[f"close_rolling_mean_{window}"] = view.get("sma", period=window)
+            df[f"close_rolling_std_{window}"] = view.get("rolling_std", period=window)
+            df[f"close_rolling_min_{window}"] = view.get("rolling_min", period=window)
+            df[f"close_rolling_max_{window}"] = view.get("rolling_max", period=window)
+            df[f"volume_rolling_mean_{window}"] = view.get("sma", period=window, source="volume")
 
         # Price vs rolling statistics
         for window in [5, 10, 20]:
@@ -762,9 +821,10 @@ class FeatureEngineer:
             ) / df[f"close_rolling_max_{window}"]
 
         # Volatility features
-        df["returns_volatility_5"] = df["returns"].rolling(5).std()
-        df["returns_volatility_10"] = df["returns"].rolling(10).std()
-        df["returns_volatility_20"] = df["returns"].rolling(20).std()
+        for window in [5, 10, 20]:
+            df[f"returns_volatility_{window}"] = view.get(
+                "rolling_std", period=window, source="returns"
+            )
 
         return df
 
@@ -774,7 +834,8 @@ class FeatureEngineer:
         df["volume_change"] = df["volume"].pct_change(fill_method=None)
 
         # Volume moving averages
-        df["volume_sma"] = df["volume"].rolling(self.config.short_period).mean()
+        view = self.indicator_graph.bind(df)
+        df["volume_sma"] = view.get("sma", period=self.config.short_period, source="volume")
         df["volume_ratio"] = df["volume"] / (df["volume_sma"] + 1e-10)
 
         # Volume-price features
@@ -800,64 +861,60 @@ class FeatureEngineer:
 
     def _add_momentum_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add momentum indicators."""
+        view = self.indicator_graph.bind(df)
+
         # RSI
-        delta = df["close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(self.config.short_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(self.config.short_period).mean()
-        rs = gain / (loss + 1e-10)
-        df["rsi"] = 100 - (100 / (1 + rs))
+        df["rsi"] = view.get("rsi", period=self.config.short_period, eps=1e-10)
 
         # MACD
-        ema_short = df["close"].ewm(span=12, adjust=False).mean()
-        ema_long = df["close"].ewm(span=26, adjust=False).mean()
-        df["macd"] = ema_short - ema_long
-        df["macd_signal"] = df["macd"].ewm(span=9, adjust=False).mean()
-        df["macd_hist"] = df["macd"] - df["macd_signal"]
+        macd = view.get("macd", fast=12, slow=26, signal=9)
+        df["macd"] = macd["macd"]
+        df["macd_signal"] = macd["signal"]
+        df["macd_hist"] = macd["histogram"]
 
         # Stochastic
-        low_min = df["low"].rolling(self.config.short_period).min()
-        high_max = df["high"].rolling(self.config.short_period).max()
-        df["stoch_k"] = 100 * (df["close"] - low_min) / (high_max - low_min + 1e-10)
-        df["stoch_d"] = df["stoch_k"].rolling(3).mean()
+        stoch = view.get("stochastic", period=self.config.short_period, smooth=3, eps=1e-10)
+        df["stoch_k"] = stoch["k"]
+        df["stoch_d"] = stoch["d"]
 
         return df
 
     def _add_volatility_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add volatility indicators."""
+        view = self.indicator_graph.bind(df)
+
         # ATR
-        high_low = df["high"] - df["low"]
-        high_close = np.abs(df["high"] - df["close"].shift())
-        low_close = np.abs(df["low"] - df["close"].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-        df["atr"] = true_range.rolling(self.config.short_period).mean()
+        df["atr"] = view.get("atr", period=self.config.short_period)
         df["atr_percent"] = df["atr"] / df["close"]
 
         # Bollinger Bands
-        sma = df["close"].rolling(self.config.medium_period).mean()
-        std = df["close"].rolling(self.config.medium_period).std()
-        df["bb_upper"] = sma + (2 * std)
-        df["bb_lower"] = sma - (2 * std)
-        df["bb_width"] = (df["bb_upper"] - df["bb_lower"]) / sma
+        bb = view.get("bollinger", period=self.config.medium_period, num_std=2.0)
+        df["bb_upper"] = bb["upper"]
+        df["bb_lower"] = bb["lower"]
+        df["bb_width"] = bb["width"]
         df["bb_position"] = (df["close"] - df["bb_lower"]) / (
             df["bb_upper"] - df["bb_lower"] + 1e-10
         )
 
         # Historical volatility
-        df["volatility"] = df["returns"].rolling(self.config.medium_period).std()
+        df["volatility"] = view.get(
+            "rolling_std", period=self.config.medium_period, source="returns"
+        )
 
         return df
 
     def _add_trend_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add trend indicators."""
+        view = self.indicator_graph.bind(df)
+
         # Moving averages
-        df["sma_short"] = df["close"].rolling(self.config.short_period).mean()
-        df["sma_medium"] = df["close"].rolling(self.config.medium_period).mean()
-        df["sma_long"] = df["close"].rolling(self.config.long_period).mean()
+        df["sma_short"] = view.get("sma", period=self.config.short_period)
+        df["sma_medium"] = view.get("sma", period=self.config.medium_period)
+        df["sma_long"] = view.get("sma", period=self.config.long_period)
 
         # EMA
-        df["ema_short"] = df["close"].ewm(span=self.config.short_period, adjust=False).mean()
-        df["ema_medium"] = df["close"].ewm(span=self.config.medium_period, adjust=False).mean()
+        df["ema_short"] = view.get("ema", period=self.config.short_period)
+        df["ema_medium"] = view.get("ema", period=self.config.medium_period)
 
         # Price vs MA
         df["price_vs_sma_short"] = (df["close"] - df["sma_short"]) / df["sma_short"]
@@ -868,23 +925,7 @@ class FeatureEngineer:
         df["ma_cross_medium_long"] = (df["sma_medium"] > df["sma_long"]).astype(int)
 
         # ADX (trend strength)
-        high_diff = df["high"].diff()
-        low_diff = -df["low"].diff()
-        plus_dm = high_diff.where((high_diff > low_diff) & (high_diff > 0), 0)
-        minus_dm = low_diff.where((low_diff > high_diff) & (low_diff > 0), 0)
-
-        # Calculate true range for ADX
-        high_low = df["high"] - df["low"]
-        high_close = np.abs(df["high"] - df["close"].shift())
-        low_close = np.abs(df["low"] - df["close"].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-
-        atr = true_range.rolling(self.config.short_period).mean()
-        plus_di = 100 * (plus_dm.rolling(self.config.short_period).mean() / (atr + 1e-10))
-        minus_di = 100 * (minus_dm.rolling(self.config.short_period).mean() / (atr + 1e-10))
-        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10)
-        df["adx"] = dx.rolling(self.config.short_period).mean()
+        df["adx"] = view.get("adx", period=self.config.short_period)
 
         return df
 
@@ -11,12 +11,27 @@ Based on roadmap requirements:
 - Use Optuna for efficient Bayesian optimization
 - Include ensemble of simple models (XGBoost, Random Forest, Logistic Regression)
 
+Fold index arrays and the NumPy feature/label arrays are built once per study;
+every fold of every trial trains a fresh model on views of them and reports its
+running score, so the median pruner can stop weak trials after the first folds.
+With a storage (RDB URL or journal file) several worker processes share one
+study, and an interrupted nightly run resumes where it stopped:
+
+    config = HyperparameterOptimizerConfig(
+        n_workers=4, storage="user_data/hyperopt/xgboost.journal"
+    )
+    results = HyperparameterOptimizer(config).optimize(X, y, "xgboost")
+
 Author: Stoic Citadel Team
 Date: December 23, 2025
 """
 
 import logging
-from dataclasses import dataclass
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
 
@@ -24,7 +39,9 @@ import numpy as np
 import optuna
 import pandas as pd
 import xgboost as xgb
-from optuna.trial import Trial
+from optuna.storages import JournalStorage
+from optuna.storages.journal import JournalFileBackend
+from optuna.trial import Trial, TrialState
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, f1_score, precision_score
@@ -75,11 +92,91 @@ class HyperparameterOptimizerConfig:
     early_stopping_rounds: int = 10
     early_stopping_patience: int = 3
 
+    # Pruning (MedianPruner over per-fold running scores)
+    pruner_startup_trials: int = 5  # Complete trials before pruning starts
+    pruner_warmup_folds: int = 1  # Folds a trial always runs before it can be pruned
+
+    # Parallel / resumable search
+    n_workers: int = 1  # Worker processes sharing one study
+    storage: str | None = None  # RDB URL ("sqlite:///...") or journal file path
+    study_name: str | None = None  # Defaults to "{model_type}_optimization"
+    model_n_jobs: int = -1  # Threads per model fit (1 inside worker processes)
+    sampler_seed: int | None = None  # TPE seed (worker i uses seed + i); None = random
+
     # Output
     save_best_model: bool = True
     output_dir: str = "user_data/models"
 
 
+@dataclass
+class StudyData:
+    """Feature/label arrays and fold slices shared by every trial of a study."""
+
+    X: np.ndarray
+    y: np.ndarray
+    folds: list[tuple[slice, slice]]
+
+    def save(self, directory: str) -> None:
+        """Write the arrays as .npy files for worker processes to memory-map."""
+        path = Path(directory)
+        np.save(path / "X.npy", self.X)
+        np.save(path / "y.npy", self.y)
+        bounds = [(t.start, t.stop, v.start, v.stop) for t, v in self.folds]
+        np.save(path / "folds.npy", np.asarray(bounds, dtype=np.int64).reshape(-1, 4))
+
+    @classmethod
+    def load(cls, directory: str) -> "StudyData":
+        """Attach to arrays written by ``save`` without copying them."""
+        path = Path(directory)
+        bounds = np.load(path / "folds.npy")
+        return cls(
+            X=np.load(path / "X.npy", mmap_mode="r"),
+            y=np.load(path / "y.npy", mmap_mode="r"),
+            folds=[(slice(int(a), int(b)), slice(int(c), int(d))) for a, b, c, d in bounds],
+        )
+
+
+def _create_storage(storage: str | None):
+    """RDB storage for URLs, journal file storage for plain paths, None for in-memory."""
+    if storage is None:
+        return None
+    if "://" in storage:
+        if storage.startswith("sqlite:///"):
+            Path(storage[len("sqlite:///") :]).parent.mkdir(parents=True, exist_ok=True)
+        return storage
+    Path(storage).parent.mkdir(parents=True, exist_ok=True)
+    return JournalStorage(JournalFileBackend(storage))
+
+
+def _run_study_worker(
+    config: HyperparameterOptimizerConfig,
+    study_name: str,
+    model_type: str,
+    data_dir: str,
+    n_trials: int,
+    verbosity: int,
+    worker_index: int = 0,
+) -> int:
+    """Worker process entry point: run trials of a shared study, return how many ran."""
+    optuna.logging.set_verbosity(verbosity)
+    # One process per core already; threaded model fits would only oversubscribe
+    config = replace(config, n_jobs=1, model_n_jobs=1, n_workers=1)
+    optimizer = HyperparameterOptimizer(config)
+    data = StudyData.load(data_dir)
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=_create_storage(config.storage),
+        sampler=optimizer._create_sampler(worker_index),
+        pruner=optimizer._create_pruner(),
+    )
+    study.optimize(
+        lambda trial: optimizer._objective_function(trial, data, model_type),
+        n_trials=n_trials,
+        timeout=config.timeout,
+    )
+    return len(optimizer.trial_results)
+
+
 class HyperparameterOptimizer:
     """
     Advanced hyperparameter optimization for trading ML models.
@@ -121,26 +218,58 @@ class HyperparameterOptimizer:
         logger.info(f"Starting hyperparameter optimization for {model_type}")
         logger.info(f"Data shape: {X.shape}, target distribution: {y.value_counts().to_dict()}")
 
-        # Create study
-        study_name = f"{model_type}_optimization"
+        study_name = self.config.study_name or f"{model_type}_optimization"
+        n_workers = max(1, self.config.n_workers)
+        storage = self.config.storage
+        if n_workers > 1 and storage is None:
+            storage = str(Path(self.config.output_dir) / f"{study_name}.journal")
+            logger.info(f"No storage configured, sharing the study through {storage}")
+
+        # Create (or resume) study
         self.study = optuna.create_study(
             direction="maximize",
             study_name=study_name,
-            pruner=optuna.pruners.MedianPruner(n_warmup_steps=5),
+            storage=_create_storage(storage),
+            sampler=self._create_sampler(),
+            pruner=self._create_pruner(),
+            load_if_exists=storage is not None,
         )
+        n_previous = len(self.study.trials)
+        if n_previous:
+            logger.info(f"Resuming study {study_name} with {n_previous} existing trials")
 
-        # Define objective function
-        def objective(trial: Trial) -> float:
-            return self._objective_function(trial, X, y, model_type)
+        # Fold slices and arrays are shared by every trial
+        data = self.prepare_study_data(X, y)
 
         # Run optimization
-        logger.info(f"Running {self.config.n_trials} trials...")
-        self.study.optimize(
-            objective,
-            n_trials=self.config.n_trials,
-            timeout=self.config.timeout,
-            n_jobs=self.config.n_jobs,
-            show_progress_bar=True,
+        logger.info(f"Running {self.config.n_trials} trials on {n_workers} worker(s)...")
+        start = time.perf_counter()
+        if n_workers == 1:
+            self.study.optimize(
+                lambda trial: self._objective_function(trial, data, model_type),
+                n_trials=self.config.n_trials,
+                timeout=self.config.timeout,
+                n_jobs=self.config.n_jobs,
+                show_progress_bar=True,
+            )
+        else:
+            self._optimize_parallel(
+                data, model_type, replace(self.config, storage=storage), study_name, n_workers
+            )
+            # Completed trials only, like the ones the objective records in serial mode
+            self.trial_results = [
+                self._trial_result(trial, model_type)
+                for trial in self.study.get_trials(deepcopy=False)[n_previous:]
+                if trial.state == TrialState.COMPLETE
+            ]
+        wall_time = time.perf_counter() - start
+
+        trials = self.study.get_trials(deepcopy=False)[n_previous:]
+        n_complete = sum(trial.state == TrialState.COMPLETE for trial in trials)
+        n_pruned = sum(trial.state == TrialState.PRUNED for trial in trials)
+        logger.info(
+            f"{n_complete} trials completed, {n_pruned} pruned in {wall_time:.1f}s "
+            f"({len(trials) / wall_time if wall_time > 0 else 0:.2f} trials/s)"
         )
 
         # Get best results
@@ -164,44 +293,118 @@ class HyperparameterOptimizer:
             "best_model": self.best_model,
             "study": self.study,
             "trial_results": self.trial_results,
+            "n_complete": n_complete,
+            "n_pruned": n_pruned,
+            "n_workers": n_workers,
+            "wall_time": wall_time,
+        }
+
+    def prepare_study_data(self, X: pd.DataFrame, y: pd.Series) -> StudyData:
+        """
+        Build the arrays and time-series fold slices once for a whole study.
+
+        TimeSeriesSplit folds are contiguous, so they are stored as slices and
+        every trial trains on NumPy views instead of re-slicing ``X.iloc``.
+        """
+        tscv = TimeSeriesSplit(
+            n_splits=self.config.n_splits, test_size=int(len(X) * self.config.test_size)
+        )
+        folds = [
+            (slice(train_idx[0], train_idx[-1] + 1), slice(val_idx[0], val_idx[-1] + 1))
+            for train_idx, val_idx in tscv.split(X)
+        ]
+        return StudyData(
+            X=np.ascontiguousarray(X.to_numpy(dtype=np.float64)),
+            y=np.ascontiguousarray(y.to_numpy()),
+            folds=folds,
+        )
+
+    def _create_sampler(self, worker_index: int = 0) -> optuna.samplers.BaseSampler:
+        """TPE sampler; each worker gets its own seed so they do not repeat suggestions."""
+        seed = self.config.sampler_seed
+        return optuna.samplers.TPESampler(seed=None if seed is None else seed + worker_index)
+
+    def _create_pruner(self) -> optuna.pruners.BasePruner:
+        """Median pruner over the running mean of fold scores."""
+        return optuna.pruners.MedianPruner(
+            n_startup_trials=self.config.pruner_startup_trials,
+            n_warmup_steps=self.config.pruner_warmup_folds,
+        )
+
+    def _optimize_parallel(
+        self,
+        data: StudyData,
+        model_type: str,
+        config: HyperparameterOptimizerConfig,
+        study_name: str,
+        n_workers: int,
+    ) -> None:
+        """Split the trial budget over worker processes attached to the shared study."""
+        budget = [
+            self.config.n_trials // n_workers + (i < self.config.n_trials % n_workers)
+            for i in range(n_workers)
+        ]
+        with tempfile.TemporaryDirectory(prefix="hyperopt_") as data_dir:
+            data.save(data_dir)
+            # Spawn, not fork: forking a parent with live BLAS/OpenMP threads can deadlock
+            context = multiprocessing.get_context("spawn")
+            verbosity = optuna.logging.get_verbosity()
+            with ProcessPoolExecutor(n_workers, mp_context=context) as pool:
+                futures = [
+                    pool.submit(
+                        _run_study_worker,
+                        config,
+                        study_name,
+                        model_type,
+                        data_dir,
+                        n,
+                        verbosity,
+                        worker_index,
+                    )
+                    for worker_index, n in enumerate(budget)
+                    if n > 0
+                ]
+                for future in futures:
+                    future.result()
+
+    @staticmethod
+    def _trial_result(trial: optuna.trial.FrozenTrial, model_type: str) -> dict[str, Any]:
+        """Trial summary in the same shape as the ones recorded by the objective."""
+        return {
+            "trial_number": trial.number,
+            "params": trial.params,
+            "score": trial.value,
+            "fold_scores": trial.user_attrs.get("fold_scores", []),
+            "model_type": model_type,
         }
 
-    def _objective_function(
-        self, trial: Trial, X: pd.DataFrame, y: pd.Series, model_type: str
-    ) -> float:
+    def _objective_function(self, trial: Trial, data: StudyData, model_type: str) -> float:
         """
         Objective function for Optuna optimization.
 
         Args:
             trial: Optuna trial
-            X: Features
-            y: Labels
+            data: Arrays and fold slices from ``prepare_study_data``
             model_type: Type of model
 
         Returns:
             Validation score (precision, f1, or accuracy)
+
+        Raises:
+            optuna.TrialPruned: If the running fold score falls below the median
         """
-        # Create model with trial parameters
         params = self._suggest_parameters(trial, model_type)
-        model = self._create_model(params, model_type)
-
-        # Time series cross-validation
-        tscv = TimeSeriesSplit(
-            n_splits=self.config.n_splits, test_size=int(len(X) * self.config.test_size)
-        )
 
         scores = []
 
-        for fold, (train_idx, val_idx) in enumerate(tscv.split(X)):
-            # Split data
-            X_train, X_val = X.iloc[train_idx], X.iloc[val_idx]
-            y_train, y_val = y.iloc[train_idx], y.iloc[val_idx]
-
-            # Train model
-            model.fit(X_train, y_train)
+        for fold, (train, val) in enumerate(data.folds):
+            # Fresh model per fold so nothing fitted on one fold leaks into the next
+            model = self._create_model(params, model_type)
+            model.fit(data.X[train], data.y[train])
 
             # Predict
-            y_pred = model.predict(X_val)
+            y_val = data.y[val]
+            y_pred = model.predict(data.X[val])
 
             # Calculate score based on optimization target
             if self.config.optimize_for == "precision":
@@ -212,6 +415,12 @@ class HyperparameterOptimizer:
                 score = accuracy_score(y_val, y_pred)
 
             scores.append(score)
+            trial.set_user_attr("fold_scores", scores)
+
+            # Report running mean so the pruner can compare trials fold by fold
+            trial.report(float(np.mean(scores)), fold)
+            if trial.should_prune():
+                raise optuna.TrialPruned(f"Pruned after fold {fold}")
 
             # Early stopping check
             if len(scores) >= 2 and scores[-1] < scores[-2] * 0.95:
@@ -277,7 +486,7 @@ class HyperparameterOptimizer:
                 "reg_alpha": trial.suggest_float("reg_alpha", *self.config.xgb_reg_alpha_range),
                 "reg_lambda": trial.suggest_float("reg_lambda", *self.config.xgb_reg_lambda_range),
                 "random_state": 42,
-                "n_jobs": -1,
+                "n_jobs": self.config.model_n_jobs,
                 "verbosity": 0,
                 "use_label_encoder": False,
                 "eval_metric": "logloss",
@@ -297,7 +506,7 @@ class HyperparameterOptimizer:
                     "min_samples_leaf", *self.config.rf_min_samples_leaf_range
                 ),
                 "random_state": 42,
-                "n_jobs": -1,
+                "n_jobs": self.config.model_n_jobs,
                 "class_weight": "balanced",
             }
 
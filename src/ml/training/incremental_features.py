@@ -0,0 +1,799 @@
+"""
+Incremental Feature Engineering
+===============================
+
+Streaming counterpart of ``FeatureEngineer._engineer_features`` for live trading.
+
+The batch pipeline recomputes every rolling window, EMA and quantile over the
+full history whenever a candle arrives. ``IncrementalFeatureEngineer`` keeps
+O(window) ring-buffer state per pair instead and only emits the feature row of
+the newly appended candle.
+
+Once ``warmup_period`` candles have been seen, every emitted row matches the
+batch output column by column. Before that, columns whose windows are not yet
+full are NaN: the batch pipeline backfills them from future rows, which a
+causal stream cannot do.
+
+Usage:
+    engine = IncrementalFeatureEngineer(FeatureConfig())
+    engine.warmup("BTC/USDT", history_df)
+    row = engine.update("BTC/USDT", candle, timestamp)  # dict of feature values
+
+    state = engine.checkpoint()
+    engine.restore(state)
+
+    blob = engine.export_state("BTC/USDT")  # JSON bytes, e.g. for Redis
+    engine.import_state("BTC/USDT", blob)
+"""
+
+import copy
+import json
+import logging
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.ml.training.feature_engineering import FeatureConfig
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+_NAN = float("nan")
+_INF = float("inf")
+
+
+def _div(a: float, b: float) -> float:
+    """Float division with NumPy semantics (x/0 -> +-inf, 0/0 -> nan)."""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a != a or a == 0:
+            return _NAN
+        return _INF if (a > 0) == (math.copysign(1.0, b) > 0) else -_INF
+
+
+def _lag(values: deque, k: int) -> float:
+    """Value ``k`` steps back (``Series.shift(k)``), NaN if not available yet."""
+    return values[-1 - k] if len(values) > k else _NAN
+
+
+def _nanmax(*values: float) -> float:
+    """``max(axis=1)`` over a row: NaNs are skipped, all-NaN gives NaN."""
+    finite = [v for v in values if v == v]
+    return max(finite) if finite else _NAN
+
+
+def _hours_between(now: Any, then: Any) -> float:
+    """Hours between two index values (mirrors ``get_hours`` in the batch pipeline)."""
+    delta = now - then
+    if hasattr(delta, "total_seconds"):
+        return delta.total_seconds() / 3600.0
+    try:
+        val = float(delta)
+    except (ValueError, TypeError):
+        return 24.0
+    if val > 1e12:  # nanoseconds
+        return val / 1e9 / 3600.0
+    if val > 1e9:  # milliseconds
+        return val / 1000.0 / 3600.0
+    return val / 3600.0
+
+
+class _RollingWindow:
+    """
+    Fixed-size window with O(1) amortized sum / mean / std.
+
+    Mirrors ``Series.rolling(window)`` with the default ``min_periods=window``:
+    the result is NaN until the window is full and while it holds a NaN.
+    Running sums are taken around a shift and rebuilt every ``window`` pushes
+    to keep floating-point drift bounded.
+    """
+
+    __slots__ = ("nonfinite", "shift", "since_rebuild", "sum", "sumsq", "values", "window")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque(maxlen=window)
+        self.shift = 0.0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.nonfinite = 0
+        self.since_rebuild = 0
+
+    def push(self, x: float) -> "_RollingWindow":
+        values = self.values
+        if len(values) == self.window:
+            old = values[0]
+            if math.isfinite(old):
+                d = old - self.shift
+                self.sum -= d
+                self.sumsq -= d * d
+            else:
+                self.nonfinite -= 1
+        values.append(x)
+        if math.isfinite(x):
+            d = x - self.shift
+            self.sum += d
+            self.sumsq += d * d
+        else:
+            self.nonfinite += 1
+
+        self.since_rebuild += 1
+        if self.since_rebuild >= self.window:
+            self._rebuild()
+        return self
+
+    def _rebuild(self) -> None:
+        finite = [v for v in self.values if math.isfinite(v)]
+        self.shift = math.fsum(finite) / len(finite) if finite else 0.0
+        deviations = [v - self.shift for v in finite]
+        self.sum = math.fsum(deviations)
+        self.sumsq = math.fsum(d * d for d in deviations)
+        self.since_rebuild = 0
+
+    def _fallback(self, func) -> float:
+        with np.errstate(all="ignore"):
+            return float(func(np.fromiter(self.values, dtype=float)))
+
+    def total(self) -> float:
+        if len(self.values) < self.window:
+            return _NAN
+        if self.nonfinite:
+            return self._fallback(np.sum)
+        return self.shift * self.window + self.sum
+
+    def mean(self) -> float:
+        if len(self.values) < self.window:
+            return _NAN
+        if self.nonfinite:
+            return self._fallback(np.mean)
+        return self.shift + self.sum / self.window
+
+    def std(self) -> float:
+        n = self.window
+        if len(self.values) < n or n < 2:
+            return _NAN
+        if self.nonfinite:
+            return self._fallback(lambda a: np.std(a, ddof=1))
+        var = (self.sumsq - self.sum * self.sum / n) / (n - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+
+class _RollingExtreme:
+    """Rolling min or max via a monotonic deque (O(1) amortized per push)."""
+
+    __slots__ = ("candidates", "count", "is_max", "last_nan", "window")
+
+    def __init__(self, window: int, is_max: bool):
+        self.window = window
+        self.is_max = is_max
+        self.count = 0
+        self.candidates: deque = deque()
+        self.last_nan = -1
+
+    def push(self, x: float) -> float:
+        t = self.count
+        self.count += 1
+        candidates = self.candidates
+        if x != x:
+            self.last_nan = t
+        elif self.is_max:
+            while candidates and candidates[-1][1] <= x:
+                candidates.pop()
+            candidates.append((t, x))
+        else:
+            while candidates and candidates[-1][1] >= x:
+                candidates.pop()
+            candidates.append((t, x))
+        while candidates and candidates[0][0] <= t - self.window:
+            candidates.popleft()
+
+        if self.count < self.window or self.last_nan > t - self.window:
+            return _NAN
+        return candidates[0][1]
+
+
+class _RollingQuantile:
+    """Rolling quantile with linear interpolation (same formula as pandas)."""
+
+    __slots__ = ("ordered", "values", "window")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque(maxlen=window)
+        self.ordered: list[float] = []
+
+    def push(self, x: float) -> "_RollingQuantile":
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if old == old:
+                del self.ordered[bisect_left(self.ordered, old)]
+        self.values.append(x)
+        if x == x:
+            insort(self.ordered, x)
+        return self
+
+    def quantile(self, q: float) -> float:
+        nobs = len(self.ordered)
+        if nobs < self.window:
+            return _NAN
+        idx_with_fraction = q * (nobs - 1)
+        idx = int(idx_with_fraction)
+        vlow = self.ordered[idx]
+        if idx_with_fraction == idx:
+            return vlow
+        vhigh = self.ordered[idx + 1]
+        return vlow + (vhigh - vlow) * (idx_with_fraction - idx)
+
+
+class _Ewm:
+    """``Series.ewm(span, adjust=False).mean()`` one observation at a time."""
+
+    __slots__ = ("new_wt", "old_wt", "old_wt_factor", "weighted")
+
+    def __init__(self, span: int):
+        # Same alpha derivation as pandas (span -> center of mass -> alpha)
+        com = (span - 1) / 2.0
+        alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = alpha
+        self.old_wt = 1.0
+        self.weighted = _NAN
+
+    def push(self, x: float) -> float:
+        is_observation = x == x
+        if self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if is_observation:
+                if self.weighted != x:
+                    self.weighted = self.old_wt * self.weighted + self.new_wt * x
+                    self.weighted /= self.old_wt + self.new_wt
+                self.old_wt = 1.0
+        elif is_observation:
+            self.weighted = x
+        return self.weighted
+
+
+class _PairState:
+    """All streaming state kept for one pair."""
+
+    def __init__(self):
+        self.windows: dict[tuple, Any] = {}
+        self.pushed: dict[tuple, Any] = {}
+        self.closes: deque = deque(maxlen=21)
+        self.volumes: deque = deque(maxlen=11)
+        self.prev: dict[str, float] = {}
+        self.last_close_valid = _NAN
+        self.log_cumsum = 0.0
+        self.last_signal_time: Any = None
+        self.last_row: dict[str, Any] | None = None
+        self.count = 0
+
+    def _once(self, key: tuple, factory: type, args: tuple, x: float):
+        """Push ``x`` into the state for ``key`` at most once per candle."""
+        result = self.pushed.get(key, self)
+        if result is not self:
+            return result
+        state = self.windows.get(key)
+        if state is None:
+            state = self.windows[key] = factory(*args)
+        result = self.pushed[key] = state.push(x)
+        return result
+
+    def rolling(self, name: str, window: int, x: float) -> _RollingWindow:
+        return self._once(("rolling", name, window), _RollingWindow, (window,), x)
+
+    def rolling_min(self, name: str, window: int, x: float) -> float:
+        return self._once(("min", name, window), _RollingExtreme, (window, False), x)
+
+    def rolling_max(self, name: str, window: int, x: float) -> float:
+        return self._once(("max", name, window), _RollingExtreme, (window, True), x)
+
+    def rolling_quantile(self, name: str, window: int, x: float) -> _RollingQuantile:
+        return self._once(("quantile", name, window), _RollingQuantile, (window,), x)
+
+    def ewm(self, name: str, span: int, x: float) -> float:
+        return self._once(("ewm", name, span), _Ewm, (span,), x)
+
+
+_STATE_CLASSES = {
+    cls.__name__: cls for cls in (_RollingWindow, _RollingExtreme, _RollingQuantile, _Ewm)
+}
+
+
+def _encode_state(value: Any) -> Any:
+    """Convert pair state into JSON-compatible values with type tags."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, list):
+        return [_encode_state(v) for v in value]
+    if isinstance(value, tuple):
+        return {"t": [_encode_state(v) for v in value]}
+    if isinstance(value, deque):
+        return {"q": [_encode_state(v) for v in value], "maxlen": value.maxlen}
+    if isinstance(value, dict):  # Keys may be tuples
+        return {"d": [[_encode_state(k), _encode_state(v)] for k, v in value.items()]}
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return {"ts": pd.Timestamp(value).isoformat()}
+    name = type(value).__name__
+    if name in _STATE_CLASSES:
+        return {
+            "cls": name,
+            "slots": {s: _encode_state(getattr(value, s)) for s in value.__slots__},
+        }
+    raise TypeError(f"Cannot serialize {name} in incremental feature state")
+
+
+def _decode_state(value: Any) -> Any:
+    """Inverse of ``_encode_state``; only whitelisted state classes are rebuilt."""
+    if isinstance(value, list):
+        return [_decode_state(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "t" in value:
+        return tuple(_decode_state(v) for v in value["t"])
+    if "q" in value:
+        return deque((_decode_state(v) for v in value["q"]), maxlen=value["maxlen"])
+    if "d" in value:
+        return {_decode_state(k): _decode_state(v) for k, v in value["d"]}
+    if "ts" in value:
+        return pd.Timestamp(value["ts"])
+    cls = _STATE_CLASSES.get(value.get("cls"))
+    if cls is None:
+        raise ValueError(f"Unknown incremental feature state entry: {sorted(value)}")
+    obj = cls.__new__(cls)
+    for slot, slot_value in value["slots"].items():
+        setattr(obj, slot, _decode_state(slot_value))
+    return obj
+
+
+class IncrementalFeatureEngineer:
+    """
+    Stateful, per-pair streaming version of ``FeatureEngineer._engineer_features``.
+
+    Each call to ``update`` costs O(1) amortized per feature regardless of the
+    history length, so live strategies do not have to recompute the whole
+    DataFrame on every candle.
+
+    Only the log-returns stationarity mode is supported; fractional
+    differentiation needs the full window of raw prices and is rejected.
+    """
+
+    def __init__(self, config: FeatureConfig | None = None):
+        self.config = config or FeatureConfig()
+        if (
+            self.config.enforce_stationarity
+            and self.config.fractional_differentiation_d > 0
+            and not self.config.use_log_returns
+        ):
+            raise ValueError(
+                "IncrementalFeatureEngineer supports log-returns stationarity only; "
+                "set use_log_returns=True or enforce_stationarity=False"
+            )
+        self._states: dict[str, _PairState] = {}
+
+    @property
+    def warmup_period(self) -> int:
+        """Number of candles after which rows match the batch pipeline exactly."""
+        cfg = self.config
+        periods = [21, cfg.medium_period + 1, 2 * cfg.short_period]
+        if cfg.include_trend_features:
+            periods.append(cfg.long_period)
+        if cfg.include_meta_labeling_features:
+            # 100-bar quantile / z-score over volatility, which starts after medium_period bars
+            periods.append(cfg.medium_period + 100)
+        return max(periods)
+
+    @property
+    def pairs(self) -> list[str]:
+        return list(self._states)
+
+    def candles_seen(self, pair: str) -> int:
+        state = self._states.get(pair)
+        return state.count if state else 0
+
+    def is_warm(self, pair: str) -> bool:
+        return self.candles_seen(pair) >= self.warmup_period
+
+    def latest(self, pair: str) -> dict[str, Any] | None:
+        """Last emitted feature row for ``pair``."""
+        state = self._states.get(pair)
+        return dict(state.last_row) if state and state.last_row else None
+
+    def reset(self, pair: str | None = None) -> None:
+        """Drop streaming state for one pair (or all pairs)."""
+        if pair is None:
+            self._states.clear()
+        else:
+            self._states.pop(pair, None)
+
+    def warmup(self, pair: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Stream a block of historical candles through the engine.
+
+        Args:
+            pair: Trading pair
+            df: OHLCV DataFrame (chronological, ideally with DatetimeIndex)
+
+        Returns:
+            DataFrame with one emitted feature row per input candle
+        """
+        rows = [
+            self.update(pair, candle, timestamp)
+            for timestamp, candle in zip(df.index, df.to_dict("records"), strict=True)
+        ]
+        return pd.DataFrame(rows, index=df.index)
+
+    def update(self, pair: str, candle: Mapping[str, Any], timestamp: Any = None) -> dict[str, Any]:
+        """
+        Append one candle for ``pair`` and return its feature row.
+
+        Args:
+            pair: Trading pair
+            candle: Mapping with open/high/low/close/volume (extra keys are passed through)
+            timestamp: Candle time; defaults to ``candle.name`` for a pandas Series
+
+        Returns:
+            Dict of column -> value in the same column order as the batch pipeline
+        """
+        if timestamp is None:
+            timestamp = getattr(candle, "name", None)
+
+        state = self._states.get(pair)
+        if state is None:
+            state = self._states[pair] = _PairState()
+
+        state.pushed.clear()
+        row = self._compute(state, dict(candle), timestamp)
+
+        # Batch pipeline replaces +-inf with NaN and forward fills gaps
+        last = state.last_row
+        for key, value in row.items():
+            if isinstance(value, float) and not math.isfinite(value):
+                row[key] = last.get(key, _NAN) if last is not None else _NAN
+
+        state.last_row = row
+        state.count += 1
+        return row
+
+    def _compute(self, st: _PairState, row: dict[str, Any], ts: Any) -> dict[str, Any]:
+        cfg = self.config
+        short, medium, long_ = cfg.short_period, cfg.medium_period, cfg.long_period
+
+        c = float(row["close"])
+
+        if cfg.enforce_stationarity and cfg.use_log_returns:
+            # close.replace(0, nan).ffill(), log ratio, fillna(0), cumsum
+            close_valid = c if (c == c and c != 0) else st.last_close_valid
+            ratio = _div(close_valid, st.last_close_valid)
+            if ratio < 1e-9:
+                ratio = 1e-9
+            log_return = math.log(ratio) if ratio == ratio else 0.0
+            st.last_close_valid = close_valid
+            st.log_cumsum += log_return
+            row["log_returns"] = log_return
+            row["close_log_cumsum"] = st.log_cumsum
+            row["close_original"] = row["close"]
+            row["close"] = c = st.log_cumsum
+
+        o, hi, lo, v = (
+            float(row["open"]),
+            float(row["high"]),
+            float(row["low"]),
+            float(row["volume"]),
+        )
+
+        closes, volumes = st.closes, st.volumes
+        closes.append(c)
+        volumes.append(v)
+        prev_c = _lag(closes, 1)
+        prev_v = _lag(volumes, 1)
+        prev = st.prev
+
+        returns = _div(c, prev_c) - 1
+        volume_change = _div(v, prev_v) - 1
+
+        # Price features
+        if cfg.include_price_features:
+            row["returns"] = returns
+            row["returns_log"] = math.log1p(-0.999999 if returns < -0.999999 else returns)
+            for period in (2, 3, 5, 10, 20):
+                row[f"returns_{period}"] = _div(c, _lag(closes, period)) - 1
+            for lag in (1, 2, 3, 5, 10):
+                row[f"close_lag_{lag}"] = _lag(closes, lag)
+                row[f"volume_lag_{lag}"] = _lag(volumes, lag)
+            row["price_position"] = _div(c - lo, hi - lo + 1e-10)
+            row["gap"] = _div(o - prev_c, prev_c)
+            row["intraday_return"] = _div(c - o, o)
+            row["high_low_ratio"] = _div(hi, lo + 1e-10)
+            row["close_open_ratio"] = _div(c, o + 1e-10)
+            for period in (5, 10, 20):
+                row[f"price_momentum_{period}"] = _div(c, _lag(closes, period)) - 1
+
+            for window in (5, 10, 20):
+                close_window = st.rolling("close", window, c)
+                row[f"close_rolling_mean_{window}"] = close_window.mean()
+                row[f"close_rolling_std_{window}"] = close_window.std()
+                row[f"close_rolling_min_{window}"] = st.rolling_min("close", window, c)
+                row[f"close_rolling_max_{window}"] = st.rolling_max("close", window, c)
+                row[f"volume_rolling_mean_{window}"] = st.rolling("volume", window, v).mean()
+
+            for window in (5, 10, 20):
+                for stat in ("mean", "min", "max"):
+                    ref = row[f"close_rolling_{stat}_{window}"]
+                    row[f"close_vs_rolling_{stat}_{window}"] = _div(c - ref, ref)
+
+            for window in (5, 10, 20):
+                row[f"returns_volatility_{window}"] = st.rolling("returns", window, returns).std()
+
+        # Volume features
+        if cfg.include_volume_features:
+            row["volume_change"] = volume_change
+            volume_sma = st.rolling("volume", short, v).mean()
+            row["volume_sma"] = volume_sma
+            row["volume_ratio"] = _div(v, volume_sma + 1e-10)
+
+            typical_price = (hi + lo + c) / 3
+            vwap_raw = _div(
+                st.rolling("price_volume", short, typical_price * v).total(),
+                st.rolling("volume", short, v).total(),
+            )
+            vwap = prev.get("vwap_raw", _NAN)
+            prev["vwap_raw"] = vwap_raw
+            row["vwap"] = vwap
+            row["vwap_diff"] = _div(c - vwap, vwap + 1e-10)
+
+        delta = c - prev_c
+        high_close = abs(hi - prev_c)
+        low_close = abs(lo - prev_c)
+        true_range = _nanmax(hi - lo, high_close, low_close)
+
+        # Momentum features
+        if cfg.include_momentum_features:
+            gain = st.rolling("gain", short, delta if delta > 0 else 0.0).mean()
+            loss = st.rolling("loss", short, -delta if delta < 0 else 0.0).mean()
+            rs = _div(gain, loss + 1e-10)
+            row["rsi"] = 100 - _div(100, 1 + rs)
+
+            macd = st.ewm("close", 12, c) - st.ewm("close", 26, c)
+            macd_signal = st.ewm("macd", 9, macd)
+            row["macd"] = macd
+            row["macd_signal"] = macd_signal
+            row["macd_hist"] = macd - macd_signal
+
+            low_min = st.rolling_min("low", short, lo)
+            high_max = st.rolling_max("high", short, hi)
+            stoch_k = _div(100 * (c - low_min), high_max - low_min + 1e-10)
+            row["stoch_k"] = stoch_k
+            row["stoch_d"] = st.rolling("stoch_k", 3, stoch_k).mean()
+
+        # Volatility features
+        if cfg.include_volatility_features:
+            atr = st.rolling("true_range", short, true_range).mean()
+            row["atr"] = atr
+            row["atr_percent"] = _div(atr, c)
+
+            close_window = st.rolling("close", medium, c)
+            sma = close_window.mean()
+            std = close_window.std()
+            bb_upper = sma + 2 * std
+            bb_lower = sma - 2 * std
+            row["bb_upper"] = bb_upper
+            row["bb_lower"] = bb_lower
+            row["bb_width"] = _div(bb_upper - bb_lower, sma)
+            row["bb_position"] = _div(c - bb_lower, bb_upper - bb_lower + 1e-10)
+
+            row["volatility"] = st.rolling("returns", medium, returns).std()
+
+        # Trend features
+        if cfg.include_trend_features:
+            sma_short = st.rolling("close", short, c).mean()
+            sma_medium = st.rolling("close", medium, c).mean()
+            sma_long = st.rolling("close", long_, c).mean()
+            row["sma_short"] = sma_short
+            row["sma_medium"] = sma_medium
+            row["sma_long"] = sma_long
+            row["ema_short"] = st.ewm("close", short, c)
+            row["ema_medium"] = st.ewm("close", medium, c)
+            row["price_vs_sma_short"] = _div(c - sma_short, sma_short)
+            row["price_vs_sma_medium"] = _div(c - sma_medium, sma_medium)
+            row["ma_cross_short_medium"] = int(sma_short > sma_medium)
+            row["ma_cross_medium_long"] = int(sma_medium > sma_long)
+
+            high_diff = hi - prev.get("high", _NAN)
+            low_diff = -(lo - prev.get("low", _NAN))
+            plus_dm = high_diff if (high_diff > low_diff and high_diff > 0) else 0.0
+            minus_dm = low_diff if (low_diff > high_diff and low_diff > 0) else 0.0
+
+            atr = st.rolling("true_range", short, true_range).mean()
+            plus_di = 100 * _div(st.rolling("plus_dm", short, plus_dm).mean(), atr + 1e-10)
+            minus_di = 100 * _div(st.rolling("minus_dm", short, minus_dm).mean(), atr + 1e-10)
+            dx = _div(100 * abs(plus_di - minus_di), plus_di + minus_di + 1e-10)
+            row["adx"] = st.rolling("dx", short, dx).mean()
+
+        if cfg.include_meta_labeling_features:
+            self._add_meta_labeling_features(st, row, c, hi, lo, v, returns, volume_change, ts)
+
+        if cfg.include_time_features and isinstance(ts, pd.Timestamp):
+            hour, day_of_week, month = ts.hour, ts.dayofweek, ts.month
+            row["hour"] = hour
+            row["day_of_week"] = day_of_week
+            row["month"] = month
+            row["hour_sin"] = math.sin(2 * math.pi * hour / 24)
+            row["hour_cos"] = math.cos(2 * math.pi * hour / 24)
+            row["day_sin"] = math.sin(2 * math.pi * day_of_week / 7)
+            row["day_cos"] = math.cos(2 * math.pi * day_of_week / 7)
+
+        prev["high"] = hi
+        prev["low"] = lo
+        return row
+
+    def _add_meta_labeling_features(
+        self,
+        st: _PairState,
+        row: dict[str, Any],
+        c: float,
+        hi: float,
+        lo: float,
+        v: float,
+        returns: float,
+        volume_change: float,
+        ts: Any,
+    ) -> None:
+        prev = st.prev
+
+        if "rsi" in row:
+            rsi = row["rsi"]
+            rsi_signal = int(rsi < 30 or rsi > 70)
+            rsi_strength = abs(rsi - 50) / 50
+        else:
+            rsi_signal, rsi_strength = 0, 0
+
+        if "macd_hist" in row:
+            macd_hist = row["macd_hist"]
+            macd_signal = int(macd_hist > 0 and macd_hist > prev.get("macd_hist", _NAN))
+            prev["macd_hist"] = macd_hist
+            hist_mean = st.rolling("macd_hist_abs", 20, abs(macd_hist)).mean()
+            macd_strength = min(_div(abs(macd_hist), hist_mean + 1e-10), 2.0) / 2.0
+        else:
+            macd_signal, macd_strength = 0, 0
+
+        if "ema_short" in row and "ema_medium" in row:
+            ema_short, ema_medium = row["ema_short"], row["ema_medium"]
+            ema_cross_signal = int(ema_short > ema_medium)
+            ema_strength = min(_div(abs(ema_short - ema_medium), ema_medium) * 100, 5.0) / 5.0
+        else:
+            ema_cross_signal, ema_strength = 0, 0
+
+        primary_signal = int(rsi_signal + macd_signal + ema_cross_signal >= 2)
+        row["primary_signal"] = primary_signal
+        row["primary_signal_strength"] = (rsi_strength + macd_strength + ema_strength) / 3
+
+        if "volatility" not in row:
+            if "returns" not in row:
+                row["returns"] = returns
+            row["volatility"] = st.rolling("returns", self.config.medium_period, returns).std()
+        volatility = row["volatility"]
+
+        vol_quantiles = st.rolling_quantile("volatility", 100, volatility)
+        vol_q33 = vol_quantiles.quantile(0.33)
+        vol_q66 = vol_quantiles.quantile(0.66)
+        regime = 0
+        if volatility > vol_q66:
+            regime = 1
+        if volatility < vol_q33:
+            regime = -1
+        row["volatility_regime"] = regime
+
+        spread_pct = _div(hi - lo, c) * 100
+        row["spread_pct"] = spread_pct
+        row["spread_ratio"] = _div(spread_pct, st.rolling("spread_pct", 20, spread_pct).mean())
+
+        order_imbalance = returns * volume_change
+        imbalance_window = st.rolling("order_imbalance", 20, order_imbalance)
+        row["order_imbalance"] = order_imbalance
+        row["order_imbalance_norm"] = _div(
+            order_imbalance - imbalance_window.mean(), imbalance_window.std() + 1e-10
+        )
+
+        if "adx" in row:
+            row["trend_regime"] = int(row["adx"] > 25)
+
+        row["volatility_cluster"] = int(volatility > prev.get("volatility", _NAN))
+        prev["volatility"] = volatility
+
+        row["signal_consecutive"] = st.rolling("primary_signal", 5, primary_signal).total()
+
+        if primary_signal == 1:
+            st.last_signal_time = ts
+        if st.last_signal_time is None:
+            time_since_signal = 24.0
+        else:
+            time_since_signal = _hours_between(ts, st.last_signal_time)
+        row["time_since_signal"] = time_since_signal
+        row["time_since_signal_norm"] = min(time_since_signal, 24) / 24
+
+        vol_window = st.rolling("volatility", 100, volatility)
+        row["volatility_zscore"] = _div(volatility - vol_window.mean(), vol_window.std() + 1e-10)
+
+        volume_window = st.rolling("volume", 20, v)
+        volume_shock = _div(v - volume_window.mean(), volume_window.std() + 1e-10)
+        row["volume_shock"] = volume_shock
+        row["volume_shock_extreme"] = int(abs(volume_shock) > 2)
+
+    def checkpoint(self, pair: str | None = None) -> dict[str, Any]:
+        """
+        Snapshot streaming state (one pair or all pairs).
+
+        The snapshot is a deep copy and is safe to pickle.
+        """
+        pairs = [pair] if pair is not None else list(self._states)
+        return {
+            "version": CHECKPOINT_VERSION,
+            "config": asdict(self.config),
+            "states": {p: copy.deepcopy(self._states[p]) for p in pairs if p in self._states},
+        }
+
+    def restore(self, checkpoint: dict[str, Any]) -> None:
+        """Restore state produced by ``checkpoint`` (pairs not in it are kept)."""
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {checkpoint.get('version')}")
+        if checkpoint["config"] != asdict(self.config):
+            raise ValueError("Checkpoint was created with a different FeatureConfig")
+        for pair, state in checkpoint["states"].items():
+            self._states[pair] = copy.deepcopy(state)
+        logger.info(f"Restored incremental feature state for {len(checkpoint['states'])} pairs")
+
+    def export_state(self, pair: str) -> bytes | None:
+        """
+        Serialize the streaming state of one pair as JSON bytes.
+
+        Unlike ``checkpoint`` the result needs no unpickling, so it can be kept
+        in shared stores such as Redis. Returns None if the pair has no state.
+        """
+        state = self._states.get(pair)
+        if state is None:
+            return None
+        payload = {
+            "version": CHECKPOINT_VERSION,
+            "config": asdict(self.config),
+            "state": {
+                name: _encode_state(value)
+                for name, value in vars(state).items()
+                if name != "pushed"  # Per-candle scratch space
+            },
+        }
+        return json.dumps(payload, separators=(",", ":")).encode()
+
+    def import_state(self, pair: str, data: bytes | str) -> None:
+        """Restore one pair from ``export_state`` output."""
+        payload = json.loads(data)
+        if payload.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported state version: {payload.get('version')}")
+        if payload["config"] != json.loads(json.dumps(asdict(self.config))):
+            raise ValueError("State was created with a different FeatureConfig")
+        state = _PairState()
+        for name, value in payload["state"].items():
+            setattr(state, name, _decode_state(value))
+        self._states[pair] = state
+
+    def save_checkpoint(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self.checkpoint(), path)
+        logger.info(f"Incremental feature state saved to {path}")
+
+    def load_checkpoint(self, path: str | Path) -> None:
+        self.restore(joblib.load(path))
@@ -9,6 +9,11 @@ This solves the fundamental problem of naive labeling where:
 - Simple "next candle up/down" labels ignore transaction costs
 - Model can be "right" but still lose money due to fees
 
+First barrier touches are found with sparse-table range max/min queries
+(binary lifting), so labeling is O(n log max_holding_period) instead of a
+forward scan per bar. The original per-bar loops remain available through
+``TripleBarrierConfig.vectorized = False`` as the reference implementation.
+
 Reference: Advances in Financial Machine Learning, Marcos Lopez de Prado
 """
 
@@ -20,6 +25,23 @@ import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Try to import Numba for the first-touch kernel
+try:
+    from numba import jit
+
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    # Dummy decorator if Numba is not present
+    def jit(signature_or_function=None, nopython=True, **kwargs):
+        def decorator(func):
+            return func
+
+        if callable(signature_or_function):
+            return signature_or_function
+        return decorator
+
 
 @dataclass
 class TripleBarrierConfig:
@@ -44,6 +66,130 @@ class TripleBarrierConfig:
     # Account for trading fees in barriers
     fee_adjustment: float = 0.001  # 0.1% round-trip fees
 
+    # Use the sparse-table engine (False = original per-bar forward scan)
+    vectorized: bool = True
+
+
+def _sparse_table(values: np.ndarray, levels: int, above: bool) -> np.ndarray:
+    """
+    Build a sparse table of range maxima (above=True) or minima.
+
+    Row k holds the extreme of ``values[p : p + 2**k]`` for every p where the
+    block fits inside the array.
+    """
+    op = np.maximum if above else np.minimum
+    n = len(values)
+    table = np.empty((levels, n))
+    table[0] = values
+    for k in range(1, levels):
+        half = 1 << (k - 1)
+        table[k] = table[k - 1]
+        if n > half:
+            table[k, : n - half] = op(table[k - 1, : n - half], table[k - 1, half:])
+    return table
+
+
+def _first_touch_numpy(
+    values: np.ndarray,
+    table: np.ndarray,
+    thresholds: np.ndarray,
+    starts: np.ndarray,
+    horizon: int,
+    above: bool,
+) -> np.ndarray:
+    """Vectorized binary lifting over all rows at once (NumPy fallback)."""
+    n = len(values)
+    pos = starts.copy()
+    end = starts + horizon - 1
+    for k in range(table.shape[0] - 1, -1, -1):
+        step = 1 << k
+        block = table[k, np.minimum(pos, n - 1)]
+        miss = block < thresholds if above else block > thresholds
+        pos += step * ((pos + step - 1 <= end) & miss)
+
+    current = values[np.minimum(pos, n - 1)]
+    hit = (pos <= end) & (current >= thresholds if above else current <= thresholds)
+    return np.where(hit, pos - starts + 1, horizon + 1)
+
+
+@jit(nopython=True)
+def _first_touch_numba(values, table, thresholds, starts, horizon, above):
+    """Per-row binary lifting compiled with Numba."""
+    n = len(values)
+    levels = table.shape[0]
+    out = np.empty(len(starts), dtype=np.int64)
+    for r in range(len(starts)):
+        start = starts[r]
+        end = start + horizon - 1
+        thr = thresholds[r]
+        pos = start
+        for k in range(levels - 1, -1, -1):
+            step = 1 << k
+            if pos + step - 1 <= end:
+                block = table[k, pos]
+                if (above and block < thr) or (not above and block > thr):
+                    pos += step
+        out[r] = horizon + 1
+        if pos <= end and pos < n:
+            if (above and values[pos] >= thr) or (not above and values[pos] <= thr):
+                out[r] = pos - start + 1
+    return out
+
+
+def first_barrier_touch(
+    values: np.ndarray,
+    thresholds: np.ndarray,
+    starts: np.ndarray,
+    horizon: int,
+    above: bool,
+    use_numba: bool | None = None,
+) -> np.ndarray:
+    """
+    Find the first bar in each forward window that touches a barrier.
+
+    For row r the window is ``values[starts[r] : starts[r] + horizon]``. A
+    touch is ``value >= threshold`` when ``above`` (take profit on highs),
+    otherwise ``value <= threshold`` (stop loss on lows). NaN prices and NaN
+    thresholds never touch, matching the comparisons of the scalar loop.
+
+    Args:
+        values: Price series (highs or lows)
+        thresholds: Barrier level per row
+        starts: First bar index of each window (windows must fit in ``values``)
+        horizon: Window length (max holding period)
+        above: Touch direction
+        use_numba: Force the Numba kernel or the NumPy path (default: auto)
+
+    Returns:
+        Holding period (1..horizon) of the first touch, or ``horizon + 1``
+        when the barrier is not touched inside the window.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    if len(starts) == 0 or horizon <= 0:
+        return np.full(len(starts), horizon + 1, dtype=np.int64)
+
+    # NaN never touches: map it to the side of the barrier that cannot be hit
+    values = np.nan_to_num(
+        np.asarray(values, dtype=np.float64),
+        nan=-np.inf if above else np.inf,
+        posinf=np.inf,
+        neginf=-np.inf,
+    )
+    table = _sparse_table(values, int(horizon).bit_length(), above)
+
+    if use_numba is None:
+        use_numba = HAVE_NUMBA
+    if use_numba:
+        return _first_touch_numba(values, table, thresholds, starts, int(horizon), above)
+    return _first_touch_numpy(values, table, thresholds, starts, int(horizon), above)
+
+
+def _at_least(values: np.ndarray, floor: float) -> np.ndarray:
+    """Element-wise ``max(value, floor)`` with Python's NaN semantics (NaN wins)."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(floor > values, floor, values)
+
 
 class TripleBarrierLabeler:
     """
@@ -91,6 +237,24 @@ class TripleBarrierLabeler:
             f"Max hold={self.config.max_holding_period} bars"
         )
 
+        if self.config.vectorized:
+            label_values = np.full(len(df), np.nan)
+            rows, entry, _, _, t_up, t_dn = self._barrier_outcomes(
+                df, self.config.take_profit, self.config.stop_loss, start=0
+            )
+            label_values[rows] = self._resolve_labels(df, rows, entry, t_up, t_dn)
+            labels = pd.Series(label_values, index=df.index, dtype=float)
+        else:
+            labels = self._label_loop(df)
+
+        # Log distribution
+        label_counts = labels.value_counts()
+        logger.info(f"Label distribution: {label_counts.to_dict()}")
+
+        return labels
+
+    def _label_loop(self, df: pd.DataFrame) -> pd.Series:
+        """Reference implementation of ``label``: forward scan for every bar."""
         label_list = [np.nan] * len(df)
 
         # Adjust barriers for fees
@@ -123,14 +287,173 @@ class TripleBarrierLabeler:
 
             label_list[i] = label
 
-        labels = pd.Series(label_list, index=df.index, dtype=float)
+        return pd.Series(label_list, index=df.index, dtype=float)
 
-        # Log distribution
-        label_counts = labels.value_counts()
-        logger.info(f"Label distribution: {label_counts.to_dict()}")
+    def _label_binary_loop(
+        self,
+        df: pd.DataFrame,
+        labels: pd.Series,
+        take_profit_pct: pd.Series,
+        stop_loss_pct: pd.Series,
+        start: int,
+    ) -> None:
+        """Reference loop for binary labels with per-bar barriers (fills ``labels``)."""
+        close = df["close"].values
+        high = df["high"].values
+        low = df["low"].values
+        opens = df["open"].values
 
+        for i in range(start, len(df) - self.config.max_holding_period):
+            # Use next open for realistic execution simulation
+            entry_price = opens[i + 1]
+
+            # Get dynamic barriers for this point
+            tp_pct = take_profit_pct.iloc[i]
+            sl_pct = stop_loss_pct.iloc[i]
+
+            # Apply minimum barriers from config
+            tp = max(tp_pct, self.config.take_profit)
+            sl = max(sl_pct, self.config.stop_loss)
+
+            # Adjust for fees
+            tp_adjusted = tp - self.config.fee_adjustment
+            sl_adjusted = sl + self.config.fee_adjustment
+
+            upper_barrier = entry_price * (1 + tp_adjusted)
+            lower_barrier = entry_price * (1 - sl_adjusted)
+
+            label = self._get_barrier_label_binary(
+                high[i + 1 : i + 1 + self.config.max_holding_period],
+                low[i + 1 : i + 1 + self.config.max_holding_period],
+                close[i + 1 : i + 1 + self.config.max_holding_period],
+                entry_price,
+                upper_barrier,
+                lower_barrier,
+            )
+
+            labels.iloc[i] = label
+
+    def _barrier_outcomes(
+        self,
+        df: pd.DataFrame,
+        take_profit: float | np.ndarray,
+        stop_loss: float | np.ndarray,
+        start: int,
+    ) -> tuple[np.ndarray, ...]:
+        """
+        Locate the first take-profit and stop-loss touch for every labelable bar.
+
+        Bars ``start .. len(df) - max_holding_period - 1`` are labeled; each
+        enters at the next open and watches the following
+        ``max_holding_period`` bars, exactly like the forward-scan loops.
+
+        Args:
+            df: DataFrame with OHLCV data
+            take_profit: Take-profit fraction, scalar or one value per bar
+            stop_loss: Stop-loss fraction, scalar or one value per bar
+            start: First bar to label
+
+        Returns:
+            Tuple of (rows, entry, upper, lower, t_up, t_dn) where t_up / t_dn
+            are holding periods of the first touch (``max_holding_period + 1``
+            when not touched).
+        """
+        n = len(df)
+        horizon = self.config.max_holding_period
+        rows = np.arange(start, n - horizon, dtype=np.int64)
+
+        entry = df["open"].to_numpy(dtype=np.float64)[rows + 1]
+        tp = np.broadcast_to(np.asarray(take_profit, dtype=np.float64), (n,))[rows]
+        sl = np.broadcast_to(np.asarray(stop_loss, dtype=np.float64), (n,))[rows]
+
+        # Adjust barriers for fees
+        upper = entry * (1 + (tp - self.config.fee_adjustment))
+        lower = entry * (1 - (sl + self.config.fee_adjustment))
+
+        t_up = first_barrier_touch(df["high"].values, upper, rows + 1, horizon, above=True)
+        t_dn = first_barrier_touch(df["low"].values, lower, rows + 1, horizon, above=False)
+        return rows, entry, upper, lower, t_up, t_dn
+
+    def _resolve_labels(
+        self,
+        df: pd.DataFrame,
+        rows: np.ndarray,
+        entry: np.ndarray,
+        t_up: np.ndarray,
+        t_dn: np.ndarray,
+    ) -> np.ndarray:
+        """Vectorized ``_get_barrier_label`` over precomputed first touches."""
+        horizon = self.config.max_holding_period
+        close = df["close"].to_numpy(dtype=np.float64)
+
+        labels = np.where(t_up < t_dn, 1.0, -1.0)
+
+        # Both barriers in the same candle: close decides
+        same_bar = (t_up == t_dn) & (t_up <= horizon)
+        same_bar_close = close[rows + np.minimum(t_up, horizon)]
+        labels[same_bar] = np.where(same_bar_close >= entry, 1.0, -1.0)[same_bar]
+
+        timed_out = (t_up > horizon) & (t_dn > horizon)
+        if self.config.include_hold_class:
+            labels[timed_out] = 0.0
+        else:
+            final_close = close[rows + horizon]
+            labels[timed_out] = np.where(final_close > entry, 1.0, -1.0)[timed_out]
         return labels
 
+    def _resolve_labels_binary(self, t_up: np.ndarray, t_dn: np.ndarray) -> np.ndarray:
+        """Vectorized ``_get_barrier_label_binary``: 1 only if TP strictly first."""
+        return np.where(t_up < t_dn, 1.0, 0.0)
+
+    def _resolve_details(
+        self,
+        df: pd.DataFrame,
+        rows: np.ndarray,
+        entry: np.ndarray,
+        upper: np.ndarray,
+        lower: np.ndarray,
+        t_up: np.ndarray,
+        t_dn: np.ndarray,
+    ) -> dict[str, np.ndarray]:
+        """Vectorized ``_get_barrier_details``."""
+        horizon = self.config.max_holding_period
+        close = df["close"].to_numpy(dtype=np.float64)
+
+        first = np.minimum(t_up, t_dn)
+        timed_out = first > horizon
+        same_bar_close = close[rows + np.minimum(first, horizon)]
+        take_profit = (t_up < t_dn) | ((t_up == t_dn) & ~timed_out & (same_bar_close >= entry))
+        stop_loss = ~timed_out & ~take_profit
+
+        return {
+            "label": np.select([take_profit, stop_loss], [1.0, -1.0], 0.0),
+            "barrier_type": np.select(
+                [take_profit, stop_loss], ["take_profit", "stop_loss"], "time_barrier"
+            ).astype(object),
+            "holding_period": np.where(timed_out, horizon, first).astype(np.float64),
+            "return_pct": np.select(
+                [take_profit, stop_loss],
+                [(upper - entry) / entry, (lower - entry) / entry],
+                (close[rows + horizon] - entry) / entry,
+            ),
+        }
+
+    @staticmethod
+    def _details_frame(
+        df: pd.DataFrame, rows: np.ndarray, details: dict[str, np.ndarray], **extra: np.ndarray
+    ) -> pd.DataFrame:
+        """Scatter per-row barrier details into a frame aligned with ``df``."""
+        n = len(df)
+        columns = {}
+        for name, values in {**details, **extra}.items():
+            if name == "barrier_type":
+                column = np.full(n, "insufficient_data", dtype=object)
+            else:
+                column = np.full(n, np.nan)
+            column[rows] = values
+            columns[name] = column
+        return pd.DataFrame(columns, index=df.index)
+
     def _validate_data(self, df: pd.DataFrame) -> None:
         """
         Validate and CLEAN data to prevent future data leakage and labeling errors.
@@ -384,6 +707,25 @@ class TripleBarrierLabeler:
         """
         logger.info("Generating labels with metadata")
 
+        if self.config.vectorized:
+            rows, entry, upper, lower, t_up, t_dn = self._barrier_outcomes(
+                df, self.config.take_profit, self.config.stop_loss, start=0
+            )
+            details = self._resolve_details(df, rows, entry, upper, lower, t_up, t_dn)
+            result_df = self._details_frame(df, rows, details)
+        else:
+            result_df = self._label_with_meta_loop(df)
+
+        # Log statistics
+        logger.info(
+            f"Barrier type distribution: {result_df['barrier_type'].value_counts().to_dict()}"
+        )
+        logger.info(f"Average holding period: {result_df['holding_period'].mean():.1f} bars")
+
+        return result_df
+
+    def _label_with_meta_loop(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Reference implementation of ``label_with_meta``."""
         results = []
 
         tp_adjusted = self.config.take_profit - self.config.fee_adjustment
@@ -429,15 +771,7 @@ class TripleBarrierLabeler:
                 }
             )
 
-        result_df = pd.DataFrame(results, index=df.index)
-
-        # Log statistics
-        logger.info(
-            f"Barrier type distribution: {result_df['barrier_type'].value_counts().to_dict()}"
-        )
-        logger.info(f"Average holding period: {result_df['holding_period'].mean():.1f} bars")
-
-        return result_df
+        return pd.DataFrame(results, index=df.index)
 
     def _get_barrier_details(
         self,
@@ -568,40 +902,16 @@ class DynamicBarrierLabeler(TripleBarrierLabeler):
 
         labels = pd.Series(index=df.index, dtype=float)
 
-        close = df["close"].values
-        high = df["high"].values
-        low = df["low"].values
-        opens = df["open"].values
-
-        for i in range(self.lookback, len(df) - self.config.max_holding_period):
-            # Use next open for realistic execution simulation
-            entry_price = opens[i + 1]
-
-            # Get dynamic barriers for this point
-            tp_pct = take_profit_pct.iloc[i]
-            sl_pct = stop_loss_pct.iloc[i]
-
-            # Apply minimum barriers from config
-            tp = max(tp_pct, self.config.take_profit)
-            sl = max(sl_pct, self.config.stop_loss)
-
-            # Adjust for fees
-            tp_adjusted = tp - self.config.fee_adjustment
-            sl_adjusted = sl + self.config.fee_adjustment
-
-            upper_barrier = entry_price * (1 + tp_adjusted)
-            lower_barrier = entry_price * (1 - sl_adjusted)
-
-            label = self._get_barrier_label_binary(
-                high[i + 1 : i + 1 + self.config.max_holding_period],
-                low[i + 1 : i + 1 + self.config.max_holding_period],
-                close[i + 1 : i + 1 + self.config.max_holding_period],
-                entry_price,
-                upper_barrier,
-                lower_barrier,
+        if self.config.vectorized:
+            rows, _, _, _, t_up, t_dn = self._barrier_outcomes(
+                df,
+                _at_least(take_profit_pct, self.config.take_profit),
+                _at_least(stop_loss_pct, self.config.stop_loss),
+                start=self.lookback,
             )
-
-            labels.iloc[i] = label
+            labels.iloc[rows] = self._resolve_labels_binary(t_up, t_dn)
+        else:
+            self._label_binary_loop(df, labels, take_profit_pct, stop_loss_pct, self.lookback)
 
         # Fill edges with NaN
         labels.iloc[: self.lookback] = np.nan
@@ -631,6 +941,39 @@ class DynamicBarrierLabeler(TripleBarrierLabeler):
             df, self.lookback, self.profit_multiplier, self.loss_multiplier
         )
 
+        if self.config.vectorized:
+            rows, entry, upper, lower, t_up, t_dn = self._barrier_outcomes(
+                df,
+                _at_least(take_profit_pct, self.config.take_profit),
+                _at_least(stop_loss_pct, self.config.stop_loss),
+                start=self.lookback,
+            )
+            details = self._resolve_details(df, rows, entry, upper, lower, t_up, t_dn)
+            result_df = self._details_frame(
+                df,
+                rows,
+                details,
+                take_profit_pct=take_profit_pct.to_numpy(dtype=np.float64)[rows],
+                stop_loss_pct=stop_loss_pct.to_numpy(dtype=np.float64)[rows],
+            )
+        else:
+            result_df = self._label_with_meta_dynamic_loop(df, take_profit_pct, stop_loss_pct)
+
+        # Log statistics
+        logger.info(
+            f"Dynamic barrier statistics - Avg TP: {take_profit_pct.mean():.3%}, "
+            f"Avg SL: {stop_loss_pct.mean():.3%}"
+        )
+        logger.info(
+            f"Barrier type distribution: {result_df['barrier_type'].value_counts().to_dict()}"
+        )
+
+        return result_df
+
+    def _label_with_meta_dynamic_loop(
+        self, df: pd.DataFrame, take_profit_pct: pd.Series, stop_loss_pct: pd.Series
+    ) -> pd.DataFrame:
+        """Reference implementation of the dynamic ``label_with_meta``."""
         results = []
 
         close = df["close"].values
@@ -690,18 +1033,7 @@ class DynamicBarrierLabeler(TripleBarrierLabeler):
                 }
             )
 
-        result_df = pd.DataFrame(results, index=df.index)
-
-        # Log statistics
-        logger.info(
-            f"Dynamic barrier statistics - Avg TP: {take_profit_pct.mean():.3%}, "
-            f"Avg SL: {stop_loss_pct.mean():.3%}"
-        )
-        logger.info(
-            f"Barrier type distribution: {result_df['barrier_type'].value_counts().to_dict()}"
-        )
-
-        return result_df
+        return pd.DataFrame(results, index=df.index)
 
 
 def get_dynamic_barriers_atr(
@@ -839,6 +1171,46 @@ class RegimeAwareBarrierLabeler(DynamicBarrierLabeler):
         atr_pct = atr / close
 
         labels = pd.Series(index=df.index, dtype=float)
+
+        if self.config.vectorized:
+            atr_values = atr_pct.to_numpy(dtype=np.float64)
+            profit_multiplier, loss_multiplier = self._get_regime_multiplier_arrays(atr_values)
+            rows, _, _, _, t_up, t_dn = self._barrier_outcomes(
+                df,
+                _at_least(profit_multiplier * atr_values, self.config.take_profit),
+                _at_least(loss_multiplier * atr_values, self.config.stop_loss),
+                start=14,
+            )
+            labels.iloc[rows] = self._resolve_labels_binary(t_up, t_dn)
+        else:
+            self._label_regime_loop(df, labels, atr_pct)
+
+        # Fill edges with NaN
+        labels.iloc[:14] = np.nan
+        labels.iloc[-self.config.max_holding_period :] = np.nan
+
+        label_counts = labels.value_counts()
+        logger.info(f"Regime-aware label distribution: {label_counts.to_dict()}")
+
+        # Log regime statistics
+        regime_counts = atr_pct.apply(self._detect_regime).value_counts()
+        logger.info(f"Market regime distribution: {regime_counts.to_dict()}")
+
+        return labels
+
+    def _get_regime_multiplier_arrays(self, atr_pct: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized ``_detect_regime`` + ``_get_regime_multipliers`` (NaN -> normal)."""
+        high_vol = atr_pct > 0.02
+        low_vol = ~high_vol & (atr_pct < 0.005)
+        profit = np.select([high_vol, low_vol], [2.0, 1.0], self.base_profit_multiplier)
+        loss = np.select([high_vol, low_vol], [1.0, 0.5], self.base_loss_multiplier)
+        return profit, loss
+
+    def _label_regime_loop(self, df: pd.DataFrame, labels: pd.Series, atr_pct: pd.Series) -> None:
+        """Reference implementation of the regime-aware labeling loop (fills ``labels``)."""
+        high = df["high"]
+        low = df["low"]
+        close = df["close"]
         opens = df["open"]
 
         for i in range(14, len(df) - self.config.max_holding_period):
@@ -878,19 +1250,6 @@ class RegimeAwareBarrierLabeler(DynamicBarrierLabeler):
 
             labels.iloc[i] = label
 
-        # Fill edges with NaN
-        labels.iloc[:14] = np.nan
-        labels.iloc[-self.config.max_holding_period :] = np.nan
-
-        label_counts = labels.value_counts()
-        logger.info(f"Regime-aware label distribution: {label_counts.to_dict()}")
-
-        # Log regime statistics
-        regime_counts = atr_pct.apply(self._detect_regime).value_counts()
-        logger.info(f"Market regime distribution: {regime_counts.to_dict()}")
-
-        return labels
-
 
 def create_labels_for_training(
     df: pd.DataFrame, method: str = "atr_barrier", **kwargs
@@ -962,40 +1321,17 @@ def create_labels_for_training(
                 )
 
                 labels = pd.Series(index=df.index, dtype=float)
-                close = df["close"].values
-                high = df["high"].values
-                low = df["low"].values
-                opens = df["open"].values
-
-                for i in range(14, len(df) - self.config.max_holding_period):
-                    # Use next open for realistic execution simulation
-                    entry_price = opens[i + 1]
-
-                    # Get ATR-based barriers for this point
-                    tp_pct = take_profit_pct.iloc[i]
-                    sl_pct = stop_loss_pct.iloc[i]
-
-                    # Apply minimum barriers from config
-                    tp = max(tp_pct, self.config.take_profit)
-                    sl = max(sl_pct, self.config.stop_loss)
-
-                    # Adjust for fees
-                    tp_adjusted = tp - self.config.fee_adjustment
-                    sl_adjusted = sl + self.config.fee_adjustment
-
-                    upper_barrier = entry_price * (1 + tp_adjusted)
-                    lower_barrier = entry_price * (1 - sl_adjusted)
-
-                    label = self._get_barrier_label_binary(
-                        high[i + 1 : i + 1 + self.config.max_holding_period],
-                        low[i + 1 : i + 1 + self.config.max_holding_period],
-                        close[i + 1 : i + 1 + self.config.max_holding_period],
-                        entry_price,
-                        upper_barrier,
-                        lower_barrier,
-                    )
 
-                    labels.iloc[i] = label
+                if self.config.vectorized:
+                    rows, _, _, _, t_up, t_dn = self._barrier_outcomes(
+                        df,
+                        _at_least(take_profit_pct, self.config.take_profit),
+                        _at_least(stop_loss_pct, self.config.stop_loss),
+                        start=14,
+                    )
+                    labels.iloc[rows] = self._resolve_labels_binary(t_up, t_dn)
+                else:
+                    self._label_binary_loop(df, labels, take_profit_pct, stop_loss_pct, 14)
 
                 # Fill edges with NaN
                 labels.iloc[:14] = np.nan
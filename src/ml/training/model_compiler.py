@@ -0,0 +1,616 @@
+"""
+Model Compiler
+==============
+
+Compile trained tree ensembles into artifacts with low single-row latency.
+
+Backends, tried in order (the first one that passes the parity check wins):
+- ``treelite``: Treelite model compiled to a shared library by tl2cgen
+- ``onnx``: ONNX graph (skl2onnx / onnxmltools) run by onnxruntime; written
+  next to the pickle as ``<model>.onnx`` so ``OptimizedInferenceService``
+  picks it up as well
+- ``native``: the trees flattened into numpy arrays and evaluated for all
+  trees at once (``CompiledTreeEnsemble``), no optional dependencies
+
+Every artifact is checked against the original ``predict_proba`` on a
+held-out sample before it is accepted.
+
+Supported models: binary sklearn DecisionTree / RandomForest / ExtraTrees /
+GradientBoosting / HistGradientBoosting classifiers, XGBClassifier and
+LGBMClassifier (numeric features only).
+
+Usage:
+    result = compile_model(model, X_holdout, "user_data/models/xgb_20250101")
+    model = load_compiled(result.path, result.backend, feature_names)
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+import json
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Optional compiled backends
+try:
+    import tl2cgen
+    import treelite
+
+    TREELITE_AVAILABLE = True
+except ImportError:
+    TREELITE_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("treelite", "onnx", "native")
+
+
+class UnsupportedModelError(ValueError):
+    """The model cannot be compiled by this backend."""
+
+
+def _as_matrix(X: Any, feature_names: list[str] | None) -> np.ndarray:
+    """2D float64 matrix; DataFrames are reordered to the training feature order."""
+    if feature_names and hasattr(X, "columns") and set(feature_names) <= set(X.columns):
+        X = X[feature_names]
+    X = np.asarray(X, dtype=np.float64)
+    return X.reshape(1, -1) if X.ndim == 1 else X
+
+
+def _proba_pair(p: np.ndarray) -> np.ndarray:
+    return np.column_stack([1.0 - p, p])
+
+
+class CompiledTreeEnsemble:
+    """
+    Tree ensemble flattened into node arrays.
+
+    All trees are walked in lockstep: one gather/compare/select per tree level
+    for the whole batch, so a single row costs ``depth`` vectorized steps
+    instead of a Python call per tree. Leaves point to themselves, so a tree
+    that reached its leaf early is unaffected by further levels.
+    """
+
+    _ARRAYS = ("feature", "threshold", "left", "right", "value", "missing_left", "roots")
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        missing_left: np.ndarray,
+        roots: np.ndarray,
+        depth: int,
+        strict: bool = False,
+        float32_inputs: bool = False,
+        aggregation: str = "sum",
+        link: str = "logistic",
+        base_score: float = 0.0,
+        feature_names: list[str] | None = None,
+    ):
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.missing_left = np.asarray(missing_left, dtype=bool)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.depth = int(depth)
+        self.strict = strict  # XGBoost: x < threshold goes left; others: x <= threshold
+        self.float32_inputs = float32_inputs  # sklearn trees / XGBoost compare in float32
+        self.aggregation = aggregation  # "sum" (boosting) or "mean" (bagging)
+        self.link = link  # "logistic" (margin) or "identity" (probability)
+        self.base_score = float(base_score)
+        self.feature_names = list(feature_names or [])
+        self.classes_ = np.array([0, 1])
+        # Trees are stored deepest first, so level d only walks the first
+        # level_counts[d] trees; shallower trees already sit on a leaf
+        self.level_counts = self._level_counts()
+
+    def _level_counts(self) -> list[int]:
+        """Per level, the prefix of trees that still has an internal node there."""
+        frontier, counts = self.roots, []
+        for _ in range(self.depth):
+            internal = frontier[self.left[frontier] != frontier]
+            if not internal.size:
+                break
+            counts.append(int(np.searchsorted(self.roots, internal, side="right").max()))
+            frontier = np.concatenate([self.left[internal], self.right[internal]])
+        return counts
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def leaves(self, X: Any) -> np.ndarray:
+        """Leaf node index per (row, tree)."""
+        X = _as_matrix(X, self.feature_names)
+        if self.float32_inputs:
+            X = X.astype(np.float32).astype(np.float64)
+        if len(X) == 1:
+            return self._leaves_row(X[0])[None, :]
+        node = np.repeat(self.roots[None, :], len(X), axis=0)
+        rows = np.arange(len(X))[:, None]
+        has_nan = bool(np.isnan(X).any())
+        for active in self.level_counts:
+            current = node[:, :active]
+            x = X[rows, self.feature[current]]
+            threshold = self.threshold[current]
+            go_left = x < threshold if self.strict else x <= threshold
+            if has_nan:
+                go_left = np.where(np.isnan(x), self.missing_left[current], go_left)
+            node[:, :active] = np.where(go_left, self.left[current], self.right[current])
+        return node
+
+    def _leaves_row(self, x: np.ndarray) -> np.ndarray:
+        """Single-row walk on 1-D arrays (the live-trading path)."""
+        node = self.roots.copy()
+        has_nan = bool(np.isnan(x).any())
+        for active in self.level_counts:
+            current = node[:active]
+            value = x[self.feature[current]]
+            threshold = self.threshold[current]
+            go_left = value < threshold if self.strict else value <= threshold
+            if has_nan:
+                go_left = np.where(np.isnan(value), self.missing_left[current], go_left)
+            node[:active] = np.where(go_left, self.left[current], self.right[current])
+        return node
+
+    def tree_sum(self, X: Any) -> np.ndarray:
+        """Sum of leaf values (without base score or link)."""
+        return self.value[self.leaves(X)].sum(axis=1)
+
+    def predict_raw(self, X: Any) -> np.ndarray:
+        raw = self.tree_sum(X)
+        if self.aggregation == "mean":
+            raw /= self.n_trees
+        return raw + self.base_score
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        raw = self.predict_raw(X)
+        p = 1.0 / (1.0 + np.exp(-raw)) if self.link == "logistic" else raw
+        return _proba_pair(p)
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path).with_suffix(".npz")
+        meta = {
+            "depth": self.depth,
+            "strict": self.strict,
+            "float32_inputs": self.float32_inputs,
+            "aggregation": self.aggregation,
+            "link": self.link,
+            "base_score": self.base_score,
+            "feature_names": self.feature_names,
+        }
+        arrays = {name: getattr(self, name) for name in self._ARRAYS}
+        np.savez(path, meta=np.array(json.dumps(meta)), **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CompiledTreeEnsemble":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            arrays = {name: data[name] for name in cls._ARRAYS}
+        return cls(**arrays, **meta)
+
+
+# ---------------------------------------------------------------------------
+# Tree extraction (native backend)
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Tree:
+    """One tree with local node ids; ``left == -1`` marks a leaf."""
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    value: np.ndarray
+    missing_left: np.ndarray
+
+    def depth(self) -> int:
+        depth, frontier = 0, [0]
+        while True:
+            frontier = [
+                c for n in frontier if self.left[n] >= 0 for c in (self.left[n], self.right[n])
+            ]
+            if not frontier:
+                return depth
+            depth += 1
+
+
+def _from_nodes(nodes: dict[int, dict[str, Any]]) -> _Tree:
+    n = max(nodes) + 1
+    tree = _Tree(
+        feature=np.zeros(n, dtype=np.intp),
+        threshold=np.zeros(n),
+        left=np.full(n, -1, dtype=np.intp),
+        right=np.full(n, -1, dtype=np.intp),
+        value=np.zeros(n),
+        missing_left=np.zeros(n, dtype=bool),
+    )
+    for node_id, node in nodes.items():
+        for name, val in node.items():
+            getattr(tree, name)[node_id] = val
+    return tree
+
+
+def _sklearn_tree(estimator: Any, value: np.ndarray) -> _Tree:
+    t = estimator.tree_
+    missing = getattr(t, "missing_go_to_left", None)
+    return _Tree(
+        feature=np.maximum(t.feature, 0),
+        threshold=t.threshold,
+        left=t.children_left,
+        right=t.children_right,
+        value=value,
+        missing_left=np.zeros(t.node_count, bool) if missing is None else missing.astype(bool),
+    )
+
+
+def _positive_fraction(estimator: Any) -> np.ndarray:
+    counts = estimator.tree_.value[:, 0, :]
+    return counts[:, 1] / counts.sum(axis=1)
+
+
+def _hist_tree(predictor: Any) -> _Tree:
+    nodes = predictor.nodes
+    if nodes["is_categorical"].any():
+        raise UnsupportedModelError("categorical splits are not supported")
+    leaf = nodes["is_leaf"].astype(bool)
+    return _Tree(
+        feature=nodes["feature_idx"].astype(np.intp),
+        threshold=nodes["num_threshold"],
+        left=np.where(leaf, -1, nodes["left"].astype(np.intp)),
+        right=np.where(leaf, -1, nodes["right"].astype(np.intp)),
+        value=nodes["value"],
+        missing_left=nodes["missing_go_to_left"].astype(bool),
+    )
+
+
+def _xgboost_trees(model: Any) -> list[_Tree]:
+    booster = model.get_booster()
+    names = {name: i for i, name in enumerate(booster.feature_names or [])}
+
+    def feature_index(split: str) -> int:
+        return names[split] if split in names else int(split.lstrip("f"))
+
+    trees = []
+    for dump in booster.get_dump(dump_format="json"):
+        nodes: dict[int, dict[str, Any]] = {}
+        stack = [json.loads(dump)]
+        while stack:
+            node = stack.pop()
+            if "leaf" in node:
+                nodes[node["nodeid"]] = {"value": node["leaf"]}
+                continue
+            nodes[node["nodeid"]] = {
+                "feature": feature_index(node["split"]),
+                # Thresholds are float32 in XGBoost; round-trip to compare exactly
+                "threshold": float(np.float32(node["split_condition"])),
+                "left": node["yes"],
+                "right": node["no"],
+                "missing_left": node["missing"] == node["yes"],
+            }
+            stack.extend(node["children"])
+        trees.append(_from_nodes(nodes))
+    return trees
+
+
+def _lightgbm_trees(model: Any) -> list[_Tree]:
+    dump = model.booster_.dump_model()
+    trees = []
+    for info in dump["tree_info"]:
+        nodes: dict[int, dict[str, Any]] = {}
+        stack = [(info["tree_structure"], 0)]
+        next_id = 1
+        while stack:
+            node, node_id = stack.pop()
+            if "leaf_value" in node:
+                nodes[node_id] = {"value": node["leaf_value"]}
+                continue
+            if node["decision_type"] != "<=":
+                raise UnsupportedModelError("categorical splits are not supported")
+            missing_type = node["missing_type"]
+            if missing_type == "Zero":
+                raise UnsupportedModelError("zero_as_missing is not supported")
+            threshold = node["threshold"]
+            left, right = next_id, next_id + 1
+            next_id += 2
+            nodes[node_id] = {
+                "feature": node["split_feature"],
+                "threshold": threshold,
+                "left": left,
+                "right": right,
+                # missing_type None: LightGBM replaces NaN by 0.0
+                "missing_left": node["default_left"] if missing_type == "NaN" else threshold >= 0,
+            }
+            stack.extend([(node["left_child"], left), (node["right_child"], right)])
+        trees.append(_from_nodes(nodes))
+    return trees
+
+
+def _extract(model: Any) -> tuple[list[_Tree], dict[str, Any], Callable | None]:
+    """Trees, ensemble parameters and the model's raw-margin function (if any)."""
+    kind = type(model).__name__
+    classes = getattr(model, "classes_", None)
+    if classes is not None and len(classes) != 2:
+        raise UnsupportedModelError(f"{kind}: only binary classifiers are supported")
+
+    if kind == "DecisionTreeClassifier":
+        trees = [_sklearn_tree(model, _positive_fraction(model))]
+        return trees, {"float32_inputs": True, "aggregation": "mean", "link": "identity"}, None
+    if kind in ("RandomForestClassifier", "ExtraTreesClassifier"):
+        trees = [_sklearn_tree(e, _positive_fraction(e)) for e in model.estimators_]
+        return trees, {"float32_inputs": True, "aggregation": "mean", "link": "identity"}, None
+    if kind == "GradientBoostingClassifier":
+        rate = model.learning_rate
+        trees = [_sklearn_tree(e, e.tree_.value[:, 0, 0] * rate) for e in model.estimators_[:, 0]]
+        return trees, {"float32_inputs": True}, model.decision_function
+    if kind == "HistGradientBoostingClassifier":
+        if getattr(model, "_preprocessor", None) is not None:
+            raise UnsupportedModelError("categorical features are not supported")
+        trees = [_hist_tree(predictors[0]) for predictors in model._predictors]
+        return trees, {}, model.decision_function
+    if kind == "XGBClassifier":
+        if model.get_xgb_params().get("objective") != "binary:logistic":
+            raise UnsupportedModelError("only the binary:logistic objective is supported")
+        raw = lambda X: model.predict(X, output_margin=True)  # noqa: E731
+        return _xgboost_trees(model), {"strict": True, "float32_inputs": True}, raw
+    if kind == "LGBMClassifier":
+        raw = lambda X: model.predict(X, raw_score=True)  # noqa: E731
+        return _lightgbm_trees(model), {}, raw
+    raise UnsupportedModelError(f"{kind} is not a supported tree ensemble")
+
+
+def _pack(trees: list[_Tree], params: dict[str, Any], feature_names: list[str] | None):
+    depths = [t.depth() for t in trees]
+    order = sorted(range(len(trees)), key=lambda i: -depths[i])
+    trees = [trees[i] for i in order]
+    offsets = np.cumsum([0] + [len(t.left) for t in trees[:-1]])
+    columns: dict[str, list[np.ndarray]] = {name: [] for name in ("left", "right")}
+    for tree, offset in zip(trees, offsets, strict=True):
+        own = np.arange(len(tree.left)) + offset
+        leaf = tree.left < 0
+        columns["left"].append(np.where(leaf, own, tree.left + offset))
+        columns["right"].append(np.where(leaf, own, tree.right + offset))
+    return CompiledTreeEnsemble(
+        feature=np.concatenate([t.feature for t in trees]),
+        threshold=np.concatenate([t.threshold for t in trees]),
+        left=np.concatenate(columns["left"]),
+        right=np.concatenate(columns["right"]),
+        value=np.concatenate([t.value for t in trees]),
+        missing_left=np.concatenate([t.missing_left for t in trees]),
+        roots=offsets,
+        depth=max(depths),
+        feature_names=feature_names,
+        **params,
+    )
+
+
+def compile_native(
+    model: Any, X_sample: np.ndarray, feature_names: list[str] | None = None
+) -> CompiledTreeEnsemble:
+    """Flatten ``model`` into a ``CompiledTreeEnsemble``."""
+    trees, params, raw_fn = _extract(model)
+    ensemble = _pack(trees, params, feature_names)
+    if raw_fn is not None:
+        # Boosting init score (prior log-odds / base_score) is not part of the trees
+        ensemble.base_score = float(np.median(raw_fn(X_sample) - ensemble.tree_sum(X_sample)))
+    return ensemble
+
+
+# ---------------------------------------------------------------------------
+# Optional backends
+# ---------------------------------------------------------------------------
+
+
+class OnnxModel:
+    """``predict_proba`` over an onnxruntime session."""
+
+    def __init__(self, path: str | Path, feature_names: list[str] | None = None):
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1
+        self.session = ort.InferenceSession(str(path), options)
+        self.input_name = self.session.get_inputs()[0].name
+        self.feature_names = list(feature_names or [])
+        self.classes_ = np.array([0, 1])
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        X = _as_matrix(X, self.feature_names).astype(np.float32)
+        outputs = self.session.run(None, {self.input_name: X})
+        proba = outputs[-1]
+        if isinstance(proba, list):  # ZipMap output: one {class: p} dict per row
+            proba = np.array([[row[c] for c in sorted(row)] for row in proba])
+        return _proba_pair(np.asarray(proba, dtype=np.float64).reshape(len(X), -1)[:, -1])
+
+
+def _export_onnx(model: Any, n_features: int, path: Path) -> Path:
+    kind = type(model).__name__
+    path = path.with_suffix(".onnx")
+    if kind in ("XGBClassifier", "LGBMClassifier"):
+        import onnxmltools
+        from onnxmltools.convert.common.data_types import FloatTensorType
+
+        convert = (
+            onnxmltools.convert_xgboost if kind == "XGBClassifier" else onnxmltools.convert_lightgbm
+        )
+        onx = convert(model, initial_types=[("input", FloatTensorType([None, n_features]))])
+    else:
+        from skl2onnx import to_onnx
+
+        sample = np.zeros((1, n_features), dtype=np.float32)
+        onx = to_onnx(model, sample, options={id(model): {"zipmap": False}})
+    path.write_bytes(onx.SerializeToString())
+    return path
+
+
+class TreeliteModel:
+    """``predict_proba`` over a tl2cgen-compiled shared library."""
+
+    def __init__(self, path: str | Path, feature_names: list[str] | None = None):
+        self.predictor = tl2cgen.Predictor(str(path), nthread=1)
+        self.feature_names = list(feature_names or [])
+        self.classes_ = np.array([0, 1])
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        X = _as_matrix(X, self.feature_names).astype(np.float32)
+        out = np.asarray(self.predictor.predict(tl2cgen.DMatrix(X)), dtype=np.float64)
+        return _proba_pair(out.reshape(len(X), -1)[:, -1])
+
+
+def _export_treelite(model: Any, path: Path) -> Path:
+    kind = type(model).__name__
+    if kind == "XGBClassifier":
+        tl_model = treelite.frontend.from_xgboost(model.get_booster())
+    elif kind == "LGBMClassifier":
+        tl_model = treelite.frontend.from_lightgbm(model.booster_)
+    else:
+        tl_model = treelite.sklearn.import_model(model)
+    path = path.with_suffix(".so")
+    tl2cgen.export_lib(tl_model, toolchain="gcc", libpath=str(path))
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Compilation with parity check
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CompilationResult:
+    """Accepted compiled artifact and its parity/latency report."""
+
+    backend: str
+    path: str
+    max_abs_error: float
+    latency_us: float  # Median single-row predict_proba latency of the artifact
+    baseline_latency_us: float  # Same for the original model
+    rejected: dict[str, str] = field(default_factory=dict)  # Backend -> reason
+
+    def report(self) -> dict[str, float]:
+        return {
+            "max_abs_error": self.max_abs_error,
+            "latency_us": self.latency_us,
+            "baseline_latency_us": self.baseline_latency_us,
+        }
+
+
+def _single_row_latency_us(predict_proba: Callable, X: np.ndarray, rounds: int = 200) -> float:
+    rows = [X[i % len(X) : i % len(X) + 1] for i in range(rounds)]
+    predict_proba(rows[0])
+    times = []
+    for row in rows:
+        start = time.perf_counter()
+        predict_proba(row)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1e6)
+
+
+def load_compiled(path: str | Path, backend: str, feature_names: list[str] | None = None) -> Any:
+    """Load a compiled artifact as an object with ``predict_proba``."""
+    if backend == "native":
+        model = CompiledTreeEnsemble.load(path)
+        if feature_names:
+            model.feature_names = list(feature_names)
+        return model
+    if backend == "onnx":
+        return OnnxModel(path, feature_names)
+    if backend == "treelite":
+        return TreeliteModel(path, feature_names)
+    raise ValueError(f"Unknown compiled backend: {backend}")
+
+
+def _build(backend: str, model: Any, X: np.ndarray, base_path: Path, names: list[str] | None):
+    if backend == "native":
+        return compile_native(model, X, names).save(base_path)
+    if backend == "onnx":
+        if not ONNX_AVAILABLE:
+            raise UnsupportedModelError("onnxruntime not installed")
+        return _export_onnx(model, X.shape[1], base_path)
+    if backend == "treelite":
+        if not TREELITE_AVAILABLE:
+            raise UnsupportedModelError("treelite/tl2cgen not installed")
+        return _export_treelite(model, base_path)
+    raise ValueError(f"Unknown compiled backend: {backend}")
+
+
+def compile_model(
+    model: Any,
+    X_sample: Any,
+    base_path: str | Path,
+    feature_names: list[str] | None = None,
+    backends: tuple[str, ...] = BACKENDS,
+    tolerance: float = 1e-5,
+) -> CompilationResult | None:
+    """
+    Compile ``model`` with the first backend whose output matches it.
+
+    Args:
+        model: Fitted binary classifier with ``predict_proba``
+        X_sample: Held-out rows for the parity check (and boosting base score)
+        base_path: Artifact path without suffix (``.npz`` / ``.onnx`` / ``.so`` is added)
+        feature_names: Training feature order, used to align DataFrame inputs
+        backends: Backends to try, in order
+        tolerance: Maximum absolute difference of the positive-class probability
+
+    Returns:
+        CompilationResult, or None if no backend produced a matching artifact
+    """
+    X = _as_matrix(X_sample, feature_names)
+    expected = np.asarray(model.predict_proba(X), dtype=np.float64)[:, -1]
+    base_path = Path(base_path)
+    rejected: dict[str, str] = {}
+
+    for backend in backends:
+        try:
+            path = _build(backend, model, X, base_path, feature_names)
+            compiled = load_compiled(path, backend, feature_names)
+            error = float(np.max(np.abs(compiled.predict_proba(X)[:, 1] - expected)))
+        except Exception as e:
+            rejected[backend] = str(e)
+            logger.debug(f"{backend} compilation of {type(model).__name__} failed: {e}")
+            continue
+        if not error <= tolerance:
+            rejected[backend] = f"parity check failed: max abs error {error:.3g}"
+            logger.warning(f"{backend} artifact rejected: max abs error {error:.3g} > {tolerance}")
+            path.unlink(missing_ok=True)
+            continue
+
+        result = CompilationResult(
+            backend=backend,
+            path=str(path),
+            max_abs_error=error,
+            latency_us=_single_row_latency_us(compiled.predict_proba, X),
+            baseline_latency_us=_single_row_latency_us(model.predict_proba, X),
+            rejected=rejected,
+        )
+        logger.info(
+            f"Compiled {type(model).__name__} with {backend}: single row "
+            f"{result.baseline_latency_us:.0f}us -> {result.latency_us:.0f}us "
+            f"(max abs error {error:.2g})"
+        )
+        return result
+
+    logger.warning(f"Could not compile {type(model).__name__}: {rejected}")
+    return None
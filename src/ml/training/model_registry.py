@@ -7,6 +7,7 @@ Manage ML model versions and deployment.
 
 import json
 import logging
+import pickle
 import shutil
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -65,6 +66,11 @@ class ModelMetadata:
     # Tags
     tags: list[str] = field(default_factory=list)
 
+    # Compiled artifact (see model_compiler)
+    compiled_path: str = ""
+    compiled_backend: str = ""
+    compile_report: dict[str, float] = field(default_factory=dict)
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
         return {
@@ -85,6 +91,9 @@ class ModelMetadata:
             "deployed_at": self.deployed_at.isoformat() if self.deployed_at else None,
             "deployment_notes": self.deployment_notes,
             "tags": self.tags,
+            "compiled_path": self.compiled_path,
+            "compiled_backend": self.compiled_backend,
+            "compile_report": self.compile_report,
         }
 
 
@@ -142,6 +151,7 @@ class ModelRegistry:
         training_config: dict[str, Any] | None = None,
         feature_names: list[str] | None = None,
         tags: list[str] | None = None,
+        compile_sample: Any = None,
     ) -> ModelMetadata:
         """
         Register a new model.
@@ -155,6 +165,8 @@ class ModelRegistry:
             training_config: Training configuration
             feature_names: List of feature names
             tags: Model tags
+            compile_sample: Held-out feature rows; if given, the model is compiled
+                for fast inference (see ``compile_model``)
 
         Returns:
             ModelMetadata object
@@ -203,6 +215,9 @@ class ModelRegistry:
             f"(F1: {metrics.get('f1', 'N/A') if metrics else 'N/A'})"
         )
 
+        if compile_sample is not None:
+            self.compile_model(model_name, version, compile_sample)
+
         return metadata
 
     def validate_model(
@@ -270,7 +285,9 @@ class ModelRegistry:
             logger.info(f"Validation PASSED for {model_name} v{version}")
             return True
 
-    def promote_to_production(self, model_name: str, version: str, notes: str = "") -> bool:
+    def promote_to_production(
+        self, model_name: str, version: str, notes: str = "", compile_sample: Any = None
+    ) -> bool:
         """
         Promote model to production.
 
@@ -278,6 +295,8 @@ class ModelRegistry:
             model_name: Model name
             version: Version to promote
             notes: Deployment notes
+            compile_sample: Held-out feature rows; compiles the model first if it
+                has no compiled artifact yet (a failed compile does not block promotion)
 
         Returns:
             True if promoted successfully
@@ -295,6 +314,9 @@ class ModelRegistry:
             )
             return False
 
+        if compile_sample is not None and not metadata.compiled_path:
+            self.compile_model(model_name, version, compile_sample)
+
         # Demote current production model
         if model_name in self.models:
             for model in self.models[model_name]:
@@ -316,6 +338,61 @@ class ModelRegistry:
 
         return True
 
+    def compile_model(
+        self,
+        model_name: str,
+        version: str,
+        X_sample: Any,
+        backends: tuple[str, ...] | None = None,
+        tolerance: float = 1e-5,
+    ) -> bool:
+        """
+        Compile a registered model (Treelite / ONNX / native arrays) for fast inference.
+
+        The artifact is written next to the model file and only recorded if its
+        probabilities match the pickled model on ``X_sample``.
+
+        Args:
+            model_name: Model name
+            version: Version to compile
+            X_sample: Held-out feature rows for the parity check
+            backends: Backends to try in order (default: all, fastest first)
+            tolerance: Maximum absolute probability difference
+
+        Returns:
+            True if a compiled artifact was recorded
+        """
+        from src.ml.training.model_compiler import BACKENDS, compile_model
+
+        metadata = self._get_model(model_name, version)
+        if not metadata:
+            logger.error(f"Model {model_name} v{version} not found")
+            return False
+
+        try:
+            with open(metadata.model_path, "rb") as f:
+                model = pickle.load(f)
+        except Exception as e:
+            logger.error(f"Cannot compile {model_name} v{version}: {e}")
+            return False
+
+        result = compile_model(
+            model,
+            X_sample,
+            Path(metadata.model_path).with_suffix(""),
+            feature_names=metadata.feature_names or None,
+            backends=backends or BACKENDS,
+            tolerance=tolerance,
+        )
+        if result is None:
+            return False
+
+        metadata.compiled_path = result.path
+        metadata.compiled_backend = result.backend
+        metadata.compile_report = result.report()
+        self._save_registry()
+        return True
+
     def rollback_to_version(self, model_name: str, version: str) -> bool:
         """
         Rollback to previous model version.
@@ -546,6 +623,11 @@ class ModelRegistry:
         except Exception as e:
             logger.warning(f"Could not create production link: {e}")
 
+    def reload(self) -> None:
+        """Re-read the registry file (e.g. after another process promoted a model)."""
+        self.models = {}
+        self._load_registry()
+
     def _load_registry(self):
         """Load registry from disk."""
         if not self.registry_file.exists():
@@ -579,6 +661,9 @@ class ModelRegistry:
                         ),
                         deployment_notes=v.get("deployment_notes", ""),
                         tags=v.get("tags", []),
+                        compiled_path=v.get("compiled_path", ""),
+                        compiled_backend=v.get("compiled_backend", ""),
+                        compile_report=v.get("compile_report", {}),
                     )
                     self.models[model_name].append(metadata)
 
@@ -0,0 +1,1154 @@
+"""
+Nightly Hyperparameter Optimization Engine
+==========================================
+
+Shared engine behind ``scripts/maintenance/nightly_hyperopt.py`` and its
+``_overnight`` / ``_overnight_light`` variants. The scripts only differ in a
+``NightlyProfile`` (output names, resource limits, thread counts, defaults).
+
+Optimized for overnight execution with:
+- Features, labels and folds materialized once as a memory-mapped StudyDataset
+- Intermediate saving every 50 trials
+- Resource monitoring (memory, disk, optionally CPU)
+- Resume from the Optuna SQLite study
+- Optional worker processes attached to the same dataset and study
+- Detailed reporting and comparison with previous results
+
+Usage:
+    optimizer = NightlyHyperparameterOptimizer(PROFILES["overnight"])
+    dataset = optimizer.load_study_dataset("BTC/USDT", "5m", days=1095)
+    results = optimizer.optimize(dataset, n_trials=1000, n_workers=4)
+    optimizer.save_results(results)
+
+Author: Stoic Citadel Team
+Date: December 25, 2025
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import optuna
+import pandas as pd
+import psutil
+from optuna.pruners import MedianPruner
+from optuna.storages import JournalStorage
+from optuna.storages.journal import JournalFileBackend
+from optuna.trial import Trial
+
+try:
+    import xgboost as xgb
+
+    XGB_AVAILABLE = True
+except ImportError:
+    XGB_AVAILABLE = False
+    warnings.warn("XGBoost not available. Using scikit-learn GradientBoosting.")
+
+from src.data.loader import get_ohlcv
+from src.ml.training.feature_engineering import FeatureEngineer
+from src.ml.training.labeling import TripleBarrierConfig, TripleBarrierLabeler
+from src.ml.training.study_dataset import StudyDataset
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PERIODS_PER_YEAR = 252 * 24 * 12  # 5-minute candles, as in calculate_sharpe_ratio
+
+
+@dataclass(frozen=True)
+class NightlyProfile:
+    """Everything that differs between the nightly, overnight and light runs."""
+
+    name: str  # File tag: best_params_{name}.json, full_results_{name}.json, ...
+    title: str  # Report and banner title
+    model_label: str  # Feature importance title and report column
+    output_subdir: str  # Under user_data/; also names the SQLite study database
+    report_filename: str
+    study_name: str
+
+    # Resource limits
+    max_memory_gb: float = 32.0
+    min_disk_gb: float = 10.0
+    max_cpu_percent: float | None = None  # None: 100% CPU is expected, do not check
+    check_resources_per_fold: bool = False
+
+    # Model threads
+    xgb_n_jobs: int = 1  # Per trial fit
+    final_n_jobs: int | None = None  # Final refit (None: same as xgb_n_jobs)
+    xgb_base_score: float | None = None
+
+    # CLI defaults
+    default_trials: int = 500
+    default_timeout: int = 28800
+    default_n_jobs: int = -1
+    description: str = ""
+
+
+PROFILES: dict[str, NightlyProfile] = {
+    "nightly": NightlyProfile(
+        name="nightly",
+        title="Nightly",
+        model_label="Nightly",
+        output_subdir="nightly_hyperopt",
+        report_filename="optimization_report.md",
+        study_name="nightly_xgboost_sharpe_optimization",
+        xgb_n_jobs=1,  # Each Optuna worker uses exactly 1 core
+        final_n_jobs=-1,
+        xgb_base_score=0.5,  # Explicit for binary classification
+        description="Nightly hyperparameter optimization for XGBoost trading models",
+    ),
+    "overnight": NightlyProfile(
+        name="overnight",
+        title="Overnight",
+        model_label="Overnight",
+        output_subdir="nightly_hyperopt_overnight",
+        report_filename="optimization_report_overnight.md",
+        study_name="nightly_xgboost_sharpe_optimization_overnight",
+        max_memory_gb=24.0,
+        min_disk_gb=20.0,
+        max_cpu_percent=98.0,
+        check_resources_per_fold=True,
+        xgb_n_jobs=4,
+        default_trials=1000,
+        default_timeout=43200,
+        default_n_jobs=8,  # Half of 16 cores
+        description="Overnight hyperparameter optimization for XGBoost trading models",
+    ),
+    "light": NightlyProfile(
+        name="light",
+        title="Light Overnight",
+        model_label="Light",
+        output_subdir="nightly_hyperopt_light",
+        report_filename="optimization_report_light.md",
+        study_name="nightly_xgboost_sharpe_optimization_light",
+        max_memory_gb=24.0,
+        min_disk_gb=20.0,
+        check_resources_per_fold=True,
+        xgb_n_jobs=1,  # Single-threaded
+        default_timeout=43200,
+        default_n_jobs=4,  # Quarter of 16 cores
+        description="Light overnight hyperparameter optimization for XGBoost trading models",
+    ),
+}
+
+
+class ResourceMonitor:
+    """Monitor system resources during optimization."""
+
+    def __init__(
+        self,
+        max_memory_gb: float = 32.0,
+        min_disk_gb: float = 10.0,
+        max_cpu_percent: float | None = None,
+    ):
+        self.max_memory_gb = max_memory_gb
+        self.min_disk_gb = min_disk_gb
+        self.max_cpu_percent = max_cpu_percent
+        self.start_time = time.time()
+
+    def check_resources(self) -> tuple[bool, str]:
+        """Check if system has enough resources to continue."""
+        issues = []
+
+        # Check memory
+        memory = psutil.virtual_memory()
+        memory_gb = memory.used / (1024**3)
+        if memory_gb > self.max_memory_gb:
+            issues.append(f"Memory usage {memory_gb:.1f}GB > {self.max_memory_gb}GB limit")
+
+        # Check disk space
+        disk = psutil.disk_usage(".")
+        disk_free_gb = disk.free / (1024**3)
+        if disk_free_gb < self.min_disk_gb:
+            issues.append(f"Disk free {disk_free_gb:.1f}GB < {self.min_disk_gb}GB minimum")
+
+        # CPU is only checked when a limit is set (100% is expected in parallel runs)
+        if self.max_cpu_percent is not None:
+            cpu_percent = psutil.cpu_percent(interval=1)
+            if cpu_percent > self.max_cpu_percent:
+                issues.append(f"CPU load {cpu_percent}% > {self.max_cpu_percent:g}%")
+
+        if issues:
+            return False, "; ".join(issues)
+        return True, "OK"
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get current resource statistics."""
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(".")
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "elapsed_hours": (time.time() - self.start_time) / 3600,
+            "memory_used_gb": memory.used / (1024**3),
+            "memory_percent": memory.percent,
+            "disk_free_gb": disk.free / (1024**3),
+            "disk_percent": disk.percent,
+            "cpu_percent": psutil.cpu_percent(interval=1),
+        }
+
+
+def sharpe_ratios(returns: np.ndarray, periods_per_year: int = PERIODS_PER_YEAR) -> np.ndarray:
+    """
+    Annualized Sharpe Ratio of each row of ``returns`` (NaNs ignored).
+
+    Row-wise equivalent of ``src.utils.risk.calculate_sharpe_ratio``: rows with
+    fewer than two returns or zero volatility score 0.
+    """
+    returns = np.atleast_2d(returns)
+    valid = np.sum(~np.isnan(returns), axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nanmean(returns, axis=-1)
+        std = np.nanstd(returns, axis=-1, ddof=1)
+        sharpe = mean * periods_per_year / (std * np.sqrt(periods_per_year))
+    return np.where((valid >= 2) & (std > 0), sharpe, 0.0)
+
+
+class NightlySharpeRatioObjective:
+    """
+    Objective function for Optuna that optimizes Sharpe Ratio.
+
+    Enhanced version with:
+    - Folds trained on views of a memory-mapped StudyDataset
+    - Early stopping based on resource limits
+    - Per-fold reporting for the median pruner
+    """
+
+    def __init__(
+        self,
+        dataset: StudyDataset,
+        resource_monitor: ResourceMonitor | None = None,
+        profile: NightlyProfile = PROFILES["nightly"],
+        threshold: float = 0.55,
+    ):
+        """
+        Initialize objective function.
+
+        Args:
+            dataset: Features, binary labels, forward returns and folds
+            resource_monitor: Resource monitor instance
+            profile: Run profile (XGBoost threads, per-fold resource checks)
+            threshold: Probability above which the strategy goes LONG
+        """
+        self.dataset = dataset
+        self.resource_monitor = resource_monitor
+        self.profile = profile
+        self.threshold = threshold
+
+    def calculate_strategy_returns(
+        self, y_pred_proba: np.ndarray, forward_returns: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate strategy returns based on trading signals.
+
+        Simple strategy: Enter LONG position if probability > threshold,
+        hold for 1 period, exit at next close.
+
+        Vectorized over trials: ``y_pred_proba`` may be a single prediction
+        vector or a (n_trials, n_rows) matrix of predictions for the same rows.
+        The last row of a validation window has no next close inside the window
+        and is dropped, as before.
+
+        Args:
+            y_pred_proba: Predicted probabilities for class 1 (LONG)
+            forward_returns: Next-period return of each row
+
+        Returns:
+            Strategy returns with the same leading shape, one column shorter
+        """
+        signals = np.asarray(y_pred_proba)[..., :-1] > self.threshold
+        return signals * np.asarray(forward_returns)[:-1]
+
+    def _create_model(self, params: dict[str, Any]):
+        if XGB_AVAILABLE:
+            if self.profile.xgb_base_score is not None:
+                return xgb.XGBClassifier(base_score=self.profile.xgb_base_score, **params)
+            return xgb.XGBClassifier(**params)
+
+        from sklearn.ensemble import GradientBoostingClassifier
+
+        return GradientBoostingClassifier(
+            n_estimators=params["n_estimators"],
+            learning_rate=params["learning_rate"],
+            max_depth=params["max_depth"],
+            subsample=params["subsample"],
+            random_state=42,
+        )
+
+    def _check_resources(self, fold: int | None = None) -> None:
+        if not self.resource_monitor:
+            return
+        ok, msg = self.resource_monitor.check_resources()
+        if not ok:
+            where = "" if fold is None else f" during fold {fold}"
+            logger.warning(f"Resource check failed{where}: {msg}")
+            raise optuna.TrialPruned(f"Resource limits exceeded: {msg}")
+
+    def __call__(self, trial: Trial) -> float:
+        """
+        Objective function for Optuna.
+
+        Args:
+            trial: Optuna trial
+
+        Returns:
+            Average Sharpe Ratio across all folds (to be maximized)
+        """
+        # Check resources before starting trial
+        self._check_resources()
+
+        # Suggest hyperparameters with strict constraints
+        params = {
+            "max_depth": trial.suggest_int("max_depth", 2, 5),
+            "learning_rate": trial.suggest_float("learning_rate", 0.005, 0.05, log=True),
+            "n_estimators": trial.suggest_int("n_estimators", 100, 800),
+            "subsample": trial.suggest_float("subsample", 0.6, 0.9),
+            "colsample_bytree": trial.suggest_float("colsample_bytree", 0.6, 0.9),
+            "gamma": trial.suggest_float("gamma", 0.1, 5.0),
+            "reg_alpha": trial.suggest_float("reg_alpha", 0.0, 1.0),
+            "reg_lambda": trial.suggest_float("reg_lambda", 0.5, 2.0),
+            "min_child_weight": trial.suggest_int("min_child_weight", 1, 10),
+            "random_state": 42,
+            "n_jobs": self.profile.xgb_n_jobs,
+            "verbosity": 0,
+            "use_label_encoder": False,
+            "eval_metric": "logloss",
+            "objective": "binary:logistic",
+        }
+
+        data = self.dataset
+        sharpe_list = []
+
+        # TimeSeriesSplit cross-validation over precomputed fold slices (views)
+        for fold, (train, val) in enumerate(data.folds):
+            if self.profile.check_resources_per_fold:
+                self._check_resources(fold)
+
+            model = self._create_model(params)
+            model.fit(data.X[train], data.y[train])
+
+            # Predict probabilities on validation set
+            y_pred_proba = model.predict_proba(data.X[val])[:, 1]  # Probability of LONG
+
+            strategy_returns = self.calculate_strategy_returns(
+                y_pred_proba, data.forward_returns[val]
+            )
+            sharpe_list.append(float(sharpe_ratios(strategy_returns)[0]))
+
+            # Report running mean so the pruner can stop weak trials fold by fold
+            trial.report(float(np.mean(sharpe_list)), fold)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+
+        # Return average Sharpe Ratio across folds
+        avg_sharpe = np.mean(sharpe_list) if sharpe_list else 0.0
+
+        # Add custom attributes to trial
+        trial.set_user_attr("completed_folds", len(sharpe_list))
+        trial.set_user_attr("sharpe_std", np.std(sharpe_list) if len(sharpe_list) > 1 else 0.0)
+
+        return avg_sharpe
+
+
+def _run_worker(
+    profile: NightlyProfile,
+    dataset_path: str,
+    tail_rows: int | None,
+    n_trials: int,
+    timeout: int | None,
+) -> int:
+    """Worker process entry point: attach to the dataset and study, run trials."""
+    optimizer = NightlyHyperparameterOptimizer(profile)
+    dataset = StudyDataset.attach(dataset_path)
+    if tail_rows is not None:
+        dataset = dataset.tail(tail_rows)
+    study = optuna.load_study(
+        study_name=profile.study_name,
+        storage=optimizer._create_storage(),
+        pruner=optimizer._create_pruner(),
+    )
+    objective = NightlySharpeRatioObjective(dataset, optimizer.resource_monitor, profile)
+    n_before = len(study.trials)
+    study.optimize(
+        objective,
+        n_trials=n_trials,
+        timeout=timeout,
+        callbacks=[optimizer._save_intermediate_callback],
+    )
+    return len(study.trials) - n_before
+
+
+class NightlyHyperparameterOptimizer:
+    """
+    Nightly hyperparameter optimizer for XGBoost trading models.
+
+    Features:
+    - Automatic resume from previous runs
+    - Intermediate saving
+    - Resource monitoring
+    - Telegram notifications
+    - Detailed reporting
+    """
+
+    def __init__(self, profile: NightlyProfile | None = None, config: dict | None = None):
+        """
+        Initialize optimizer.
+
+        Args:
+            profile: Run profile (defaults to the nightly profile)
+            config: Configuration dictionary
+        """
+        self.profile = profile or PROFILES["nightly"]
+        self.config = config or {}
+        self.study = None
+        self.best_params = None
+        self.best_value = None
+        self.resource_monitor = ResourceMonitor(
+            self.profile.max_memory_gb, self.profile.min_disk_gb, self.profile.max_cpu_percent
+        )
+
+        # Create output directories
+        self.output_dir = Path("user_data")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Profile-specific directories
+        self.nightly_dir = self.output_dir / self.profile.output_subdir
+        self.nightly_dir.mkdir(parents=True, exist_ok=True)
+
+        # Optuna journal for resume capability; a journal file takes concurrent
+        # writes from --workers processes, where SQLite fails with "database is locked"
+        self.storage_path = self.nightly_dir / f"{self.profile.output_subdir}.journal"
+
+        # Materialized features/labels/folds, shared by runs and worker processes
+        self.dataset_dir = self.output_dir / "cache" / "study_datasets"
+
+        logger.info(
+            f"{self.profile.title} hyperopt initialized. Output directory: {self.nightly_dir}"
+        )
+
+    def check_data_freshness(
+        self, symbol: str = "BTC/USDT", timeframe: str = "5m", max_age_hours: int = 24
+    ) -> tuple[bool, str | None]:
+        """
+        Check if data is fresh enough for optimization.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            max_age_hours: Maximum age of data in hours
+
+        Returns:
+            Tuple of (is_fresh, message)
+        """
+        try:
+            # Check if data file exists
+            pair_filename = symbol.replace("/", "_")
+            data_file = (
+                self.output_dir / "data" / "binance" / f"{pair_filename}-{timeframe}.feather"
+            )
+
+            if not data_file.exists():
+                return False, f"Data file not found: {data_file}"
+
+            # Check file modification time
+            mtime = data_file.stat().st_mtime
+            file_age_hours = (time.time() - mtime) / 3600
+
+            if file_age_hours > max_age_hours:
+                return False, f"Data is {file_age_hours:.1f} hours old (max: {max_age_hours}h)"
+
+            return True, f"Data is fresh ({file_age_hours:.1f} hours old)"
+
+        except Exception as e:
+            return False, f"Error checking data freshness: {e}"
+
+    def load_ohlcv(
+        self, symbol: str = "BTC/USDT", timeframe: str = "5m", days: int = 1095
+    ) -> pd.DataFrame:
+        """
+        Load the last ``days`` days of candles (counted back from the last candle).
+
+        Anchoring the window on the data rather than on the wall clock keeps the
+        candles, and so the study dataset key, identical between runs until new
+        candles arrive.
+        """
+        logger.info(f"Loading {days} days of data for {symbol} {timeframe}")
+
+        df = get_ohlcv(
+            pair=symbol,
+            timeframe=timeframe,
+            exchange="binance",
+        )
+
+        # Ensure index is datetime and drop it from columns if it exists
+        if not isinstance(df.index, pd.DatetimeIndex):
+            if "date" in df.columns:
+                df["date"] = pd.to_datetime(df["date"])
+                df.set_index("date", inplace=True)
+            else:
+                for col in df.columns:
+                    if "date" in col.lower() or "time" in col.lower():
+                        df[col] = pd.to_datetime(df[col])
+                        df.set_index(col, inplace=True)
+                        break
+
+        if len(df):
+            df = df.loc[df.index >= df.index[-1] - pd.Timedelta(days=days)]
+
+        logger.info(f"Loaded {len(df)} candles from {df.index[0]} to {df.index[-1]}")
+        return df
+
+    def load_study_dataset(
+        self,
+        symbol: str = "BTC/USDT",
+        timeframe: str = "5m",
+        days: int = 1095,
+        n_splits: int = 5,
+        rebuild: bool = False,
+    ) -> StudyDataset:
+        """
+        Load candles and attach to their study dataset, building it on a miss.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            days: Number of days to load (1095 for 3 years)
+            n_splits: Number of TimeSeriesSplit folds
+            rebuild: Rebuild the dataset even if a matching one exists
+
+        Returns:
+            Memory-mapped StudyDataset
+        """
+        start = time.perf_counter()
+        df = self.load_ohlcv(symbol, timeframe, days)
+        dataset = StudyDataset.materialize(
+            df,
+            FeatureEngineer(),
+            TripleBarrierLabeler(config=TripleBarrierConfig()),
+            n_splits=n_splits,
+            root_dir=self.dataset_dir,
+            rebuild=rebuild,
+        )
+
+        logger.info(
+            f"Final dataset: {len(dataset)} samples, {len(dataset.feature_names)} features "
+            f"(ready in {time.perf_counter() - start:.1f}s)"
+        )
+        labels, counts = np.unique(np.asarray(dataset.y), return_counts=True)
+        logger.info(f"Binary label distribution: {dict(zip(labels.tolist(), counts.tolist()))}")
+        return dataset
+
+    def load_and_prepare_data(
+        self, symbol: str = "BTC/USDT", timeframe: str = "5m", days: int = 1095
+    ) -> tuple[pd.DataFrame, pd.Series, pd.Series]:
+        """
+        Load and prepare data for optimization.
+
+        Returns:
+            Tuple of (X, y, close_prices) - features, labels, and close prices
+        """
+        return self.load_study_dataset(symbol, timeframe, days).to_frame()
+
+    def _create_storage(self) -> JournalStorage:
+        """Optuna journal storage shared by the main process and worker processes."""
+        return JournalStorage(JournalFileBackend(str(self.storage_path)))
+
+    def _create_pruner(self) -> MedianPruner:
+        return MedianPruner(n_startup_trials=5, n_warmup_steps=1, interval_steps=1)
+
+    def _save_intermediate_callback(self, study: optuna.Study, trial: optuna.trial.FrozenTrial):
+        """Save intermediate results every 50 trials."""
+        if trial.number % 50 == 0:
+            self._save_intermediate_results(study)
+            # Log resource stats
+            stats = self.resource_monitor.get_stats()
+            logger.info(f"Trial {trial.number} completed. Resource stats: {stats}")
+
+    def optimize(
+        self,
+        dataset: StudyDataset,
+        n_trials: int | None = None,
+        timeout: int | None = None,
+        n_jobs: int | None = None,
+        resume: bool = True,
+        n_workers: int = 1,
+        tail_rows: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Run hyperparameter optimization with resume capability.
+
+        Args:
+            dataset: Study dataset (features, labels, forward returns, folds)
+            n_trials: Number of Optuna trials (profile default if None)
+            timeout: Optimization timeout in seconds (profile default if None)
+            n_jobs: Optuna threads per process (profile default if None)
+            resume: Whether to resume from previous study
+            n_workers: Worker processes attached to the same dataset and study
+            tail_rows: Only use the last N rows of the dataset (quick mode)
+
+        Returns:
+            Dictionary with optimization results
+        """
+        profile = self.profile
+        n_trials = profile.default_trials if n_trials is None else n_trials
+        timeout = profile.default_timeout if timeout is None else timeout
+        n_jobs = profile.default_n_jobs if n_jobs is None else n_jobs
+        if tail_rows is not None:
+            dataset = dataset.tail(tail_rows)
+
+        logger.info(f"Starting {profile.title.lower()} hyperparameter optimization")
+        logger.info(
+            f"Target: {n_trials} trials, timeout: {timeout}s, jobs: {n_jobs}, "
+            f"workers: {n_workers}, XGBoost jobs: {profile.xgb_n_jobs}"
+        )
+
+        # Create or load study
+        study_name = profile.study_name
+        # Check for a previous study before the journal file is created
+        storage_existed = self.storage_path.exists()
+        storage = self._create_storage()
+        if storage_existed and not resume:
+            try:
+                optuna.delete_study(study_name=study_name, storage=storage)
+                logger.info("Discarded previous study (--no-resume)")
+            except KeyError:
+                pass
+
+        # Create new study, or load the previous one when resuming
+        self.study = optuna.create_study(
+            direction="maximize",
+            study_name=study_name,
+            storage=storage,
+            pruner=self._create_pruner(),
+            load_if_exists=True,
+        )
+        completed_trials = len(self.study.trials)
+        if completed_trials:
+            logger.info(f"Resumed study with {completed_trials} completed trials: {self.storage_path}")
+        else:
+            logger.info("Created new study")
+        remaining_trials = max(0, n_trials - completed_trials)
+        logger.info(f"Remaining trials to run: {remaining_trials}")
+
+        # Run optimization
+        try:
+            if n_workers > 1:
+                self._optimize_workers(dataset, remaining_trials, timeout, n_workers, tail_rows)
+            else:
+                objective = NightlySharpeRatioObjective(dataset, self.resource_monitor, profile)
+                self.study.optimize(
+                    objective,
+                    n_trials=remaining_trials,
+                    timeout=timeout,
+                    n_jobs=n_jobs,
+                    show_progress_bar=True,
+                    callbacks=[self._save_intermediate_callback],
+                )
+        except Exception as e:
+            logger.error(f"Optimization failed: {e}")
+            # Save partial results
+            self._save_intermediate_results(self.study)
+            raise
+
+        # Get best results
+        self.best_params = self.study.best_params
+        self.best_value = self.study.best_value
+
+        logger.info(f"Optimization completed. Best Sharpe Ratio: {self.best_value:.4f}")
+        logger.info(f"Best parameters: {self.best_params}")
+
+        # Train final model with best parameters
+        final_model = self._train_final_model(dataset, self.best_params)
+
+        return {
+            "best_params": self.best_params,
+            "best_value": self.best_value,
+            "study": self.study,
+            "final_model": final_model,
+            "timestamp": datetime.now().isoformat(),
+            "total_trials": len(self.study.trials),
+            "resource_stats": self.resource_monitor.get_stats(),
+        }
+
+    def _optimize_workers(
+        self,
+        dataset: StudyDataset,
+        n_trials: int,
+        timeout: int | None,
+        n_workers: int,
+        tail_rows: int | None,
+    ) -> None:
+        """Split the trials over worker processes attached to the dataset and study."""
+        budget = [n_trials // n_workers + (i < n_trials % n_workers) for i in range(n_workers)]
+        # Spawn, not fork: forking a parent with live BLAS/OpenMP threads can deadlock
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(n_workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(_run_worker, self.profile, str(dataset.path), tail_rows, n, timeout)
+                for n in budget
+                if n > 0
+            ]
+            ran = sum(future.result() for future in futures)
+        logger.info(f"{n_workers} workers ran {ran} trials")
+
+    def _save_intermediate_results(self, study: optuna.Study):
+        """Save intermediate results to disk."""
+        intermediate_path = (
+            self.nightly_dir
+            / f"intermediate_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+
+        # Handle case where no trials completed successfully yet
+        try:
+            best_value = study.best_value
+            best_params = study.best_params
+        except ValueError:
+            best_value = None
+            best_params = None
+
+        # Convert study to serializable format
+        serializable_results = {
+            "timestamp": datetime.now().isoformat(),
+            "n_trials_completed": len(study.trials),
+            "best_value": best_value,
+            "best_params": best_params,
+            "trials_summary": [
+                {
+                    "number": t.number,
+                    "value": t.value,
+                    "params": t.params,
+                    "state": str(t.state),
+                    "user_attrs": t.user_attrs,
+                }
+                for t in study.trials
+            ],
+        }
+
+        with open(intermediate_path, "w") as f:
+            json.dump(serializable_results, f, indent=2)
+
+        logger.info(f"Intermediate results saved to {intermediate_path}")
+
+    def _train_final_model(self, dataset: StudyDataset, params: dict) -> Any:
+        """
+        Train final model with best parameters on full dataset.
+
+        Args:
+            dataset: Study dataset
+            params: Best hyperparameters
+
+        Returns:
+            Trained XGBoost model
+        """
+        logger.info("Training final model with best parameters...")
+
+        # Prepare parameters for final training
+        final_params = params.copy()
+        final_params["n_estimators"] = 800  # Use max from search space
+        final_n_jobs = self.profile.final_n_jobs
+        final_params["n_jobs"] = self.profile.xgb_n_jobs if final_n_jobs is None else final_n_jobs
+
+        # Train on full dataset
+        if XGB_AVAILABLE:
+            model = xgb.XGBClassifier(**final_params)
+        else:
+            from sklearn.ensemble import GradientBoostingClassifier
+
+            model = GradientBoostingClassifier(
+                n_estimators=final_params["n_estimators"],
+                learning_rate=final_params["learning_rate"],
+                max_depth=final_params["max_depth"],
+                subsample=final_params["subsample"],
+                random_state=42,
+            )
+
+        # DataFrame keeps the feature names on the booster (importance plot)
+        X = pd.DataFrame(np.asarray(dataset.X), columns=dataset.feature_names)
+        model.fit(X, np.asarray(dataset.y))
+
+        logger.info("Final model trained successfully")
+        return model
+
+    def save_results(self, results: dict[str, Any]):
+        """
+        Save optimization results to disk.
+
+        Args:
+            results: Optimization results
+        """
+        tag = self.profile.name
+
+        # Save best parameters
+        params_path = self.nightly_dir / f"best_params_{tag}.json"
+        with open(params_path, "w") as f:
+            json.dump(results["best_params"], f, indent=2)
+        logger.info(f"Best parameters saved to {params_path}")
+
+        # Also save to main user_data directory for compatibility
+        main_params_path = self.output_dir / f"model_best_params_{tag}.json"
+        with open(main_params_path, "w") as f:
+            json.dump(results["best_params"], f, indent=2)
+
+        # Save full results
+        results_path = self.nightly_dir / f"full_results_{tag}.json"
+
+        # Convert study to serializable format
+        serializable_results = {
+            "best_params": results["best_params"],
+            "best_value": results["best_value"],
+            "timestamp": results["timestamp"],
+            "total_trials": results["total_trials"],
+            "resource_stats": results["resource_stats"],
+            "trials_summary": [
+                {
+                    "number": t.number,
+                    "value": t.value,
+                    "params": t.params,
+                    "state": str(t.state),
+                    "user_attrs": t.user_attrs,
+                }
+                for t in results["study"].trials
+            ],
+        }
+
+        with open(results_path, "w") as f:
+            json.dump(serializable_results, f, indent=2)
+        logger.info(f"Full results saved to {results_path}")
+
+        # Save importance plot if possible
+        try:
+            self._plot_importance(results["final_model"])
+        except Exception as e:
+            logger.warning(f"Could not create importance plot: {e}")
+
+        # Generate comparison report
+        self.generate_report(results)
+
+    def _plot_importance(self, model: Any):
+        """
+        Plot and save feature importance.
+
+        Args:
+            model: Trained model
+        """
+        try:
+            import matplotlib.pyplot as plt
+
+            # Get feature importance
+            if XGB_AVAILABLE and hasattr(model, "feature_importances_"):
+                importance = model.feature_importances_
+                feature_names = model.get_booster().feature_names
+            elif hasattr(model, "feature_importances_"):
+                importance = model.feature_importances_
+                feature_names = [f"feature_{i}" for i in range(len(importance))]
+            else:
+                logger.warning("Model does not have feature_importances_ attribute")
+                return
+
+            if feature_names is None:
+                feature_names = [f"feature_{i}" for i in range(len(importance))]
+
+            # Create DataFrame
+            importance_df = (
+                pd.DataFrame({"feature": feature_names, "importance": importance})
+                .sort_values("importance", ascending=False)
+                .head(20)
+            )
+
+            # Plot
+            plt.figure(figsize=(10, 6))
+            plt.barh(range(len(importance_df)), importance_df["importance"])
+            plt.yticks(range(len(importance_df)), importance_df["feature"])
+            plt.xlabel("Importance")
+            plt.title(f"Top 20 Feature Importance ({self.profile.model_label} Model)")
+            plt.tight_layout()
+
+            # Save
+            plot_path = self.nightly_dir / f"feature_importance_{self.profile.name}.png"
+            plt.savefig(plot_path, dpi=150)
+            plt.close()
+
+            logger.info(f"Feature importance plot saved to {plot_path}")
+
+        except Exception as e:
+            logger.warning(f"Could not create importance plot: {e}")
+
+    def _send_notification(self, message: str, level: str = "info"):
+        """
+        Send notification (placeholder for Telegram/email integration).
+
+        Args:
+            message: Notification message
+            level: info, warning, error
+        """
+        # This is a placeholder. In production, integrate with Telegram/email
+        logger.info(f"Notification ({level}): {message}")
+
+        # Example Telegram integration (uncomment and configure)
+        # if TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
+        #     send_telegram_message(message)
+
+    def generate_report(self, results: dict[str, Any]):
+        """
+        Generate detailed comparison report.
+
+        Args:
+            results: Optimization results
+        """
+        report_path = self.nightly_dir / self.profile.report_filename
+        label = self.profile.model_label
+
+        # Load previous best parameters for comparison
+        previous_params_path = self.output_dir / "model_best_params_3y.json"
+        previous_best = None
+        if previous_params_path.exists():
+            with open(previous_params_path) as f:
+                previous_best = json.load(f)
+
+        with open(report_path, "w") as f:
+            f.write(f"# {self.profile.title} Hyperparameter Optimization Report\n\n")
+            f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+            f.write("## Summary\n\n")
+            f.write(f"- **Best Sharpe Ratio:** {results['best_value']:.4f}\n")
+            f.write(f"- **Total Trials:** {results['total_trials']}\n")
+            f.write(
+                f"- **Optimization Duration:** {results['resource_stats']['elapsed_hours']:.2f} hours\n\n"
+            )
+
+            f.write("## Best Parameters\n\n")
+            f.write("```json\n")
+            f.write(json.dumps(results["best_params"], indent=2))
+            f.write("\n```\n\n")
+
+            if previous_best:
+                f.write("## Comparison with Previous Best (3-Year Model)\n\n")
+                f.write(f"| Parameter | Previous Best | {label} Best | Change |\n")
+                f.write(f"|-----------|---------------|{'-' * (len(label) + 7)}|--------|\n")
+
+                all_params = set(list(results["best_params"].keys()) + list(previous_best.keys()))
+                for param in sorted(all_params):
+                    prev = previous_best.get(param, "N/A")
+                    curr = results["best_params"].get(param, "N/A")
+
+                    if param in [
+                        "learning_rate",
+                        "gamma",
+                        "reg_alpha",
+                        "reg_lambda",
+                        "subsample",
+                        "colsample_bytree",
+                    ]:
+                        if isinstance(prev, (int, float)) and isinstance(curr, (int, float)):
+                            change_pct = ((curr - prev) / prev * 100) if prev != 0 else 0
+                            f.write(f"| {param} | {prev:.4f} | {curr:.4f} | {change_pct:+.1f}% |\n")
+                        else:
+                            f.write(f"| {param} | {prev} | {curr} | - |\n")
+                    else:
+                        f.write(f"| {param} | {prev} | {curr} | - |\n")
+
+                f.write("\n")
+
+            f.write("## Resource Usage\n\n")
+            stats = results["resource_stats"]
+            f.write(
+                f"- **Peak Memory Usage:** {stats['memory_used_gb']:.1f} GB ({stats['memory_percent']:.1f}%)\n"
+            )
+            f.write(f"- **Disk Free:** {stats['disk_free_gb']:.1f} GB\n")
+            f.write(f"- **CPU Usage:** {stats['cpu_percent']:.1f}%\n")
+            f.write(f"- **Elapsed Time:** {stats['elapsed_hours']:.2f} hours\n\n")
+
+            f.write("## Recommendations\n\n")
+            f.write(
+                "1. **Model Deployment:** Consider deploying the new parameters if Sharpe Ratio improvement > 5%\n"
+            )
+            f.write("2. **Next Optimization:** Schedule next run in 3-7 days\n")
+            f.write("3. **Data Freshness:** Ensure data is updated before next optimization\n")
+            f.write("4. **Monitoring:** Monitor model performance after deployment\n")
+
+        logger.info(f"Report generated: {report_path}")
+
+        # Send notification
+        improvement = ""
+        if previous_best and "best_value" in results:
+            # Try to load previous best value
+            previous_results_path = self.output_dir / "hyperopt_results_3y.json"
+            if previous_results_path.exists():
+                try:
+                    with open(previous_results_path) as f:
+                        prev_results = json.load(f)
+                        prev_value = prev_results.get("best_value", 0)
+                        improvement_pct = (
+                            ((results["best_value"] - prev_value) / abs(prev_value) * 100)
+                            if prev_value != 0
+                            else 0
+                        )
+                        improvement = f" ({improvement_pct:+.1f}% change)"
+                except Exception:
+                    pass
+
+        self._send_notification(
+            f"{self.profile.title} hyperopt completed. "
+            f"Best Sharpe: {results['best_value']:.4f}{improvement}. "
+            f"Trials: {results['total_trials']}. Report: {report_path}"
+        )
+
+
+def main(profile: NightlyProfile, argv: list[str] | None = None) -> int:
+    """Command line entry point shared by the nightly hyperopt scripts."""
+    parser = argparse.ArgumentParser(description=profile.description)
+
+    parser.add_argument(
+        "--symbol", type=str, default="BTC/USDT", help="Trading pair (default: BTC/USDT)"
+    )
+    parser.add_argument("--timeframe", type=str, default="5m", help="Timeframe (default: 5m)")
+    parser.add_argument(
+        "--days", type=int, default=1095, help="Number of days to load (default: 1095 for 3 years)"
+    )
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=profile.default_trials,
+        help=f"Number of Optuna trials (default: {profile.default_trials})",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=profile.default_timeout,
+        help=(
+            f"Optimization timeout in seconds (default: {profile.default_timeout} = "
+            f"{profile.default_timeout / 3600:g} hours)"
+        ),
+    )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=profile.default_n_jobs,
+        help=f"Number of parallel Optuna jobs per process (default: {profile.default_n_jobs})",
+    )
+    parser.add_argument(
+        "--n-jobs-xgb",
+        type=int,
+        default=profile.xgb_n_jobs,
+        help=f"Number of jobs for XGBoost (default: {profile.xgb_n_jobs})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes attached to the shared study dataset (default: 1)",
+    )
+    parser.add_argument(
+        "--rebuild-dataset",
+        action="store_true",
+        help="Rebuild features/labels/folds even if a matching study dataset exists",
+    )
+    parser.add_argument(
+        "--no-resume", action="store_true", help="Do not resume from previous study"
+    )
+    parser.add_argument(
+        "--check-data", action="store_true", help="Check data freshness before starting"
+    )
+    parser.add_argument(
+        "--max-data-age", type=int, default=24, help="Maximum data age in hours (default: 24)"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Quick mode (use only recent data for testing)"
+    )
+
+    args = parser.parse_args(argv)
+    if args.n_jobs_xgb != profile.xgb_n_jobs:
+        profile = replace(profile, xgb_n_jobs=args.n_jobs_xgb)
+
+    print("\n" + "=" * 70)
+    print(f"🌙 {profile.title.upper()} HYPERPARAMETER OPTIMIZATION")
+    print("=" * 70)
+    print("\nConfiguration:")
+    print(f"  Symbol:          {args.symbol}")
+    print(f"  Timeframe:       {args.timeframe}")
+    print(f"  Days:            {args.days} ({args.days // 365} years)")
+    print(f"  Trials:          {args.trials}")
+    print(f"  Timeout:         {args.timeout}s ({args.timeout / 3600:.1f}h)")
+    print(f"  N Jobs:          {args.n_jobs} (Optuna)")
+    print(f"  N Jobs XGBoost:  {profile.xgb_n_jobs}")
+    print(f"  Workers:         {args.workers}")
+    print(f"  Resume:          {not args.no_resume}")
+    print(f"  Check Data:      {args.check_data}")
+    print(f"  Max Data Age:    {args.max_data_age}h")
+    print(f"  Quick Mode:      {args.quick}")
+    print("\n" + "=" * 70)
+
+    try:
+        # Initialize optimizer
+        optimizer = NightlyHyperparameterOptimizer(profile)
+
+        # Check data freshness
+        if args.check_data:
+            is_fresh, message = optimizer.check_data_freshness(
+                symbol=args.symbol, timeframe=args.timeframe, max_age_hours=args.max_data_age
+            )
+            if not is_fresh:
+                print(f"\n❌ Data freshness check failed: {message}")
+                print("Consider running data download first:")
+                print("  python scripts/download_data.py --pair BTC/USDT --days 30")
+                return 1
+            print(f"\n✅ {message}")
+
+        # Attach to (or build) the study dataset
+        dataset = optimizer.load_study_dataset(
+            symbol=args.symbol,
+            timeframe=args.timeframe,
+            days=args.days,
+            rebuild=args.rebuild_dataset,
+        )
+
+        # For quick mode, use only recent data
+        tail_rows = None
+        if args.quick:
+            print("\n⚡ Quick mode: Using only 1000 most recent samples")
+            tail_rows = 1000
+            args.trials = min(args.trials, 50)  # Reduce trials for quick mode
+
+        # Run optimization
+        results = optimizer.optimize(
+            dataset,
+            n_trials=args.trials,
+            timeout=args.timeout,
+            n_jobs=args.n_jobs,
+            resume=not args.no_resume,
+            n_workers=args.workers,
+            tail_rows=tail_rows,
+        )
+
+        # Save results
+        optimizer.save_results(results)
+
+        print("\n" + "=" * 70)
+        print(f"✅ {profile.title.upper()} OPTIMIZATION COMPLETED SUCCESSFULLY!")
+        print("=" * 70)
+        print(f"\nBest Sharpe Ratio: {results['best_value']:.4f}")
+        print(f"\nResults saved to: user_data/{profile.output_subdir}/")
+        print(f"Report: user_data/{profile.output_subdir}/{profile.report_filename}")
+        print("\n" + "=" * 70)
+
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Optimization failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(PROFILES["nightly"]))
@@ -0,0 +1,341 @@
+"""
+Study Dataset
+=============
+
+Materialized features, labels and CV folds shared by hyperparameter studies.
+
+Nightly hyperopt used to rebuild features, triple-barrier labels and the
+TimeSeriesSplit folds at the start of every run, before the first trial could
+start. A study dataset is built once per (raw candles, feature config and code,
+labeler config and code, number of folds) and stored as plain .npy files:
+
+    <root_dir>/<key>/
+        X.npy                float32 feature matrix (rows x features)
+        y.npy                int8 binary labels (1 = LONG)
+        close.npy            float64 close prices
+        forward_returns.npy  float64 next-period return per row (NaN on the last row)
+        timestamps.npy       int64 index values (ns)
+        folds.npy            int64 [train_start, train_stop, val_start, val_stop] per fold
+        meta.json            feature names, key components, build time
+
+Arrays are opened with ``mmap_mode="r"``, so every worker process attaches to
+the same page-cache pages instead of recomputing or unpickling copies, and
+folds are slices, so per-fold train/validation sets are views. A later run on
+unchanged candles finds the entry by its key and starts in seconds.
+
+The key hashes the full candle frame, so a run on candles that gained even one
+new bar builds a new entry from scratch: the scaler, the correlated-feature
+filter and the triple-barrier labels near the end all depend on the whole
+window, so an older entry cannot be extended row-by-row without changing its
+values. Entries are bounded instead: after every attach or build the least
+recently used entries are deleted until the root directory fits
+``max_size_mb``.
+
+Usage:
+    dataset = StudyDataset.materialize(ohlcv, FeatureEngineer(), TripleBarrierLabeler())
+    train, val = dataset.folds[0]
+    model.fit(dataset.X[train], dataset.y[train])
+
+    # In a worker process
+    dataset = StudyDataset.attach(path)
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import TimeSeriesSplit
+
+from src.data.loader import get_data_hash
+from src.ml.training.feature_engineering import FeatureEngineer, _code_version
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout or the preparation logic changes
+STUDY_DATASET_VERSION = 1
+
+_ARRAYS = ("X", "y", "close", "forward_returns", "timestamps")
+
+
+def prepare_features_and_labels(
+    df: pd.DataFrame, feature_engineer: FeatureEngineer, labeler: Any
+) -> tuple[pd.DataFrame, pd.Series, pd.Series]:
+    """
+    Engineer features and binary labels aligned on a common index.
+
+    Args:
+        df: OHLCV candles with a DatetimeIndex
+        feature_engineer: Feature engineer (fitted on ``df``)
+        labeler: Labeler with a ``label(df)`` method (e.g. TripleBarrierLabeler)
+
+    Returns:
+        Tuple of (X, y, close_prices); y is 1 for LONG, 0 for NEUTRAL/SHORT
+    """
+    close_prices = df["close"]
+
+    logger.info("Generating features...")
+    X = feature_engineer.fit_transform(df.copy())
+    # Remove non-numeric columns from X to avoid scaler issues
+    X = X.select_dtypes(include=[np.number])
+
+    logger.info("Generating labels...")
+    y = labeler.label(df)
+
+    # Align features, labels, and close prices
+    common_index = X.index.intersection(y.index).intersection(close_prices.index)
+    X = X.loc[common_index]
+    y = y.loc[common_index]
+    close_prices = close_prices.loc[common_index]
+
+    # Convert labels to binary: 1 for LONG (original 1), 0 for NEUTRAL/SHORT (-1, 0)
+    y_binary = (y == 1).astype(int)
+
+    # Remove rows with NaN
+    nan_mask = y_binary.isna() | close_prices.isna()
+    if nan_mask.any():
+        logger.info(f"Removing {nan_mask.sum()} rows with NaN values")
+        X = X[~nan_mask]
+        y_binary = y_binary[~nan_mask]
+        close_prices = close_prices[~nan_mask]
+
+    return X, y_binary, close_prices
+
+
+def fold_slices(n_rows: int, n_splits: int) -> list[tuple[slice, slice]]:
+    """TimeSeriesSplit folds as contiguous (train, validation) slices."""
+    splits = TimeSeriesSplit(n_splits=n_splits).split(np.empty((n_rows, 1)))
+    return [
+        (slice(int(train[0]), int(train[-1]) + 1), slice(int(val[0]), int(val[-1]) + 1))
+        for train, val in splits
+    ]
+
+
+@dataclass
+class StudyDataset:
+    """Memory-mapped features, labels, prices and fold slices of one study."""
+
+    path: Path
+    X: np.ndarray
+    y: np.ndarray
+    close: np.ndarray
+    forward_returns: np.ndarray
+    timestamps: np.ndarray
+    feature_names: list[str]
+    folds: list[tuple[slice, slice]]
+    n_splits: int
+    tz: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(np.asarray(self.timestamps, dtype="datetime64[ns]"))
+        return index.tz_localize("UTC").tz_convert(self.tz) if self.tz else index
+
+    @staticmethod
+    def make_key(
+        data_hash: str, feature_engineer: FeatureEngineer, labeler: Any, n_splits: int
+    ) -> str:
+        """Hash of everything the arrays depend on."""
+        labeler_config = getattr(labeler, "config", None)
+        payload = json.dumps(
+            {
+                "version": STUDY_DATASET_VERSION,
+                "data": data_hash,
+                "features": feature_engineer.cache_fingerprint(),
+                "labeler": type(labeler).__name__,
+                "labeler_code": _code_version(type(labeler)),
+                "labeler_config": asdict(labeler_config) if labeler_config is not None else None,
+                "n_splits": n_splits,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:20]
+
+    @classmethod
+    def materialize(
+        cls,
+        df: pd.DataFrame,
+        feature_engineer: FeatureEngineer,
+        labeler: Any,
+        n_splits: int = 5,
+        root_dir: str | Path = "user_data/cache/study_datasets",
+        rebuild: bool = False,
+        max_size_mb: float = 4000.0,
+    ) -> "StudyDataset":
+        """
+        Attach to the dataset for ``df``, building and persisting it on a miss.
+
+        Args:
+            df: OHLCV candles with a DatetimeIndex
+            feature_engineer: Feature engineer to fit on ``df``
+            labeler: Labeler with a ``label(df)`` method
+            n_splits: Number of TimeSeriesSplit folds
+            root_dir: Directory holding one subdirectory per dataset
+            rebuild: Ignore an existing entry and build it again
+            max_size_mb: Size bound for ``root_dir``; least recently used entries
+                other than this one are evicted to stay under it
+
+        Returns:
+            Memory-mapped StudyDataset
+        """
+        start = time.perf_counter()
+        key = cls.make_key(get_data_hash(df), feature_engineer, labeler, n_splits)
+        path = Path(root_dir) / key
+
+        if not rebuild and (path / "meta.json").exists():
+            try:
+                dataset = cls.attach(path)
+                logger.info(
+                    f"Study dataset {key} attached in {time.perf_counter() - start:.2f}s "
+                    f"({len(dataset)} samples, {len(dataset.feature_names)} features)"
+                )
+                cls._touch(path)
+                cls._evict(Path(root_dir), max_size_mb, keep=path)
+                return dataset
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Rebuilding unreadable study dataset {key}: {e}")
+
+        X, y, close_prices = prepare_features_and_labels(df, feature_engineer, labeler)
+        cls._write(path, X, y, close_prices, n_splits, key)
+        dataset = cls.attach(path)
+        logger.info(
+            f"Study dataset {key} built in {time.perf_counter() - start:.2f}s "
+            f"({len(dataset)} samples, {len(dataset.feature_names)} features)"
+        )
+        cls._evict(Path(root_dir), max_size_mb, keep=path)
+        return dataset
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        """Mark an entry as used; eviction goes by the mtime of ``meta.json``."""
+        try:
+            os.utime(path / "meta.json")
+        except OSError:
+            pass
+
+    @staticmethod
+    def _evict(root_dir: Path, max_size_mb: float, keep: Path) -> None:
+        """Delete least recently used entries until ``root_dir`` fits ``max_size_mb``."""
+        max_bytes = max_size_mb * 1e6
+        entries = []
+        for meta_path in root_dir.glob("*/meta.json"):
+            entry = meta_path.parent
+            # In-progress builds live in "<key>.tmp-<pid>" and have no meta.json yet
+            try:
+                last_used = meta_path.stat().st_mtime
+                size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+            except OSError:
+                continue
+            entries.append((last_used, size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= max_bytes:
+                break
+            if entry == keep:
+                continue
+            # Workers that still map the arrays keep reading them: on POSIX this only
+            # drops the names; where mapped files cannot be deleted it is retried later
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted study dataset {entry.name} ({size / 1e6:.1f} MB)")
+
+    @classmethod
+    def attach(cls, path: str | Path) -> "StudyDataset":
+        """Open a persisted dataset read-only and memory-mapped."""
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+        bounds = np.load(path / "folds.npy")
+        return cls(
+            path=path,
+            feature_names=meta["feature_names"],
+            folds=[(slice(int(a), int(b)), slice(int(c), int(d))) for a, b, c, d in bounds],
+            n_splits=meta["n_splits"],
+            tz=meta.get("tz"),
+            **arrays,
+        )
+
+    @classmethod
+    def _write(
+        cls,
+        path: Path,
+        X: pd.DataFrame,
+        y: pd.Series,
+        close_prices: pd.Series,
+        n_splits: int,
+        key: str,
+    ) -> None:
+        """Write all arrays into a temporary directory and rename it into place."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+
+        index = X.index
+        tz = str(index.tz) if getattr(index, "tz", None) is not None else None
+        timestamps = index.tz_convert("UTC").tz_localize(None) if tz else index
+        arrays = {
+            "X": np.ascontiguousarray(X.to_numpy(dtype=np.float32)),
+            "y": y.to_numpy(dtype=np.int8),
+            "close": close_prices.to_numpy(dtype=np.float64),
+            # Next-period return, NaN on the last row (no next close)
+            "forward_returns": close_prices.pct_change().shift(-1).to_numpy(dtype=np.float64),
+            "timestamps": np.asarray(timestamps, dtype="datetime64[ns]").view(np.int64),
+        }
+        try:
+            for name, values in arrays.items():
+                np.save(tmp / f"{name}.npy", values)
+            bounds = [(t.start, t.stop, v.start, v.stop) for t, v in fold_slices(len(X), n_splits)]
+            np.save(tmp / "folds.npy", np.asarray(bounds, dtype=np.int64).reshape(-1, 4))
+            meta = {
+                "key": key,
+                "version": STUDY_DATASET_VERSION,
+                "feature_names": [str(c) for c in X.columns],
+                "n_splits": n_splits,
+                "rows": len(X),
+                "tz": tz,
+                "created": time.time(),
+            }
+            # meta.json last: its presence marks a complete entry
+            (tmp / "meta.json").write_text(json.dumps(meta))
+            if path.exists():
+                shutil.rmtree(path)
+            os.replace(tmp, path)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def tail(self, n: int) -> "StudyDataset":
+        """The last ``n`` rows (views) with folds recomputed for them."""
+        start = max(0, len(self) - n)
+        return replace(
+            self,
+            X=self.X[start:],
+            y=self.y[start:],
+            close=self.close[start:],
+            forward_returns=self.forward_returns[start:],
+            timestamps=self.timestamps[start:],
+            folds=fold_slices(len(self) - start, self.n_splits),
+        )
+
+    def to_frame(self) -> tuple[pd.DataFrame, pd.Series, pd.Series]:
+        """Materialize (X, y, close_prices) as pandas objects (copies)."""
+        index = self.index
+        X = pd.DataFrame(np.asarray(self.X), index=index, columns=self.feature_names)
+        y = pd.Series(np.asarray(self.y, dtype=int), index=index)
+        close_prices = pd.Series(np.asarray(self.close), index=index, name="close")
+        return X, y, close_prices
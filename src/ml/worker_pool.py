@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+ML Worker Pool
+==============
+
+Multi-process consumers for the ``ml:requests:{model}`` queues.
+
+Each worker process:
+- pins itself to one core (single-threaded BLAS/OpenMP, so processes do not
+  oversubscribe the machine)
+- loads the production models from ``ModelRegistry`` once via ``ModelLoader``
+- drains requests in batches (``InferenceWorker``: BRPOP + RPOP COUNT, or
+  XREADGROUP on streams) and scores every model's rows with one vectorized
+  ``predict_proba`` call
+- watches the registry file and hot-swaps a newly promoted model: the new
+  version is loaded and warmed up in a thread while the old one keeps
+  serving, then replaces it between two batches, so no request is dropped
+
+Requests sent by ``MLInferenceService`` either way are answered: binary
+batches from ``PipelinedInferenceTransport`` go to the client's reply list,
+legacy JSON requests to ``ml:results``.
+
+``MLWorkerPool`` runs the processes, restarts dead ones and reports
+throughput (rows/s per worker) and queue depth (messages per model) through
+``TradingMetricsExporter``.
+
+Usage:
+    pool = MLWorkerPool(WorkerPoolConfig(models=["trend_classifier"], n_workers=4))
+    pool.start()
+    await pool.monitor()
+
+    python -m src.ml.worker_pool --models trend_classifier --workers 4
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from .batch_inference import BatchInferenceConfig, BatchInferenceEngine
+from .inference_transport import InferenceWorker, TransportConfig
+from .model_loader import ModelLoader
+
+# Try to import metrics exporter
+try:
+    from src.monitoring.metrics_exporter import get_exporter
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Per-worker counters in the shared stats array
+_COUNTERS = ("messages", "batches", "rows", "expired_rows", "errors", "swaps", "heartbeat")
+_N_COUNTERS = len(_COUNTERS)
+
+_THREAD_ENV = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+@dataclass
+class WorkerPoolConfig:
+    """Configuration for the ML worker pool."""
+
+    models: list[str]
+    redis_url: str = "redis://localhost:6379"
+    registry_dir: str | None = None  # Default: <models_dir>/registry
+    n_workers: int = 2
+    pin_cores: bool = True
+    cores: list[int] | None = None  # Default: cores this process may run on
+    reload_interval: float = 5.0  # Seconds between registry checks (hot swap)
+    stats_interval: float = 1.0  # Seconds between shared-counter updates
+    transport: TransportConfig = field(default_factory=TransportConfig)
+    batch: BatchInferenceConfig = field(default_factory=BatchInferenceConfig)
+
+
+def _available_cores() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _pin_to_cores(cores: list[int] | None) -> None:
+    if not cores:
+        return
+    if not hasattr(os, "sched_setaffinity"):
+        logger.info("CPU pinning not supported on this platform")
+        return
+    try:
+        os.sched_setaffinity(0, cores)
+    except OSError as e:
+        logger.warning(f"Could not pin worker to cores {cores}: {e}")
+
+
+@contextlib.contextmanager
+def _single_threaded_env() -> Iterator[None]:
+    """Spawned children inherit single-threaded BLAS/OpenMP settings."""
+    saved = {name: os.environ.get(name) for name in _THREAD_ENV}
+    for name in _THREAD_ENV:
+        os.environ.setdefault(name, "1")
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+class ModelServer:
+    """One worker process: registry-backed models, batch consumer and hot swap."""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        config: WorkerPoolConfig,
+        consumer_name: str,
+        counters: Any = None,
+        slot: int = 0,
+        loader: ModelLoader | None = None,
+    ):
+        self.config = config
+        self.loader = loader or ModelLoader(config.registry_dir)
+        self.engine = BatchInferenceEngine(config.batch)
+        self.worker = InferenceWorker(
+            redis_client, self.engine, config.models, config.transport, consumer_name
+        )
+        self.versions: dict[str, str] = {}
+        self.swaps = 0
+        self._counters = counters
+        self._offset = slot * _N_COUNTERS
+        self._registry_mtime = self._registry_stamp()
+
+    def _registry_stamp(self) -> int:
+        try:
+            return self.loader.registry.registry_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    async def load(self, model_name: str) -> bool:
+        """Load and warm up the production version in a thread, then swap it in."""
+        model, metadata = await asyncio.to_thread(self.loader.load_production_model, model_name)
+        if model is None:
+            logger.warning(f"No loadable production model for {model_name}")
+            return False
+        await asyncio.to_thread(
+            self.engine.register_model, model_name, model, metadata.feature_names or None
+        )
+        previous = self.versions.get(model_name)
+        self.versions[model_name] = metadata.version
+        if previous is not None:
+            self.swaps += 1
+            logger.info(f"Hot-swapped {model_name}: v{previous} -> v{metadata.version}")
+        return True
+
+    async def load_all(self) -> None:
+        for model_name in self.config.models:
+            await self.load(model_name)
+
+    async def check_registry(self) -> list[str]:
+        """Reload the registry if it changed; swap models whose production version moved."""
+        stamp = self._registry_stamp()
+        if stamp == self._registry_mtime:
+            return []
+        self._registry_mtime = stamp
+        self.loader.registry.reload()
+
+        swapped = []
+        for model_name in self.config.models:
+            metadata = self.loader.registry.get_production_model(model_name)
+            if metadata is not None and metadata.version != self.versions.get(model_name):
+                if await self.load(model_name):
+                    swapped.append(model_name)
+        return swapped
+
+    def publish_stats(self) -> None:
+        if self._counters is None:
+            return
+        stats = {**self.worker.get_stats(), "swaps": self.swaps, "heartbeat": time.time()}
+        for i, name in enumerate(_COUNTERS):
+            self._counters[self._offset + i] = stats[name]
+
+    async def _watch_registry(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.reload_interval)
+            try:
+                await self.check_registry()
+            except Exception as e:
+                logger.error(f"Registry check failed: {e}")
+
+    async def _publish_loop(self) -> None:
+        while True:
+            self.publish_stats()
+            await asyncio.sleep(self.config.stats_interval)
+
+    async def serve(self, stop_event: Any = None) -> None:
+        """Serve until ``stop_event`` (a multiprocessing/threading Event) is set."""
+        await self.load_all()
+        tasks = [
+            asyncio.create_task(self.worker.run()),
+            asyncio.create_task(self._watch_registry()),
+            asyncio.create_task(self._publish_loop()),
+        ]
+        try:
+            while stop_event is None or not stop_event.is_set():
+                await asyncio.sleep(0.2)
+        finally:
+            self.worker.stop()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.publish_stats()
+
+
+def _worker_main(
+    index: int, config: WorkerPoolConfig, cores: list[int] | None, counters: Any, stop_event: Any
+) -> None:
+    """Process entry point."""
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s [ml-worker-{index}] %(message)s")
+    _pin_to_cores(cores)
+
+    async def main():
+        import redis.asyncio as redis
+
+        client = redis.from_url(config.redis_url, decode_responses=False)
+        server = ModelServer(client, config, f"ml-worker-{os.getpid()}", counters, index)
+        try:
+            await server.serve(stop_event)
+        finally:
+            await client.aclose()
+
+    asyncio.run(main())
+
+
+class MLWorkerPool:
+    """Runs, supervises and reports on ``ModelServer`` processes."""
+
+    def __init__(self, config: WorkerPoolConfig):
+        if config.n_workers < 1:
+            raise ValueError("n_workers must be at least 1")
+        self.config = config
+        self._context = multiprocessing.get_context("spawn")
+        self._counters = self._context.Array("d", config.n_workers * _N_COUNTERS, lock=False)
+        self._stop_event = self._context.Event()
+        self._processes: list[Any] = [None] * config.n_workers
+        self._last_sample: tuple[float, list[float]] | None = None
+        self.restarts = 0
+
+    def worker_cores(self, index: int) -> list[int] | None:
+        if not self.config.pin_cores:
+            return None
+        cores = self.config.cores or _available_cores()
+        return [cores[index % len(cores)]]
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, self.config, self.worker_cores(index), self._counters, self._stop_event),
+            name=f"ml-worker-{index}",
+            daemon=True,
+        )
+        with _single_threaded_env():
+            process.start()
+        self._processes[index] = process
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        for index in range(self.config.n_workers):
+            self._spawn(index)
+        logger.info(
+            f"Started {self.config.n_workers} ML workers for {self.config.models} "
+            f"({self.config.transport.mode} mode)"
+        )
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop_event.set()
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout)
+        logger.info("ML worker pool stopped")
+
+    def ensure_alive(self) -> int:
+        """Restart worker processes that exited; returns the number restarted."""
+        restarted = 0
+        if self._stop_event.is_set():
+            return restarted
+        for index, process in enumerate(self._processes):
+            if process is not None and not process.is_alive():
+                logger.warning(f"ML worker {index} exited ({process.exitcode}), restarting")
+                self._spawn(index)
+                restarted += 1
+        self.restarts += restarted
+        return restarted
+
+    def get_stats(self) -> dict[str, Any]:
+        """Per-worker counters, liveness and rows/s since the previous call."""
+        now = time.time()
+        counters = list(self._counters)
+        rows_index = _COUNTERS.index("rows")
+        previous = self._last_sample
+        self._last_sample = (now, counters)
+
+        workers = []
+        for index, process in enumerate(self._processes):
+            values = counters[index * _N_COUNTERS : (index + 1) * _N_COUNTERS]
+            stats = {name: values[i] for i, name in enumerate(_COUNTERS)}
+            throughput = 0.0
+            if previous is not None and now > previous[0]:
+                before = previous[1][index * _N_COUNTERS + rows_index]
+                throughput = (stats["rows"] - before) / (now - previous[0])
+            workers.append(
+                {
+                    "index": index,
+                    "pid": process.pid if process is not None else None,
+                    "alive": process is not None and process.is_alive(),
+                    "cores": self.worker_cores(index),
+                    "rows_per_second": throughput,
+                    **stats,
+                }
+            )
+        return {
+            "workers": workers,
+            "rows": sum(w["rows"] for w in workers),
+            "rows_per_second": sum(w["rows_per_second"] for w in workers),
+            "restarts": self.restarts,
+        }
+
+    async def queue_depths(self, redis_client: Any) -> dict[str, int]:
+        """Pending request messages per model queue (LLEN or XLEN)."""
+        transport = self.config.transport
+        pipe = redis_client.pipeline(transaction=False)
+        for model_name in self.config.models:
+            key = transport.request_key(model_name)
+            if transport.mode == "stream":
+                pipe.xlen(key)
+            else:
+                pipe.llen(key)
+        depths = await pipe.execute()
+        return {name: int(depth) for name, depth in zip(self.config.models, depths, strict=True)}
+
+    async def report_metrics(self, redis_client: Any) -> dict[str, Any]:
+        stats = self.get_stats()
+        stats["queue_depth"] = await self.queue_depths(redis_client)
+        if METRICS_AVAILABLE:
+            exporter = get_exporter()
+            for model_name, depth in stats["queue_depth"].items():
+                exporter.record_ml_queue_depth(model_name, depth)
+            for worker in stats["workers"]:
+                exporter.record_ml_worker_throughput(
+                    str(worker["index"]), worker["rows_per_second"]
+                )
+        return stats
+
+    async def monitor(self, interval: float = 5.0, redis_client: Any = None) -> None:
+        """Restart dead workers and export metrics every ``interval`` seconds."""
+        if redis_client is None:
+            import redis.asyncio as redis
+
+            redis_client = redis.from_url(self.config.redis_url, decode_responses=False)
+        while not self._stop_event.is_set():
+            self.ensure_alive()
+            try:
+                stats = await self.report_metrics(redis_client)
+                logger.info(
+                    f"ML workers: {stats['rows_per_second']:.0f} rows/s, "
+                    f"queue depth {stats['queue_depth']}"
+                )
+            except Exception as e:
+                logger.warning(f"Failed to report ML worker metrics: {e}")
+            await asyncio.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ML inference worker pool")
+    parser.add_argument("--models", nargs="+", required=True, help="Model names to serve")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379"))
+    parser.add_argument("--registry-dir", default=None, help="Model registry directory")
+    parser.add_argument("--mode", choices=["list", "stream"], default="list")
+    parser.add_argument("--no-pin", action="store_true", help="Do not pin workers to cores")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    pool = MLWorkerPool(
+        WorkerPoolConfig(
+            models=args.models,
+            redis_url=args.redis_url,
+            registry_dir=args.registry_dir,
+            n_workers=args.workers,
+            pin_cores=not args.no_pin,
+            transport=TransportConfig(mode=args.mode),
+        )
+    )
+    pool.start()
+    try:
+        asyncio.run(pool.monitor())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
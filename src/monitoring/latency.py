@@ -0,0 +1,103 @@
+"""
+Stoic Citadel - In-Process Latency Histograms
+==============================================
+
+Constant-memory latency histograms for hot paths (stream aggregation,
+inference, persistence) where per-sample storage or a Prometheus round trip
+per observation is too expensive.
+
+Buckets are log-spaced (about 9% relative width), so recording is O(1) and
+percentiles are accurate to one bucket regardless of the number of samples.
+
+Usage:
+    hist = LatencyHistogram()
+    start = time.perf_counter()
+    ...
+    hist.record(time.perf_counter() - start)
+    hist.summary()  # {"count": ..., "p50_ms": ..., "p99_ms": ...}
+"""
+
+import math
+from typing import Any
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (values in seconds)."""
+
+    __slots__ = ("_counts", "_log_base", "_log_min", "count", "max", "min", "min_value", "total")
+
+    def __init__(self, min_value: float = 1e-6, max_value: float = 60.0, base: float = 2**0.125):
+        self.min_value = min_value
+        self._log_min = math.log(min_value)
+        self._log_base = math.log(base)
+        n_buckets = math.ceil((math.log(max_value) - self._log_min) / self._log_base) + 2
+        self._counts = [0] * n_buckets
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one observation."""
+        if seconds <= self.min_value:
+            index = 0
+        else:
+            index = min(
+                int((math.log(seconds) - self._log_min) / self._log_base) + 1,
+                len(self._counts) - 1,
+            )
+        self._counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def _upper_bound(self, index: int) -> float:
+        return math.exp(self._log_min + index * self._log_base)
+
+    def percentile(self, q: float) -> float:
+        """Approximate ``q``-th percentile (0-100) in seconds (bucket upper bound)."""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self._counts):
+            cumulative += bucket_count
+            if cumulative >= rank and bucket_count:
+                return min(max(self._upper_bound(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the observations of a histogram with the same bucket layout."""
+        if len(other._counts) != len(self._counts) or other._log_base != self._log_base:
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for index, bucket_count in enumerate(other._counts):
+            self._counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def summary(self) -> dict[str, Any]:
+        """Count plus mean / p50 / p90 / p99 / max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": self.mean * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p90_ms": self.percentile(90) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
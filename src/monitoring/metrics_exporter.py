@@ -129,6 +129,13 @@ class TradingMetricsExporter:
             buckets=[0.1, 0.5, 1, 5, 10, 50, 100],
         )
 
+        self.aggregation_latency = Histogram(
+            f"{self.namespace}_aggregation_latency_ms",
+            "Market data update-to-emit latency of the aggregator in milliseconds",
+            ["symbol"],
+            buckets=[0.05, 0.1, 0.5, 1, 5, 10, 50, 100, 500],
+        )
+
         # Smart limit order metrics
         self.fee_savings_total = Gauge(
             f"{self.namespace}_fee_savings_total_usd",
@@ -169,6 +176,30 @@ class TradingMetricsExporter:
             ["model", "prediction_type"],
         )
 
+        self.prediction_cache_events = Counter(
+            f"{self.namespace}_prediction_cache_events_total",
+            "Prediction cache hits, misses, evictions and expirations",
+            ["tier", "event"],
+        )
+
+        self.prediction_cache_size = Gauge(
+            f"{self.namespace}_prediction_cache_size",
+            "Number of entries in the prediction cache",
+            ["tier"],
+        )
+
+        self.ml_request_queue_depth = Gauge(
+            f"{self.namespace}_ml_request_queue_depth",
+            "Pending inference request messages per model queue",
+            ["model"],
+        )
+
+        self.ml_worker_throughput = Gauge(
+            f"{self.namespace}_ml_worker_throughput_rps",
+            "Rows scored per second by each ML worker process",
+            ["worker"],
+        )
+
         # HRP Metrics
         self.hrp_weights = Gauge(
             f"{self.namespace}_hrp_asset_weight", "Calculated HRP weight for an asset", ["asset"]
@@ -341,6 +372,38 @@ class TradingMetricsExporter:
         if self.trading_metrics:
             self.trading_metrics.observe_latency(latency_ms / 1000.0, "strategy")
 
+    def record_prediction_cache(
+        self, tier: str, counts: dict[str, int], size: int | None = None
+    ) -> None:
+        """
+        Record prediction cache counter increments.
+
+        Args:
+            tier: Cache tier ("l1", "redis")
+            counts: Increments per event (hits, misses, evictions, ...)
+            size: Current number of entries, if known
+        """
+        if not self._enabled:
+            return
+
+        for event, count in counts.items():
+            if count > 0:
+                self.prediction_cache_events.labels(tier=tier, event=event).inc(count)
+        if size is not None:
+            self.prediction_cache_size.labels(tier=tier).set(size)
+
+    def record_ml_queue_depth(self, model: str, depth: int) -> None:
+        """Record the number of pending request messages for a model."""
+        if not self._enabled:
+            return
+        self.ml_request_queue_depth.labels(model=model).set(depth)
+
+    def record_ml_worker_throughput(self, worker: str, rows_per_second: float) -> None:
+        """Record the scoring throughput of one ML worker process."""
+        if not self._enabled:
+            return
+        self.ml_worker_throughput.labels(worker=worker).set(rows_per_second)
+
     def record_ws_metrics(self, symbol: str, spread_pct: float, imbalance: float) -> None:
         """Record real-time market microstructure metrics."""
         if not self._enabled:
@@ -354,6 +417,12 @@ class TradingMetricsExporter:
             return
         self.ws_message_latency.observe(latency_ms)
 
+    def record_aggregation_latency(self, symbol: str, latency_ms: float) -> None:
+        """Record aggregator update-to-emit latency for a symbol."""
+        if not self._enabled:
+            return
+        self.aggregation_latency.labels(symbol=symbol).observe(latency_ms)
+
     def record_hrp_weights(self, weights: dict) -> None:
         """Record HRP weights."""
         if not self._enabled:
@@ -9,6 +9,8 @@ Key Features:
 2. Idempotency key support (prevents duplicate orders)
 3. Order state recovery after restart
 4. Atomic operations with transaction support
+5. High-throughput write path: persistent per-thread connections, WAL,
+   group commit of writes and an in-memory front for duplicate checks
 
 Critical for Production:
 - Prevents duplicate orders on restart/retry
@@ -32,13 +34,26 @@ Usage:
 
     # Recover state after restart
     active_orders = ledger.get_active_orders()
+
+    # Flush queued status updates and release connections on shutdown
+    ledger.close()
 """
 
+import asyncio
+import atexit
+import hashlib
 import json
 import logging
+import math
+import queue
 import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -51,6 +66,99 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_JOURNAL_MODES = {"WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+@dataclass
+class LedgerConfig:
+    """Configuration for the order ledger storage engine."""
+
+    # SQLite tuning (per connection)
+    journal_mode: str = "WAL"  # Readers never block the writer
+    synchronous: str = "NORMAL"  # Safe with WAL on app crash; FULL also survives power loss
+    cache_size_kb: int = 16384
+    mmap_size_mb: int = 256
+    busy_timeout_ms: int = 5000
+
+    # Writes
+    group_commit: bool = True  # All writes go through one batching writer thread
+    async_status_updates: bool = True  # Status updates return before they are committed
+    max_batch_size: int = 512  # Max writes per transaction
+    max_queue_size: int = 10_000  # Producers block (backpressure) beyond this
+
+    # In-memory front for is_duplicate (0 disables it)
+    bloom_capacity: int = 1_000_000
+    bloom_error_rate: float = 1e-4
+    recent_keys: int = 100_000  # LRU of keys known to be stored
+
+    def __post_init__(self):
+        self.journal_mode = self.journal_mode.upper()
+        self.synchronous = self.synchronous.upper()
+        if self.journal_mode not in _JOURNAL_MODES:
+            raise ValueError(f"Unsupported journal_mode: {self.journal_mode}")
+        if self.synchronous not in _SYNCHRONOUS:
+            raise ValueError(f"Unsupported synchronous mode: {self.synchronous}")
+
+
+def _status_value(status: Any) -> str:
+    """Plain status string (``OrderStatus.FILLED`` -> ``"filled"``)."""
+    return str(getattr(status, "value", status))
+
+
+class _DuplicateFilter:
+    """
+    Bloom filter plus LRU of idempotency keys in front of the database.
+
+    A key missing from the Bloom filter was never stored, a key in the LRU
+    certainly was; anything else (a possible false positive) needs a query.
+    Assumes this process is the only writer of the ledger.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, recent: int):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.recent: OrderedDict[str, None] = OrderedDict()
+        self.max_recent = recent
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        """Mark ``key`` as possibly stored (call before the insert commits)."""
+        with self._lock:
+            for pos in self._positions(key):
+                self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def remember(self, key: str) -> None:
+        """Record ``key`` as stored."""
+        self.add(key)
+        with self._lock:
+            self.recent[key] = None
+            self.recent.move_to_end(key)
+            if len(self.recent) > self.max_recent:
+                self.recent.popitem(last=False)
+
+    def lookup(self, key: str) -> bool | None:
+        """False: never stored; True: stored; None: unknown, ask the database."""
+        positions = self._positions(key)
+        with self._lock:
+            if not all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in positions):
+                return False
+            if key in self.recent:
+                self.recent.move_to_end(key)
+                return True
+        return None
+
+    def forget_recent(self) -> None:
+        with self._lock:
+            self.recent.clear()
+
 
 class OrderLedger:
     """
@@ -58,6 +166,15 @@ class OrderLedger:
 
     Thread-safe SQLite database for storing all orders.
 
+    Each thread keeps one persistent connection (WAL, tuned pragmas). With
+    ``group_commit`` every write is handed to a single writer thread that
+    commits everything queued in one transaction, so a storm of chase-limit
+    status updates costs one commit per batch instead of one per update.
+    ``store_order`` still waits for its own commit, so idempotency holds
+    across restarts; status updates of known orders are fire-and-forget unless
+    ``wait=True``.
+    Reads flush queued writes first, so they always see them.
+
     Schema:
         orders table:
             - order_id: PRIMARY KEY
@@ -75,36 +192,76 @@ class OrderLedger:
             - order_data: JSON (full order object)
     """
 
-    def __init__(self, db_path: str = "data/orders.db"):
+    def __init__(self, db_path: str = "data/orders.db", config: LedgerConfig | None = None):
         """
         Initialize order ledger.
 
         Args:
             db_path: Path to SQLite database file
+            config: Storage engine configuration
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.config = config or LedgerConfig()
+
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] | None = []  # None once closed
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=self.config.max_queue_size)
+        self._writer: threading.Thread | None = None
+        self._unflushed = 0  # Writes queued without a waiting caller
+        self._closed = False
 
         self._create_tables()
+
+        # LRU of order ids known to exist: only their status updates skip the wait
+        self._known_orders: OrderedDict[str, None] = OrderedDict()
+        self._known_lock = threading.Lock()
+
+        self._duplicates: _DuplicateFilter | None = None
+        if self.config.bloom_capacity > 0:
+            self._duplicates = _DuplicateFilter(
+                self.config.bloom_capacity, self.config.bloom_error_rate, self.config.recent_keys
+            )
+            with self._get_connection() as conn:
+                for (key,) in conn.execute("SELECT idempotency_key FROM orders"):
+                    if key is not None:
+                        self._duplicates.add(key)
+
         logger.info(f"Order ledger initialized: {self.db_path}")
 
-    @contextmanager
-    def _get_connection(self):
-        """Get database connection with automatic commit/rollback."""
+    def _connect(self) -> sqlite3.Connection:
+        cfg = self.config
         conn = sqlite3.connect(
             self.db_path,
-            isolation_level="DEFERRED",  # Transaction support
-            check_same_thread=False,  # Allow multi-threading
+            isolation_level="IMMEDIATE",  # Take the write lock up front, no upgrade deadlocks
+            check_same_thread=False,  # Closed from whichever thread calls close()
         )
         conn.row_factory = sqlite3.Row  # Return dict-like rows
+        conn.execute(f"PRAGMA busy_timeout = {int(cfg.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA journal_mode = {cfg.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {cfg.synchronous}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute(f"PRAGMA cache_size = {-int(cfg.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size = {int(cfg.mmap_size_mb) * 1024 * 1024}")
+        return conn
+
+    @contextmanager
+    def _get_connection(self):
+        """Get this thread's persistent connection with automatic commit/rollback."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._lock:
+                if self._connections is None:
+                    raise RuntimeError("Order ledger is closed")
+                conn = self._local.conn = self._connect()
+                self._connections.append(conn)
         try:
             yield conn
             conn.commit()
         except Exception:
             conn.rollback()
             raise
-        finally:
-            conn.close()
 
     def _create_tables(self):
         """Create database tables if they don't exist."""
@@ -147,24 +304,215 @@ class OrderLedger:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_status ON orders (status)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_symbol ON orders (symbol)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON orders (created_at)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_updates_order_id ON order_updates (order_id)"
+            )
 
         logger.info("Database tables created/verified")
 
+    # -- write path -------------------------------------------------------------------
+
+    def _insert_order(self, conn: sqlite3.Connection, row: tuple) -> bool:
+        cursor = conn.execute(
+            """
+            INSERT INTO orders (
+                order_id, idempotency_key, client_order_id,
+                exchange_order_id, symbol, order_type, side,
+                quantity, price, status, created_at, updated_at,
+                order_data
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT DO NOTHING
+        """,
+            row,
+        )
+        if cursor.rowcount:
+            return True
+        order_id, idempotency_key = row[0], row[1]
+        if conn.execute(
+            "SELECT 1 FROM orders WHERE idempotency_key = ? LIMIT 1", (idempotency_key,)
+        ).fetchone():
+            return False
+        raise sqlite3.IntegrityError(f"UNIQUE constraint failed: orders.order_id ({order_id})")
+
+    def _apply_status(
+        self,
+        conn: sqlite3.Connection,
+        order_id: str,
+        new_status: str,
+        update_data: dict | None,
+        updated_at: str,
+    ) -> str:
+        row = conn.execute("SELECT status FROM orders WHERE order_id = ?", (order_id,)).fetchone()
+        if not row:
+            raise ValueError(f"Order {order_id} not found")
+        old_status = row["status"]
+        conn.execute(
+            "UPDATE orders SET status = ?, updated_at = ? WHERE order_id = ?",
+            (new_status, updated_at, order_id),
+        )
+        conn.execute(
+            """
+            INSERT INTO order_updates (
+                order_id, old_status, new_status, updated_at, update_data
+            ) VALUES (?, ?, ?, ?, ?)
+        """,
+            (order_id, old_status, new_status, updated_at, json.dumps(update_data or {})),
+        )
+        logger.debug(f"Updated order {order_id}: {old_status} → {new_status}")
+        return old_status
+
+    def _apply_batch(self, batch: list[tuple[str, tuple, Future, bool]]) -> None:
+        """Run queued writes in one transaction and resolve their futures."""
+        handlers = {"insert": self._insert_order, "status": self._apply_status}
+        outcomes = []
+        try:
+            with self._get_connection() as conn:
+                for op, args, _, _ in batch:
+                    if op == "flush":
+                        outcomes.append((None, None))
+                        continue
+                    try:
+                        outcomes.append((handlers[op](conn, *args), None))
+                    except (sqlite3.IntegrityError, ValueError) as e:
+                        outcomes.append((None, e))
+        except Exception as e:  # The commit itself failed: nothing in the batch is stored
+            outcomes = [(None, e)] * len(batch)
+
+        detached = 0
+        for (op, args, future, waited), (result, error) in zip(batch, outcomes, strict=True):
+            if not waited and op != "flush":
+                detached += 1
+                if error is not None:
+                    logger.error(f"Ledger {op} of {args[0]} failed: {error}")
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+        if detached:
+            with self._lock:
+                self._unflushed -= detached
+
+    def _writer_loop(self) -> None:
+        max_batch = self.config.max_batch_size
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._apply_batch(batch)
+            if stop:
+                return
+
+    def _submit(self, op: str, args: tuple, wait: bool) -> Future:
+        """Hand a write to the writer thread (or run it inline without group commit)."""
+        future: Future = Future()
+        item = (op, args, future, wait)
+        if not self.config.group_commit:
+            self._apply_batch([item])
+            return future
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Order ledger is closed")
+            if not wait:
+                self._unflushed += 1
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="order-ledger-writer", daemon=True
+                )
+                self._writer.start()
+                atexit.register(self.close)
+        self._queue.put(item)  # Outside the lock: the writer takes it after each batch
+        return future
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until every queued write is committed."""
+        if self._unflushed and self._writer is not None:
+            self._submit("flush", (), wait=True).result(timeout)
+
+    def close(self) -> None:
+        """Commit queued writes, stop the writer thread and close all connections."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+            atexit.unregister(self.close)
+            # Writes enqueued while closing landed behind the stop marker
+            leftovers = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    leftovers.append(item)
+            if leftovers:
+                self._apply_batch(leftovers)
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = None
+        logger.info(f"Order ledger closed: {self.db_path}")
+
+    def __enter__(self) -> "OrderLedger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _remember_order(self, order_id: str) -> None:
+        with self._known_lock:
+            self._known_orders[order_id] = None
+            self._known_orders.move_to_end(order_id)
+            if len(self._known_orders) > self.config.recent_keys:
+                self._known_orders.popitem(last=False)
+
+    def _is_known_order(self, order_id: str) -> bool:
+        with self._known_lock:
+            return order_id in self._known_orders
+
+    # -- public API -------------------------------------------------------------------
+
     def is_duplicate(self, idempotency_key: str) -> bool:
         """
         Check if order with this idempotency key already exists.
 
+        Answered from memory when possible: a Bloom filter rules out new keys
+        and an LRU confirms recently stored ones; only possible false positives
+        reach the database.
+
         Args:
             idempotency_key: Unique key for this order
 
         Returns:
             True if order already exists, False otherwise
         """
+        if self._duplicates is not None:
+            known = self._duplicates.lookup(idempotency_key)
+            if known is not None:
+                return known
+
         with self._get_connection() as conn:
             cursor = conn.execute(
                 "SELECT 1 FROM orders WHERE idempotency_key = ? LIMIT 1", (idempotency_key,)
             )
-            return cursor.fetchone() is not None
+            exists = cursor.fetchone() is not None
+        if exists and self._duplicates is not None:
+            self._duplicates.remember(idempotency_key)
+        return exists
 
     def store_order(
         self,
@@ -174,6 +522,9 @@ class OrderLedger:
         """
         Store order in ledger.
 
+        Returns once the insert is committed (group-committed with concurrent
+        writers), so a stored key is never lost on restart.
+
         Args:
             order: Order object to store
             idempotency_key: Optional idempotency key (defaults to order_id)
@@ -182,6 +533,9 @@ class OrderLedger:
             True if stored successfully, False if duplicate
         """
         idempotency_key = idempotency_key or order.order_id
+        if self._duplicates is not None and self._duplicates.lookup(idempotency_key):
+            logger.warning(f"Duplicate order detected: {idempotency_key}")
+            return False
 
         # Convert order to dict for JSON storage
         if hasattr(order, "__dict__"):
@@ -193,94 +547,66 @@ class OrderLedger:
             order_dict = dict(order)
 
         order_json = json.dumps(order_dict, default=str)
+        now = datetime.now()
+        row = (
+            order.order_id,
+            idempotency_key,
+            getattr(order, "client_order_id", None),
+            getattr(order, "exchange_order_id", None),
+            order.symbol,
+            str(order.order_type),
+            str(order.side),
+            order.quantity,
+            getattr(order, "price", None),
+            _status_value(order.status),
+            getattr(order, "created_at", now).isoformat(),
+            now.isoformat(),
+            order_json,
+        )
 
-        try:
-            with self._get_connection() as conn:
-                conn.execute(
-                    """
-                    INSERT INTO orders (
-                        order_id, idempotency_key, client_order_id,
-                        exchange_order_id, symbol, order_type, side,
-                        quantity, price, status, created_at, updated_at,
-                        order_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        order.order_id,
-                        idempotency_key,
-                        getattr(order, "client_order_id", None),
-                        getattr(order, "exchange_order_id", None),
-                        order.symbol,
-                        str(order.order_type),
-                        str(order.side),
-                        order.quantity,
-                        getattr(order, "price", None),
-                        str(order.status),
-                        getattr(order, "created_at", datetime.now()).isoformat(),
-                        datetime.now().isoformat(),
-                        order_json,
-                    ),
-                )
-
-            logger.info(f"Stored order {order.order_id} with idempotency key {idempotency_key}")
-            return True
-
-        except sqlite3.IntegrityError as e:
-            if "idempotency_key" in str(e):
-                logger.warning(f"Duplicate order detected: {idempotency_key}")
-                return False
-            raise
+        if self._duplicates is not None:
+            self._duplicates.add(idempotency_key)  # Before commit: no false "new" verdicts
+        stored = self._submit("insert", (row,), wait=True).result()
+        if not stored:
+            logger.warning(f"Duplicate order detected: {idempotency_key}")
+            return False
+        if self._duplicates is not None:
+            self._duplicates.remember(idempotency_key)
+        self._remember_order(order.order_id)
+        logger.info(f"Stored order {order.order_id} with idempotency key {idempotency_key}")
+        return True
 
     def update_order_status(
         self,
         order_id: str,
-        new_status: str,
+        new_status: Any,
         update_data: dict | None = None,
+        wait: bool | None = None,
     ):
         """
         Update order status and record change.
 
+        With ``async_status_updates`` the update of an order this ledger has
+        recently stored or updated is queued and group-committed by the writer
+        thread; reads made afterwards still see it. Any other order id (e.g. a
+        typo, or an order stored before a restart) waits for its commit, so an
+        unknown order raises ValueError.
+
         Args:
             order_id: Order ID to update
-            new_status: New order status
+            new_status: New order status (string or ``OrderStatus``)
             update_data: Optional additional data
+            wait: Block until committed (default: unless ``config.async_status_updates``
+                and the order is known); only a waiting call raises ValueError for an
+                unknown order
         """
-        with self._get_connection() as conn:
-            # Get current status
-            cursor = conn.execute("SELECT status FROM orders WHERE order_id = ?", (order_id,))
-            row = cursor.fetchone()
-            if not row:
-                raise ValueError(f"Order {order_id} not found")
-
-            old_status = row["status"]
-
-            # Update order
-            conn.execute(
-                """
-                UPDATE orders
-                SET status = ?, updated_at = ?
-                WHERE order_id = ?
-            """,
-                (new_status, datetime.now().isoformat(), order_id),
-            )
-
-            # Record update history
-            conn.execute(
-                """
-                INSERT INTO order_updates (
-                    order_id, old_status, new_status, updated_at, update_data
-                ) VALUES (?, ?, ?, ?, ?)
-            """,
-                (
-                    order_id,
-                    old_status,
-                    new_status,
-                    datetime.now().isoformat(),
-                    json.dumps(update_data or {}),
-                ),
-            )
-
-        logger.info(f"Updated order {order_id}: {old_status} → {new_status}")
+        if wait is None:
+            wait = not (self.config.async_status_updates and self._is_known_order(order_id))
+        args = (order_id, _status_value(new_status), update_data, datetime.now().isoformat())
+        future = self._submit("status", args, wait=wait or not self.config.group_commit)
+        if wait or not self.config.group_commit:
+            future.result()
+            self._remember_order(order_id)
 
     def get_order(self, order_id: str) -> dict | None:
         """
@@ -292,6 +618,7 @@ class OrderLedger:
         Returns:
             Order dict or None if not found
         """
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.execute("SELECT * FROM orders WHERE order_id = ?", (order_id,))
             row = cursor.fetchone()
@@ -311,6 +638,7 @@ class OrderLedger:
         """
         active_statuses = ["pending", "open", "partially_filled"]
 
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.execute(
                 f"SELECT * FROM orders WHERE status IN ({','.join('?' * len(active_statuses))})",
@@ -336,6 +664,7 @@ class OrderLedger:
         Returns:
             List of order dicts
         """
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.execute(
                 """
@@ -365,6 +694,7 @@ class OrderLedger:
         Returns:
             List of update records
         """
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.execute(
                 """
@@ -400,6 +730,7 @@ class OrderLedger:
             where_clause = "WHERE created_at >= ?"
             params.append(start_date.isoformat())
 
+        self.flush()
         with self._get_connection() as conn:
             # Total orders
             cursor = conn.execute(f"SELECT COUNT(*) as count FROM orders {where_clause}", params)
@@ -444,6 +775,7 @@ class OrderLedger:
         """
         cutoff_date = datetime.now() - timedelta(days=days)
 
+        self.flush()
         with self._get_connection() as conn:
             cursor = conn.execute(
                 """
@@ -456,10 +788,74 @@ class OrderLedger:
 
             deleted_count = cursor.rowcount
 
+        if self._duplicates is not None:
+            self._duplicates.forget_recent()  # Deleted keys may be reused
         logger.info(f"Cleaned up {deleted_count} old orders (older than {days} days)")
         return deleted_count
 
 
+class AsyncOrderLedger:
+    """
+    Coroutine front-end for ``OrderLedger``.
+
+    Every call that may touch SQLite (or wait for a group commit, or block on
+    a full write queue) runs on a small dedicated thread pool, so the event
+    loop keeps processing tickers while the ledger works. Duplicate checks the
+    in-memory filter can answer are served inline.
+
+    Usage:
+        ledger = AsyncOrderLedger(OrderLedger("orders.db"))
+        if not await ledger.store_order(order):
+            ...  # duplicate
+        await ledger.update_order_status(order.order_id, OrderStatus.FILLED)
+        await ledger.close()  # flushes queued updates
+    """
+
+    def __init__(self, ledger: OrderLedger, max_workers: int = 2):
+        self.ledger = ledger
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="order-ledger-io")
+
+    async def _call(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def is_duplicate(self, idempotency_key: str) -> bool:
+        duplicates = self.ledger._duplicates
+        if duplicates is not None:
+            known = duplicates.lookup(idempotency_key)
+            if known is not None:
+                return known
+        return await self._call(self.ledger.is_duplicate, idempotency_key)
+
+    async def store_order(self, order: Any, idempotency_key: str | None = None) -> bool:
+        """Store ``order``; resolves once the insert is committed."""
+        return await self._call(self.ledger.store_order, order, idempotency_key)
+
+    async def update_order_status(
+        self,
+        order_id: str,
+        new_status: Any,
+        update_data: dict | None = None,
+        wait: bool | None = None,
+    ) -> None:
+        await self._call(self.ledger.update_order_status, order_id, new_status, update_data, wait)
+
+    async def get_order(self, order_id: str) -> dict | None:
+        return await self._call(self.ledger.get_order, order_id)
+
+    async def get_active_orders(self) -> list[dict]:
+        return await self._call(self.ledger.get_active_orders)
+
+    async def flush(self) -> None:
+        """Wait until every queued write is committed."""
+        await self._call(self.ledger.flush)
+
+    async def close(self) -> None:
+        """Flush and close the underlying ledger and release the I/O threads."""
+        await self._call(self.ledger.close)
+        self._executor.shutdown(wait=False)
+
+
 # Convenience function
 def create_idempotency_key(
     symbol: str, side: str, quantity: float, timestamp: datetime | None = None
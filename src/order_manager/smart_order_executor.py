@@ -14,6 +14,7 @@ from datetime import datetime
 
 from src.notification.telegram import TelegramBot
 from src.order_manager.exchange_backend import CCXTBackend, IExchangeBackend, MockExchangeBackend
+from src.order_manager.order_ledger import AsyncOrderLedger, OrderLedger
 from src.order_manager.order_types import OrderStatus, IcebergOrder
 from src.order_manager.smart_order import ChaseLimitOrder, SmartOrder, TWAPOrder, VWAPOrder, PeggedOrder
 from src.risk.risk_manager import RiskManager
@@ -23,6 +24,10 @@ from src.websocket.aggregator import AggregatedTicker, DataAggregator
 logger = logging.getLogger(__name__)
 
 
+def _from_timestamp(timestamp: float | None) -> datetime | None:
+    return datetime.fromtimestamp(timestamp) if timestamp else None
+
+
 class SmartOrderExecutor:
     """
     Asynchronous executor for Smart Orders.
@@ -33,6 +38,7 @@ class SmartOrderExecutor:
     - Automatic retry and error handling
     - Safe Execution Abstraction (Live/Dry-Run)
     - Integrated Risk Management Gate
+    - Optional order ledger; ledger and attribution I/O run off the event loop
     """
 
     def __init__(
@@ -43,6 +49,7 @@ class SmartOrderExecutor:
         dry_run: bool = True,
         shadow_mode: bool = False,
         risk_manager: RiskManager | None = None,
+        ledger: OrderLedger | AsyncOrderLedger | None = None,
     ):
         self.aggregator = aggregator
         self._active_orders: dict[str, SmartOrder] = {}
@@ -58,6 +65,11 @@ class SmartOrderExecutor:
         # Initialize Risk Manager
         self.risk_manager = risk_manager or RiskManager()
 
+        # Persistent order ledger (idempotency + audit trail), accessed asynchronously
+        if isinstance(ledger, OrderLedger):
+            ledger = AsyncOrderLedger(ledger)
+        self.ledger = ledger
+
         # Initialize Notification Bot
         self.telegram = TelegramBot()
 
@@ -151,6 +163,13 @@ class SmartOrderExecutor:
         if self.backend:
             await self.backend.close()
 
+        # Flush-on-shutdown: queued ledger updates and attribution records
+        if self.ledger is not None:
+            await self.ledger.flush()
+        from src.analysis.attribution import AttributionService
+
+        await AttributionService.flush_async()
+
         logger.info("Smart Order Executor stopped")
 
     async def submit_order(self, order: SmartOrder, exchange: str = None) -> str:
@@ -200,7 +219,10 @@ class SmartOrderExecutor:
             # Record signal timestamp if not set (Phase 3)
             if not order.signal_timestamp:
                 order.signal_timestamp = time.time()
-                
+
+            if self.ledger is not None and not await self.ledger.store_order(order):
+                raise RuntimeError(f"Duplicate order rejected by ledger: {order.order_id}")
+
             self._active_orders[order.order_id] = order
 
             # Attach exchange info to order metadata
@@ -313,6 +335,12 @@ class SmartOrderExecutor:
                 if order.order_id in self._order_tasks:
                     del self._order_tasks[order.order_id]
 
+            if self.ledger is not None:
+                try:
+                    await self.ledger.update_order_status(order.order_id, order.status)
+                except Exception as e:
+                    logger.error(f"Failed to record final status of {order.order_id}: {e}")
+
     async def _execute_standard_order(self, order: SmartOrder):
         """Logic for handling standard (e.g., ChaseLimit) orders."""
         if self.backend and not order.exchange_order_id:
@@ -640,80 +668,70 @@ class SmartOrderExecutor:
             log.error(f"Emergency liquidation failed: {e}")
             await self.telegram.send_message_async(f"❌ <b>Emergency liquidation failed:</b> {e}")
 
+    @staticmethod
+    def _execution_metrics(order: SmartOrder) -> tuple[float, float]:
+        """Slippage (%) against the decision price and signal-to-fill latency (ms)."""
+        target_price = order.price
+        fill_price = order.average_fill_price
+        slippage = abs(fill_price - target_price) / target_price * 100 if target_price else 0
+        latency_ms = 0
+        if order.signal_timestamp and order.fill_timestamp:
+            latency_ms = (order.fill_timestamp - order.signal_timestamp) * 1000
+        return slippage, latency_ms
+
     async def _log_execution(self, order: SmartOrder):
-        """Log a completed trade in live mode to the database."""
+        """
+        Log a completed trade in live mode to the database.
+
+        The records are queued on the attribution writer thread, so the
+        event loop never waits on the database.
+        """
         try:
-            from src.database.db_manager import DatabaseManager
-            from src.database.models import ExecutionRecord
-            
-            # Calculate metrics
-            target_price = order.price
-            fill_price = order.average_fill_price
-            slippage = abs(fill_price - target_price) / target_price * 100 if target_price > 0 else 0
-            
-            latency_ms = 0
-            if order.signal_timestamp and order.fill_timestamp:
-                latency_ms = (order.fill_timestamp - order.signal_timestamp) * 1000
-
-            db = DatabaseManager()
-            async with db.session() as session:
-                # Find corresponding TradeRecord (this logic depends on how trades are linked)
-                # For now, we assume a placeholder link or create a record
-                execution = ExecutionRecord(
-                    trade_id=0, # Need actual trade ID link
-                    symbol=order.symbol,
-                    side="buy" if order.is_buy else "sell",
-                    target_price=target_price,
-                    fill_price=fill_price,
-                    slippage_pct=slippage,
-                    latency_ms=latency_ms,
-                    timestamp=datetime.fromtimestamp(order.fill_timestamp) if order.fill_timestamp else datetime.utcnow(),
-                    meta_data=order.attribution_metadata
-                )
-                session.add(execution)
-                await session.commit()
-                
+            from src.analysis.attribution import AttributionService
+
+            slippage, latency_ms = self._execution_metrics(order)
+            metadata = order.attribution_metadata or {}
+            await AttributionService.record_execution_async(
+                trade_data={
+                    "symbol": order.symbol,
+                    "exchange": metadata.get("exchange", "unknown"),
+                    "side": "buy" if order.is_buy else "sell",
+                    "price": order.average_fill_price,
+                    "amount": order.filled_quantity or order.quantity,
+                    "strategy": metadata.get("strategy_name", "unknown"),
+                    "time": (
+                        datetime.fromtimestamp(order.fill_timestamp)
+                        if order.fill_timestamp
+                        else datetime.utcnow()
+                    ),
+                },
+                execution_metrics={
+                    "target_price": order.price,
+                    "slippage_pct": slippage,
+                    "latency_ms": latency_ms,
+                },
+                signal_id=metadata.get("signal_id"),
+                attribution_metadata=order.attribution_metadata,
+            )
+
             log.info(f"⚡ MFT Execution Logged: {order.symbol} | Latency: {latency_ms:.2f}ms")
-            
+
         except Exception as e:
             log.error("Failed to log execution metrics", error=str(e))
 
     async def _log_shadow_trade(self, order: SmartOrder):
-        """Log a completed trade in shadow mode to the database."""
+        """Log a completed trade in shadow mode to the database (queued, non-blocking)."""
         if not self._shadow_mode:
             return
 
         try:
-            from src.database.db_manager import DatabaseManager
-            from src.database.models import ShadowTradeRecord
-            
-            # Calculate metrics
-            target_price = order.price # In this context, what we wanted
-            fill_price = order.average_fill_price
-            slippage = abs(fill_price - target_price) / target_price * 100 if target_price > 0 else 0
-            
-            # Calculate latency
-            latency_ms = 0
-            if order.signal_timestamp and order.fill_timestamp:
-                latency_ms = (order.fill_timestamp - order.signal_timestamp) * 1000
+            from src.analysis.attribution import AttributionService
 
-            exchange = order.attribution_metadata.get("exchange", "default") if order.attribution_metadata else "default"
+            fill_price = order.average_fill_price
+            slippage, latency_ms = self._execution_metrics(order)
+            metadata = order.attribution_metadata or {}
+            exchange = metadata.get("exchange", "default")
 
-            shadow_record = ShadowTradeRecord(
-                symbol=order.symbol,
-                side="buy" if order.is_buy else "sell",
-                target_price=target_price,
-                fill_price=fill_price,
-                amount=order.quantity,
-                slippage_pct=slippage,
-                signal_timestamp=datetime.fromtimestamp(order.signal_timestamp) if order.signal_timestamp else None,
-                submission_timestamp=datetime.fromtimestamp(order.submission_timestamp) if order.submission_timestamp else None,
-                fill_timestamp=datetime.fromtimestamp(order.fill_timestamp) if order.fill_timestamp else None,
-                latency_ms=latency_ms,
-                strategy_name=order.attribution_metadata.get("strategy_name", "unknown") if order.attribution_metadata else "unknown",
-                meta_data={**(order.attribution_metadata or {}), "exchange": exchange}
-            )
-            
             # Update Risk Manager positions
             self.risk_manager.record_entry(
                 symbol=order.symbol,
@@ -723,12 +741,24 @@ class SmartOrderExecutor:
                 exchange=exchange
             )
 
-            db = DatabaseManager()
-            async with db.session() as session:
-                session.add(shadow_record)
-                await session.commit()
-                
+            await AttributionService.record_shadow_trade_async(
+                {
+                    "symbol": order.symbol,
+                    "side": "buy" if order.is_buy else "sell",
+                    "target_price": order.price,  # In this context, what we wanted
+                    "fill_price": fill_price,
+                    "amount": order.quantity,
+                    "slippage_pct": slippage,
+                    "signal_timestamp": _from_timestamp(order.signal_timestamp),
+                    "submission_timestamp": _from_timestamp(order.submission_timestamp),
+                    "fill_timestamp": _from_timestamp(order.fill_timestamp),
+                    "latency_ms": latency_ms,
+                    "strategy_name": metadata.get("strategy_name", "unknown"),
+                    "meta_data": {**metadata, "exchange": exchange},
+                }
+            )
+
             log.info(f"📈 Shadow Trade Logged: {order.symbol} @ {fill_price} on {exchange}")
-            
+
         except Exception as e:
             log.error("Failed to log shadow trade", error=str(e))
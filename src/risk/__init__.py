@@ -6,6 +6,7 @@ from src.risk.circuit_breaker import (
     CircuitState,
 )
 from src.risk.correlation import CorrelationManager, DrawdownMonitor
+from src.risk.covariance import StreamingCovariance
 from src.risk.position_sizing import (
     PositionSizer,
     PositionSizingConfig,
@@ -20,5 +21,6 @@ __all__ = [
     "DrawdownMonitor",
     "PositionSizer",
     "PositionSizingConfig",
+    "StreamingCovariance",
     "create_freqtrade_stake_function",
 ]
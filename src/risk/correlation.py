@@ -18,6 +18,8 @@ import numpy as np
 import pandas as pd
 from scipy.cluster import hierarchy
 
+from src.risk.covariance import StreamingCovariance
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,25 +31,36 @@ class CorrelationManager:
     - Calculate rolling correlation between assets
     - Block entries if portfolio heat exceeds threshold
     - Force-close highly correlated losing positions
+
+    Correlations come from a shared StreamingCovariance engine that is
+    updated once per candle; pairs it has not warmed up yet fall back to a
+    direct calculation from the supplied DataFrames.
     """
 
     def __init__(
         self,
-        correlation_window: int = 24,  # hours
+        correlation_window: int | None = None,  # candles
         max_correlation: float = 0.7,
         max_portfolio_heat: float = 0.15,  # 15%
+        covariance: StreamingCovariance | None = None,
     ):
         """
         Initialize correlation manager.
 
         Args:
-            correlation_window: Rolling window for correlation (hours)
+            correlation_window: Rolling window for correlation in candles
+                (default: full common history of the supplied frames)
             max_correlation: Maximum allowed correlation with open positions
             max_portfolio_heat: Maximum portfolio exposure
+            covariance: Shared covariance engine (default: own engine over
+                ``correlation_window``)
         """
         self.correlation_window = correlation_window
         self.max_correlation = max_correlation
         self.max_portfolio_heat = max_portfolio_heat
+        self.covariance = (
+            covariance if covariance is not None else StreamingCovariance(window=correlation_window)
+        )
 
         # Cache for price data
         self.price_cache: dict[str, pd.DataFrame] = {}
@@ -68,6 +81,9 @@ class CorrelationManager:
         """
         # Align indices
         common_index = pair1_data.index.intersection(pair2_data.index)
+        if self.correlation_window is not None:
+            # One extra candle, so the window covers correlation_window returns
+            common_index = common_index[-(self.correlation_window + 1) :]
 
         if len(common_index) < 10:
             logger.warning("Insufficient data for correlation calculation")
@@ -84,6 +100,10 @@ class CorrelationManager:
         corr = returns1.corr(returns2, method=method)
         return corr if not np.isnan(corr) else 0.0
 
+    def update_prices(self, prices: dict[str, float], timestamp=None) -> None:
+        """Feed one candle of close prices into the covariance engine."""
+        self.covariance.update(prices, timestamp)
+
     def check_entry_correlation(
         self,
         new_pair: str,
@@ -106,18 +126,22 @@ class CorrelationManager:
         if not open_positions:
             return True  # No correlation risk with empty portfolio
 
-        # Check correlation with each open position
-        for position in open_positions:
-            open_pair = position.get("pair")
+        # Catch the engine up on new candles, then read one correlation row
+        frames = dict(all_pairs_data)
+        if new_pair_data is not None:
+            frames.setdefault(new_pair, new_pair_data)
+        self.covariance.sync(frames)
+        open_pairs = [position.get("pair") for position in open_positions]
+        correlations = self.covariance.correlations(new_pair, open_pairs)
 
-            if open_pair not in all_pairs_data:
-                logger.warning(f"No data for {open_pair}, skipping correlation check")
-                continue
-
-            open_pair_data = all_pairs_data[open_pair]
-
-            # Calculate correlation
-            corr = self.calculate_correlation(new_pair_data, open_pair_data)
+        # Check correlation with each open position
+        for open_pair, corr in zip(open_pairs, correlations, strict=True):
+            if np.isnan(corr):
+                # Not warmed up in the engine yet
+                if open_pair not in all_pairs_data or new_pair_data is None:
+                    logger.warning(f"No data for {open_pair}, skipping correlation check")
+                    continue
+                corr = self.calculate_correlation(new_pair_data, all_pairs_data[open_pair])
 
             logger.info(f"Correlation {new_pair} vs {open_pair}: {corr:.2f}")
 
@@ -289,37 +313,40 @@ class CorrelationAnalyzer:
     and warns if portfolio is too concentrated in any single cluster.
     """
 
-    def __init__(self, window: int = 100):
+    def __init__(self, window: int = 100, covariance: StreamingCovariance | None = None):
         """
         Initialize correlation analyzer.
 
         Args:
             window: Rolling window for correlation calculation
+            covariance: Shared covariance engine (default: own rolling window)
         """
         self.correlation_matrix = None
         self.window = window
+        self.covariance = covariance if covariance is not None else StreamingCovariance(window=window)
 
     def calculate_portfolio_correlation(self, returns_df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate correlation between all positions.
 
+        Only rows newer than the last call are fed to the covariance engine,
+        so passing the same growing history every candle is cheap.
+
         Args:
             returns_df: DataFrame with returns for all symbols.
                        Columns: symbols, index: datetime
 
         Returns:
-            Correlation matrix (rolling window correlation)
+            Latest correlation matrix (rolling window correlation)
         """
         if len(returns_df) < self.window:
             logger.warning(
                 f"Insufficient data for correlation calculation: "
                 f"have {len(returns_df)} rows, need {self.window}"
             )
-            # Use simple correlation if insufficient data
-            self.correlation_matrix = returns_df.corr()
-        else:
-            # Calculate rolling correlation
-            self.correlation_matrix = returns_df.rolling(self.window).corr()
+        # Until the window fills this is the correlation over all rows seen
+        self.covariance.update_returns_frame(returns_df)
+        self.correlation_matrix = self.covariance.submatrix(list(returns_df.columns))
 
         logger.info(f"Correlation matrix calculated: {self.correlation_matrix.shape}")
         return self.correlation_matrix
@@ -442,6 +469,10 @@ class CorrelationAnalyzer:
             # Return identity matrix if no correlation data
             return pd.DataFrame(np.eye(len(symbols)), index=symbols, columns=symbols)
 
+        known = [symbol for symbol in symbols if symbol in self.covariance]
+        if known:
+            return self.covariance.submatrix(known)
+
         # Check if we have a MultiIndex (rolling correlation)
         if (
             hasattr(self.correlation_matrix.index, "levels")
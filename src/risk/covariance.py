@@ -0,0 +1,453 @@
+"""
+Streaming Covariance Engine
+===========================
+
+Keeps a portfolio-wide return covariance matrix current one candle at a time,
+so correlation checks become lookups instead of pandas recomputations.
+
+Three weighting schemes are supported:
+- ``window=N``: exact rolling covariance over the last N candles. Pairwise
+  sums are added for the new candle and subtracted for the candle leaving the
+  window, and are rebuilt from the ring buffer once per lap to cap drift.
+- ``halflife=H``: exponentially weighted (EWMA) mean and covariance.
+- neither: expanding covariance over everything seen.
+
+Sums are kept per pair (count, sum x, sum x^2, sum xy over candles where both
+assets traded), so missing prices behave like pandas' pairwise-complete
+``DataFrame.corr()``. An update costs O(n^2) vectorized NumPy for n symbols;
+a pairwise lookup is O(1) and a k-symbol submatrix O(k^2).
+
+Usage:
+    covariance = StreamingCovariance(window=100)
+    covariance.update({"BTC/USDT": 64250.0, "ETH/USDT": 3120.5}, timestamp=ts)
+    covariance.correlation("BTC/USDT", "ETH/USDT")
+    covariance.submatrix(["BTC/USDT", "ETH/USDT", "SOL/USDT"])
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+import logging
+import threading
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingCovariance:
+    """
+    Incrementally updated covariance/correlation matrix over asset returns.
+
+    Args:
+        window: Rolling window in candles (exact rolling statistics)
+        halflife: EWMA half-life in candles (mutually exclusive with ``window``)
+        min_periods: Shared observations required before a pair is reported
+        initial_capacity: Symbols to allocate for up front (grows on demand)
+    """
+
+    def __init__(
+        self,
+        window: int | None = None,
+        halflife: float | None = None,
+        min_periods: int = 10,
+        initial_capacity: int = 16,
+    ):
+        if window is not None and halflife is not None:
+            raise ValueError("window and halflife are mutually exclusive")
+        if window is not None and window < 2:
+            raise ValueError("window must be at least 2")
+        if halflife is not None and halflife <= 0:
+            raise ValueError("halflife must be positive")
+
+        self.window = window
+        self.halflife = halflife
+        self.alpha = 1.0 - 0.5 ** (1.0 / halflife) if halflife is not None else None
+        self.min_periods = max(2, min_periods)
+        self.last_timestamp: Any = None
+        self.updates = 0
+
+        self._lock = threading.RLock()
+        self._index: dict[str, int] = {}
+        self._capacity = 0
+        self._allocate(max(1, initial_capacity))
+
+    def __getstate__(self):
+        """Custom pickling to drop the lock."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        """Restore state and recreate the lock."""
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    # -- storage --------------------------------------------------------------------------
+
+    def _allocate(self, capacity: int) -> None:
+        """(Re)allocate per-symbol arrays, keeping existing statistics."""
+        old = self._capacity
+
+        def grow(array: np.ndarray | None, shape: tuple, fill: float = 0.0) -> np.ndarray:
+            new = np.full(shape, fill)
+            if array is not None:
+                new[tuple(slice(0, s) for s in array.shape)] = array
+            return new
+
+        get = self.__dict__.get
+        self._last_price = grow(get("_last_price"), (capacity,), np.nan)
+        self._n = grow(get("_n"), (capacity, capacity))
+        if self.alpha is not None:
+            self._mean = grow(get("_mean"), (capacity,))
+            self._cov = grow(get("_cov"), (capacity, capacity))
+        else:
+            self._sx = grow(get("_sx"), (capacity, capacity))
+            self._sq = grow(get("_sq"), (capacity, capacity))
+            self._sxy = grow(get("_sxy"), (capacity, capacity))
+        if self.window is not None:
+            buffer = get("_buffer")
+            self._buffer = grow(buffer, (self.window, capacity), np.nan)
+            if buffer is None:
+                self._head = 0
+                self._filled = 0
+        self._capacity = capacity
+        if old:
+            logger.debug(f"StreamingCovariance grown to {capacity} symbols")
+
+    def _indices(self, symbols: Iterable[str], create: bool = False) -> np.ndarray:
+        """Map symbols to slots (-1 when unknown unless ``create``)."""
+        slots = []
+        for symbol in symbols:
+            slot = self._index.get(symbol)
+            if slot is None and create:
+                slot = len(self._index)
+                if slot >= self._capacity:
+                    self._allocate(self._capacity * 2)
+                self._index[symbol] = slot
+            slots.append(-1 if slot is None else slot)
+        return np.asarray(slots, dtype=np.intp)
+
+    @property
+    def symbols(self) -> list[str]:
+        """Tracked symbols in slot order."""
+        return list(self._index)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def reset(self) -> None:
+        """Forget all symbols and statistics."""
+        with self._lock:
+            for name in ("_last_price", "_n", "_mean", "_cov", "_sx", "_sq", "_sxy", "_buffer"):
+                self.__dict__.pop(name, None)
+            self._index.clear()
+            self._capacity = 0
+            self.last_timestamp = None
+            self.updates = 0
+            self._allocate(16)
+
+    # -- updates --------------------------------------------------------------------------
+
+    def _is_stale(self, timestamp: Any) -> bool:
+        if timestamp is None or self.last_timestamp is None:
+            return False
+        try:
+            return bool(timestamp <= self.last_timestamp)
+        except TypeError:
+            return False
+
+    def update(self, prices: Mapping[str, float], timestamp: Any = None) -> bool:
+        """
+        Ingest one candle of prices.
+
+        Returns are taken against each symbol's previous price; a symbol's
+        first price only seeds it. Candles at or before ``last_timestamp``
+        are ignored.
+
+        Returns:
+            True if the candle was applied
+        """
+        with self._lock:
+            if self._is_stale(timestamp):
+                return False
+            symbols = [s for s, p in prices.items() if p is not None and np.isfinite(p) and p > 0]
+            idx = self._indices(symbols, create=True)
+            price = np.array([prices[s] for s in symbols], dtype=float)
+            previous = self._last_price[idx]
+            self._last_price[idx] = price
+            seeded = np.isfinite(previous)
+            self._push(idx[seeded], price[seeded] / previous[seeded] - 1.0)
+            if timestamp is not None:
+                self.last_timestamp = timestamp
+            return True
+
+    def update_returns(self, returns: Mapping[str, float], timestamp: Any = None) -> bool:
+        """Ingest one candle of precomputed returns (NaN/None = no observation)."""
+        with self._lock:
+            if self._is_stale(timestamp):
+                return False
+            symbols = [s for s, r in returns.items() if r is not None and np.isfinite(r)]
+            idx = self._indices(symbols, create=True)
+            self._push(idx, np.array([returns[s] for s in symbols], dtype=float))
+            if timestamp is not None:
+                self.last_timestamp = timestamp
+            return True
+
+    def _new_rows(self, frame: pd.DataFrame) -> pd.DataFrame:
+        if self.last_timestamp is None or frame.empty:
+            return frame
+        try:
+            return frame[frame.index > self.last_timestamp]
+        except TypeError:
+            logger.warning("Frame index is not comparable with the last update, resetting")
+            self.reset()
+            return frame
+
+    def update_frame(self, prices: pd.DataFrame) -> int:
+        """
+        Ingest a block of candles (rows: time, columns: symbols, values: prices).
+
+        Only rows newer than ``last_timestamp`` are applied, so the same
+        growing history can be passed on every call. Gaps carry the last
+        valid price forward, like ``pct_change()``.
+
+        Returns:
+            Number of candles applied
+        """
+        with self._lock:
+            frame = self._new_rows(prices)
+            if frame.empty:
+                return 0
+            idx = self._indices(frame.columns, create=True)
+            values = frame.to_numpy(dtype=float, copy=True)
+            values[~(values > 0)] = np.nan
+            carried = pd.DataFrame(np.vstack([self._last_price[idx], values])).ffill().to_numpy()
+            self._last_price[idx] = carried[-1]
+            self._push_block(idx, values / carried[:-1] - 1.0)
+            self.last_timestamp = frame.index[-1]
+            return len(frame)
+
+    def update_returns_frame(self, returns: pd.DataFrame) -> int:
+        """Block version of ``update_returns``; only rows newer than ``last_timestamp``."""
+        with self._lock:
+            frame = self._new_rows(returns)
+            if frame.empty:
+                return 0
+            idx = self._indices(frame.columns, create=True)
+            self._push_block(idx, frame.to_numpy(dtype=float))
+            self.last_timestamp = frame.index[-1]
+            return len(frame)
+
+    def sync(self, frames: Mapping[str, pd.DataFrame], column: str = "close") -> int:
+        """
+        Catch up from per-symbol OHLCV frames (e.g. the bot's pair data).
+
+        Only the tails newer than ``last_timestamp`` are aligned, so a call
+        per candle touches one row per symbol instead of the full history.
+        """
+        tails = {}
+        for symbol, frame in frames.items():
+            if frame is None or column not in frame:
+                continue
+            series = frame[column]
+            if self.last_timestamp is not None:
+                try:
+                    start = series.index.searchsorted(self.last_timestamp, side="right")
+                except TypeError:
+                    start = 0
+                series = series.iloc[start:]
+            tails[symbol] = series
+        if not tails:
+            return 0
+        return self.update_frame(pd.DataFrame(tails).sort_index())
+
+    def _push(self, idx: np.ndarray, x: np.ndarray) -> None:
+        """Apply one candle of returns ``x`` for slots ``idx``."""
+        self.updates += 1
+        k = len(self._index)
+        if self.alpha is not None:
+            self._push_ewm(idx, x)
+            return
+        row = np.full(k, np.nan)
+        row[idx] = x
+        if self.window is not None:
+            if self._filled == self.window:
+                self._accumulate(self._buffer[self._head, :k], -1.0)
+            self._buffer[self._head, :k] = row
+            self._head = (self._head + 1) % self.window
+            self._filled = min(self._filled + 1, self.window)
+            if self._head == 0:
+                self._resync()
+                return
+        self._accumulate(row, 1.0)
+
+    def _push_block(self, idx: np.ndarray, block: np.ndarray) -> None:
+        """Apply many candles at once (rows: time, columns: slots ``idx``)."""
+        if self.alpha is not None:
+            for x in block:
+                present = np.isfinite(x)
+                self._push(idx[present], x[present])
+            return
+        k = len(self._index)
+        rows = np.full((len(block), k), np.nan)
+        rows[:, idx] = block
+        self.updates += len(rows)
+        if self.window is None:
+            present = np.isfinite(rows)
+            values = np.where(present, rows, 0.0)
+            mask = present.astype(float)
+            self._n[:k, :k] += mask.T @ mask
+            self._sx[:k, :k] += values.T @ mask
+            self._sq[:k, :k] += (values * values).T @ mask
+            self._sxy[:k, :k] += values.T @ values
+            return
+        rows = rows[-self.window :]
+        slots = (self._head + np.arange(len(rows))) % self.window
+        self._buffer[slots, :k] = rows
+        self._head = (self._head + len(rows)) % self.window
+        self._filled = min(self._filled + len(rows), self.window)
+        self._resync()
+
+    def _accumulate(self, row: np.ndarray, sign: float) -> None:
+        present = np.isfinite(row)
+        if not present.any():
+            return
+        k = len(row)
+        values = np.where(present, sign * row, 0.0)
+        if present.all():  # Common case: every symbol traded, broadcast instead of outer
+            self._n[:k, :k] += sign
+            self._sx[:k, :k] += values[:, None]
+            self._sq[:k, :k] += (values * row)[:, None]
+        else:
+            mask = present.astype(float)
+            self._n[:k, :k] += sign * np.outer(mask, mask)
+            self._sx[:k, :k] += np.outer(values, mask)
+            self._sq[:k, :k] += np.outer(np.where(present, values * row, 0.0), mask)
+        self._sxy[:k, :k] += np.outer(values, np.where(present, row, 0.0))
+
+    def _resync(self) -> None:
+        """Rebuild window sums from the ring buffer (exact, no accumulated drift)."""
+        k = len(self._index)
+        rows = (
+            self._buffer[:, :k] if self._filled == self.window else self._buffer[: self._head, :k]
+        )
+        present = np.isfinite(rows)
+        values = np.where(present, rows, 0.0)
+        mask = present.astype(float)
+        self._n[:k, :k] = mask.T @ mask
+        self._sx[:k, :k] = values.T @ mask
+        self._sq[:k, :k] = (values * values).T @ mask
+        self._sxy[:k, :k] = values.T @ values
+
+    def _push_ewm(self, idx: np.ndarray, x: np.ndarray) -> None:
+        if not len(idx):
+            return
+        block = np.ix_(idx, idx)
+        first = self._n[idx, idx] == 0
+        self._mean[idx[first]] = x[first]
+        delta = x - self._mean[idx]
+        self._mean[idx] += self.alpha * delta
+        self._cov[block] = (1.0 - self.alpha) * (
+            self._cov[block] + self.alpha * np.outer(delta, delta)
+        )
+        self._n[block] += 1.0
+
+    # -- lookups --------------------------------------------------------------------------
+
+    @staticmethod
+    def _selector(slots: np.ndarray) -> slice | np.ndarray:
+        """Contiguous slot runs become slices so reads are views, not gathers."""
+        if len(slots) and slots[0] >= 0 and (np.diff(slots) == 1).all():
+            return slice(int(slots[0]), int(slots[0]) + len(slots))
+        return slots
+
+    def _block(self, rows: np.ndarray, cols: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Covariance and correlation for slot grid ``rows`` x ``cols`` (-1 = unknown)."""
+        known_r, known_c = rows >= 0, cols >= 0
+        r = self._selector(np.where(known_r, rows, 0))
+        c = self._selector(np.where(known_c, cols, 0))
+        if isinstance(r, slice) and isinstance(c, slice):
+            grid, transposed = (r, c), (c, r)
+        else:
+            r, c = np.where(known_r, rows, 0), np.where(known_c, cols, 0)
+            grid, transposed = np.ix_(r, c), np.ix_(c, r)
+        n = self._n[grid]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if self.alpha is not None:
+                cov = self._cov[grid].copy()
+                diag = np.diag(self._cov)
+                corr = cov / np.sqrt(diag[r][:, None] * diag[c][None, :])
+            else:
+                # In-place arithmetic; the (n - 1) normalization cancels in corr
+                sx, sy = self._sx[grid], self._sx[transposed].T
+                inv = 1.0 / n
+                cov = sx * sy
+                cov *= inv
+                np.subtract(self._sxy[grid], cov, out=cov)
+                var = sx * sx
+                var *= inv
+                np.subtract(self._sq[grid], var, out=var)
+                var_c = sy * sy
+                var_c *= inv
+                np.subtract(self._sq[transposed].T, var_c, out=var_c)
+                var *= var_c
+                corr = np.divide(cov, np.sqrt(var, out=var))
+                cov /= n - 1
+            np.clip(corr, -1.0, 1.0, out=corr)
+        corr[rows[:, None] == cols[None, :]] = 1.0
+        invalid = (n < self.min_periods) | ~known_r[:, None] | ~known_c[None, :]
+        cov[invalid] = np.nan
+        corr[invalid] = np.nan
+        return cov, corr
+
+    def count(self, a: str, b: str) -> int:
+        """Candles where both symbols had a return."""
+        with self._lock:
+            slot_a, slot_b = self._index.get(a), self._index.get(b)
+            if slot_a is None or slot_b is None:
+                return 0
+            return int(self._n[slot_a, slot_b])
+
+    def is_warm(self, symbol: str) -> bool:
+        """Whether ``symbol`` has ``min_periods`` observations of its own."""
+        return self.count(symbol, symbol) >= self.min_periods
+
+    def covariance(self, a: str, b: str) -> float:
+        """Return covariance of two symbols (NaN if unknown or not warm)."""
+        with self._lock:
+            cov, _ = self._block(self._indices([a]), self._indices([b]))
+            return float(cov[0, 0])
+
+    def correlation(self, a: str, b: str) -> float:
+        """Return correlation of two symbols (NaN if unknown or not warm)."""
+        with self._lock:
+            _, corr = self._block(self._indices([a]), self._indices([b]))
+            return float(corr[0, 0])
+
+    def correlations(self, symbol: str, others: Iterable[str]) -> np.ndarray:
+        """Correlations of ``symbol`` with each of ``others`` (one O(k) row read)."""
+        with self._lock:
+            _, corr = self._block(self._indices([symbol]), self._indices(others))
+            return corr[0]
+
+    def submatrix(self, symbols: Iterable[str] | None = None, kind: str = "corr") -> pd.DataFrame:
+        """
+        Return the correlation (``kind="corr"``) or covariance (``"cov"``) submatrix.
+
+        Unknown or cold symbols get NaN rows/columns.
+        """
+        if kind not in ("corr", "cov"):
+            raise ValueError(f"Unknown kind: {kind}")
+        with self._lock:
+            symbols = self.symbols if symbols is None else list(symbols)
+            idx = self._indices(symbols)
+            cov, corr = self._block(idx, idx)
+            values = corr if kind == "corr" else cov
+            return pd.DataFrame(values, index=symbols, columns=symbols)
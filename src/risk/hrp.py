@@ -8,31 +8,46 @@ and allocate risk across them equally.
 """
 
 import logging
+
 import numpy as np
 import pandas as pd
 from scipy.cluster.hierarchy import linkage
 from scipy.spatial.distance import pdist, squareform
 
+from src.risk.covariance import StreamingCovariance
+
 logger = logging.getLogger(__name__)
 
-def get_hrp_weights(prices: pd.DataFrame) -> dict[str, float]:
+def get_hrp_weights(
+    prices: pd.DataFrame, covariance: StreamingCovariance | None = None
+) -> dict[str, float]:
     """
     Calculate asset weights using Hierarchical Risk Parity.
     
     Args:
         prices: DataFrame of historical prices for assets (columns are symbols)
+        covariance: Streaming covariance engine; when every symbol is warm its
+            matrices are used instead of recomputing them from ``prices``
         
     Returns:
         Dictionary of {symbol: weight}
     """
+    symbols = list(prices.columns)
+    if covariance is not None and len(symbols) >= 2 and all(map(covariance.is_warm, symbols)):
+        cov = covariance.submatrix(symbols, kind="cov")
+        corr = covariance.submatrix(symbols)
+        if not (cov.isna().values.any() or corr.isna().values.any()):
+            return _hrp_weights(cov, corr)
+
     if prices.empty or prices.shape[1] < 2 or len(prices) < 10:
         return {col: 1.0/max(1, prices.shape[1]) for col in prices.columns}
         
     # 1. Calculate Returns and Covariance
     returns = prices.pct_change().dropna()
-    corr = returns.corr()
-    cov = returns.cov()
-    
+    return _hrp_weights(returns.cov(), returns.corr())
+
+def _hrp_weights(cov: pd.DataFrame, corr: pd.DataFrame) -> dict[str, float]:
+    """Run HRP on a covariance/correlation pair."""
     # 2. Cluster assets
     # Distance metric based on correlation
     dist = ((1 - corr) / 2.0)**0.5
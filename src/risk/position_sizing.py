@@ -25,6 +25,7 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
+from src.risk.covariance import StreamingCovariance
 from src.risk.hrp import get_hrp_weights
 from src.utils.logger import log
 
@@ -61,14 +62,20 @@ class PositionSizer:
     Advanced position sizing with multiple methods.
     """
 
-    def __init__(self, config: PositionSizingConfig | None = None) -> None:
+    def __init__(
+        self,
+        config: PositionSizingConfig | None = None,
+        covariance: StreamingCovariance | None = None,
+    ) -> None:
         """
         Initialize PositionSizer.
 
         Args:
             config: Configuration object.
+            covariance: Shared streaming covariance engine for correlation and HRP.
         """
         self.config = config or PositionSizingConfig()
+        self.covariance = covariance
         self._correlation_matrix: pd.DataFrame | None = None
         self._current_positions: dict[str, float] = {}
 
@@ -308,7 +315,7 @@ class PositionSizer:
         if prices is None or prices.empty:
             raise ValueError("HRP sizing requires a `prices` dataframe.")
 
-        weights = get_hrp_weights(prices)
+        weights = get_hrp_weights(prices, covariance=self.covariance)
         symbol_weight = weights.get(symbol, 0.0)
 
         position_value = account_balance * symbol_weight
@@ -398,7 +405,9 @@ class PositionSizer:
             return (False, msg)
 
         # Check correlation exposure if matrix available
-        if self._correlation_matrix is not None and symbol in self._correlation_matrix.columns:
+        if (self.covariance is not None and symbol in self.covariance) or (
+            self._correlation_matrix is not None and symbol in self._correlation_matrix.columns
+        ):
             correlated_exposure = self._calculate_correlated_exposure(
                 symbol, new_position.get("position_value", 0)
             )
@@ -428,6 +437,13 @@ class PositionSizer:
 
     def _calculate_correlated_exposure(self, symbol: str, position_value: float) -> float:
         """Calculate total correlated exposure."""
+        if self.covariance is not None and symbol in self.covariance:
+            others = list(self._current_positions)
+            correlations = np.abs(np.nan_to_num(self.covariance.correlations(symbol, others)))
+            values = np.fromiter(self._current_positions.values(), dtype=float, count=len(others))
+            correlated = correlations > 0.5  # Only count highly correlated
+            return position_value + float(values[correlated] @ correlations[correlated])
+
         if self._correlation_matrix is None:
             return position_value
 
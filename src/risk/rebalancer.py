@@ -10,6 +10,7 @@ import logging
 import pandas as pd
 
 from src.order_manager.smart_order import OrderSide, SmartOrder
+from src.risk.covariance import StreamingCovariance
 from src.risk.hrp import get_hrp_weights
 
 logger = logging.getLogger(__name__)
@@ -39,7 +40,10 @@ class Rebalancer:
             logger.info("No open positions to rebalance.")
             return
 
-        target_weights = get_hrp_weights(prices)
+        covariance = getattr(self.risk_manager, "covariance", None)
+        if not isinstance(covariance, StreamingCovariance):
+            covariance = None
+        target_weights = get_hrp_weights(prices, covariance=covariance)
 
         current_weights = {
             symbol: pos["value"] / account_balance for symbol, pos in current_portfolio.items()
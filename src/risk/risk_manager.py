@@ -19,6 +19,7 @@ from typing import Any
 
 from .circuit_breaker import CircuitBreaker, CircuitBreakerConfig
 from .correlation import CorrelationAnalyzer
+from .covariance import StreamingCovariance
 from .liquidation import LiquidationConfig, LiquidationGuard
 from .position_sizing import PositionSizer, PositionSizingConfig
 
@@ -96,9 +97,11 @@ class RiskManager:
                 pass
 
         self.circuit_breaker = CircuitBreaker(circuit_config)
-        self.position_sizer = PositionSizer(sizing_config)
+        # One covariance engine shared by correlation checks, sizing and HRP
+        self.covariance = StreamingCovariance(window=100)
+        self.position_sizer = PositionSizer(sizing_config, covariance=self.covariance)
         self.liquidation_guard = LiquidationGuard(liquidation_config)
-        self.correlation_analyzer = CorrelationAnalyzer()
+        self.correlation_analyzer = CorrelationAnalyzer(covariance=self.covariance)
 
         self._account_balance: Decimal = Decimal("0.0")
         self._exchange_balances: dict[str, Decimal] = {}
@@ -16,6 +16,10 @@ License: MIT
 import pandas as pd
 import talib.abstract as ta
 
+from src.utils.indicator_graph import IndicatorGraph
+
+HLC = ("high", "low", "close")
+
 
 class IndicatorLibrary:
     """
@@ -143,10 +147,15 @@ class SignalGenerator:
     Generate trading signals using indicator library.
 
     This class MUST produce identical signals in both research and production.
+
+    Indicators are pulled from an ``IndicatorGraph`` as TA-Lib nodes with the
+    same parameters as ``IndicatorLibrary``; pass the pair's shared graph to
+    reuse them across consumers and ticks.
     """
 
-    def __init__(self):
+    def __init__(self, graph: IndicatorGraph | None = None):
         self.indicators = IndicatorLibrary()
+        self.graph = graph if graph is not None else IndicatorGraph()
 
     def populate_all_indicators(self, dataframe: pd.DataFrame) -> pd.DataFrame:
         """
@@ -159,36 +168,51 @@ class SignalGenerator:
             Dataframe with indicator columns added
         """
         df = dataframe.copy()
+        view = self.graph.bind(dataframe)
 
         # Trend indicators
-        df["ema_50"], df["ema_100"], df["ema_200"] = self.indicators.calculate_ema_trio(
-            df["close"], 50, 100, 200
-        )
+        df["ema_50"] = view.get("talib", function="EMA", timeperiod=50)
+        df["ema_100"] = view.get("talib", function="EMA", timeperiod=100)
+        df["ema_200"] = view.get("talib", function="EMA", timeperiod=200)
 
         # Oscillators
-        df["rsi"] = self.indicators.calculate_rsi(df["close"])
-        df["slowk"], df["slowd"] = self.indicators.calculate_stochastic(
-            df["high"], df["low"], df["close"]
+        df["rsi"] = view.get("talib", function="RSI", timeperiod=14)
+        stoch = view.get(
+            "talib",
+            function="STOCH",
+            inputs=HLC,
+            fastk_period=14,
+            slowk_period=3,
+            slowd_period=3,
         )
+        df["slowk"], df["slowd"] = stoch["slowk"], stoch["slowd"]
 
         # Trend strength
-        df["adx"] = self.indicators.calculate_adx(df["high"], df["low"], df["close"])
+        df["adx"] = view.get("talib", function="ADX", inputs=HLC, timeperiod=14)
 
         # MACD
-        df["macd"], df["macdsignal"], df["macdhist"] = self.indicators.calculate_macd(df["close"])
+        macd = view.get("talib", function="MACD", fastperiod=12, slowperiod=26, signalperiod=9)
+        df["macd"], df["macdsignal"], df["macdhist"] = (
+            macd["macd"],
+            macd["macdsignal"],
+            macd["macdhist"],
+        )
 
         # Bollinger Bands
-        df["bb_upper"], df["bb_middle"], df["bb_lower"] = self.indicators.calculate_bollinger_bands(
-            df["close"]
+        bb = view.get("talib", function="BBANDS", timeperiod=20, nbdevup=2.0, nbdevdn=2.0)
+        df["bb_upper"], df["bb_middle"], df["bb_lower"] = (
+            bb["upperband"],
+            bb["middleband"],
+            bb["lowerband"],
         )
 
         df["bb_width"] = (df["bb_upper"] - df["bb_lower"]) / df["bb_middle"]
 
         # Volatility
-        df["atr"] = self.indicators.calculate_atr(df["high"], df["low"], df["close"])
+        df["atr"] = view.get("talib", function="ATR", inputs=HLC, timeperiod=14)
 
         # Volume
-        df["volume_mean"] = df["volume"].rolling(window=20).mean()
+        df["volume_mean"] = view.get("sma", period=20, source="volume")
 
         # Custom features
         df["pct_change_1"] = df["close"].pct_change(1)
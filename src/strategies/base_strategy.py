@@ -22,6 +22,7 @@ from src.strategies.risk_mixin import StoicRiskMixin
 from src.strategies.core_logic import StoicLogic
 from src.strategies.hybrid_connector import HybridConnectorMixin
 from src.strategies.ml_adapter import StrategyMLAdapter
+from src.utils.indicator_graph import IndicatorGraph
 from src.utils.logger import log as stoic_log
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,7 @@ class BaseStoicStrategy(HybridConnectorMixin, StoicRiskMixin, IStrategy):
         self._alt_data_fetcher = None
         self.last_alt_data = {}
         self._ml_adapters = {}
+        self._indicator_graphs = {}
 
     def informative_pairs(self):
         return [("BTC/USDT:USDT", "1h"), ("ETH/USDT:USDT", "1h")]
@@ -53,15 +55,17 @@ class BaseStoicStrategy(HybridConnectorMixin, StoicRiskMixin, IStrategy):
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         dataframe.columns = dataframe.columns.str.lower()
         try:
-            # 1. Technical Indicators
-            dataframe = StoicLogic.populate_indicators(dataframe)
+            # 1. Technical Indicators (shared per-pair graph, reused by regime detection)
+            graph = self._get_indicator_graph(metadata.get('pair'))
+            dataframe = StoicLogic.populate_indicators(dataframe, graph=graph)
             
             # 2. Regime Detection
             regime_df = calculate_regime(
                 dataframe['high'], dataframe['low'], dataframe['close'], dataframe['volume'],
                 vol_threshold=float(self.regime_vol_threshold.value),
                 adx_threshold=float(self.regime_adx_threshold.value),
-                hurst_threshold=float(self.regime_hurst_threshold.value)
+                hurst_threshold=float(self.regime_hurst_threshold.value),
+                graph=graph
             )
             dataframe['regime'] = regime_df['regime']
             dataframe['hurst'] = regime_df['hurst']
@@ -87,6 +91,11 @@ class BaseStoicStrategy(HybridConnectorMixin, StoicRiskMixin, IStrategy):
                 dataframe['ml_prediction'] = 0.5
         return dataframe
 
+    def _get_indicator_graph(self, pair: Optional[str]) -> IndicatorGraph:
+        if pair not in self._indicator_graphs:
+            self._indicator_graphs[pair] = IndicatorGraph()
+        return self._indicator_graphs[pair]
+
     def _calculate_ml_predictions(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         try:
             pair = metadata['pair']
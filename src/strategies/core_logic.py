@@ -17,13 +17,7 @@ import pandas as pd
 import numpy as np
 
 # Import indicators and regime
-from src.utils.indicators import (
-    calculate_bollinger_bands,
-    calculate_ema,
-    calculate_macd,
-    calculate_rsi,
-    calculate_atr,
-)
+from src.utils.indicator_graph import IndicatorGraph
 from src.utils.logger import log_strategy_signal
 from src.utils.regime_detection import MarketRegime, calculate_regime
 
@@ -59,42 +53,47 @@ class StoicLogic:
     @staticmethod
     def calculate_ema(series: pd.Series, period: int) -> pd.Series:
         """Wrapper for EMA calculation."""
-        return calculate_ema(series, period)
+        return series.ewm(span=period, adjust=False).mean()
 
     @staticmethod
-    def populate_indicators(dataframe: pd.DataFrame) -> pd.DataFrame:
+    def populate_indicators(
+        dataframe: pd.DataFrame, graph: Optional[IndicatorGraph] = None
+    ) -> pd.DataFrame:
         """
         Comprehensive technical indicator calculation.
         Includes technical indicators, column aliasing, and safety fallbacks.
+
+        Pass the pair's shared ``IndicatorGraph`` so regime detection and the
+        feature pipeline reuse these nodes instead of recomputing them.
         """
         df = dataframe.copy()
-        
+        view = (graph or IndicatorGraph()).bind(dataframe)
+
         # 1. Core Technicals
-        df["ema_50"] = calculate_ema(df["close"], 50)
-        df["ema_100"] = calculate_ema(df["close"], 100)
-        df["ema_200"] = calculate_ema(df["close"], 200)
-        df["rsi"] = calculate_rsi(df["close"], 14)
-        df["atr"] = calculate_atr(df["high"], df["low"], df["close"], 14)
+        df["ema_50"] = view.get("ema", period=50)
+        df["ema_100"] = view.get("ema", period=100)
+        df["ema_200"] = view.get("ema", period=200)
+        df["rsi"] = view.get("rsi", period=14)
+        df["atr"] = view.get("atr", period=14)
 
-        macd = calculate_macd(df["close"])
+        macd = view.get("macd")
         df["macd"] = macd["macd"]
         df["macd_signal"] = macd["signal"]
         df["macd_hist"] = macd["histogram"]
 
-        bb = calculate_bollinger_bands(df["close"], 20, 2.0)
+        bb = view.get("bollinger", period=20, num_std=2.0)
         df["bb_lower"] = bb["lower"]
         df["bb_middle"] = bb["middle"]
         df["bb_upper"] = bb["upper"]
         df["bb_width"] = bb["width"]
-        
+
         # Stochastic (Legacy/Robustness)
-        low_min = df['low'].rolling(window=14).min()
-        high_max = df['high'].rolling(window=14).max()
-        df['slowk'] = 100 * (df['close'] - low_min) / (high_max - low_min)
-        df['slowd'] = df['slowk'].rolling(window=3).mean()
-        
+        stoch = view.get("stochastic", period=14, smooth=3)
+        df['slowk'] = stoch["k"]
+        df['slowd'] = stoch["d"]
+
         # Volume
-        df['volume_mean'] = df['volume'].rolling(window=20).mean()
+        df['volume_mean'] = view.get("sma", period=20, source="volume")
 
         # 2. Aliases for backward compatibility and tests
         df['bb_lowerband'] = df['bb_lower']
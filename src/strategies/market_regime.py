@@ -26,9 +26,10 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
-import numpy as np
 import pandas as pd
 
+from src.utils.indicator_graph import IndicatorGraph, IndicatorView
+
 logger = logging.getLogger(__name__)
 
 
@@ -89,9 +90,19 @@ class MarketRegimeFilter:
             return True
     """
 
-    def __init__(self, config: RegimeFilterConfig | None = None):
-        """Initialize regime filter."""
+    def __init__(
+        self, config: RegimeFilterConfig | None = None, graph: IndicatorGraph | None = None
+    ):
+        """
+        Initialize regime filter.
+
+        Args:
+            config: Filter configuration
+            graph: Indicator graph shared with the strategy, so EMA/ADX/volume MA
+                already computed for the same candles are reused
+        """
         self.config = config or RegimeFilterConfig()
+        self.graph = graph if graph is not None else IndicatorGraph()
         self.regime_history: list = []
         self.blocked_trades: int = 0
         self.allowed_trades: int = 0
@@ -113,8 +124,9 @@ class MarketRegimeFilter:
 
         # Calculate indicators
         close = dataframe["close"].iloc[-1]
-        ema_200 = dataframe["close"].ewm(span=self.config.ema_period, adjust=False).mean().iloc[-1]
-        adx = self._calculate_adx(dataframe)
+        view = self.graph.bind(dataframe)
+        ema_200 = view.get("ema", period=self.config.ema_period).iloc[-1]
+        adx = self._calculate_adx(dataframe, view)
 
         details["close"] = close
         details["ema_200"] = ema_200
@@ -231,35 +243,10 @@ class MarketRegimeFilter:
 
         return should_trade, reason
 
-    def _calculate_adx(self, dataframe: pd.DataFrame) -> float:
+    def _calculate_adx(self, dataframe: pd.DataFrame, view: IndicatorView | None = None) -> float:
         """Calculate ADX (Average Directional Index)."""
-        period = self.config.adx_period
-
-        high = dataframe["high"]
-        low = dataframe["low"]
-        close = dataframe["close"]
-
-        # Calculate +DM and -DM
-        high_diff = high.diff()
-        low_diff = -low.diff()
-
-        plus_dm = high_diff.where((high_diff > low_diff) & (high_diff > 0), 0)
-        minus_dm = low_diff.where((low_diff > high_diff) & (low_diff > 0), 0)
-
-        # Calculate True Range
-        high_low = high - low
-        high_close = np.abs(high - close.shift())
-        low_close = np.abs(low - close.shift())
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-
-        # Smoothed TR, +DM, -DM
-        atr = true_range.rolling(period).mean()
-        plus_di = 100 * (plus_dm.rolling(period).mean() / (atr + 1e-10))
-        minus_di = 100 * (minus_dm.rolling(period).mean() / (atr + 1e-10))
-
-        # Calculate DX and ADX
-        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10)
-        adx = dx.rolling(period).mean()
+        view = view or self.graph.bind(dataframe)
+        adx = view.get("adx", period=self.config.adx_period)
 
         return adx.iloc[-1] if not pd.isna(adx.iloc[-1]) else 0.0
 
@@ -284,7 +271,11 @@ class MarketRegimeFilter:
             return True, "No volume data"
 
         volume = dataframe["volume"].iloc[-1]
-        volume_ma = dataframe["volume"].rolling(self.config.volume_ma_period).mean().iloc[-1]
+        volume_ma = (
+            self.graph.bind(dataframe)
+            .get("sma", period=self.config.volume_ma_period, source="volume")
+            .iloc[-1]
+        )
 
         if pd.isna(volume_ma) or volume_ma <= 0:
             return True, "Insufficient volume history"
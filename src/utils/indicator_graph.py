@@ -0,0 +1,372 @@
+"""
+Stoic Citadel - Indicator Graph
+===============================
+
+Lazy, cached indicator DAG shared by every consumer of a pair's candles.
+
+StoicLogic, calculate_regime, MarketRegimeFilter, SignalGenerator and
+FeatureEngineer used to compute the same EMAs, ATRs and ADXs independently
+on every tick. Here each indicator is a node that pulls its inputs from other
+nodes or from frame columns, and results are cached under
+
+    (indicator, params, fingerprints of the input columns it read)
+
+so a node is computed once per candle batch, whoever asks first. Appending
+candles changes the fingerprints of the columns that grew, which invalidates
+exactly the nodes that read them. Nodes over untouched columns stay cached.
+Different series with the same column name (e.g. FeatureEngineer's
+stationary ``close``) are kept side by side, up to ``max_variants`` per node.
+
+Formulas are the ones already used in this codebase. Variants that differ
+only by a stabilising epsilon take it as a parameter, so they share every
+upstream node but not the final value.
+
+Usage:
+    graph = IndicatorGraph()
+    view = graph.bind(dataframe)  # Cheap; call again for each new candle batch
+    dataframe["ema_200"] = view.get("ema", period=200)
+    adx = view.get("adx", period=14)
+    graph.stats()  # Per-indicator compute time, computes and cache hits
+
+Results are shared between consumers and must not be modified in place.
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import talib.abstract as ta
+
+    TALIB_AVAILABLE = True
+except ImportError:
+    TALIB_AVAILABLE = False
+
+IndicatorFunc = Callable[..., pd.Series | pd.DataFrame]
+
+_INDICATORS: dict[str, IndicatorFunc] = {}
+
+
+def indicator(name: str) -> Callable[[IndicatorFunc], IndicatorFunc]:
+    """
+    Register an indicator node.
+
+    The function receives an ``IndicatorView`` followed by its parameters
+    and must read inputs only through ``view.column()`` / ``view.get()``,
+    so the graph can record which columns the node depends on.
+    """
+
+    def decorator(func: IndicatorFunc) -> IndicatorFunc:
+        _INDICATORS[name] = func
+        return func
+
+    return decorator
+
+
+class IndicatorView:
+    """A frame bound to an ``IndicatorGraph``; produced by ``IndicatorGraph.bind``."""
+
+    def __init__(self, graph: "IndicatorGraph", frame: pd.DataFrame):
+        self.graph = graph
+        self.frame = frame
+        self._fingerprints: dict[str, Hashable] = {}
+
+    def column(self, name: str) -> pd.Series:
+        """Read a frame column, recording it as an input of the node being computed."""
+        self.graph._record_read(name)
+        return self.frame[name]
+
+    def fingerprint(self, name: str) -> Hashable:
+        """Identity of a column's contents (memoized for the lifetime of the view)."""
+        fingerprint = self._fingerprints.get(name)
+        if fingerprint is None:
+            series = self.frame[name]
+            values = series.to_numpy()
+            if values.dtype.kind in "fiub":
+                data = np.ascontiguousarray(values).tobytes()
+            else:
+                data = pd.util.hash_array(values.astype(object)).tobytes()
+            digest = hashlib.blake2b(data, digest_size=16)
+            digest.update(values.dtype.str.encode())
+            index = series.index
+            fingerprint = (
+                (len(series), index[0], index[-1], digest.hexdigest()) if len(series) else (0,)
+            )
+            self._fingerprints[name] = fingerprint
+        return fingerprint
+
+    def get(self, name: str, **params: Any) -> pd.Series | pd.DataFrame:
+        """Return indicator ``name`` for this frame, computing it at most once."""
+        return self.graph._get(self, name, params)
+
+
+class IndicatorGraph:
+    """
+    Cache of indicator nodes for one series (typically one pair/timeframe).
+
+    Args:
+        max_variants: Distinct input versions kept per node (older are evicted)
+    """
+
+    def __init__(self, max_variants: int = 4):
+        self.max_variants = max_variants
+        self._lock = threading.RLock()
+        self._cache: dict[tuple, pd.Series | pd.DataFrame] = {}
+        self._variants: dict[tuple, deque] = {}
+        self._reads: dict[tuple, tuple[str, ...]] = {}
+        self._stack: list[dict[str, Any]] = []
+        self._stats: dict[tuple, dict[str, float]] = OrderedDict()
+
+    def __getstate__(self):
+        """Pickle configuration only; cached results and the lock are rebuilt."""
+        return {"max_variants": self.max_variants}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def bind(self, frame: pd.DataFrame) -> IndicatorView:
+        """
+        Bind a candle frame. Column fingerprints are taken lazily and kept for
+        the view's lifetime, so bind again after modifying input columns.
+        """
+        return IndicatorView(self, frame)
+
+    def invalidate(self, columns: Iterable[str] | None = None) -> int:
+        """
+        Drop cached nodes that read any of ``columns`` (all nodes if None).
+
+        Returns:
+            Number of cached results dropped
+        """
+        with self._lock:
+            targets = None if columns is None else set(columns)
+            dropped = 0
+            for node, reads in list(self._reads.items()):
+                if targets is not None and targets.isdisjoint(reads):
+                    continue
+                for key in self._variants.pop(node, ()):
+                    dropped += self._cache.pop(key, None) is not None
+            return dropped
+
+    def _record_read(self, column: str) -> None:
+        if self._stack:
+            self._stack[-1]["reads"].add(column)
+
+    def _get(self, view: IndicatorView, name: str, params: dict) -> pd.Series | pd.DataFrame:
+        try:
+            func = _INDICATORS[name]
+        except KeyError:
+            raise KeyError(f"Unknown indicator: {name}") from None
+        node = (name, tuple(sorted(params.items())))
+
+        with self._lock:
+            stats = self._stats.setdefault(node, {"computes": 0, "hits": 0, "seconds": 0.0})
+            reads = self._reads.get(node)
+            if reads is not None:
+                key = (node, tuple(view.fingerprint(column) for column in reads))
+                result = self._cache.get(key)
+                if result is not None:
+                    stats["hits"] += 1
+                    if self._stack:
+                        self._stack[-1]["reads"].update(reads)
+                    return result
+
+            frame = {"reads": set(), "children": 0.0}
+            self._stack.append(frame)
+            start = time.perf_counter()
+            try:
+                result = func(view, **params)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._stack.pop()
+            # Exclusive time: upstream nodes are reported under their own names
+            stats["computes"] += 1
+            stats["seconds"] += elapsed - frame["children"]
+            if self._stack:
+                self._stack[-1]["children"] += elapsed
+                self._stack[-1]["reads"].update(frame["reads"])
+
+            reads = tuple(sorted(frame["reads"]))
+            self._reads[node] = reads
+            key = (node, tuple(view.fingerprint(column) for column in reads))
+            self._cache[key] = result
+            variants = self._variants.setdefault(node, deque())
+            variants.append(key)
+            while len(variants) > self.max_variants:
+                self._cache.pop(variants.popleft(), None)
+            return result
+
+    def stats(self) -> pd.DataFrame:
+        """Per-indicator computes, cache hits and exclusive compute time."""
+        with self._lock:
+            rows = [
+                {
+                    "indicator": name,
+                    "params": ", ".join(f"{k}={v}" for k, v in params),
+                    "computes": int(s["computes"]),
+                    "hits": int(s["hits"]),
+                    "total_ms": s["seconds"] * 1e3,
+                    "mean_ms": s["seconds"] * 1e3 / s["computes"] if s["computes"] else 0.0,
+                }
+                for (name, params), s in self._stats.items()
+            ]
+        columns = ["indicator", "params", "computes", "hits", "total_ms", "mean_ms"]
+        return pd.DataFrame(rows, columns=columns).sort_values("total_ms", ascending=False)
+
+    def reset_stats(self) -> None:
+        """Clear the statistics returned by ``stats()``."""
+        with self._lock:
+            self._stats.clear()
+
+
+# -- Indicator nodes -----------------------------------------------------------------------
+
+
+@indicator("ema")
+def _ema(view: IndicatorView, period: int, source: str = "close") -> pd.Series:
+    return view.column(source).ewm(span=period, adjust=False).mean()
+
+
+@indicator("sma")
+def _sma(view: IndicatorView, period: int, source: str = "close") -> pd.Series:
+    return view.column(source).rolling(period).mean()
+
+
+@indicator("rolling_std")
+def _rolling_std(view: IndicatorView, period: int, source: str = "close") -> pd.Series:
+    return view.column(source).rolling(period).std()
+
+
+@indicator("rolling_min")
+def _rolling_min(view: IndicatorView, period: int, source: str = "close") -> pd.Series:
+    return view.column(source).rolling(period).min()
+
+
+@indicator("rolling_max")
+def _rolling_max(view: IndicatorView, period: int, source: str = "close") -> pd.Series:
+    return view.column(source).rolling(period).max()
+
+
+@indicator("true_range")
+def _true_range(view: IndicatorView) -> pd.Series:
+    high, low, close = view.column("high"), view.column("low"), view.column("close")
+    prev_close = close.shift()
+    ranges = pd.concat([high - low, np.abs(high - prev_close), np.abs(low - prev_close)], axis=1)
+    return ranges.max(axis=1)
+
+
+@indicator("atr")
+def _atr(view: IndicatorView, period: int = 14) -> pd.Series:
+    return view.get("true_range").rolling(period).mean()
+
+
+@indicator("avg_gain")
+def _avg_gain(view: IndicatorView, period: int = 14, source: str = "close") -> pd.Series:
+    delta = view.column(source).diff()
+    return delta.where(delta > 0, 0).rolling(period).mean()
+
+
+@indicator("avg_loss")
+def _avg_loss(view: IndicatorView, period: int = 14, source: str = "close") -> pd.Series:
+    delta = view.column(source).diff()
+    return (-delta.where(delta < 0, 0)).rolling(period).mean()
+
+
+@indicator("rsi")
+def _rsi(view: IndicatorView, period: int = 14, eps: float = 0.0) -> pd.Series:
+    """Simple-average RSI; ``eps`` stabilises the gain/loss ratio."""
+    loss = view.get("avg_loss", period=period)
+    rs = view.get("avg_gain", period=period) / (loss + eps if eps else loss)
+    return 100 - (100 / (1 + rs))
+
+
+@indicator("macd")
+def _macd(view: IndicatorView, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
+    macd = view.get("ema", period=fast) - view.get("ema", period=slow)
+    signal_line = macd.ewm(span=signal, adjust=False).mean()
+    return pd.DataFrame({"macd": macd, "signal": signal_line, "histogram": macd - signal_line})
+
+
+@indicator("bollinger")
+def _bollinger(view: IndicatorView, period: int = 20, num_std: float = 2.0) -> pd.DataFrame:
+    middle = view.get("sma", period=period)
+    std = view.get("rolling_std", period=period)
+    upper, lower = middle + num_std * std, middle - num_std * std
+    return pd.DataFrame(
+        {"upper": upper, "middle": middle, "lower": lower, "width": (upper - lower) / middle}
+    )
+
+
+@indicator("stochastic")
+def _stochastic(
+    view: IndicatorView, period: int = 14, smooth: int = 3, eps: float = 0.0
+) -> pd.DataFrame:
+    low_min = view.get("rolling_min", period=period, source="low")
+    high_max = view.get("rolling_max", period=period, source="high")
+    span = high_max - low_min
+    k = 100 * (view.column("close") - low_min) / (span + eps if eps else span)
+    return pd.DataFrame({"k": k, "d": k.rolling(smooth).mean()})
+
+
+@indicator("directional_movement")
+def _directional_movement(view: IndicatorView) -> pd.DataFrame:
+    high_diff = view.column("high").diff()
+    low_diff = -view.column("low").diff()
+    return pd.DataFrame(
+        {
+            "plus_dm": high_diff.where((high_diff > low_diff) & (high_diff > 0), 0),
+            "minus_dm": low_diff.where((low_diff > high_diff) & (low_diff > 0), 0),
+        }
+    )
+
+
+@indicator("adx")
+def _adx(view: IndicatorView, period: int = 14, wilder: bool = False) -> pd.Series:
+    """
+    ADX over the simple-average ATR.
+
+    Simple rolling DM/DX averages by default (as in MarketRegimeFilter and
+    FeatureEngineer); ``wilder=True`` uses Wilder's ``ewm(alpha=1/period)``
+    smoothing of ``src.utils.indicators.calculate_adx`` (as in calculate_regime).
+    """
+    dm = view.get("directional_movement")
+    atr = view.get("atr", period=period)
+    if wilder:
+        plus_di = 100 * dm["plus_dm"].ewm(alpha=1 / period).mean() / atr
+        minus_di = 100 * dm["minus_dm"].ewm(alpha=1 / period).mean() / atr
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+        return dx.ewm(alpha=1 / period).mean()
+    plus_di = 100 * (dm["plus_dm"].rolling(period).mean() / (atr + 1e-10))
+    minus_di = 100 * (dm["minus_dm"].rolling(period).mean() / (atr + 1e-10))
+    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10)
+    return dx.rolling(period).mean()
+
+
+@indicator("talib")
+def _talib(
+    view: IndicatorView, function: str, inputs: tuple[str, ...] = ("close",), **kwargs: Any
+) -> pd.Series | pd.DataFrame:
+    """Any TA-Lib abstract function, e.g. ``get("talib", function="RSI", timeperiod=14)``."""
+    if not TALIB_AVAILABLE:
+        raise ImportError("TA-Lib is required for talib indicator nodes")
+    func = getattr(ta, function)
+    result = func(*(view.column(column) for column in inputs), **kwargs)
+    # Depending on the TA-Lib version, Series inputs may come back as bare arrays
+    index = view.frame.index
+    if isinstance(result, list):
+        return pd.DataFrame(dict(zip(func.output_names, result, strict=True)), index=index)
+    if isinstance(result, np.ndarray):
+        return pd.Series(result, index=index)
+    return result
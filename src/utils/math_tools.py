@@ -4,6 +4,12 @@ Stoic Citadel - Mathematical Tools
 
 Advanced mathematical functions for financial analysis.
 Focuses on statistical measures of series properties (Hurst, Entropy, etc.).
+
+Rolling Hurst is computed from prefix sums of log prices and squared log
+returns: every window's mean and standard deviation are O(1) lookups, and the
+cumulative-deviation range is one allocation-free pass over the window's log
+prices (the de-meaning slope changes each step, so the extremes cannot be
+carried over). ``last_n`` restricts the work to the trailing values needed live.
 """
 
 import logging
@@ -108,14 +114,126 @@ else:
         return result
 
 
-def calculate_hurst(series: pd.Series, window: int = 100) -> pd.Series:
+if HAVE_NUMBA:
+
+    @jit(nopython=True)
+    def _hurst_prefix(values):
+        """Log prices plus prefix sums of squared log returns and invalid steps."""
+        n = len(values)
+        log_p = np.full(n, np.nan)
+        for t in range(n):
+            if values[t] > 0:
+                log_p[t] = np.log(values[t])
+        sq = np.zeros(n)
+        bad = np.zeros(n, dtype=np.int64)
+        for t in range(1, n):
+            r = log_p[t] - log_p[t - 1]
+            valid = np.isfinite(r)
+            sq[t] = sq[t - 1] + (r * r if valid else 0.0)
+            bad[t] = bad[t - 1] + (0 if valid else 1)
+        return log_p, sq, bad
+
+    @jit(nopython=True)
+    def _deviation_range(log_p, s, window, mean):
+        """Range of cumulative deviations from ``mean`` over one window."""
+        hi = -np.inf
+        lo = np.inf
+        for k in range(1, window):
+            d = log_p[s + k] - log_p[s] - k * mean
+            hi = max(hi, d)
+            lo = min(lo, d)
+        return hi - lo
+
+    @jit(float64[:](float64[:], int64, int64), nopython=True)
+    def _rolling_hurst_kernel(values, window, start):
+        n = len(values)
+        result = np.full(n, np.nan)
+        first = max(window, start)
+        if first >= n:
+            return result
+        if window < 10:
+            result[first:] = 0.5
+            return result
+
+        log_p, sq, bad = _hurst_prefix(values)
+        m = window - 1
+        log_n = np.log(window)
+        for i in range(first, n):
+            s = i - window
+            if bad[i - 1] - bad[s] > 0:
+                continue
+            mean = (log_p[i - 1] - log_p[s]) / m
+            var = (sq[i - 1] - sq[s]) / m - mean * mean
+            R = _deviation_range(log_p, s, window, mean)
+            S = np.sqrt(var) if var > 0 else 0.0
+            if S == 0 or R == 0:
+                result[i] = 0.5
+            else:
+                result[i] = np.log(R / S) / log_n
+        return result
+else:
+
+    def _rolling_hurst_kernel(values, window, start):
+        n = len(values)
+        result = np.full(n, np.nan)
+        first = max(window, start)
+        if first >= n:
+            return result
+        if window < 10:
+            result[first:] = 0.5
+            return result
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_p = np.log(np.where(values > 0, values, np.nan))
+            returns = np.diff(log_p)
+        valid = np.isfinite(returns)
+        sq = np.concatenate(([0.0], np.cumsum(np.where(valid, returns * returns, 0.0))))
+        bad = np.concatenate(([0], np.cumsum(~valid)))
+
+        m = window - 1
+        ends = np.arange(first, n)
+        starts = ends - window
+        mean = (log_p[ends - 1] - log_p[starts]) / m
+        var = (sq[ends - 1] - sq[starts]) / m - mean * mean
+        S = np.sqrt(np.maximum(var, 0.0))
+
+        # Range of cumulative deviations, chunked to bound the (rows x window) temporary
+        R = np.empty(len(ends))
+        steps = np.arange(1, window)
+        chunk = max(1, (1 << 20) // window)
+        for lo in range(0, len(ends), chunk):
+            s = starts[lo : lo + chunk]
+            dev = (
+                log_p[s[:, None] + steps] - log_p[s][:, None] - steps * mean[lo : lo + chunk, None]
+            )
+            R[lo : lo + chunk] = dev.max(axis=1) - dev.min(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hurst = np.where((S == 0) | (R == 0), 0.5, np.log(R / S) / np.log(window))
+        hurst[bad[ends - 1] - bad[starts] > 0] = np.nan
+        result[first:] = hurst
+        return result
+
+
+def calculate_hurst(series: pd.Series, window: int = 100, last_n: int | None = None) -> pd.Series:
     """
     Calculate rolling Hurst Exponent (R/S analysis).
     Automatically falls back to NumPy if Numba is not available.
-    """
-    values = series.values.astype(np.float64)
 
-    result = _rolling_hurst_loop(values, window)
+    Each value uses the ``window`` prices before its bar. With ``last_n``
+    only the trailing ``last_n`` values are computed (earlier ones are NaN),
+    touching just the last ``last_n + window`` prices - the live path.
+    """
+    n = len(series)
+
+    if last_n is None:
+        result = _rolling_hurst_kernel(series.values.astype(np.float64), window, 0)
+    else:
+        start = max(n - last_n, 0)
+        offset = max(start - window, 0)
+        values = series.values[offset:].astype(np.float64)
+        result = np.full(n, np.nan)
+        result[offset:] = _rolling_hurst_kernel(values, window, start - offset)
 
     return pd.Series(result, index=series.index)
 
@@ -131,6 +249,8 @@ def calculate_efficiency_ratio(series: pd.Series, window: int = 100) -> pd.Serie
     return er.fillna(0)
 
 
-def calculate_rolling_hurst(series: pd.Series, window: int = 100) -> pd.Series:
+def calculate_rolling_hurst(
+    series: pd.Series, window: int = 100, last_n: int | None = None
+) -> pd.Series:
     """Wrapper for backward compatibility."""
-    return calculate_hurst(series, window)
+    return calculate_hurst(series, window, last_n)
@@ -15,7 +15,7 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
-from .indicators import calculate_adx, calculate_atr
+from .indicator_graph import IndicatorGraph
 from .math_tools import calculate_hurst
 
 logger = logging.getLogger(__name__)
@@ -46,6 +46,8 @@ def calculate_regime(
     vol_threshold: float = 0.5,
     adx_threshold: float = 25.0,
     hurst_threshold: float = 0.55,
+    hurst_last_n: int | None = None,
+    graph: IndicatorGraph | None = None,
 ) -> pd.DataFrame:
     """
     Calculate Regime State based on Volatility Z-Score and Trend Strength.
@@ -60,15 +62,21 @@ def calculate_regime(
         vol_threshold: Z-Score threshold for high volatility
         adx_threshold: ADX threshold for trending
         hurst_threshold: Hurst threshold for persistence
+        hurst_last_n: Only compute Hurst for the trailing N candles (live mode);
+            earlier rows get NaN and are never classified as trending
+        graph: Shared indicator graph of the pair, so ATR/ADX computed by
+            StoicLogic or the feature pipeline for the same candles are reused
 
     Returns:
         DataFrame with 'regime' column (MarketRegime value) and metrics.
     """
     result = pd.DataFrame(index=close.index)
+    candles = pd.DataFrame({"high": high, "low": low, "close": close}, copy=False)
+    view = (graph or IndicatorGraph()).bind(candles)
 
     # --- 1. Volatility Metric (Z-Score of ATR%) ---
-    # Optimized: Cache ATR calculation
-    atr = calculate_atr(high, low, close, 14)
+    # Optimized: ATR comes from the shared indicator graph
+    atr = view.get("atr", period=14)
     atr_pct = (atr / close).replace([np.inf, -np.inf], 0).fillna(0)
 
     # Calculate Rolling Mean/Std of ATR% for Z-Score
@@ -82,19 +90,13 @@ def calculate_regime(
     result["vol_zscore"] = (atr_pct - vol_mean) / (vol_std + 1e-9)
 
     # --- 2. Trend Metric (ADX + Hurst) ---
-    # ADX measures directional strength (0-100)
-    adx_data = calculate_adx(high, low, close, 14)
-    result["adx"] = adx_data["adx"]
+    # ADX measures directional strength (0-100), Wilder-smoothed as in calculate_adx
+    result["adx"] = view.get("adx", period=14, wilder=True)
 
     # Hurst measures persistence (0.0-1.0)
     # Optimization: Hurst calculation is the bottleneck.
-    # In live trading, we only need the LAST value.
-    if len(close) > lookback_trend * 2:
-        # For large dataframes (backtest), use full rolling
-        result["hurst"] = calculate_hurst(close, window=lookback_trend)
-    else:
-        # For short dataframes (live), optimize if possible
-        result["hurst"] = calculate_hurst(close, window=lookback_trend)
+    # In live trading, we only need the LAST value(s).
+    result["hurst"] = calculate_hurst(close, window=lookback_trend, last_n=hurst_last_n)
 
     # --- 3. Classification Logic ---
 
@@ -139,7 +141,7 @@ def get_market_regime(
     Returns:
         Tuple(RegimeEnum, MetricsDict)
     """
-    df = calculate_regime(high, low, close, volume)
+    df = calculate_regime(high, low, close, volume, hurst_last_n=1)
     last_row = df.iloc[-1]
 
     regime_str = last_row["regime"]
@@ -2,5 +2,12 @@
 
 from .aggregator import DataAggregator
 from .data_stream import StreamConfig, WebSocketDataStream
+from .orderbook import L2OrderBook, OrderBookRegistry
 
-__all__ = ["DataAggregator", "StreamConfig", "WebSocketDataStream"]
+__all__ = [
+    "DataAggregator",
+    "L2OrderBook",
+    "OrderBookRegistry",
+    "StreamConfig",
+    "WebSocketDataStream",
+]
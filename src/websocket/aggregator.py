@@ -9,9 +9,12 @@ Features:
 - Multi-exchange aggregation
 - Best bid/ask calculation
 - Volume-weighted average price (VWAP)
+- Array-backed trade tapes with rolling multi-horizon trade flow stats
 - Spread monitoring
 - Arbitrage detection
 - Orderbook imbalance calculation (L2)
+- Event-driven mode: only symbols whose inputs changed are re-aggregated,
+  bursts are coalesced and results are emitted immediately
 
 Author: Stoic Citadel Team
 License: MIT
@@ -19,14 +22,28 @@ License: MIT
 
 import asyncio
 import logging
+import statistics
 import time
 from collections import defaultdict
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any
 
+from src.monitoring.latency import LatencyHistogram
+
 from .data_stream import Exchange, StreamConfig, TickerData, TradeData, WebSocketDataStream
 from .data_types import OrderbookData
+from .ingestion import ShardedDataStream, create_data_stream
+from .orderbook import L2OrderBook, OrderBookRegistry
+from .trade_tape import TradeTape
+
+# Try to import metrics exporter
+try:
+    from src.monitoring.metrics_exporter import get_exporter
+
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +82,7 @@ class AggregatedTicker:
 
 @dataclass
 class TradeVolume:
-    """Accumulated trade volume statistics."""
+    """Trade volume statistics over a rolling window."""
 
     symbol: str
     buy_volume: float = 0.0
@@ -89,36 +106,65 @@ class TradeVolume:
 class DataAggregator:
     """
     Aggregates data from multiple exchange streams.
+
+    By default every symbol is re-aggregated each ``aggregation_interval``.
+    With ``event_driven=True`` ticker/orderbook updates mark their symbol
+    dirty and only dirty symbols are recomputed and emitted as soon as the
+    aggregation task runs; updates arriving within ``coalesce_window`` seconds
+    (or the same event-loop turn) are folded into one emission.
     """
 
-    def __init__(self, aggregation_interval: float = 0.1):
+    def __init__(
+        self,
+        aggregation_interval: float = 0.1,
+        event_driven: bool = False,
+        coalesce_window: float = 0.0,
+        trade_horizons: tuple[float, ...] = (1, 10, 60, 300),
+        trade_tape_capacity: int = 65536,
+    ):
         self.aggregation_interval = aggregation_interval
-        self._streams: dict[Exchange, WebSocketDataStream] = {}
+        self.event_driven = event_driven
+        self.coalesce_window = coalesce_window
+        self._streams: dict[Exchange, WebSocketDataStream | ShardedDataStream] = {}
         self._running = False
 
         # Data storage
         self._tickers: dict[str, dict[str, TickerData]] = defaultdict(dict)
         self._orderbooks: dict[str, dict[str, OrderbookData]] = defaultdict(dict)
-        self._trade_volumes: dict[str, TradeVolume] = {}
-        self._recent_trades: dict[str, list[TradeData]] = defaultdict(list)
+        self.order_books = OrderBookRegistry()  # Live L2 books shared by all streams
+        self._trade_tapes: dict[str, TradeTape] = {}
 
         # Callbacks
         self._aggregated_ticker_handlers: list[Callable] = []
         self._arbitrage_handlers: list[Callable] = []
         self._volume_alert_handlers: list[Callable] = []
 
+        # Dirty tracking: symbol -> perf_counter() of its oldest unemitted update
+        self._dirty: dict[str, float] = {}
+        self._dirty_event = asyncio.Event()
+        self._emit_latency: dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._metrics = get_exporter() if METRICS_AVAILABLE else None
+
         # Configuration
         self._volume_window_seconds = 60
-        self._max_recent_trades = 1000
+        self._trade_horizons = tuple(sorted({*trade_horizons, self._volume_window_seconds}))
+        self._trade_tape_capacity = trade_tape_capacity
 
     def add_exchange(
-        self, exchange: Exchange, symbols: list[str], channels: list[str] | None = None
+        self,
+        exchange: Exchange,
+        symbols: list[str],
+        channels: list[str] | None = None,
+        **stream_options: Any,
     ):
-        """Add exchange stream to aggregator."""
+        """Add exchange stream to aggregator (``stream_options`` go to ``StreamConfig``)."""
         config = StreamConfig(
-            exchange=exchange, symbols=symbols, channels=channels or ["ticker", "trade", "orderbook"]
+            exchange=exchange,
+            symbols=symbols,
+            channels=channels or ["ticker", "trade", "orderbook"],
+            **stream_options,
         )
-        stream = WebSocketDataStream(config)
+        stream = create_data_stream(config, order_books=self.order_books)
 
         # Register internal handlers
         @stream.on_ticker
@@ -144,8 +190,10 @@ class DataAggregator:
     async def start(self):
         """Start all streams and aggregation."""
         self._running = True
-        asyncio.create_task(self._aggregation_loop())
-        asyncio.create_task(self._volume_cleanup_loop())
+        if self.event_driven:
+            asyncio.create_task(self._event_loop())
+        else:
+            asyncio.create_task(self._aggregation_loop())
         tasks = [asyncio.create_task(stream.start()) for stream in self._streams.values()]
         logger.info(f"Started aggregator with {len(self._streams)} exchanges")
         await asyncio.gather(*tasks, return_exceptions=True)
@@ -153,6 +201,7 @@ class DataAggregator:
     async def stop(self):
         """Stop all streams."""
         self._running = False
+        self._dirty_event.set()  # Wake the event loop so it can exit
         for stream in self._streams.values():
             await stream.stop()
         logger.info("Aggregator stopped")
@@ -168,30 +217,28 @@ class DataAggregator:
                     return
             
             self._tickers[symbol][ticker.exchange] = ticker
+            self._mark_dirty(symbol)
 
     async def _process_trade(self, trade: TradeData):
         """Process incoming trade data."""
         symbol = self._normalize_symbol(trade.symbol)
-        self._recent_trades[symbol].append(trade)
-        if len(self._recent_trades[symbol]) > self._max_recent_trades:
-            self._recent_trades[symbol] = self._recent_trades[symbol][-self._max_recent_trades :]
-
-        if symbol not in self._trade_volumes:
-            self._trade_volumes[symbol] = TradeVolume(symbol=symbol)
-        vol = self._trade_volumes[symbol]
-        vol.total_value += trade.price * trade.quantity
-        if trade.side == "buy":
-            vol.buy_volume += trade.quantity
-        else:
-            vol.sell_volume += trade.quantity
-        total_volume = vol.buy_volume + vol.sell_volume
-        if total_volume > 0:
-            vol.vwap = vol.total_value / total_volume
+        tape = self._trade_tapes.get(symbol)
+        if tape is None:
+            tape = TradeTape(self._trade_tape_capacity, self._trade_horizons)
+            self._trade_tapes[symbol] = tape
+        tape.append(trade.timestamp, trade.price, trade.quantity, trade.side == "buy")
 
     async def _process_orderbook(self, orderbook: OrderbookData):
         """Process incoming orderbook data."""
         symbol = self._normalize_symbol(orderbook.symbol)
         self._orderbooks[symbol][orderbook.exchange] = orderbook
+        self._mark_dirty(symbol)
+
+    def _mark_dirty(self, symbol: str):
+        # Keep the oldest pending update time: latency is measured from it
+        if symbol not in self._dirty:
+            self._dirty[symbol] = time.perf_counter()
+            self._dirty_event.set()
 
     def _normalize_symbol(self, symbol: str) -> str:
         return symbol.upper().replace("-", "/").replace("_", "/")
@@ -204,13 +251,51 @@ class DataAggregator:
             except Exception as e:
                 logger.error(f"Aggregation error: {e}")
 
+    async def _event_loop(self):
+        while self._running:
+            try:
+                await self._dirty_event.wait()
+                # Coalesce the rest of the burst before recomputing
+                await asyncio.sleep(self.coalesce_window)
+                self._dirty_event.clear()
+                await self._emit_dirty()
+            except Exception as e:
+                logger.error(f"Aggregation error: {e}")
+
+    async def _emit_dirty(self):
+        dirty, self._dirty = self._dirty, {}
+        for symbol, updated_at in dirty.items():
+            exchange_tickers = self._tickers.get(symbol)
+            if not exchange_tickers:
+                continue  # Orderbook without a ticker yet
+            await self._emit(symbol, exchange_tickers, updated_at)
+
     async def _aggregate_and_emit(self):
+        dirty, self._dirty = self._dirty, {}
         for symbol, exchange_tickers in self._tickers.items():
             if not exchange_tickers:
                 continue
-            aggregated = self._aggregate_ticker(symbol, exchange_tickers)
-            for handler in self._aggregated_ticker_handlers:
-                await handler(aggregated)
+            await self._emit(symbol, exchange_tickers, dirty.get(symbol))
+
+    async def _emit(
+        self, symbol: str, exchange_tickers: dict[str, TickerData], updated_at: float | None
+    ):
+        aggregated = self._aggregate_ticker(symbol, exchange_tickers)
+        for handler in self._aggregated_ticker_handlers:
+            await handler(aggregated)
+
+        if updated_at is not None:
+            latency = time.perf_counter() - updated_at
+            self._emit_latency[symbol].record(latency)
+            if self._metrics is not None:
+                self._metrics.record_aggregation_latency(symbol, latency * 1000)
+
+    def get_latency_stats(self, symbol: str | None = None) -> dict[str, Any]:
+        """Update-to-emit latency summaries, per symbol (or for one symbol)."""
+        if symbol is not None:
+            histogram = self._emit_latency.get(self._normalize_symbol(symbol))
+            return histogram.summary() if histogram else LatencyHistogram().summary()
+        return {sym: histogram.summary() for sym, histogram in self._emit_latency.items()}
 
     def _aggregate_ticker(
         self, symbol: str, exchange_tickers: dict[str, TickerData]
@@ -230,7 +315,6 @@ class DataAggregator:
                 avg_imbalance = sum(ob.imbalance for ob in obs.values()) / len(obs)
 
         # Outlier Detection (Median-based)
-        import statistics
         reliability_issues = []
         
         valid_bids = []
@@ -313,11 +397,44 @@ class DataAggregator:
     def _is_data_valid(self, ticker: TickerData) -> bool:
         return ticker.last > 0 and ticker.bid > 0 and ticker.ask > 0
 
-    async def _volume_cleanup_loop(self):
-        while self._running:
-            await asyncio.sleep(self._volume_window_seconds)
-            for symbol in self._trade_volumes:
-                self._trade_volumes[symbol] = TradeVolume(symbol=symbol)
+    def get_trade_tape(self, symbol: str) -> TradeTape | None:
+        """Trade tape of a symbol (vectorized export via ``to_array``/``to_frame``)."""
+        return self._trade_tapes.get(self._normalize_symbol(symbol))
+
+    def get_trade_stats(
+        self, symbol: str, horizon: float | None = None, now: float | None = None
+    ) -> dict[str, Any] | None:
+        """Rolling trade flow stats for one horizon (default: all horizons)."""
+        tape = self.get_trade_tape(symbol)
+        if tape is None:
+            return None
+        now = now if now is not None else time.time()
+        if horizon is not None:
+            return tape.stats(horizon, now)
+        return {h: tape.stats(h, now) for h in tape.horizons}
+
+    def get_trade_volume(self, symbol: str, now: float | None = None) -> TradeVolume | None:
+        """Rolling trade volume over the last ``_volume_window_seconds``."""
+        tape = self.get_trade_tape(symbol)
+        if tape is None:
+            return None
+        now = now if now is not None else time.time()
+        stats = tape.stats(self._volume_window_seconds, now)
+        return TradeVolume(
+            symbol=self._normalize_symbol(symbol),
+            buy_volume=stats["buy_volume"],
+            sell_volume=stats["sell_volume"],
+            buy_count=stats["buy_count"],
+            sell_count=stats["sell_count"],
+            total_value=stats["vwap"] * stats["volume"],
+            vwap=stats["vwap"],
+            window_start=now - self._volume_window_seconds,
+        )
+
+    def get_order_book(self, symbol: str, exchange: str) -> L2OrderBook | None:
+        """Live incremental book behind the latest orderbook update, if any."""
+        orderbook = self._orderbooks.get(self._normalize_symbol(symbol), {}).get(exchange)
+        return orderbook.book if orderbook is not None else None
 
     def get_aggregated_ticker(self, symbol: str) -> AggregatedTicker | None:
         symbol = self._normalize_symbol(symbol)
@@ -9,7 +9,9 @@ Provides low-latency price updates for multiple symbols simultaneously.
 Features:
 - Multi-exchange WebSocket connections
 - Automatic reconnection with exponential backoff
-- Rate limiting and message buffering
+- Rate limiting and message buffering (bounded, with drop/backlog metrics)
+- Fast JSON parsing (orjson) when installed
+- Optional sharded multi-core ingestion (see ``ingestion.py``)
 - Data normalization across exchanges
 - Health monitoring and alerting
 
@@ -21,7 +23,7 @@ import asyncio
 import json
 import logging
 import time
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -31,6 +33,17 @@ from websockets.exceptions import ConnectionClosed
 from .data_types import IWebSocketClient, TickerData, TradeData, OrderbookData
 from .exchange_handlers import ExchangeHandler, create_exchange_handler
 from .exchange_types import Exchange
+from .orderbook import OrderBookRegistry
+
+# Fast JSON parser when available (orjson errors subclass json.JSONDecodeError)
+try:
+    import orjson
+
+    json_loads = orjson.loads
+    FAST_JSON_AVAILABLE = True
+except ImportError:
+    json_loads = json.loads
+    FAST_JSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -48,11 +61,38 @@ class StreamConfig:
     ping_timeout: float = 10.0
     max_queue_size: int = 10000
 
+    # Order book channel
+    orderbook_depth: int = 5  # Levels emitted to orderbook handlers
+    orderbook_diff: bool = False  # Binance: diff-depth stream instead of partial snapshots
+    # Async callable(symbol) -> {"bids", "asks", "lastUpdateId" | "nonce"} (e.g. REST depth).
+    # Used to resync a book after a sequence gap; without it the symbol is resubscribed.
+    # Required for Binance diff-depth, which never sends a snapshot over the socket.
+    orderbook_snapshot_fetcher: Callable[[str], Awaitable[dict[str, Any]]] | None = None
+
+    # Sharded ingestion (used by ``ingestion.create_data_stream``)
+    ingestion_shards: int = 0  # 0 = parse and dispatch on the caller's event loop
+    ingestion_mode: str = "thread"  # "thread" or "process"
+    ring_capacity: int = 65536  # Records buffered per shard before dropping
+    ring_slot_bytes: int = 4096  # Max serialized record size (process mode)
+    dispatch_batch_size: int = 1024  # Records drained per shard per dispatch pass
+    max_idle_sleep: float = 0.001  # Upper bound of the idle poll back-off (seconds)
+
+    def __post_init__(self):
+        if (
+            self.orderbook_diff
+            and self.exchange == Exchange.BINANCE
+            and self.orderbook_snapshot_fetcher is None
+        ):
+            # Resubscribing only restarts the diff stream, so the book would never sync
+            raise ValueError("Binance orderbook_diff requires an orderbook_snapshot_fetcher")
+
     @property
     def ws_url(self) -> str:
         """Get WebSocket URL for exchange."""
         urls = {
-            Exchange.BINANCE: "wss://stream.binance.com:9443/ws",
+            # Combined endpoint: every message is wrapped as {"stream", "data"}, which is
+            # the only place partial-depth payloads name their symbol
+            Exchange.BINANCE: "wss://stream.binance.com:9443/stream",
             Exchange.BYBIT: "wss://stream.bybit.com/v5/public/spot",
             Exchange.OKX: "wss://ws.okx.com:8443/ws/v5/public",
             Exchange.KRAKEN: "wss://ws.kraken.com",
@@ -65,9 +105,17 @@ class WebSocketDataStream:
     Real-time market data streaming via WebSocket.
     """
 
-    def __init__(self, config: StreamConfig, websocket_client: IWebSocketClient | None = None):
+    def __init__(
+        self,
+        config: StreamConfig,
+        websocket_client: IWebSocketClient | None = None,
+        order_books: OrderBookRegistry | None = None,
+    ):
         """
         Initialize WebSocket data stream.
+
+        ``order_books`` may be shared between streams to keep every
+        (exchange, symbol) book in one registry.
         """
         self.config = config
         self._ws: IWebSocketClient | None = None
@@ -76,7 +124,13 @@ class WebSocketDataStream:
         self._reconnect_delay = config.reconnect_delay
 
         # Exchange handler
-        self._exchange_handler: ExchangeHandler = create_exchange_handler(config.exchange)
+        self._exchange_handler: ExchangeHandler = create_exchange_handler(
+            config.exchange, order_books
+        )
+        self._exchange_handler.orderbook_depth = config.orderbook_depth
+        self._exchange_handler.orderbook_diff = config.orderbook_diff
+        self._exchange_handler.resync_handler = self._schedule_orderbook_resync
+        self._resync_tasks: set[asyncio.Task] = set()
 
         # Callback handlers
         self._ticker_handlers: list[Callable[[TickerData], Any]] = []
@@ -91,6 +145,8 @@ class WebSocketDataStream:
         self._stats = {
             "messages_received": 0,
             "messages_processed": 0,
+            "messages_dropped": 0,
+            "queue_high_water": 0,
             "reconnects": 0,
             "errors": 0,
             "last_message_time": 0.0,
@@ -202,6 +258,8 @@ class WebSocketDataStream:
             )
 
         self._reconnect_delay = self.config.reconnect_delay
+        # Updates were missed while disconnected
+        self.order_books.invalidate(self.config.exchange.value)
         await self._subscribe()
         await self._listen()
 
@@ -248,9 +306,21 @@ class WebSocketDataStream:
         self._stats["last_message_time"] = time.time()
 
         try:
-            await self._message_queue.put(message)
+            self._message_queue.put_nowait(message)
         except asyncio.QueueFull:
-            logger.warning("Message queue full, dropping message")
+            # Never block the receive loop: drop, count and warn at a bounded rate
+            self._stats["messages_dropped"] += 1
+            dropped = self._stats["messages_dropped"]
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning(
+                    f"Message queue full ({self._message_queue.maxsize}), "
+                    f"{dropped} messages dropped so far"
+                )
+            return
+
+        depth = self._message_queue.qsize()
+        if depth > self._stats["queue_high_water"]:
+            self._stats["queue_high_water"] = depth
 
     async def _process_messages(self):
         """Process messages from queue."""
@@ -267,7 +337,7 @@ class WebSocketDataStream:
     async def _handle_message(self, raw_message: str):
         """Parse and route message to handlers."""
         try:
-            data = json.loads(raw_message)
+            data = json_loads(raw_message)
             await self._exchange_handler.handle_message(
                 data, self._ticker_handlers, self._trade_handlers, self._orderbook_handlers
             )
@@ -278,6 +348,41 @@ class WebSocketDataStream:
             for handler in self._error_handlers:
                 await handler(e)
 
+    # =========================================================================
+    # Order Book Sync
+    # =========================================================================
+
+    @property
+    def order_books(self) -> OrderBookRegistry:
+        return self._exchange_handler.order_books
+
+    async def _schedule_orderbook_resync(self, symbol: str):
+        # Run in the background: deltas keep arriving and are buffered meanwhile
+        task = asyncio.create_task(self._resync_orderbook(symbol))
+        self._resync_tasks.add(task)
+        task.add_done_callback(self._resync_tasks.discard)
+
+    async def _resync_orderbook(self, symbol: str):
+        """Restore a desynced book from a snapshot (REST fetch or resubscribe)."""
+        book = self.order_books.get_or_create(self.config.exchange.value, symbol)
+        try:
+            fetcher = self.config.orderbook_snapshot_fetcher
+            if fetcher is not None:
+                snapshot = await fetcher(symbol)
+                book.apply_snapshot(
+                    snapshot["bids"],
+                    snapshot["asks"],
+                    sequence=snapshot.get("lastUpdateId", snapshot.get("nonce")),
+                )
+                logger.info(f"Resynced {self.config.exchange.value} {symbol} order book")
+            elif self._ws is not None:
+                # Exchanges with snapshot+delta channels send a fresh snapshot on subscribe
+                await self._exchange_handler.unsubscribe_symbol(self._ws, symbol, ["orderbook"])
+                await self._exchange_handler.subscribe_symbol(self._ws, symbol, ["orderbook"])
+        except Exception as e:
+            logger.error(f"Order book resync failed for {symbol}: {e}")
+            book.resync_requested = False
+
     # =========================================================================
     # Dynamic Subscription Management
     # =========================================================================
@@ -310,6 +415,7 @@ class WebSocketDataStream:
             "connected": self._ws is not None and self._running,
             "subscribed_symbols": list(self._subscribed),
             "queue_size": self._message_queue.qsize(),
+            "queue_fill_ratio": self._message_queue.qsize() / self.config.max_queue_size,
             "messages_per_second": (self._stats["messages_received"] / max(1, uptime)),
         }
 
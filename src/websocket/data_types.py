@@ -3,9 +3,12 @@
 Data types and interfaces for WebSocket data streaming.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
+
+if TYPE_CHECKING:
+    from .orderbook import L2OrderBook
 
 
 @runtime_checkable
@@ -104,6 +107,8 @@ class OrderbookData:
     asks: list[list[float]]  # [[price, volume], ...]
     timestamp: float
     imbalance: float = 0.0
+    # Live incremental book this view was taken from (deeper levels, microprice)
+    book: "L2OrderBook | None" = field(default=None, repr=False, compare=False)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -17,8 +17,9 @@ from abc import ABC, abstractmethod
 from collections.abc import Awaitable, Callable
 from typing import Any
 
-from .data_types import IWebSocketClient, TickerData, TradeData, OrderbookData
+from .data_types import IWebSocketClient, OrderbookData, TickerData, TradeData
 from .exchange_types import Exchange
+from .orderbook import L2OrderBook, OrderBookRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +27,14 @@ logger = logging.getLogger(__name__)
 class ExchangeHandler(ABC):
     """Abstract base class for exchange-specific WebSocket handlers."""
 
-    def __init__(self, exchange: Exchange):
+    def __init__(self, exchange: Exchange, order_books: OrderBookRegistry | None = None):
         self.exchange = exchange
+        self.order_books = order_books if order_books is not None else OrderBookRegistry()
+
+        # Order book stream settings (set from StreamConfig by the data stream)
+        self.orderbook_depth = 5  # Levels emitted to handlers / partial-depth subscription
+        self.orderbook_diff = False  # Subscribe to diff-depth instead of partial snapshots
+        self.resync_handler: Callable[[str], Awaitable[None]] | None = None
 
     @abstractmethod
     async def subscribe(
@@ -73,12 +80,37 @@ class ExchangeHandler(ABC):
         """Get exchange name as string."""
         return self.exchange.value
 
+    async def _emit_orderbook(
+        self,
+        book: L2OrderBook,
+        orderbook_handlers: list[Callable[[OrderbookData], Awaitable[None]]],
+    ) -> None:
+        """Emit the top-of-book view of an updated book."""
+        if not orderbook_handlers:
+            return
+        orderbook = book.to_orderbook_data(self.orderbook_depth)
+        for handler in orderbook_handlers:
+            await handler(orderbook)
+
+    async def _request_resync(self, book: L2OrderBook) -> None:
+        """Ask the stream for a fresh snapshot once per desync."""
+        if book.resync_requested or self.resync_handler is None:
+            return
+        book.resync_requested = True
+        logger.info(f"Requesting order book resync for {book.exchange} {book.symbol}")
+        await self.resync_handler(book.symbol)
+
 
 class BinanceHandler(ExchangeHandler):
     """Handler for Binance WebSocket API."""
 
-    def __init__(self):
-        super().__init__(Exchange.BINANCE)
+    def __init__(self, order_books: OrderBookRegistry | None = None):
+        super().__init__(Exchange.BINANCE, order_books)
+
+    def _depth_stream(self, symbol_lower: str) -> str:
+        if self.orderbook_diff:
+            return f"{symbol_lower}@depth@100ms"  # Diff-depth, synced against a snapshot
+        return f"{symbol_lower}@depth{self.orderbook_depth}@100ms"  # Partial book, 100ms
 
     async def subscribe(
         self, websocket: IWebSocketClient, symbols: list[str], channels: list[str]
@@ -92,7 +124,7 @@ class BinanceHandler(ExchangeHandler):
             if "trade" in channels:
                 streams.append(f"{symbol_lower}@trade")
             if "orderbook" in channels:
-                streams.append(f"{symbol_lower}@depth5@100ms") # Top 5 levels, 100ms update
+                streams.append(self._depth_stream(symbol_lower))
             if "kline" in channels:
                 streams.append(f"{symbol_lower}@kline_1m")
 
@@ -108,33 +140,41 @@ class BinanceHandler(ExchangeHandler):
         orderbook_handlers: list[Callable[[OrderbookData], Awaitable[None]]],
     ) -> None:
         """Handle Binance-specific message format."""
+        # Combined-stream envelope: {"stream": "btcusdt@depth5@100ms", "data": {...}}
+        stream_symbol = None
+        if "stream" in data and "data" in data:
+            stream_symbol = data["stream"].split("@", 1)[0].upper()
+            data = data["data"]
+
         # 1. Handle Depth/Orderbook (partial book depth)
         # Note: top-N depth doesn't have 'e' field, but has 'lastUpdateId'
         if "bids" in data and "asks" in data and "lastUpdateId" in data:
-            # For Binance @depthN, symbol is NOT in the payload usually.
-            symbol = data.get("s", "UNKNOWN/USDT") 
-            
-            bids = [[float(b[0]), float(b[1])] for b in data["bids"]]
-            asks = [[float(a[0]), float(a[1])] for a in data["asks"]]
-            
-            bid_vol = sum(b[1] for b in bids)
-            ask_vol = sum(a[1] for a in asks)
-            imbalance = (bid_vol - ask_vol) / (bid_vol + ask_vol) if (bid_vol + ask_vol) > 0 else 0
-            
-            ob = OrderbookData(
-                exchange="binance",
-                symbol=symbol,
-                bids=bids,
-                asks=asks,
-                timestamp=time.time(),
-                imbalance=imbalance
-            )
-            for handler in orderbook_handlers:
-                await handler(ob)
+            # Partial-depth payloads carry no symbol; only the stream name has it
+            symbol = data.get("s", stream_symbol)
+            if symbol is None:
+                logger.debug("Dropping Binance partial depth without a stream name")
+                return
+            book = self.order_books.get_or_create("binance", symbol)
+            book.apply_snapshot(data["bids"], data["asks"], sequence=data["lastUpdateId"])
+            await self._emit_orderbook(book, orderbook_handlers)
             return
 
         event_type = data.get("e")
-        if event_type == "24hrTicker":
+        if event_type == "depthUpdate":
+            book = self.order_books.get_or_create("binance", data["s"])
+            applied = book.apply_delta(
+                data["b"],
+                data["a"],
+                sequence=data["u"],
+                first_sequence=data["U"],
+                timestamp=data["E"] / 1000,
+            )
+            if applied:
+                await self._emit_orderbook(book, orderbook_handlers)
+            elif book.needs_resync:
+                await self._request_resync(book)
+
+        elif event_type == "24hrTicker":
             ticker = TickerData(
                 exchange="binance",
                 symbol=data["s"],
@@ -172,7 +212,7 @@ class BinanceHandler(ExchangeHandler):
         if "trade" in channels:
             streams.append(f"{symbol_lower}@trade")
         if "orderbook" in channels:
-            streams.append(f"{symbol_lower}@depth5@100ms")
+            streams.append(self._depth_stream(symbol_lower))
 
         msg = {"method": "SUBSCRIBE", "params": streams, "id": int(time.time() * 1000)}
         await websocket.send(json.dumps(msg))
@@ -188,6 +228,8 @@ class BinanceHandler(ExchangeHandler):
             streams.append(f"{symbol_lower}@ticker")
         if "trade" in channels:
             streams.append(f"{symbol_lower}@trade")
+        if "orderbook" in channels:
+            streams.append(self._depth_stream(symbol_lower))
 
         msg = {"method": "UNSUBSCRIBE", "params": streams, "id": int(time.time() * 1000)}
         await websocket.send(json.dumps(msg))
@@ -197,8 +239,15 @@ class BinanceHandler(ExchangeHandler):
 class BybitHandler(ExchangeHandler):
     """Handler for Bybit WebSocket API."""
 
-    def __init__(self):
-        super().__init__(Exchange.BYBIT)
+    # Spot order book depths with snapshot + delta updates
+    _BOOK_DEPTHS = (1, 50, 200)
+
+    def __init__(self, order_books: OrderBookRegistry | None = None):
+        super().__init__(Exchange.BYBIT, order_books)
+
+    def _book_topic(self, symbol_upper: str) -> str:
+        depth = next((d for d in self._BOOK_DEPTHS if d >= self.orderbook_depth), 200)
+        return f"orderbook.{depth}.{symbol_upper}"
 
     async def subscribe(
         self, websocket: IWebSocketClient, symbols: list[str], channels: list[str]
@@ -211,6 +260,8 @@ class BybitHandler(ExchangeHandler):
                 args.append(f"tickers.{symbol_upper}")
             if "trade" in channels:
                 args.append(f"publicTrade.{symbol_upper}")
+            if "orderbook" in channels:
+                args.append(self._book_topic(symbol_upper))
 
         subscribe_msg = {"op": "subscribe", "args": args}
         await websocket.send(json.dumps(subscribe_msg))
@@ -226,7 +277,28 @@ class BybitHandler(ExchangeHandler):
         """Handle Bybit-specific message format."""
         topic = data.get("topic", "")
 
-        if "tickers" in topic:
+        if topic.startswith("orderbook."):
+            book_data = data.get("data", {})
+            book = self.order_books.get_or_create("bybit", book_data.get("s", ""))
+            timestamp = data.get("ts", time.time() * 1000) / 1000
+            if data.get("type") == "snapshot":
+                book.apply_snapshot(
+                    book_data.get("b", []), book_data.get("a", []), book_data.get("u"), timestamp
+                )
+                applied = True
+            else:
+                applied = book.apply_delta(
+                    book_data.get("b", []),
+                    book_data.get("a", []),
+                    sequence=book_data.get("u"),
+                    timestamp=timestamp,
+                )
+            if applied:
+                await self._emit_orderbook(book, orderbook_handlers)
+            elif book.needs_resync:
+                await self._request_resync(book)
+
+        elif "tickers" in topic:
             ticker_data = data.get("data", {})
             ticker = TickerData(
                 exchange="bybit",
@@ -265,6 +337,8 @@ class BybitHandler(ExchangeHandler):
             args.append(f"tickers.{symbol_upper}")
         if "trade" in channels:
             args.append(f"publicTrade.{symbol_upper}")
+        if "orderbook" in channels:
+            args.append(self._book_topic(symbol_upper))
 
         msg = {"op": "subscribe", "args": args}
         await websocket.send(json.dumps(msg))
@@ -280,6 +354,8 @@ class BybitHandler(ExchangeHandler):
             args.append(f"tickers.{symbol_upper}")
         if "trade" in channels:
             args.append(f"publicTrade.{symbol_upper}")
+        if "orderbook" in channels:
+            args.append(self._book_topic(symbol_upper))
 
         msg = {"op": "unsubscribe", "args": args}
         await websocket.send(json.dumps(msg))
@@ -289,8 +365,8 @@ class BybitHandler(ExchangeHandler):
 class OkxHandler(ExchangeHandler):
     """Handler for OKX WebSocket API."""
 
-    def __init__(self):
-        super().__init__(Exchange.OKX)
+    def __init__(self, order_books: OrderBookRegistry | None = None):
+        super().__init__(Exchange.OKX, order_books)
 
     async def subscribe(
         self, websocket: IWebSocketClient, symbols: list[str], channels: list[str]
@@ -303,6 +379,8 @@ class OkxHandler(ExchangeHandler):
                 args.append({"channel": "tickers", "instId": symbol_upper})
             if "trade" in channels:
                 args.append({"channel": "trades", "instId": symbol_upper})
+            if "orderbook" in channels:
+                args.append({"channel": "books", "instId": symbol_upper})
 
         subscribe_msg = {"op": "subscribe", "args": args}
         await websocket.send(json.dumps(subscribe_msg))
@@ -328,7 +406,30 @@ class OkxHandler(ExchangeHandler):
         if not data_list:
             return
 
-        if channel == "tickers":
+        if channel == "books":
+            book = self.order_books.get_or_create("okx", arg.get("instId", "").replace("-", "/"))
+            for book_data in data_list:
+                timestamp = int(book_data.get("ts", time.time() * 1000)) / 1000
+                sequence = book_data.get("seqId")
+                if data.get("action") == "snapshot":
+                    book.apply_snapshot(
+                        book_data.get("bids", []), book_data.get("asks", []), sequence, timestamp
+                    )
+                    applied = True
+                else:
+                    applied = book.apply_delta(
+                        book_data.get("bids", []),
+                        book_data.get("asks", []),
+                        sequence=sequence,
+                        prev_sequence=book_data.get("prevSeqId"),
+                        timestamp=timestamp,
+                    )
+                if applied:
+                    await self._emit_orderbook(book, orderbook_handlers)
+                elif book.needs_resync:
+                    await self._request_resync(book)
+
+        elif channel == "tickers":
             for ticker_data in data_list:
                 ticker = TickerData(
                     exchange="okx",
@@ -371,6 +472,8 @@ class OkxHandler(ExchangeHandler):
             args.append({"channel": "tickers", "instId": symbol_upper})
         if "trade" in channels:
             args.append({"channel": "trades", "instId": symbol_upper})
+        if "orderbook" in channels:
+            args.append({"channel": "books", "instId": symbol_upper})
 
         msg = {"op": "subscribe", "args": args}
         await websocket.send(json.dumps(msg))
@@ -386,6 +489,8 @@ class OkxHandler(ExchangeHandler):
             args.append({"channel": "tickers", "instId": symbol_upper})
         if "trade" in channels:
             args.append({"channel": "trades", "instId": symbol_upper})
+        if "orderbook" in channels:
+            args.append({"channel": "books", "instId": symbol_upper})
 
         msg = {"op": "unsubscribe", "args": args}
         await websocket.send(json.dumps(msg))
@@ -395,8 +500,8 @@ class OkxHandler(ExchangeHandler):
 class KrakenHandler(ExchangeHandler):
     """Handler for Kraken WebSocket API."""
 
-    def __init__(self):
-        super().__init__(Exchange.KRAKEN)
+    def __init__(self, order_books: OrderBookRegistry | None = None):
+        super().__init__(Exchange.KRAKEN, order_books)
 
     async def subscribe(
         self, websocket: IWebSocketClient, symbols: list[str], channels: list[str]
@@ -500,7 +605,9 @@ class KrakenHandler(ExchangeHandler):
         return kraken_symbol
 
 
-def create_exchange_handler(exchange: Exchange) -> ExchangeHandler:
+def create_exchange_handler(
+    exchange: Exchange, order_books: OrderBookRegistry | None = None
+) -> ExchangeHandler:
     """Factory function to create exchange handler."""
     handlers = {
         Exchange.BINANCE: BinanceHandler,
@@ -513,5 +620,5 @@ def create_exchange_handler(exchange: Exchange) -> ExchangeHandler:
     if not handler_class:
         raise ValueError(f"No handler available for exchange: {exchange}")
 
-    return handler_class()
+    return handler_class(order_books)
     handler_class = handlers.get(exchange)
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Sharded WebSocket Ingestion
+===========================
+
+Moves WebSocket receive, JSON parsing and normalization off the main event loop.
+
+Symbols of one exchange are split across shards. Each shard runs its own
+``WebSocketDataStream`` (own connection, own event loop) in a thread or in a
+spawned process and publishes normalized ``TickerData`` / ``TradeData`` /
+``OrderbookData`` into a bounded single-producer/single-consumer ring:
+- thread shards use ``RingBuffer`` (preallocated object slots, no locks)
+- process shards use ``SharedMemoryRing`` (fixed-size byte slots in shared memory)
+
+The main loop only drains the rings in batches and awaits the registered
+handlers, so order management is not stalled by parsing bursts. A full ring
+drops the newest record and counts it; depth, high-water mark, drops and
+shard-to-dispatch latency are exposed by ``get_stats()``.
+
+Usage:
+    config = StreamConfig(Exchange.BINANCE, symbols, ingestion_shards=4)
+    stream = create_data_stream(config)  # ShardedDataStream
+
+    @stream.on_ticker
+    async def on_ticker(ticker): ...
+
+    await stream.start()
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+import pickle
+import threading
+import time
+from collections.abc import Callable
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+
+from src.monitoring.latency import LatencyHistogram
+
+from .data_stream import FAST_JSON_AVAILABLE, StreamConfig, WebSocketDataStream
+from .data_types import IWebSocketClient, OrderbookData, TickerData, TradeData
+from .orderbook import OrderBookRegistry
+
+logger = logging.getLogger(__name__)
+
+# Record kinds published by shards
+TICKER, TRADE, ORDERBOOK, ERROR = 0, 1, 2, 3
+
+
+class RingBuffer:
+    """
+    Bounded single-producer/single-consumer ring of Python objects.
+
+    Lock-free under the GIL: only the producer advances ``_head`` and only
+    the consumer advances ``_tail``.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        self.capacity = capacity
+        self._slots: list[Any] = [None] * capacity
+        self._head = 0  # Total records written
+        self._tail = 0  # Total records read
+        self.drops = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def put(self, item: Any) -> bool:
+        """Append ``item``; returns False (and counts a drop) if the ring is full."""
+        depth = self._head - self._tail
+        if depth >= self.capacity:
+            self.drops += 1
+            return False
+        self._slots[self._head % self.capacity] = item
+        self._head += 1
+        if depth + 1 > self.high_water:
+            self.high_water = depth + 1
+        return True
+
+    def get_batch(self, max_items: int = 1024) -> list[Any]:
+        """Remove and return up to ``max_items`` records, oldest first."""
+        n = min(self._head - self._tail, max_items)
+        if n <= 0:
+            return []
+        start = self._tail % self.capacity
+        end = start + n
+        slots = self._slots
+        if end <= self.capacity:
+            items = slots[start:end]
+            slots[start:end] = [None] * n
+        else:
+            items = slots[start:] + slots[: end - self.capacity]
+            slots[start:] = [None] * (self.capacity - start)
+            slots[: end - self.capacity] = [None] * (end - self.capacity)
+        self._tail += n
+        return items
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "depth": len(self),
+            "capacity": self.capacity,
+            "fill_ratio": len(self) / self.capacity,
+            "high_water": self.high_water,
+            "published": self._head,
+            "drops": self.drops,
+        }
+
+
+class SharedMemoryRing:
+    """
+    Bounded single-producer/single-consumer ring of byte records in shared memory.
+
+    Layout: a header of uint64 counters [head, tail, drops, oversize, high_water]
+    followed by ``capacity`` slots of ``slot_size`` bytes (4-byte length prefix
+    plus payload). The producer writes the payload before publishing ``head``.
+
+    Pickling an instance (e.g. as a ``Process`` argument) attaches to the same
+    block; only the creator unlinks it.
+    """
+
+    _HEADER = 5
+    _HEAD, _TAIL, _DROPS, _OVERSIZE, _HIGH_WATER = range(_HEADER)
+
+    def __init__(self, capacity: int = 16384, slot_size: int = 4096, name: str | None = None):
+        self.capacity = capacity
+        self.slot_size = slot_size
+        size = self._HEADER * 8 + capacity * slot_size
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size)
+        self.name = self._shm.name
+        self._header = np.ndarray((self._HEADER,), dtype=np.uint64, buffer=self._shm.buf)
+        if self._owner:
+            self._header[:] = 0
+        self._slots = self._shm.buf[self._HEADER * 8 :]
+
+    def __reduce__(self):
+        return (self.__class__, (self.capacity, self.slot_size, self.name))
+
+    def __len__(self) -> int:
+        return int(self._header[self._HEAD] - self._header[self._TAIL])
+
+    def put(self, payload: bytes) -> bool:
+        """Append a record; returns False if the ring is full or the record too large."""
+        header = self._header
+        if len(payload) > self.slot_size - 4:
+            header[self._OVERSIZE] += 1
+            return False
+        head = int(header[self._HEAD])
+        depth = head - int(header[self._TAIL])
+        if depth >= self.capacity:
+            header[self._DROPS] += 1
+            return False
+
+        offset = (head % self.capacity) * self.slot_size
+        self._slots[offset : offset + 4] = len(payload).to_bytes(4, "little")
+        self._slots[offset + 4 : offset + 4 + len(payload)] = payload
+        header[self._HEAD] = head + 1
+        if depth + 1 > header[self._HIGH_WATER]:
+            header[self._HIGH_WATER] = depth + 1
+        return True
+
+    def get_batch(self, max_items: int = 1024) -> list[bytes]:
+        """Remove and return up to ``max_items`` records, oldest first."""
+        header = self._header
+        tail = int(header[self._TAIL])
+        n = min(int(header[self._HEAD]) - tail, max_items)
+        items = []
+        for seq in range(tail, tail + n):
+            offset = (seq % self.capacity) * self.slot_size
+            length = int.from_bytes(self._slots[offset : offset + 4], "little")
+            items.append(bytes(self._slots[offset + 4 : offset + 4 + length]))
+        if n > 0:
+            header[self._TAIL] = tail + n
+        return items
+
+    def get_stats(self) -> dict[str, Any]:
+        header = self._header
+        return {
+            "depth": len(self),
+            "capacity": self.capacity,
+            "fill_ratio": len(self) / self.capacity,
+            "high_water": int(header[self._HIGH_WATER]),
+            "published": int(header[self._HEAD]),
+            "drops": int(header[self._DROPS]),
+            "oversize": int(header[self._OVERSIZE]),
+        }
+
+    def close(self) -> None:
+        # Release exported views before closing the mapping
+        self._header = None
+        self._slots.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _publisher(stream: WebSocketDataStream, publish: Callable[[tuple], Any]) -> None:
+    """Register handlers on ``stream`` that publish (kind, received_at, record) tuples."""
+
+    @stream.on_ticker
+    async def on_ticker(ticker: TickerData):
+        publish((TICKER, time.perf_counter(), ticker))
+
+    @stream.on_trade
+    async def on_trade(trade: TradeData):
+        publish((TRADE, time.perf_counter(), trade))
+
+    @stream.on_orderbook
+    async def on_orderbook(orderbook: OrderbookData):
+        # Publish the top-k snapshot only: the shard keeps mutating the live book
+        # while the consumer reads the record on another thread or process
+        orderbook = dataclasses.replace(orderbook, book=None)
+        publish((ORDERBOOK, time.perf_counter(), orderbook))
+
+    @stream.on_error
+    async def on_error(error: Exception):
+        publish((ERROR, time.perf_counter(), RuntimeError(f"{type(error).__name__}: {error}")))
+
+
+def _run_process_shard(config: StreamConfig, ring: SharedMemoryRing, stop_event) -> None:
+    """Process entry point: stream ``config.symbols`` into ``ring`` until stopped."""
+    stream = WebSocketDataStream(config)
+
+    def publish(record: tuple) -> None:
+        ring.put(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL))
+
+    _publisher(stream, publish)
+
+    async def main():
+        task = asyncio.create_task(stream.start())
+        while not stop_event.is_set() and not task.done():
+            await asyncio.sleep(0.1)
+        await stream.stop()
+        task.cancel()
+
+    try:
+        asyncio.run(main())
+    finally:
+        ring.close()
+
+
+class _ThreadShard:
+    """Shard running a ``WebSocketDataStream`` on its own event loop in a thread."""
+
+    def __init__(
+        self,
+        index: int,
+        config: StreamConfig,
+        websocket_client: IWebSocketClient | None,
+        order_books: OrderBookRegistry,
+    ):
+        self.index = index
+        self.symbols = config.symbols
+        self.ring = RingBuffer(config.ring_capacity)
+        self.stream = WebSocketDataStream(config, websocket_client, order_books)
+        _publisher(self.stream, self.ring.put)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"ws-shard-{config.exchange.value}-{index}", daemon=True
+        )
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self.stream.start())
+        except Exception as e:
+            logger.error(f"Ingestion shard {self.index} crashed: {e}")
+        finally:
+            self._loop.close()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._loop is not None and self._loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(self.stream.stop(), self._loop)
+            try:
+                future.result(timeout)
+            except Exception as e:
+                logger.warning(f"Error stopping ingestion shard {self.index}: {e}")
+        self._thread.join(timeout)
+
+    def decode(self, record: Any) -> tuple:
+        return record
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "mode": "thread",
+            "symbols": self.symbols,
+            "alive": self._thread.is_alive(),
+            "ring": self.ring.get_stats(),
+            "stream": self.stream.get_stats(),
+        }
+
+
+class _ProcessShard:
+    """Shard running a ``WebSocketDataStream`` in a spawned process."""
+
+    def __init__(self, index: int, config: StreamConfig):
+        self.index = index
+        self.symbols = config.symbols
+        self.ring = SharedMemoryRing(config.ring_capacity, config.ring_slot_bytes)
+        context = multiprocessing.get_context("spawn")
+        self._stop_event = context.Event()
+        self._process = context.Process(
+            target=_run_process_shard,
+            args=(config, self.ring, self._stop_event),
+            name=f"ws-shard-{config.exchange.value}-{index}",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        self._process.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout)
+        self.ring.close()
+
+    def decode(self, record: bytes) -> tuple:
+        return pickle.loads(record)  # noqa: S301 - written by our own shard process
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "mode": "process",
+            "symbols": self.symbols,
+            "alive": self._process.is_alive(),
+            "ring": self.ring.get_stats(),
+        }
+
+
+class ShardedDataStream:
+    """
+    Drop-in alternative to ``WebSocketDataStream`` with sharded ingestion.
+
+    Exposes the same handler decorators, ``start``/``stop``, ``get_stats`` and
+    ``health_check``. ``OrderbookData.book`` is None: records carry the top-k
+    levels, and the live books stay with the shard that mutates them. In
+    process mode ``orderbook_snapshot_fetcher`` must be picklable.
+    """
+
+    def __init__(
+        self,
+        config: StreamConfig,
+        websocket_client: IWebSocketClient | None = None,
+        order_books: OrderBookRegistry | None = None,
+    ):
+        if config.ingestion_mode not in ("thread", "process"):
+            raise ValueError(f"Unknown ingestion_mode: {config.ingestion_mode}")
+        self.config = config
+        self._websocket_client = websocket_client
+        self.order_books = order_books if order_books is not None else OrderBookRegistry()
+        self._running = False
+        self._shards: list[_ThreadShard | _ProcessShard] = []
+
+        self._ticker_handlers: list[Callable[[TickerData], Any]] = []
+        self._trade_handlers: list[Callable[[TradeData], Any]] = []
+        self._orderbook_handlers: list[Callable[[OrderbookData], Any]] = []
+        self._error_handlers: list[Callable[[Exception], Any]] = []
+
+        self._dispatch_latency = LatencyHistogram()
+        self._stats = {"records_dispatched": 0, "handler_errors": 0, "uptime_start": 0.0}
+
+    # =========================================================================
+    # Decorator Methods for Event Handlers
+    # =========================================================================
+
+    def on_ticker(self, handler: Callable):
+        """Decorator to register ticker handler."""
+        self._ticker_handlers.append(handler)
+        return handler
+
+    def on_trade(self, handler: Callable):
+        """Decorator to register trade handler."""
+        self._trade_handlers.append(handler)
+        return handler
+
+    def on_orderbook(self, handler: Callable):
+        """Decorator to register orderbook handler."""
+        self._orderbook_handlers.append(handler)
+        return handler
+
+    def on_error(self, handler: Callable):
+        """Decorator to register error handler."""
+        self._error_handlers.append(handler)
+        return handler
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    def _shard_configs(self) -> list[StreamConfig]:
+        n_shards = max(1, min(self.config.ingestion_shards, len(self.config.symbols)))
+        groups = [self.config.symbols[i::n_shards] for i in range(n_shards)]
+        return [
+            dataclasses.replace(self.config, symbols=symbols, ingestion_shards=0)
+            for symbols in groups
+        ]
+
+    async def start(self):
+        """Start the shards and dispatch their records until stopped."""
+        self._running = True
+        self._stats["uptime_start"] = time.time()
+
+        for index, shard_config in enumerate(self._shard_configs()):
+            if self.config.ingestion_mode == "process":
+                shard = _ProcessShard(index, shard_config)
+            else:
+                shard = _ThreadShard(index, shard_config, self._websocket_client, self.order_books)
+            shard.start()
+            self._shards.append(shard)
+        logger.info(
+            f"Started {len(self._shards)} {self.config.ingestion_mode} ingestion shards "
+            f"for {self.config.exchange.value} (fast JSON: {FAST_JSON_AVAILABLE})"
+        )
+
+        await self._dispatch_loop()
+
+    async def stop(self):
+        """Stop the shards and release their rings."""
+        self._running = False
+        shards, self._shards = self._shards, []
+        for shard in shards:
+            await asyncio.to_thread(shard.stop)
+        logger.info("Sharded WebSocket stream stopped")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+        return False
+
+    async def _dispatch_loop(self):
+        idle_sleep = 0.0
+        while self._running:
+            dispatched = 0
+            for shard in list(self._shards):
+                for record in shard.ring.get_batch(self.config.dispatch_batch_size):
+                    await self._dispatch(shard.decode(record))
+                    dispatched += 1
+
+            if dispatched:
+                idle_sleep = 0.0
+                await asyncio.sleep(0)  # Let other tasks run between batches
+            else:
+                # Back off while idle, capped so latency stays bounded
+                idle_sleep = min(idle_sleep * 2 or 0.0001, self.config.max_idle_sleep)
+                await asyncio.sleep(idle_sleep)
+
+    async def _dispatch(self, record: tuple):
+        kind, received_at, payload = record
+        if kind == TICKER:
+            handlers = self._ticker_handlers
+        elif kind == TRADE:
+            handlers = self._trade_handlers
+        elif kind == ORDERBOOK:
+            handlers = self._orderbook_handlers
+        else:
+            handlers = self._error_handlers
+
+        for handler in handlers:
+            try:
+                await handler(payload)
+            except Exception as e:
+                self._stats["handler_errors"] += 1
+                logger.error(f"Handler error: {e}")
+        self._dispatch_latency.record(time.perf_counter() - received_at)
+        self._stats["records_dispatched"] += 1
+
+    # =========================================================================
+    # Health & Statistics
+    # =========================================================================
+
+    def get_stats(self) -> dict[str, Any]:
+        uptime = time.time() - self._stats["uptime_start"] if self._stats["uptime_start"] else 0
+        shards = [shard.get_stats() for shard in self._shards]
+        return {
+            **self._stats,
+            "uptime_seconds": uptime,
+            "connected": self._running and any(s["alive"] for s in shards),
+            "shards": shards,
+            "backlog": sum(s["ring"]["depth"] for s in shards),
+            "dropped": sum(s["ring"]["drops"] + s["ring"].get("oversize", 0) for s in shards),
+            "dispatch_latency": self._dispatch_latency.summary(),
+            "records_per_second": self._stats["records_dispatched"] / max(1, uptime),
+        }
+
+    async def health_check(self) -> dict[str, Any]:
+        stats = self.get_stats()
+        alive = [s["alive"] for s in stats["shards"]]
+        return {
+            "service": "websocket_stream",
+            "status": "healthy" if alive and all(alive) and not stats["dropped"] else "degraded",
+            "exchange": self.config.exchange.value,
+            "connected": stats["connected"],
+            "stats": stats,
+        }
+
+
+def create_data_stream(
+    config: StreamConfig,
+    websocket_client: IWebSocketClient | None = None,
+    order_books: OrderBookRegistry | None = None,
+) -> WebSocketDataStream | ShardedDataStream:
+    """Create a sharded stream if ``config.ingestion_shards`` > 0, else a single-loop stream."""
+    if config.ingestion_shards > 0:
+        return ShardedDataStream(config, websocket_client, order_books)
+    return WebSocketDataStream(config, websocket_client, order_books)
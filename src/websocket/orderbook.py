@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Incremental L2 Order Book
+=========================
+
+Per-(exchange, symbol) L2 book maintained from snapshots and diff-depth updates.
+
+Each side is a pair of preallocated NumPy arrays (price key, size) kept sorted so
+that the best level is the last element:
+- bids are keyed by price, asks by negated price
+- best bid/ask is O(1), top-k depth is an O(k) slice
+- level updates are a binary search plus a short memmove (most activity is
+  near the top of the book, i.e. the end of the array)
+
+Sequence handling follows the exchanges' diff-depth sync procedure: deltas
+must continue the book's sequence; a gap marks the book unsynced, deltas are
+buffered and replayed on top of the next snapshot.
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+import numpy as np
+
+from .data_types import OrderbookData
+
+logger = logging.getLogger(__name__)
+
+Levels = Iterable[Sequence[Any]]  # [[price, size, ...], ...] as str or float
+
+
+class _BookSide:
+    """One side of the book: sorted price keys with the best level last."""
+
+    __slots__ = ("keys", "n", "sign", "sizes")
+
+    def __init__(self, sign: float, capacity: int = 64):
+        self.sign = sign
+        self.keys = np.empty(capacity, dtype=np.float64)
+        self.sizes = np.empty(capacity, dtype=np.float64)
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def best_price(self) -> float:
+        return self.sign * self.keys[self.n - 1] if self.n else np.nan
+
+    @property
+    def best_size(self) -> float:
+        return self.sizes[self.n - 1] if self.n else 0.0
+
+    def update(self, price: float, size: float) -> None:
+        """Set the size at ``price``; a size of zero removes the level."""
+        key = self.sign * price
+        n = self.n
+        keys, sizes = self.keys, self.sizes
+        i = int(keys[:n].searchsorted(key))
+
+        if i < n and keys[i] == key:
+            if size > 0:
+                sizes[i] = size
+            else:
+                keys[i : n - 1] = keys[i + 1 : n]
+                sizes[i : n - 1] = sizes[i + 1 : n]
+                self.n = n - 1
+        elif size > 0:
+            if n == len(keys):
+                self._grow()
+                keys, sizes = self.keys, self.sizes
+            keys[i + 1 : n + 1] = keys[i:n]
+            sizes[i + 1 : n + 1] = sizes[i:n]
+            keys[i] = key
+            sizes[i] = size
+            self.n = n + 1
+
+    def replace(self, levels: Levels) -> None:
+        """Replace the whole side with ``levels``."""
+        data = np.array([(level[0], level[1]) for level in levels], dtype=np.float64)
+        if data.size == 0:
+            self.n = 0
+            return
+        data = data[data[:, 1] > 0]
+        keys = self.sign * data[:, 0]
+        order = np.argsort(keys, kind="stable")
+
+        n = len(order)
+        if n > len(self.keys):
+            self.keys = np.empty(2 * n, dtype=np.float64)
+            self.sizes = np.empty(2 * n, dtype=np.float64)
+        self.keys[:n] = keys[order]
+        self.sizes[:n] = data[order, 1]
+        self.n = n
+
+    def trim(self, max_depth: int) -> None:
+        """Drop the levels furthest from the top beyond ``max_depth``."""
+        excess = self.n - max_depth
+        if excess > 0:
+            self.keys[:max_depth] = self.keys[excess : self.n]
+            self.sizes[:max_depth] = self.sizes[excess : self.n]
+            self.n = max_depth
+
+    def top(self, k: int) -> np.ndarray:
+        """Top ``k`` levels as a (k, 2) array of [price, size], best first."""
+        lo = max(self.n - k, 0)
+        out = np.empty((self.n - lo, 2), dtype=np.float64)
+        out[:, 0] = self.keys[lo : self.n][::-1]
+        out[:, 0] *= self.sign
+        out[:, 1] = self.sizes[lo : self.n][::-1]
+        return out
+
+    def volume(self, k: int | None = None) -> float:
+        lo = 0 if k is None else max(self.n - k, 0)
+        return float(self.sizes[lo : self.n].sum())
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self.keys)
+        keys = np.empty(capacity, dtype=np.float64)
+        sizes = np.empty(capacity, dtype=np.float64)
+        keys[: self.n] = self.keys[: self.n]
+        sizes[: self.n] = self.sizes[: self.n]
+        self.keys, self.sizes = keys, sizes
+
+
+class L2OrderBook:
+    """
+    Incrementally maintained L2 order book for one symbol on one exchange.
+
+    Usage:
+        book = L2OrderBook("binance", "BTCUSDT")
+        book.apply_snapshot(bids, asks, sequence=last_update_id)
+        if not book.apply_delta(b, a, sequence=u, first_sequence=U):
+            if book.needs_resync:
+                ...  # fetch / resubscribe for a fresh snapshot
+        book.best_bid, book.microprice(depth=5), book.imbalance(depth=10)
+    """
+
+    def __init__(self, exchange: str, symbol: str, max_depth: int = 1000, max_pending: int = 1000):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.max_depth = max_depth
+
+        self.bids = _BookSide(1.0)
+        self.asks = _BookSide(-1.0)
+        self.sequence: int | None = None
+        self.timestamp = 0.0
+        self.synced = False
+        self.resync_requested = False
+
+        # Deltas received while unsynced, replayed on top of the next snapshot
+        self._pending: deque[tuple] = deque(maxlen=max_pending)
+
+        self.snapshots = 0
+        self.updates = 0
+        self.gaps = 0
+
+    # =========================================================================
+    # Updates
+    # =========================================================================
+
+    def apply_snapshot(
+        self,
+        bids: Levels,
+        asks: Levels,
+        sequence: int | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Replace the book with a full (or partial-depth) snapshot."""
+        self.bids.replace(bids)
+        self.asks.replace(asks)
+        self.bids.trim(self.max_depth)
+        self.asks.trim(self.max_depth)
+        self.sequence = sequence
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.synced = True
+        self.resync_requested = False
+        self.snapshots += 1
+
+        pending, self._pending = list(self._pending), deque(maxlen=self._pending.maxlen)
+        for i, delta in enumerate(pending):
+            self.apply_delta(*delta)
+            if not self.synced:
+                self._pending.extend(pending[i + 1 :])
+                break
+
+    def apply_delta(
+        self,
+        bids: Levels,
+        asks: Levels,
+        sequence: int | None = None,
+        first_sequence: int | None = None,
+        prev_sequence: int | None = None,
+        timestamp: float | None = None,
+    ) -> bool:
+        """
+        Apply a diff-depth update (absolute sizes; zero removes a level).
+
+        Args:
+            bids: Changed bid levels
+            asks: Changed ask levels
+            sequence: Last update id contained in this delta
+            first_sequence: First update id in this delta (Binance ``U``)
+            prev_sequence: Sequence of the previous delta (OKX ``prevSeqId``)
+            timestamp: Exchange timestamp in seconds (default: now)
+
+        Returns:
+            True if applied, False if buffered (unsynced / gap) or stale
+        """
+        delta = (bids, asks, sequence, first_sequence, prev_sequence, timestamp)
+        if not self.synced:
+            self._pending.append(delta)
+            return False
+
+        if sequence is not None and self.sequence is not None:
+            if sequence <= self.sequence:
+                return False  # Already contained in the snapshot
+            if prev_sequence is not None:
+                gap = prev_sequence != self.sequence
+            elif first_sequence is not None:
+                gap = first_sequence > self.sequence + 1
+            else:
+                gap = sequence != self.sequence + 1
+            if gap:
+                self.gaps += 1
+                self.synced = False
+                self._pending.append(delta)
+                logger.warning(
+                    f"Order book sequence gap on {self.exchange} {self.symbol}: "
+                    f"book at {self.sequence}, update {first_sequence or prev_sequence}-{sequence}"
+                )
+                return False
+
+        bid_side, ask_side = self.bids, self.asks
+        for level in bids:
+            bid_side.update(float(level[0]), float(level[1]))
+        for level in asks:
+            ask_side.update(float(level[0]), float(level[1]))
+        if bid_side.n > 2 * self.max_depth:
+            bid_side.trim(self.max_depth)
+        if ask_side.n > 2 * self.max_depth:
+            ask_side.trim(self.max_depth)
+
+        if sequence is not None:
+            self.sequence = sequence
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.updates += 1
+        return True
+
+    def invalidate(self) -> None:
+        """Mark the book unsynced (e.g. after a reconnect)."""
+        self.synced = False
+
+    @property
+    def needs_resync(self) -> bool:
+        return not self.synced
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    @property
+    def best_bid(self) -> float:
+        return self.bids.best_price
+
+    @property
+    def best_ask(self) -> float:
+        return self.asks.best_price
+
+    @property
+    def mid(self) -> float:
+        return (self.best_bid + self.best_ask) / 2
+
+    @property
+    def spread(self) -> float:
+        return self.best_ask - self.best_bid
+
+    def depth(self, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top ``k`` bid and ask levels as (k, 2) [price, size] arrays, best first."""
+        return self.bids.top(k), self.asks.top(k)
+
+    def microprice(self, depth: int = 1) -> float:
+        """Size-weighted mid using the volume of the top ``depth`` levels per side."""
+        bid_volume = self.bids.volume(depth)
+        ask_volume = self.asks.volume(depth)
+        total = bid_volume + ask_volume
+        if total <= 0:
+            return self.mid
+        return (self.best_bid * ask_volume + self.best_ask * bid_volume) / total
+
+    def imbalance(self, depth: int | None = None) -> float:
+        """(bid - ask) / (bid + ask) volume over the top ``depth`` levels (None: whole book)."""
+        bid_volume = self.bids.volume(depth)
+        ask_volume = self.asks.volume(depth)
+        total = bid_volume + ask_volume
+        return (bid_volume - ask_volume) / total if total > 0 else 0.0
+
+    def to_orderbook_data(self, depth: int = 5) -> OrderbookData:
+        """Top-``depth`` view in the normalized ``OrderbookData`` format."""
+        bids, asks = self.depth(depth)
+        return OrderbookData(
+            exchange=self.exchange,
+            symbol=self.symbol,
+            bids=bids.tolist(),
+            asks=asks.tolist(),
+            timestamp=self.timestamp,
+            imbalance=self.imbalance(depth),
+            book=self,
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "exchange": self.exchange,
+            "symbol": self.symbol,
+            "synced": self.synced,
+            "sequence": self.sequence,
+            "bid_levels": len(self.bids),
+            "ask_levels": len(self.asks),
+            "snapshots": self.snapshots,
+            "updates": self.updates,
+            "gaps": self.gaps,
+            "pending": len(self._pending),
+        }
+
+
+class OrderBookRegistry:
+    """Order books keyed by (exchange, symbol), shareable across streams."""
+
+    def __init__(self, max_depth: int = 1000):
+        self.max_depth = max_depth
+        self._books: dict[tuple[str, str], L2OrderBook] = {}
+
+    def get(self, exchange: str, symbol: str) -> L2OrderBook | None:
+        return self._books.get((exchange, symbol))
+
+    def get_or_create(self, exchange: str, symbol: str) -> L2OrderBook:
+        book = self._books.get((exchange, symbol))
+        if book is None:
+            book = L2OrderBook(exchange, symbol, max_depth=self.max_depth)
+            self._books[(exchange, symbol)] = book
+        return book
+
+    def invalidate(self, exchange: str | None = None) -> None:
+        """Mark books (of one exchange, or all) unsynced, e.g. after a reconnect."""
+        for (book_exchange, _), book in self._books.items():
+            if exchange is None or book_exchange == exchange:
+                book.invalidate()
+
+    def __iter__(self) -> Iterator[L2OrderBook]:
+        return iter(self._books.values())
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    def get_stats(self) -> list[dict[str, Any]]:
+        return [book.get_stats() for book in self._books.values()]
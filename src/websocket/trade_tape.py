@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Trade Tape
+==========
+
+Fixed-capacity, array-backed trade history per symbol with rolling statistics.
+
+Trades are stored in a NumPy structured ring buffer (ts, price, qty, side).
+Every configured horizon keeps running sums plus a pointer to its oldest
+trade; appending a trade adds it to all sums and expired trades are
+subtracted as the pointer advances, so rolling buy/sell volume, VWAP, trade
+count and imbalance are O(1) amortized per trade instead of a periodic reset
+or a rescan.
+
+Usage:
+    tape = TradeTape(horizons=(1, 10, 60, 300))
+    tape.append(ts, price, qty, is_buy)
+    tape.stats(60)          # {"buy_volume": ..., "vwap": ..., "imbalance": ...}
+    tape.features()         # flat dict for feature generation
+    tape.to_array(since=ts) # structured array copy, oldest first
+
+Author: Stoic Citadel Team
+License: MIT
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+TRADE_DTYPE = np.dtype([("ts", "f8"), ("price", "f8"), ("qty", "f8"), ("side", "i1")])
+
+BUY, SELL = 1, -1
+
+# Running sums are rebuilt from the buffer after this many evictions (float drift)
+_RESYNC_EVICTIONS = 100_000
+
+
+class _RollingWindow:
+    """Running sums over the trades of one horizon."""
+
+    __slots__ = (
+        "buy_count",
+        "buy_volume",
+        "evictions",
+        "horizon",
+        "notional",
+        "sell_count",
+        "sell_volume",
+        "start",
+        "truncated",
+    )
+
+    def __init__(self, horizon: float):
+        self.horizon = horizon
+        self.start = 0  # Absolute index of the oldest trade inside the window
+        self.truncated = False  # Window lost trades to ring overwrite
+        self.evictions = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self.buy_volume = 0.0
+        self.sell_volume = 0.0
+        self.buy_count = 0
+        self.sell_count = 0
+        self.notional = 0.0
+
+    def add(self, price: float, qty: float, side: int, sign: int = 1) -> None:
+        if side == BUY:
+            self.buy_volume += sign * qty
+            self.buy_count += sign
+        else:
+            self.sell_volume += sign * qty
+            self.sell_count += sign
+        self.notional += sign * price * qty
+
+
+class TradeTape:
+    """Ring buffer of trades for one symbol with multi-horizon rolling stats."""
+
+    def __init__(self, capacity: int = 65536, horizons: Iterable[float] = (1, 10, 60, 300)):
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=TRADE_DTYPE)
+        self._ts = self._buffer["ts"]
+        self._price = self._buffer["price"]
+        self._qty = self._buffer["qty"]
+        self._side = self._buffer["side"]
+        self._count = 0  # Total trades appended
+        self._windows = {float(h): _RollingWindow(float(h)) for h in sorted(horizons)}
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def horizons(self) -> list[float]:
+        return list(self._windows)
+
+    @property
+    def last_timestamp(self) -> float | None:
+        return float(self._ts[(self._count - 1) % self.capacity]) if self._count else None
+
+    # =========================================================================
+    # Updates
+    # =========================================================================
+
+    def append(self, ts: float, price: float, qty: float, is_buy: bool) -> None:
+        """Add one trade (timestamps are expected to be non-decreasing)."""
+        side = BUY if is_buy else SELL
+        index = self._count
+
+        if index >= self.capacity:
+            # The slot about to be overwritten leaves every window still holding it
+            self._evict_through(index - self.capacity, truncated=True)
+
+        slot = index % self.capacity
+        self._buffer[slot] = (ts, price, qty, side)
+        self._count = index + 1
+
+        for window in self._windows.values():
+            window.add(price, qty, side)
+        self._expire(ts)
+
+    def extend(self, trades: np.ndarray) -> None:
+        """Append a structured array of trades (``TRADE_DTYPE`` fields)."""
+        for ts, price, qty, side in zip(
+            trades["ts"].tolist(),
+            trades["price"].tolist(),
+            trades["qty"].tolist(),
+            trades["side"].tolist(),
+            strict=True,
+        ):
+            self.append(ts, price, qty, side == BUY)
+
+    def _expire(self, now: float) -> None:
+        """Move each window's start past trades with ts <= now - horizon."""
+        count, capacity, ts = self._count, self.capacity, self._ts
+        for window in self._windows.values():
+            cutoff = now - window.horizon
+            start = window.start
+            if start < count and ts[start % capacity] <= cutoff:
+                window.truncated = False  # Start is time-bound again
+                while start < count and ts[start % capacity] <= cutoff:
+                    self._evict_one(window, start)
+                    start += 1
+                self._finish_eviction(window, start)
+
+    def _evict_through(self, index: int, truncated: bool = False) -> None:
+        """Evict trades up to and including absolute ``index`` from all windows."""
+        for window in self._windows.values():
+            start = window.start
+            if start <= index:
+                window.truncated = truncated
+                while start <= index:
+                    self._evict_one(window, start)
+                    start += 1
+                self._finish_eviction(window, start)
+
+    def _evict_one(self, window: _RollingWindow, index: int) -> None:
+        slot = index % self.capacity
+        window.add(float(self._price[slot]), float(self._qty[slot]), int(self._side[slot]), -1)
+        window.evictions += 1
+
+    def _finish_eviction(self, window: _RollingWindow, start: int) -> None:
+        window.start = start
+        if start == self._count:
+            window.reset()  # Empty window: drop accumulated float error
+        elif window.evictions >= _RESYNC_EVICTIONS:
+            self._resync(window)
+
+    def _resync(self, window: _RollingWindow) -> None:
+        trades = self._slice(window.start, self._count)
+        buys = trades["side"] == BUY
+        window.buy_volume = float(trades["qty"][buys].sum())
+        window.sell_volume = float(trades["qty"][~buys].sum())
+        window.buy_count = int(buys.sum())
+        window.sell_count = len(trades) - window.buy_count
+        window.notional = float((trades["price"] * trades["qty"]).sum())
+        window.evictions = 0
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def stats(self, horizon: float, now: float | None = None) -> dict[str, Any]:
+        """
+        Rolling statistics over ``(now - horizon, now]``.
+
+        Args:
+            horizon: One of the configured horizons (seconds)
+            now: Reference time (default: timestamp of the last trade)
+
+        Returns:
+            Buy/sell volume and count, VWAP, volume and count imbalance
+        """
+        window = self._windows.get(float(horizon))
+        if window is None:
+            raise KeyError(f"Horizon {horizon}s is not tracked (tracked: {self.horizons})")
+        if now is not None:
+            self._expire(now)
+
+        volume = window.buy_volume + window.sell_volume
+        count = window.buy_count + window.sell_count
+        return {
+            "buy_volume": window.buy_volume,
+            "sell_volume": window.sell_volume,
+            "volume": volume,
+            "buy_count": window.buy_count,
+            "sell_count": window.sell_count,
+            "trade_count": count,
+            "vwap": window.notional / volume if volume > 0 else 0.0,
+            "imbalance": (window.buy_volume - window.sell_volume) / volume if volume > 0 else 0.0,
+            "count_imbalance": (window.buy_count - window.sell_count) / count if count else 0.0,
+            "truncated": window.truncated,
+        }
+
+    def features(self, now: float | None = None) -> dict[str, float]:
+        """Flat ``{stat}_{horizon}s`` features for every horizon."""
+        if now is not None:
+            self._expire(now)
+        features = {}
+        for horizon in self._windows:
+            stats = self.stats(horizon)
+            suffix = f"{horizon:g}s"
+            for key in ("buy_volume", "sell_volume", "trade_count", "vwap", "imbalance"):
+                features[f"{key}_{suffix}"] = float(stats[key])
+        return features
+
+    def _slice(self, start: int, stop: int) -> np.ndarray:
+        """Trades with absolute indices [start, stop) as a chronological copy."""
+        lo, hi = start % self.capacity, stop % self.capacity
+        if stop - start <= 0:
+            return self._buffer[:0].copy()
+        if lo < hi:
+            return self._buffer[lo:hi].copy()
+        return np.concatenate([self._buffer[lo:], self._buffer[:hi]])
+
+    def to_array(self, since: float | None = None, last: int | None = None) -> np.ndarray:
+        """
+        Stored trades as a structured array, oldest first.
+
+        Args:
+            since: Only trades with ts > since
+            last: Only the most recent ``last`` trades
+        """
+        start = max(self._count - self.capacity, 0)
+        if last is not None:
+            start = max(start, self._count - last)
+        trades = self._slice(start, self._count)
+        if since is not None:
+            trades = trades[trades["ts"].searchsorted(since, side="right") :]
+        return trades
+
+    def to_frame(self, since: float | None = None) -> pd.DataFrame:
+        """Stored trades as a DataFrame indexed by UTC timestamp."""
+        trades = self.to_array(since)
+        frame = pd.DataFrame(
+            {"price": trades["price"], "qty": trades["qty"], "side": trades["side"]},
+            index=pd.to_datetime(trades["ts"], unit="s", utc=True),
+        )
+        frame.index.name = "ts"
+        return frame
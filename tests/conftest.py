@@ -54,6 +54,33 @@ def sample_ohlcv():
     return df
 
 
+@pytest.fixture
+def make_ohlcv():
+    """
+    Factory for random-walk OHLCV candles.
+
+    make_ohlcv(n, freq="5min", seed=0, tz=None, price=30000.0, volatility=0.003)
+    returns ``n`` candles where each open is the previous close and the wicks
+    extend up to 0.3% beyond the body. Same arguments, same frame.
+    """
+    def make(n=600, freq="5min", seed=0, tz=None, price=30000.0, volatility=0.003):
+        rng = np.random.default_rng(seed)
+        close = price * np.exp(np.cumsum(rng.normal(0, volatility, n)))
+        open_ = np.r_[close[0], close[:-1]]
+        return pd.DataFrame(
+            {
+                "open": open_,
+                "high": np.maximum(open_, close) * (1 + rng.uniform(0, 0.003, n)),
+                "low": np.minimum(open_, close) * (1 - rng.uniform(0, 0.003, n)),
+                "close": close,
+                "volume": rng.uniform(100, 1000, n),
+            },
+            index=pd.date_range("2024-01-01", periods=n, freq=freq, tz=tz),
+        )
+
+    return make
+
+
 @pytest.fixture
 def sample_ohlcv_short():
     """
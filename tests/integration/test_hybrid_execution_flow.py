@@ -7,6 +7,7 @@ from src.websocket.aggregator import AggregatedTicker
 from src.order_manager.smart_order_executor import SmartOrderExecutor
 from src.order_manager.smart_order import ChaseLimitOrder
 from src.order_manager.order_types import OrderStatus
+from src.analysis.attribution import AttributionService
 
 class MockStrategy(HybridConnectorMixin):
     def __init__(self):
@@ -17,6 +18,14 @@ class MockStrategy(HybridConnectorMixin):
 def strategy():
     return MockStrategy()
 
+@pytest.fixture
+def fresh_attribution_writer():
+    """Give the test its own attribution write queue (bound to whatever DatabaseManager is patched)"""
+    AttributionService._writer = None
+    yield
+    AttributionService.shutdown()
+    AttributionService._writer = None
+
 @pytest.mark.asyncio
 async def test_hybrid_flow_ticker_to_cache(strategy):
     """Test that tickers from aggregator reach the strategy cache"""
@@ -129,7 +138,7 @@ async def test_slippage_check_rejection(strategy):
         await executor.submit_order(order)
 
 @pytest.mark.asyncio
-async def test_shadow_mode_execution(strategy):
+async def test_shadow_mode_execution(strategy, fresh_attribution_writer):
     """Test that shadow mode simulates fill and logs to DB"""
     mock_aggregator = MagicMock()
     ticker = AggregatedTicker(
@@ -148,7 +157,7 @@ async def test_shadow_mode_execution(strategy):
     mock_aggregator.get_aggregated_ticker.return_value = ticker
     
     # We need to mock DatabaseManager to avoid real DB connection in test
-    with patch('src.database.db_manager.DatabaseManager') as MockDB:
+    with patch('src.analysis.attribution.DatabaseManager') as MockDB:
         executor = SmartOrderExecutor(aggregator=mock_aggregator, shadow_mode=True)
         executor.risk_manager.circuit_breaker.manual_reset()
         executor._running = True # Simulate started executor
@@ -173,13 +182,16 @@ async def test_shadow_mode_execution(strategy):
         
         assert order.status == OrderStatus.FILLED
         assert order.filled_quantity == 1.0
+
+        # Shadow trades are queued; wait for the writer to commit them
+        AttributionService.flush(timeout=5)
     assert order.average_fill_price == 50000.0
     
     # Verify DB logging was attempted
-    assert MockDB.return_value.session.called
+    assert MockDB.session.called
 
 @pytest.mark.asyncio
-async def test_latency_tracking(strategy):
+async def test_latency_tracking(strategy, fresh_attribution_writer):
     """Test that signal, submission, and fill timestamps are tracked"""
     mock_aggregator = MagicMock()
     ticker = AggregatedTicker(
@@ -197,7 +209,7 @@ async def test_latency_tracking(strategy):
     )
     mock_aggregator.get_aggregated_ticker.return_value = ticker
     
-    with patch('src.database.db_manager.DatabaseManager'):
+    with patch('src.analysis.attribution.DatabaseManager'):
         executor = SmartOrderExecutor(aggregator=mock_aggregator, shadow_mode=True)
         executor.risk_manager.circuit_breaker.manual_reset()
         executor._running = True
@@ -221,6 +233,7 @@ async def test_latency_tracking(strategy):
         assert order.signal_timestamp is not None
         assert order.submission_timestamp is not None
         assert order.fill_timestamp is not None
+        AttributionService.flush(timeout=5)
     assert order.submission_timestamp >= order.signal_timestamp
     assert order.fill_timestamp >= order.submission_timestamp
 
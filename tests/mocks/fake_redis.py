@@ -0,0 +1,453 @@
+"""
+In-memory async Redis stand-in for unit tests.
+
+Implements the subset of the ``redis.asyncio`` API used by the ML services:
+strings (GET/SET/MGET/DEL/UNLINK/EXPIRE), lists (LPUSH/RPUSH/BRPOP/LLEN),
+hashes (HGET/HSET/HGETALL), streams with consumer groups
+(XADD/XGROUP CREATE/XREADGROUP/XACK/XLEN/XPENDING/XAUTOCLAIM) and
+non-transactional pipelines.
+``SyncFakeRedis`` exposes the same store through the blocking ``redis.Redis`` API.
+Values are stored as bytes, like a client created with ``decode_responses=False``.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Any
+
+
+class ResponseError(Exception):
+    pass
+
+
+def _b(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, memoryview | bytearray):
+        return bytes(value)
+    return str(value).encode()
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on ``execute``."""
+
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+        self._commands: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        if not hasattr(self._redis, name):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        commands, self._commands = self._commands, []
+        self._redis.pipelines_executed += 1
+        return [
+            await getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in commands
+        ]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRedis:
+    def __init__(self):
+        self._strings: dict[bytes, bytes] = {}
+        self._expiry: dict[bytes, float] = {}
+        self._lists: dict[bytes, deque[bytes]] = {}
+        self._hashes: dict[bytes, dict[bytes, bytes]] = {}
+        self._streams: dict[bytes, list[tuple[bytes, dict[bytes, bytes]]]] = {}
+        self._groups: dict[tuple[bytes, bytes], dict[str, Any]] = {}
+        self._stream_ids = itertools.count(1)
+        self._changed = asyncio.Condition()
+        self.commands = 0
+        self.pipelines_executed = 0
+
+    # -- helpers ---------------------------------------------------------------
+
+    def _count(self) -> None:
+        self.commands += 1
+
+    def _alive(self, key: bytes) -> bool:
+        expires_at = self._expiry.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._delete(key)
+            return False
+        return True
+
+    def _delete(self, key: bytes) -> int:
+        self._expiry.pop(key, None)
+        found = 0
+        for store in (self._strings, self._lists, self._hashes, self._streams):
+            if store.pop(key, None) is not None:
+                found = 1
+        return found
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _wait(self, timeout: float | None) -> bool:
+        try:
+            async with self._changed:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    # -- connection --------------------------------------------------------------
+
+    async def ping(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    def pipeline(self, transaction: bool = False) -> FakePipeline:
+        return FakePipeline(self)
+
+    # -- strings / keys ------------------------------------------------------------
+
+    async def get(self, key):
+        self._count()
+        key = _b(key)
+        return self._strings.get(key) if self._alive(key) else None
+
+    async def mget(self, keys, *args):
+        self._count()
+        keys = [keys, *args] if isinstance(keys, str | bytes) else list(keys)
+        out = []
+        for key in map(_b, keys):
+            out.append(self._strings.get(key) if self._alive(key) else None)
+        return out
+
+    async def set(self, key, value, ex=None, px=None):
+        self._count()
+        key = _b(key)
+        self._strings[key] = _b(value)
+        self._expiry.pop(key, None)
+        if ex is not None:
+            self._expiry[key] = time.monotonic() + ex
+        elif px is not None:
+            self._expiry[key] = time.monotonic() + px / 1000
+        return True
+
+    async def setex(self, key, seconds, value):
+        return await self.set(key, value, ex=seconds)
+
+    async def expire(self, key, seconds):
+        self._count()
+        key = _b(key)
+        if not self._alive(key) or not any(
+            key in s for s in (self._strings, self._lists, self._hashes, self._streams)
+        ):
+            return False
+        self._expiry[key] = time.monotonic() + seconds
+        return True
+
+    async def ttl(self, key):
+        key = _b(key)
+        if key not in self._expiry:
+            return -1
+        return max(0, int(self._expiry[key] - time.monotonic()))
+
+    async def delete(self, *keys):
+        self._count()
+        return sum(self._delete(_b(key)) for key in keys)
+
+    async def unlink(self, *keys):
+        return await self.delete(*keys)
+
+    async def exists(self, *keys):
+        self._count()
+        return sum(
+            1
+            for key in map(_b, keys)
+            if self._alive(key)
+            and any(key in s for s in (self._strings, self._lists, self._hashes, self._streams))
+        )
+
+    async def keys(self, pattern="*"):
+        import fnmatch
+
+        pattern = pattern.decode() if isinstance(pattern, bytes) else pattern
+        stores = (self._strings, self._lists, self._hashes, self._streams)
+        return [
+            key
+            for store in stores
+            for key in list(store)
+            if self._alive(key) and fnmatch.fnmatchcase(key.decode(), pattern)
+        ]
+
+    async def scan_iter(self, match="*", count=None):
+        for key in await self.keys(match):
+            yield key
+
+    # -- hashes ---------------------------------------------------------------------
+
+    async def hset(self, name, key=None, value=None, mapping=None):
+        self._count()
+        h = self._hashes.setdefault(_b(name), {})
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        added = sum(1 for k in items if _b(k) not in h)
+        h.update({_b(k): _b(v) for k, v in items.items()})
+        return added
+
+    async def hget(self, name, key):
+        self._count()
+        return self._hashes.get(_b(name), {}).get(_b(key))
+
+    async def hgetall(self, name):
+        self._count()
+        return dict(self._hashes.get(_b(name), {}))
+
+    async def hdel(self, name, *keys):
+        self._count()
+        h = self._hashes.get(_b(name), {})
+        return sum(1 for key in keys if h.pop(_b(key), None) is not None)
+
+    # -- lists ---------------------------------------------------------------------
+
+    async def lpush(self, key, *values):
+        self._count()
+        items = self._lists.setdefault(_b(key), deque())
+        for value in values:
+            items.appendleft(_b(value))
+        await self._notify()
+        return len(items)
+
+    async def rpush(self, key, *values):
+        self._count()
+        items = self._lists.setdefault(_b(key), deque())
+        items.extend(_b(value) for value in values)
+        await self._notify()
+        return len(items)
+
+    async def llen(self, key):
+        self._count()
+        return len(self._lists.get(_b(key), ()))
+
+    async def rpop(self, key, count=None):
+        self._count()
+        items = self._lists.get(_b(key))
+        if not items:
+            return None
+        if count is None:
+            return items.pop()
+        return [items.pop() for _ in range(min(count, len(items)))]
+
+    async def brpop(self, keys, timeout=0):
+        self._count()
+        keys = [keys] if isinstance(keys, str | bytes) else list(keys)
+        deadline = None if not timeout else time.monotonic() + timeout
+        while True:
+            for key in map(_b, keys):
+                items = self._lists.get(key)
+                if items:
+                    return key, items.pop()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            await self._wait(remaining)
+
+    # -- streams -------------------------------------------------------------------
+
+    async def xadd(self, name, fields, id="*", maxlen=None, approximate=True):
+        self._count()
+        entries = self._streams.setdefault(_b(name), [])
+        entry_id = f"{int(time.time() * 1000)}-{next(self._stream_ids)}".encode()
+        entries.append((entry_id, {_b(k): _b(v) for k, v in fields.items()}))
+        if maxlen is not None and len(entries) > maxlen:
+            del entries[: len(entries) - maxlen]
+        await self._notify()
+        return entry_id
+
+    async def xlen(self, name):
+        return len(self._streams.get(_b(name), ()))
+
+    async def xgroup_create(self, name, groupname, id="$", mkstream=False):
+        self._count()
+        name, groupname = _b(name), _b(groupname)
+        if name not in self._streams:
+            if not mkstream:
+                raise ResponseError("ERR The XGROUP subcommand requires the key to exist")
+            self._streams[name] = []
+        if (name, groupname) in self._groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        start = len(self._streams[name]) if _b(id) == b"$" else 0
+        self._groups[(name, groupname)] = {"next": start, "pending": {}}
+        return True
+
+    async def xreadgroup(self, groupname, consumername, streams, count=None, block=None):
+        self._count()
+        groupname = _b(groupname)
+        deadline = None if block is None else time.monotonic() + block / 1000
+        while True:
+            out = []
+            for name, start_id in streams.items():
+                name = _b(name)
+                group = self._groups.get((name, groupname))
+                if group is None:
+                    raise ResponseError("NOGROUP No such key or consumer group")
+                if _b(start_id) != b">":
+                    continue
+                entries = self._streams.get(name, [])
+                batch = entries[group["next"] : None if count is None else group["next"] + count]
+                if batch:
+                    group["next"] += len(batch)
+                    for entry_id, _ in batch:
+                        group["pending"][entry_id] = _Delivery(_b(consumername))
+                    out.append([name, batch])
+            if out or block is None:
+                return out
+            remaining = deadline - time.monotonic() if block else None
+            if remaining is not None and remaining <= 0:
+                return []
+            await self._wait(remaining)
+
+    async def xack(self, name, groupname, *ids):
+        self._count()
+        group = self._groups.get((_b(name), _b(groupname)))
+        if group is None:
+            return 0
+        return sum(1 for i in ids if group["pending"].pop(_b(i), None) is not None)
+
+    async def xpending(self, name, groupname):
+        group = self._groups.get((_b(name), _b(groupname)), {"pending": {}})
+        return {"pending": len(group["pending"])}
+
+    async def xpending_range(self, name, groupname, min, max, count, consumername=None, idle=None):
+        self._count()
+        group = self._groups.get((_b(name), _b(groupname)), {"pending": {}})
+        lo, hi = _stream_id(min), _stream_id(max)
+        now = time.monotonic()
+        out = []
+        for entry_id, delivery in sorted(group["pending"].items(), key=lambda i: _stream_id(i[0])):
+            idle_ms = int((now - delivery.delivered_at) * 1000)
+            if not lo <= _stream_id(entry_id) <= hi:
+                continue
+            if consumername is not None and delivery.consumer != _b(consumername):
+                continue
+            if idle is not None and idle_ms < idle:
+                continue
+            out.append(
+                {
+                    "message_id": entry_id,
+                    "consumer": delivery.consumer,
+                    "time_since_delivered": idle_ms,
+                    "times_delivered": delivery.times_delivered,
+                }
+            )
+            if len(out) == count:
+                break
+        return out
+
+    async def xautoclaim(
+        self, name, groupname, consumername, min_idle_time, start_id="0-0", count=None
+    ):
+        self._count()
+        name = _b(name)
+        group = self._groups.get((name, _b(groupname)))
+        if group is None:
+            raise ResponseError("NOGROUP No such key or consumer group")
+        entries = dict(self._streams.get(name, []))
+        now = time.monotonic()
+        claimed, deleted = [], []
+        for entry_id in sorted(group["pending"], key=_stream_id):
+            delivery = group["pending"][entry_id]
+            if _stream_id(entry_id) < _stream_id(start_id):
+                continue
+            if (now - delivery.delivered_at) * 1000 < min_idle_time:
+                continue
+            if entry_id not in entries:
+                del group["pending"][entry_id]
+                deleted.append(entry_id)
+                continue
+            group["pending"][entry_id] = _Delivery(
+                _b(consumername), times_delivered=delivery.times_delivered + 1
+            )
+            claimed.append((entry_id, entries[entry_id]))
+            if count is not None and len(claimed) == count:
+                break
+        return [b"0-0", claimed, deleted]
+
+
+class _Delivery:
+    """Pending-entry bookkeeping of a consumer group (owner, delivery time and count)."""
+
+    def __init__(self, consumer: bytes, times_delivered: int = 1):
+        self.consumer = consumer
+        self.delivered_at = time.monotonic()
+        self.times_delivered = times_delivered
+
+
+def _stream_id(value: Any) -> tuple[float, float]:
+    """Sortable (ms, seq) of a stream id; ``-`` / ``+`` are the open range ends."""
+    value = _b(value).decode()
+    if value in ("-", "+"):
+        end = float("-inf") if value == "-" else float("inf")
+        return end, end
+    ms, _, seq = value.partition("-")
+    return float(ms), float(seq or 0)
+
+
+def _run(coro):
+    """Drive a FakeRedis coroutine that completes without suspending."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("Blocking commands are not supported by SyncFakeRedis")
+
+
+class SyncFakePipeline:
+    def __init__(self, pipeline: FakePipeline):
+        self._pipeline = pipeline
+
+    def __getattr__(self, name: str):
+        queue = getattr(self._pipeline, name)
+
+        def call(*args, **kwargs):
+            queue(*args, **kwargs)
+            return self
+
+        return call
+
+    def execute(self) -> list[Any]:
+        return _run(self._pipeline.execute())
+
+
+class SyncFakeRedis:
+    """Synchronous facade over ``FakeRedis`` (like ``redis.Redis``), non-blocking commands only."""
+
+    def __init__(self, backend: FakeRedis | None = None):
+        self.backend = backend or FakeRedis()
+
+    def __getattr__(self, name: str):
+        method = getattr(self.backend, name)
+        return lambda *args, **kwargs: _run(method(*args, **kwargs))
+
+    def pipeline(self, transaction: bool = False) -> SyncFakePipeline:
+        return SyncFakePipeline(self.backend.pipeline(transaction))
+
+    def scan_iter(self, match="*", count=None):
+        return iter(_run(self.backend.keys(match)))
+
+    def info(self) -> dict[str, Any]:
+        return {"redis_version": "fake", "used_memory_human": "0B"}
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.vectorized_backtester import BacktestConfig, VectorizedBacktester
+
+
+@pytest.fixture
+def batch_inputs(make_ohlcv):
+    data = {
+        f"PAIR{i}/USDT": make_ohlcv(600, seed=i, price=100.0, volatility=0.004) for i in range(3)
+    }
+    # Shorter history for one pair to exercise padding
+    data["PAIR2/USDT"] = data["PAIR2/USDT"].iloc[150:]
+    rng = np.random.default_rng(42)
+    index = data["PAIR0/USDT"].index
+    signals = pd.DataFrame(
+        {pair: (rng.random(len(index)) < 0.05).astype(int) for pair in data}, index=index
+    )
+    return signals, data
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_run_batch_matches_run(batch_inputs, use_numba):
+    signals, data = batch_inputs
+    bt = VectorizedBacktester(BacktestConfig())
+    tp, sl, mhb = bt.parameter_grid([0.005, 0.015], [0.005, 0.01], [6, 24])
+
+    result = bt.run_batch(signals, data, tp, sl, mhb, use_numba=use_numba)
+
+    assert result.final_capital.shape == (3, 8)
+    for j, pair in enumerate(result.keys):
+        for k in range(len(tp)):
+            config = BacktestConfig(
+                take_profit=tp[k], stop_loss=sl[k], max_holding_bars=int(mhb[k])
+            )
+            single = VectorizedBacktester(config).run(signals[pair], data[pair])
+            equity = single["equity_curve"]
+            returns = equity.pct_change().dropna()
+            drawdown = ((equity - equity.cummax()) / equity.cummax()).min()
+
+            assert result.final_capital[j, k] == pytest.approx(single["final_capital"])
+            assert result.total_return[j, k] == pytest.approx(single["total_return"])
+            assert result.num_trades[j, k] == len(single["trades"])
+            assert result.max_drawdown[j, k] == pytest.approx(drawdown)
+            assert result.sharpe_ratio[j, k] == pytest.approx(
+                returns.mean() / returns.std() * np.sqrt(365 * 288)
+            )
+
+
+def test_run_batch_trades_are_opt_in(batch_inputs):
+    signals, data = batch_inputs
+    config = BacktestConfig(take_profit=0.01, stop_loss=0.005, max_holding_bars=12)
+    bt = VectorizedBacktester(config)
+
+    assert bt.run_batch(signals, data).trades is None
+
+    result = bt.run_batch(signals, data, return_trades=True)
+    for pair in signals.columns:
+        expected = bt.run(signals[pair], data[pair])["trades"]
+        pd.testing.assert_frame_equal(result.trades[(pair, 0)], expected)
+
+
+def test_run_batch_shared_ohlcv_and_frame_export(make_ohlcv):
+    data = make_ohlcv(600, seed=7, price=100.0, volatility=0.004)
+    signals = pd.DataFrame({"every_10": 0, "never": 0}, index=data.index)
+    signals.loc[signals.index[::10], "every_10"] = 1
+    bt = VectorizedBacktester(BacktestConfig(fee_rate=0.0, slippage_rate=0.0))
+
+    result = bt.run_batch(signals, data, take_profit=[0.01, 0.02])
+    frame = result.to_frame()
+
+    assert len(frame) == 4
+    assert list(frame["key"]) == ["every_10", "every_10", "never", "never"]
+    assert (result.num_trades[0] > 0).all()
+    assert (result.num_trades[1] == 0).all()
+    assert (result.final_capital[1] == 10000.0).all()
+    assert np.isnan(result.win_rate[1]).all()
+
+
+def test_run_batch_rejects_missing_ohlcv(batch_inputs):
+    signals, data = batch_inputs
+    data.pop("PAIR1/USDT")
+    with pytest.raises(ValueError, match="No OHLCV data"):
+        VectorizedBacktester(BacktestConfig()).run_batch(signals, data)
@@ -0,0 +1,91 @@
+"""
+Tests for parallel Walk-Forward Optimization
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.vectorized_backtester import BacktestConfig
+from src.backtesting.wfo_engine import WFOConfig, WFOEngine, _frame_from_shared, _share_frame
+
+
+class RandomSignalWFOEngine(WFOEngine):
+    """Skips model training; signals come from the (fold-seeded) global RNG."""
+
+    def _generate_signals(self, train_data, test_data, pair):
+        return pd.Series(np.random.choice([-1, 0, 1], size=len(test_data)), index=test_data.index)
+
+
+@pytest.fixture
+def hourly_ohlcv(make_ohlcv):
+    """Hourly UTC candles covering ``days`` days."""
+
+    def make(seed: int, days: int = 120) -> pd.DataFrame:
+        return make_ohlcv(days * 24, freq="1h", seed=seed, tz="UTC", price=100.0, volatility=0.01)
+
+    return make
+
+
+def _engine(n_jobs: int) -> WFOEngine:
+    wfo_config = WFOConfig(train_days=30, test_days=15, step_days=15, n_jobs=n_jobs, seed=7)
+    return RandomSignalWFOEngine(wfo_config, BacktestConfig())
+
+
+def _assert_same_result(a: dict, b: dict):
+    assert a["summary"] == b["summary"]
+    assert a["fold_results"] == b["fold_results"]
+    pd.testing.assert_frame_equal(a["trades"], b["trades"])
+    pd.testing.assert_series_equal(a["equity_curve"], b["equity_curve"])
+
+
+def test_split_folds(hourly_ohlcv):
+    folds = _engine(1).split_folds(hourly_ohlcv(0))
+
+    assert len(folds) == 5
+    assert [f.index for f in folds] == list(range(5))
+    assert all(f.test_start == f.train_end for f in folds)
+    assert folds[1].train_start - folds[0].train_start == pd.Timedelta(days=15)
+
+
+def test_shared_frame_roundtrip(hourly_ohlcv):
+    # Mixed float64/float32 columns
+    data = hourly_ohlcv(1, days=3).astype({"volume": np.float32})
+    shm, spec = _share_frame(data)
+    try:
+        window = _frame_from_shared(spec, 10, 40)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    pd.testing.assert_frame_equal(window, data.iloc[10:40], check_freq=False)
+
+
+def test_shared_frame_rejects_non_numeric(hourly_ohlcv):
+    data = hourly_ohlcv(1, days=1).assign(pair="BTC/USDT")
+    with pytest.raises(ValueError, match="numeric"):
+        _share_frame(data)
+
+
+def test_parallel_matches_serial(hourly_ohlcv):
+    data = hourly_ohlcv(2)
+
+    serial = _engine(1).run(data, "BTC/USDT")
+    parallel = _engine(2).run(data, "BTC/USDT")
+
+    assert len(serial["fold_results"]) > 1
+    assert not serial["trades"].empty
+    _assert_same_result(serial, parallel)
+
+
+def test_run_many_shares_pool_across_pairs(hourly_ohlcv):
+    datasets = {"BTC/USDT": hourly_ohlcv(3), "ETH/USDT": hourly_ohlcv(4, days=90)}
+
+    serial = _engine(1).run_many(datasets)
+    engine = _engine(3)
+    engine.wfo_config.max_pending_folds = 2
+    parallel = engine.run_many(datasets)
+
+    assert list(parallel) == list(datasets)
+    for pair in datasets:
+        _assert_same_result(serial[pair], parallel[pair])
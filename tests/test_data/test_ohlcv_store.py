@@ -0,0 +1,130 @@
+"""
+Tests for the partitioned OHLCV store.
+"""
+
+import asyncio
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.loader import DataLoader
+from src.data.ohlcv_store import OHLCVStore
+
+
+def _candles(start: str, periods: int, freq: str = "1h", seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, periods))
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": rng.uniform(1, 10, periods),
+        },
+        index=pd.date_range(start, periods=periods, freq=freq, tz="UTC", name="date"),
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OHLCVStore(tmp_path / "store")
+
+
+def test_append_partitions_by_month(store):
+    df = _candles("2024-01-30", 24 * 5)  # spans Jan -> Feb
+
+    store.append("BTC/USDT", "1h", df)
+
+    names = [p.name for p in store.partitions("BTC/USDT", "1h")]
+    assert names == ["2024-01.arrow", "2024-02.arrow"]
+    pd.testing.assert_frame_equal(store.load("BTC/USDT", "1h"), df, check_freq=False)
+
+
+def test_load_prunes_partitions_rows_and_columns(store):
+    df = _candles("2024-01-01", 24 * 90)
+    store.append("BTC/USDT", "1h", df)
+
+    result = store.load(
+        "BTC/USDT", "1h", start="2024-02-10", end="2024-02-12 05:00", columns=["close"]
+    )
+
+    assert len(store.partitions("BTC/USDT", "1h", start="2024-02-10", end="2024-02-12")) == 1
+    assert list(result.columns) == ["close"]
+    expected = df.loc["2024-02-10":"2024-02-12 05:00", ["close"]]
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+
+def test_append_merges_overlap_keeping_latest(store):
+    df = _candles("2024-03-01", 48)
+    store.append("ETH/USDT", "1h", df.iloc[:30])
+
+    update = df.iloc[20:].copy()
+    update["close"] += 1000
+    store.append("ETH/USDT", "1h", update)
+
+    result = store.load("ETH/USDT", "1h")
+    assert result.index.is_unique and len(result) == 48
+    np.testing.assert_allclose(result["close"].iloc[:20], df["close"].iloc[:20])
+    np.testing.assert_allclose(result["close"].iloc[20:], update["close"])
+    assert store.time_range("ETH/USDT", "1h") == (df.index[0], df.index[-1])
+
+
+def test_empty_range_returns_empty_frame(store):
+    store.append("BTC/USDT", "1h", _candles("2024-01-01", 24))
+
+    result = store.load("BTC/USDT", "1h", start="2025-01-01")
+
+    assert result.empty
+    assert list(result.columns) == ["open", "high", "low", "close", "volume"]
+
+
+def test_data_loader_prefers_store_and_falls_back_to_legacy(tmp_path):
+    legacy = _candles("2024-01-01", 100).reset_index()
+    legacy["date"] = legacy["date"].dt.tz_localize(None)
+    (tmp_path / "binance").mkdir()
+    legacy.to_feather(tmp_path / "binance" / "SOL_USDT-1h.feather")
+
+    loader = DataLoader(data_dir=str(tmp_path))
+    fallback = loader.load("SOL/USDT", "1h", start="2024-01-02", end="2024-01-03")
+    assert len(fallback) == 25
+    assert str(fallback.index.tz) == "UTC"
+
+    assert loader.import_to_store("SOL/USDT", "1h") == 100
+    stored = loader.load("SOL/USDT", "1h", start="2024-01-02", end="2024-01-03")
+    pd.testing.assert_frame_equal(stored, fallback)
+
+
+def test_fetch_historical_ohlcv_appends_to_store(store):
+    pytest.importorskip("ccxt")
+    from src.data.async_fetcher import AsyncDataFetcher
+
+    candles = _candles("2024-01-01", 50)
+    rows = [
+        [int(ts.timestamp() * 1000), *values]
+        for ts, values in zip(candles.index, candles.to_numpy().tolist(), strict=True)
+    ]
+
+    class FakeExchange:
+        async def fetch_ohlcv(self, symbol, timeframe, since, limit):
+            return [row for row in rows if row[0] >= since][:20]
+
+    fetcher = AsyncDataFetcher()
+    fetcher.exchange = FakeExchange()
+    fetcher._semaphore = asyncio.Semaphore(1)
+    fetcher._connected = True
+
+    result = asyncio.run(
+        fetcher.fetch_historical_ohlcv(
+            "BTC/USDT",
+            "1h",
+            datetime(2024, 1, 1),
+            datetime(2024, 1, 3, 1),
+            store=store,
+        )
+    )
+
+    assert len(result) == 50
+    np.testing.assert_allclose(store.load("BTC/USDT", "1h")["close"], candles["close"])
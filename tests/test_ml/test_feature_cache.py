@@ -0,0 +1,111 @@
+"""
+Tests for the persistent feature cache
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.training.feature_cache import FeatureCache, FeatureCacheConfig
+from src.ml.training.feature_engineering import FeatureConfig, FeatureEngineer
+
+
+@pytest.fixture
+def ohlcv_data(make_ohlcv):
+    return make_ohlcv(800, freq="1h", seed=3)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FeatureCache(FeatureCacheConfig(cache_dir=tmp_path / "features"))
+
+
+def test_prepare_data_reuses_cache_across_instances(ohlcv_data, cache):
+    fresh = FeatureEngineer(feature_cache=cache).prepare_data(ohlcv_data)
+
+    cached = FeatureEngineer(feature_cache=cache).prepare_data(ohlcv_data)
+
+    pd.testing.assert_frame_equal(cached, fresh)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_key_covers_data_and_config(ohlcv_data, cache):
+    FeatureEngineer(feature_cache=cache).prepare_data(ohlcv_data)
+
+    changed = ohlcv_data.copy()
+    changed.iloc[-1, changed.columns.get_loc("close")] *= 1.01
+    FeatureEngineer(feature_cache=cache).prepare_data(changed)
+    FeatureEngineer(FeatureConfig(short_period=7), feature_cache=cache).prepare_data(ohlcv_data)
+
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["entries"] == 3
+
+
+def test_fold_is_not_sliced_from_cached_superset(ohlcv_data, tmp_path):
+    # Even with superset lookups enabled, windowed features must be recomputed
+    cache = FeatureCache(FeatureCacheConfig(cache_dir=tmp_path, allow_superset=True))
+    engineer = FeatureEngineer(feature_cache=cache)
+    engineer.prepare_data(ohlcv_data)
+
+    fold = ohlcv_data.iloc[300:500]
+    from_cache = engineer.prepare_data(fold)
+    fresh = FeatureEngineer().prepare_data(fold, use_cache=False)
+
+    assert cache.stats()["superset_hits"] == 0
+    pd.testing.assert_frame_equal(from_cache, fresh)
+
+
+def test_superset_slice_differs_from_fresh_features(ohlcv_data):
+    # Why slicing is off: rolling/lagged features depend on rows before the slice
+    engineer = FeatureEngineer()
+    full = engineer._engineer_features(ohlcv_data.copy())
+    fold = ohlcv_data.iloc[300:500]
+    fresh = engineer._engineer_features(fold.copy())
+
+    assert not np.allclose(
+        full.loc[fold.index, "volume_lag_10"].to_numpy(), fresh["volume_lag_10"].to_numpy()
+    )
+
+
+def test_superset_slice_for_row_local_features(ohlcv_data, tmp_path):
+    cache = FeatureCache(FeatureCacheConfig(cache_dir=tmp_path, allow_superset=True))
+    def row_local(frame):
+        return frame.assign(hl_range=frame["high"] - frame["low"])
+
+    cache.put(ohlcv_data, "fp", row_local(ohlcv_data))
+
+    fold = ohlcv_data.iloc[300:500]
+    sliced = cache.get(fold, "fp")
+
+    assert cache.stats()["superset_hits"] == 1
+    pd.testing.assert_frame_equal(sliced, row_local(fold), check_freq=False)
+
+
+def test_superset_requires_matching_raw_data(ohlcv_data, tmp_path):
+    cache = FeatureCache(FeatureCacheConfig(cache_dir=tmp_path, allow_superset=True))
+    cache.put(ohlcv_data, "fp", ohlcv_data * 1.0)
+
+    fold = ohlcv_data.iloc[300:500].copy()
+    fold["close"] *= 1.01
+
+    assert cache.get(fold, "fp") is None
+    assert cache.stats()["superset_hits"] == 0
+
+
+def test_lru_eviction_keeps_recently_used(ohlcv_data, tmp_path):
+    cache = FeatureCache(FeatureCacheConfig(cache_dir=tmp_path, max_size_mb=0.5))
+    frames = [ohlcv_data.iloc[i * 200 : (i + 1) * 200] for i in range(3)]
+    features = [f * 1.0 for f in frames]
+
+    cache.put(frames[0], "fp", features[0])
+    cache.put(frames[1], "fp", features[1])
+    entry_size = cache.stats()["size_mb"] / 2
+    cache.config.max_size_mb = entry_size * 2.5
+
+    assert cache.get(frames[0], "fp") is not None  # refresh entry 0
+    cache.put(frames[2], "fp", features[2])
+
+    assert cache.get(frames[0], "fp") is not None
+    assert cache.get(frames[1], "fp") is None
+    assert cache.get(frames[2], "fp") is not None
@@ -13,8 +13,10 @@ from src.ml.feature_store import (
     TradingFeatureStore,
     MockFeatureStore,
     RedisFeatureStore,
-    create_feature_store
+    create_feature_store,
+    FeatureVectorCodec,
 )
+from tests.mocks.fake_redis import SyncFakeRedis
 
 
 class TestMockFeatureStore:
@@ -143,7 +145,7 @@ class TestRedisFeatureStore:
         store = RedisFeatureStore()
         # Should have Redis connection
         assert hasattr(store, 'redis')
-        assert hasattr(store, 'pickle')
+        assert hasattr(store, 'codec')
         assert store.ttl == 3600  # 1 hour in seconds
     
     @patch('src.ml.feature_store.redis.Redis')
@@ -359,6 +361,138 @@ class TestIntegration:
         assert isinstance(stats['feature_views'], list)
 
 
+class TestRedisFeatureStoreBulk:
+    """Batched reads, binary encoding, bulk writes and UNLINK invalidation."""
+
+    @pytest.fixture
+    def store(self):
+        fake = SyncFakeRedis()
+        with patch('src.ml.feature_store.redis.Redis', return_value=fake):
+            store = RedisFeatureStore()
+        store.initialize()
+        return store
+
+    def test_codec_round_trip_is_float32_and_schema_tagged(self):
+        codec = FeatureVectorCodec()
+        data = codec.encode(["rsi", "close"], [55.5, "n/a"])
+
+        assert len(data) == 15 + 2 * 4
+        names, values = FeatureVectorCodec(resolve_schema=lambda _: ["rsi", "close"]).decode(data)
+        assert names == ("rsi", "close")
+        assert values.dtype == np.float32 and values[0] == 55.5 and np.isnan(values[1])
+        with pytest.raises(KeyError):
+            FeatureVectorCodec().decode(data)  # Schema unknown to this reader
+        with pytest.raises(ValueError):
+            codec.decode(b"\x80\x04" + data[2:])  # A pickle is rejected, never executed
+
+    def test_materialize_dataframe_in_one_pipeline(self, store):
+        index = pd.date_range("2024-01-01", periods=500, freq="5min")
+        df = pd.DataFrame({"close": np.linspace(100, 200, 500), "volume": 1.0, "pair": "x"},
+                          index=index)
+        fake = store.redis.backend
+        before = fake.pipelines_executed
+
+        assert store.materialize_dataframe("BTC/USDT", df) == 500
+        assert fake.pipelines_executed == before + 1
+
+        # Readable by another process: the schema comes from Redis, not local state
+        other = FeatureVectorCodec(resolve_schema=store._fetch_schema)
+        names, values = other.decode(store.redis.get(f"features:BTC/USDT:{index[7].isoformat()}"))
+        assert names == ("close", "volume")
+        assert values[0] == pytest.approx(df["close"].iloc[7], rel=1e-6)
+        assert store.get_features("BTC/USDT", index[7]) == pytest.approx(
+            {"close": df["close"].iloc[7], "volume": 1.0}, rel=1e-6)
+
+    def test_get_online_features_many_uses_single_mget(self, store):
+        symbols = ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+        timestamp = datetime(2024, 1, 1, 12)
+        fake = store.redis.backend
+
+        first = store.get_online_features_many(symbols, timestamp, ["rsi_14", "close"])
+        commands = fake.commands
+        second = store.get_online_features_many(symbols, timestamp, ["rsi_14", "close"])
+
+        assert fake.commands == commands + 1  # One MGET, no writes on a full hit
+        assert list(second["symbol_id"]) == symbols
+        pd.testing.assert_frame_equal(first, second, check_dtype=False, rtol=1e-6)
+        assert store.get_online_features("ETH/USDT", timestamp, ["rsi_14", "close"]).equals(
+            second.iloc[[1]].reset_index(drop=True))
+
+    def test_unlink_invalidation(self, store):
+        index = pd.date_range("2024-01-01", periods=20, freq="1min")
+        df = pd.DataFrame({"close": 1.0}, index=index)
+        store.materialize_dataframe("BTC/USDT", df)
+        store.materialize_dataframe("ETH/USDT", df)
+
+        assert store.invalidate_features("BTC/USDT", index[:5]) == 5
+        assert store.get_features("BTC/USDT", index[0]) is None
+        assert store.clear_redis_cache("BTC/USDT") == 15
+        assert store.get_features("ETH/USDT", index[0]) == {"close": 1.0}
+        assert store.clear_redis_cache() == 20
+        assert store.get_features_many(["ETH/USDT"], index[1]) == {"ETH/USDT": None}
+
+
+class TestRedisFeatureStoreIncremental:
+    """Indicator state persisted in Redis and advanced one candle at a time."""
+
+    @pytest.fixture
+    def backend(self):
+        return SyncFakeRedis().backend
+
+    def make_store(self, backend):
+        with patch('src.ml.feature_store.redis.Redis', return_value=SyncFakeRedis(backend)):
+            store = RedisFeatureStore()
+        store.initialize()
+        return store
+
+    def test_streamed_rows_match_batch_and_survive_restart(self, backend, make_ohlcv):
+        history = make_ohlcv(320, seed=3)
+        store = self.make_store(backend)
+        warmup = store.engine.warmup_period
+
+        assert store.update_features_incremental("BTC/USDT", history.iloc[:250]).shape[0] == 50
+        # A fresh process resumes from the state in Redis, one candle per call
+        store = self.make_store(backend)
+        for i in range(250, 320):
+            rows = store.update_features_incremental("BTC/USDT", history.iloc[i - 1 : i + 1])
+            assert list(rows.index) == [history.index[i]]  # Replayed candle skipped
+
+        report = store.check_incremental_consistency("BTC/USDT", history)
+        assert report["consistent"], report["mismatched_columns"]
+        assert report["rows_checked"] == 320 - warmup and report["rows_missing"] == 0
+
+        latest = store.get_features_many(["BTC/USDT"], "latest")["BTC/USDT"]
+        assert latest == store.get_features("BTC/USDT", history.index[-1])
+        assert {"rsi", "atr", "macd", "bb_width"} <= set(latest)
+
+    def test_checker_reports_divergence(self, backend, make_ohlcv):
+        history = make_ohlcv(260, seed=3)
+        store = self.make_store(backend)
+        store.update_features_incremental("BTC/USDT", history)
+
+        shifted = history.copy()
+        shifted.iloc[-10:, shifted.columns.get_loc("close")] *= 1.05
+        report = store.check_incremental_consistency("BTC/USDT", shifted)
+        assert not report["consistent"] and "close" in report["mismatched_columns"]
+
+    def test_many_symbols_use_one_write_pipeline(self, backend, make_ohlcv):
+        store = self.make_store(backend)
+        symbols = [f"PAIR{i}/USDT" for i in range(20)]
+        store.update_features_incremental_many(
+            {s: make_ohlcv(220, seed=i) for i, s in enumerate(symbols)})
+
+        store = self.make_store(backend)
+        before = backend.pipelines_executed
+        new = {s: make_ohlcv(221, seed=i).iloc[[-1]] for i, s in enumerate(symbols)}
+        written = store.update_features_incremental_many(new)
+
+        assert backend.pipelines_executed == before + 2  # State read + write
+        assert all(len(rows) == 1 for rows in written.values())
+        assert store.clear_redis_cache() > 0 and store.engine.candles_seen(symbols[0]) == 221
+        store.reset_feature_state(symbols[0])
+        assert not store.redis.exists(f"feature_state:{symbols[0]}")
+        assert store.redis.exists(f"feature_state:{symbols[1]}")
+
 if __name__ == "__main__":
     # Run tests
     import sys
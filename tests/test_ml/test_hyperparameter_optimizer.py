@@ -0,0 +1,123 @@
+"""
+Tests for HyperparameterOptimizer (fold reporting, pruning, shared studies)
+"""
+
+import numpy as np
+import optuna
+import pandas as pd
+import pytest
+from optuna.trial import TrialState
+
+from src.ml.training.hyperparameter_optimizer import (
+    HyperparameterOptimizer,
+    HyperparameterOptimizerConfig,
+)
+
+
+@pytest.fixture
+def sample_data():
+    """Noisy binary classification problem."""
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.normal(size=(600, 6)), columns=[f"f{i}" for i in range(6)])
+    y = pd.Series((X["f0"] + 0.5 * X["f1"] + rng.normal(0, 1, 600) > 0).astype(int))
+    return X, y
+
+
+def make_config(tmp_path, **kwargs) -> HyperparameterOptimizerConfig:
+    defaults = dict(
+        n_trials=12,
+        timeout=None,
+        n_jobs=1,
+        n_splits=4,
+        optimize_for="accuracy",
+        save_best_model=False,
+        output_dir=str(tmp_path),
+        pruner_startup_trials=2,
+    )
+    defaults.update(kwargs)
+    return HyperparameterOptimizerConfig(**defaults)
+
+
+class TestStudyData:
+    def test_folds_are_contiguous_views(self, tmp_path, sample_data):
+        X, y = sample_data
+        optimizer = HyperparameterOptimizer(make_config(tmp_path))
+        data = optimizer.prepare_study_data(X, y)
+
+        assert len(data.folds) == 4
+        for train, val in data.folds:
+            assert train.stop <= val.start
+            assert np.shares_memory(data.X[train], data.X)
+            np.testing.assert_array_equal(data.X[val], X.iloc[val].to_numpy())
+
+    def test_save_and_load_round_trip(self, tmp_path, sample_data):
+        X, y = sample_data
+        data = HyperparameterOptimizer(make_config(tmp_path)).prepare_study_data(X, y)
+        data.save(str(tmp_path))
+        loaded = type(data).load(str(tmp_path))
+
+        assert loaded.folds == data.folds
+        np.testing.assert_array_equal(loaded.X, data.X)
+        assert isinstance(loaded.X, np.memmap)
+
+
+class TestOptimize:
+    def test_reports_every_fold_and_prunes(self, tmp_path, sample_data):
+        X, y = sample_data
+        optimizer = HyperparameterOptimizer(make_config(tmp_path, n_trials=25, sampler_seed=0))
+        results = optimizer.optimize(X, y, "logistic_regression")
+
+        trials = results["study"].get_trials(deepcopy=False)
+        complete = [t for t in trials if t.state == TrialState.COMPLETE]
+        assert complete
+        for trial in complete:
+            assert len(trial.intermediate_values) == len(trial.user_attrs["fold_scores"])
+        assert results["n_pruned"] > 0
+        assert results["n_complete"] + results["n_pruned"] == 25
+        assert len(results["trial_results"]) == results["n_complete"]
+        assert results["wall_time"] > 0
+
+    def test_fresh_model_per_fold(self, tmp_path, sample_data, monkeypatch):
+        X, y = sample_data
+        optimizer = HyperparameterOptimizer(make_config(tmp_path, n_trials=1))
+        created = []
+        original = optimizer._create_model
+
+        def counting_create(params, model_type):
+            created.append(model_type)
+            return original(params, model_type)
+
+        monkeypatch.setattr(optimizer, "_create_model", counting_create)
+        optimizer.optimize(X, y, "logistic_regression")
+
+        fold_scores = optimizer.study.trials[0].user_attrs["fold_scores"]
+        # One model per evaluated fold plus the final refit on all data
+        assert len(created) == len(fold_scores) + 1
+
+    def test_resumes_from_storage(self, tmp_path, sample_data):
+        X, y = sample_data
+        storage = str(tmp_path / "study.journal")
+        config = make_config(tmp_path, n_trials=4, storage=storage, study_name="resume")
+
+        HyperparameterOptimizer(config).optimize(X, y, "logistic_regression")
+        HyperparameterOptimizer(config).optimize(X, y, "logistic_regression")
+
+        study = optuna.load_study(
+            study_name="resume",
+            storage=optuna.storages.JournalStorage(
+                optuna.storages.journal.JournalFileBackend(storage)
+            ),
+        )
+        assert len(study.trials) == 8
+
+    @pytest.mark.slow
+    def test_workers_share_one_study(self, tmp_path, sample_data):
+        X, y = sample_data
+        config = make_config(tmp_path, n_trials=6, n_workers=2, study_name="shared")
+        results = HyperparameterOptimizer(config).optimize(X, y, "logistic_regression")
+
+        assert (tmp_path / "shared.journal").exists()
+        assert len(results["study"].trials) == 6
+        assert len(results["trial_results"]) == results["n_complete"]
+        assert all(result["score"] is not None for result in results["trial_results"])
+        assert results["n_workers"] == 2
@@ -0,0 +1,115 @@
+"""
+Tests for the incremental (streaming) feature engine
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.training.feature_engineering import FeatureConfig, FeatureEngineer
+from src.ml.training.incremental_features import IncrementalFeatureEngineer
+
+
+@pytest.fixture
+def ohlcv_data(make_ohlcv):
+    """Random-walk OHLCV long enough to get well past the warmup period."""
+    return make_ohlcv(600, seed=7)
+
+
+def _assert_parity(batch: pd.DataFrame, stream: pd.DataFrame, warmup: int):
+    assert list(stream.columns) == list(batch.columns)
+    for col in batch.columns:
+        np.testing.assert_allclose(
+            stream[col].to_numpy(dtype=float)[warmup:],
+            batch[col].to_numpy(dtype=float)[warmup:],
+            rtol=1e-7,
+            atol=1e-9,
+            err_msg=col,
+        )
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        FeatureConfig(),
+        FeatureConfig(enforce_stationarity=True),
+        FeatureConfig(include_volatility_features=False, include_time_features=False),
+    ],
+    ids=["default", "log_returns", "partial"],
+)
+def test_streaming_matches_batch(ohlcv_data, config):
+    engineer = FeatureEngineer(config)
+    batch = engineer._engineer_features(engineer._apply_stationarity_transformation(ohlcv_data))
+
+    engine = IncrementalFeatureEngineer(config)
+    stream = engine.warmup("BTC/USDT", ohlcv_data)
+
+    assert engine.is_warm("BTC/USDT")
+    _assert_parity(batch, stream, engine.warmup_period)
+
+
+def test_update_emits_single_row(ohlcv_data):
+    engine = IncrementalFeatureEngineer()
+    engine.warmup("BTC/USDT", ohlcv_data.iloc[:-1])
+
+    row = engine.update("BTC/USDT", ohlcv_data.iloc[-1])
+
+    batch = FeatureEngineer()._engineer_features(ohlcv_data).iloc[-1]
+    assert list(row) == list(batch.index)
+    np.testing.assert_allclose(list(row.values()), batch.to_numpy(dtype=float), rtol=1e-7)
+    assert engine.candles_seen("BTC/USDT") == len(ohlcv_data)
+
+
+def test_checkpoint_restore_resumes_stream(ohlcv_data, tmp_path):
+    head, tail = ohlcv_data.iloc[:300], ohlcv_data.iloc[300:]
+
+    reference = IncrementalFeatureEngineer().warmup("BTC/USDT", ohlcv_data).iloc[300:]
+
+    engine = IncrementalFeatureEngineer()
+    engine.warmup("BTC/USDT", head)
+    engine.warmup("ETH/USDT", head)
+    engine.save_checkpoint(tmp_path / "features.joblib")
+
+    # Mutating the original engine must not leak into the saved state
+    engine.warmup("BTC/USDT", tail)
+
+    resumed = IncrementalFeatureEngineer()
+    resumed.load_checkpoint(tmp_path / "features.joblib")
+
+    assert sorted(resumed.pairs) == ["BTC/USDT", "ETH/USDT"]
+    pd.testing.assert_frame_equal(resumed.warmup("BTC/USDT", tail), reference)
+
+
+def test_export_state_is_json_and_resumes_stream(ohlcv_data):
+    head, tail = ohlcv_data.iloc[:300], ohlcv_data.iloc[300:]
+    config = FeatureConfig(enforce_stationarity=True)
+    reference = IncrementalFeatureEngineer(config).warmup("BTC/USDT", ohlcv_data).iloc[300:]
+
+    engine = IncrementalFeatureEngineer(config)
+    engine.warmup("BTC/USDT", head)
+    blob = engine.export_state("BTC/USDT")
+    assert json.loads(blob)["version"] == 1
+    assert engine.export_state("ETH/USDT") is None
+
+    resumed = IncrementalFeatureEngineer(config)
+    resumed.import_state("BTC/USDT", blob)
+    pd.testing.assert_frame_equal(resumed.warmup("BTC/USDT", tail), reference)
+
+    with pytest.raises(ValueError, match="different FeatureConfig"):
+        IncrementalFeatureEngineer().import_state("BTC/USDT", blob)
+
+
+def test_restore_rejects_other_config(ohlcv_data):
+    engine = IncrementalFeatureEngineer()
+    engine.warmup("BTC/USDT", ohlcv_data.iloc[:50])
+
+    with pytest.raises(ValueError, match="different FeatureConfig"):
+        IncrementalFeatureEngineer(FeatureConfig(short_period=7)).restore(engine.checkpoint())
+
+
+def test_fractional_differentiation_not_supported():
+    config = FeatureConfig(enforce_stationarity=True, use_log_returns=False)
+    with pytest.raises(ValueError, match="log-returns"):
+        IncrementalFeatureEngineer(config)
@@ -0,0 +1,122 @@
+"""
+Tests for the model compiler (native backend; Treelite/ONNX are optional)
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from lightgbm import LGBMClassifier
+from sklearn.ensemble import (
+    GradientBoostingClassifier,
+    HistGradientBoostingClassifier,
+    RandomForestClassifier,
+)
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+
+from src.ml.model_loader import ModelLoader
+from src.ml.training.model_compiler import (
+    CompiledTreeEnsemble,
+    compile_model,
+    compile_native,
+    load_compiled,
+)
+from src.ml.training.model_registry import ModelRegistry
+
+FEATURES = [f"f{i}" for i in range(6)]
+
+
+def make_data(n=1200, nan_rate=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, len(FEATURES)))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(0, 0.5, n) > 0).astype(int)
+    X[rng.random(X.shape) < nan_rate] = np.nan
+    return X, y
+
+
+@pytest.mark.parametrize(
+    "model,nan_rate,unseen_nan",
+    [
+        (RandomForestClassifier(n_estimators=20, max_depth=8, random_state=0), 0.0, True),
+        (GradientBoostingClassifier(n_estimators=30, random_state=0), 0.0, False),
+        (HistGradientBoostingClassifier(max_iter=30, random_state=0), 0.05, False),
+        (XGBClassifier(n_estimators=30, max_depth=4), 0.05, False),
+        (LGBMClassifier(n_estimators=30, verbose=-1), 0.05, False),
+        (LGBMClassifier(n_estimators=30, verbose=-1), 0.0, True),  # NaN -> 0.0 branches
+    ],
+)
+def test_native_ensemble_matches_model(model, nan_rate, unseen_nan, tmp_path):
+    X, y = make_data(nan_rate=nan_rate)
+    model.fit(X[:800], y[:800])
+    holdout = X[800:].copy()
+    if unseen_nan:
+        holdout[::7, 3] = np.nan  # Missing values never seen in training
+
+    compiled = CompiledTreeEnsemble.load(compile_native(model, holdout).save(tmp_path / "m"))
+    expected = model.predict_proba(holdout)[:, 1]
+
+    np.testing.assert_allclose(compiled.predict_proba(holdout)[:, 1], expected, atol=1e-6)
+    single = [compiled.predict_proba(row)[0, 1] for row in holdout[:20]]
+    np.testing.assert_allclose(single, expected[:20], atol=1e-6)
+
+
+def test_compile_model_records_parity_and_aligns_dataframes(tmp_path):
+    X, y = make_data()
+    model = XGBClassifier(n_estimators=20, max_depth=3).fit(X[:800], y[:800])
+
+    result = compile_model(model, X[800:], tmp_path / "xgb", feature_names=FEATURES)
+    assert result.backend == "native" and result.path.endswith("xgb.npz")
+    assert result.max_abs_error <= 1e-5 and result.latency_us > 0
+
+    compiled = load_compiled(result.path, result.backend, FEATURES)
+    shuffled = pd.DataFrame(X[800:], columns=FEATURES)[FEATURES[::-1]]
+    np.testing.assert_allclose(
+        compiled.predict_proba(shuffled)[:, 1], model.predict_proba(X[800:])[:, 1], atol=1e-5
+    )
+
+    assert compile_model(LogisticRegression().fit(X, y), X[800:], tmp_path / "lr") is None
+
+
+def test_registry_compiles_and_loader_prefers_artifact(tmp_path):
+    X, y = make_data()
+    model = GradientBoostingClassifier(n_estimators=20, random_state=0).fit(X[:800], y[:800])
+    model_path = tmp_path / "gb_model.pkl"
+    with open(model_path, "wb") as f:
+        pickle.dump(model, f)
+
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.register_model("m", str(model_path), version="v1", feature_names=FEATURES)
+    registry.validate_model("m", "v1")
+    assert registry.promote_to_production("m", "v1", compile_sample=X[800:])
+
+    metadata = ModelRegistry(str(tmp_path / "registry")).get_production_model("m")
+    assert metadata.compiled_backend == "native"
+    assert metadata.compiled_path == str(tmp_path / "gb_model.npz")
+    assert metadata.compile_report["max_abs_error"] <= 1e-5
+
+    loader = ModelLoader(str(tmp_path / "registry"))
+    compiled, _ = loader.load_production_model("m")
+    pickled, _ = loader.load_production_model("m", compiled=False)
+    assert isinstance(compiled, CompiledTreeEnsemble)
+    assert isinstance(pickled, GradientBoostingClassifier)
+
+    # A broken artifact falls back to the pickle
+    (tmp_path / "gb_model.npz").write_bytes(b"corrupt")
+    fallback, _ = loader.load_production_model("m")
+    assert isinstance(fallback, GradientBoostingClassifier)
+
+
+def test_uncompilable_model_is_still_promoted(tmp_path):
+    X, y = make_data()
+    model_path = tmp_path / "lr_model.pkl"
+    with open(model_path, "wb") as f:
+        pickle.dump(LogisticRegression().fit(X, y), f)
+
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.register_model("m", str(model_path), version="v1", compile_sample=X[:100])
+    registry.validate_model("m", "v1")
+
+    assert registry.promote_to_production("m", "v1", compile_sample=X[:100])
+    assert registry.get_production_model("m").compiled_path == ""
@@ -0,0 +1,106 @@
+"""
+Tests for the materialized study dataset and the nightly hyperopt objective
+"""
+
+import numpy as np
+import pytest
+from sklearn.model_selection import TimeSeriesSplit
+
+from src.ml.training.feature_engineering import FeatureEngineer
+from src.ml.training.labeling import TripleBarrierConfig, TripleBarrierLabeler
+from src.ml.training.nightly_hyperopt import PROFILES, NightlySharpeRatioObjective, sharpe_ratios
+from src.ml.training.study_dataset import StudyDataset
+from src.utils.risk import calculate_sharpe_ratio
+
+
+@pytest.fixture
+def ohlcv_data(make_ohlcv):
+    return make_ohlcv(700, seed=11)
+
+
+def materialize(ohlcv_data, tmp_path, **kwargs):
+    return StudyDataset.materialize(
+        ohlcv_data,
+        FeatureEngineer(),
+        TripleBarrierLabeler(TripleBarrierConfig()),
+        n_splits=4,
+        root_dir=tmp_path,
+        **kwargs,
+    )
+
+
+def test_materialize_then_attach(ohlcv_data, tmp_path, monkeypatch):
+    built = materialize(ohlcv_data, tmp_path)
+    assert isinstance(built.X, np.memmap)
+    assert built.X.dtype == np.float32
+    assert len(built.X) == len(built.y) == len(built.forward_returns)
+
+    # A second run on the same candles must not engineer features again
+    def fail(*args, **kwargs):
+        raise AssertionError("features recomputed")
+
+    monkeypatch.setattr(FeatureEngineer, "fit_transform", fail)
+    attached = materialize(ohlcv_data, tmp_path)
+
+    assert attached.path == built.path
+    assert attached.feature_names == built.feature_names
+    np.testing.assert_array_equal(attached.X, built.X)
+    assert attached.index.equals(built.index)
+
+    # Different candles get their own entry
+    monkeypatch.undo()
+    other = materialize(ohlcv_data.iloc[:-20], tmp_path)
+    assert other.path != built.path
+
+
+def test_least_recently_used_entries_are_evicted(ohlcv_data, tmp_path):
+    first = materialize(ohlcv_data, tmp_path)
+    second = materialize(ohlcv_data.iloc[:-20], tmp_path)
+    # Using the first entry again makes the second one the least recently used
+    materialize(ohlcv_data, tmp_path)
+    entry_mb = sum(f.stat().st_size for f in first.path.iterdir()) / 1e6
+
+    third = materialize(ohlcv_data.iloc[:-40], tmp_path, max_size_mb=2.5 * entry_mb)
+
+    assert first.path.exists()
+    assert not second.path.exists()
+    assert third.path.exists()
+
+    # The entry being returned is never evicted, even over the bound
+    materialize(ohlcv_data, tmp_path, max_size_mb=0)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [first.path.name]
+
+
+def test_folds_match_time_series_split(ohlcv_data, tmp_path):
+    dataset = materialize(ohlcv_data, tmp_path)
+    expected = TimeSeriesSplit(n_splits=4).split(np.empty((len(dataset), 1)))
+
+    for (train, val), (train_idx, val_idx) in zip(dataset.folds, expected):
+        np.testing.assert_array_equal(np.arange(len(dataset))[train], train_idx)
+        np.testing.assert_array_equal(np.arange(len(dataset))[val], val_idx)
+        assert np.shares_memory(dataset.X[train], dataset.X)
+
+    tail = dataset.tail(200)
+    assert len(tail) == 200
+    assert tail.folds[-1][1].stop == 200
+    np.testing.assert_array_equal(tail.y, dataset.y[-200:])
+
+
+def test_vectorized_returns_match_per_fold_pandas(ohlcv_data, tmp_path):
+    dataset = materialize(ohlcv_data, tmp_path)
+    _, _, close = dataset.to_frame()
+    objective = NightlySharpeRatioObjective(dataset, profile=PROFILES["light"])
+    rng = np.random.default_rng(0)
+
+    for _, val in dataset.folds:
+        # Several trials' predictions for the same validation rows at once
+        proba = rng.uniform(0, 1, (3, val.stop - val.start))
+        returns = objective.calculate_strategy_returns(proba, dataset.forward_returns[val])
+        sharpe = sharpe_ratios(returns)
+
+        for k in range(len(proba)):
+            # Formula the nightly scripts used, on the pandas validation slice
+            val_close = close.iloc[val]
+            signals = (proba[k] > 0.55).astype(int)
+            expected = (signals * val_close.pct_change().shift(-1)).dropna()
+            assert sharpe[k] == pytest.approx(calculate_sharpe_ratio(expected), rel=1e-9)
@@ -0,0 +1,131 @@
+"""
+Tests for the order ledger write path.
+"""
+
+import asyncio
+import sqlite3
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.order_manager.order_ledger import AsyncOrderLedger, LedgerConfig, OrderLedger
+from src.order_manager.order_types import LimitOrder, OrderSide, OrderStatus
+from src.order_manager.smart_order import ChaseLimitOrder
+from src.order_manager.smart_order_executor import SmartOrderExecutor
+from src.risk.risk_manager import RiskManager
+
+
+def make_order(i: int) -> LimitOrder:
+    return LimitOrder(
+        order_id=f"order-{i}", symbol="BTC/USDT", side=OrderSide.BUY, quantity=0.1, price=30000.0
+    )
+
+
+@pytest.fixture(
+    params=[LedgerConfig(), LedgerConfig(group_commit=False, bloom_capacity=0)],
+    ids=["group_commit", "inline"],
+)
+def ledger(request, tmp_path):
+    ledger = OrderLedger(str(tmp_path / "orders.db"), request.param)
+    yield ledger
+    ledger.close()
+
+
+class TestOrderLedger:
+    """Storage, idempotency and status history."""
+
+    def test_store_and_duplicate_detection(self, ledger):
+        assert not ledger.is_duplicate("key-1")
+        assert ledger.store_order(make_order(1), idempotency_key="key-1")
+        assert ledger.is_duplicate("key-1")
+
+        assert not ledger.store_order(make_order(2), idempotency_key="key-1")
+        with pytest.raises(sqlite3.IntegrityError, match="order_id"):
+            ledger.store_order(make_order(1), idempotency_key="key-2")
+        assert not ledger.is_duplicate("key-2")
+
+        stored = ledger.get_order("order-1")
+        assert stored["status"] == "pending" and stored["order_data"]["price"] == 30000.0
+
+    def test_status_updates_are_visible_to_reads(self, ledger):
+        ledger.store_order(make_order(1))
+        for status in (OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED, OrderStatus.FILLED):
+            ledger.update_order_status("order-1", status, {"filled": 0.05})
+
+        history = ledger.get_order_history("order-1")
+        assert [(h["old_status"], h["new_status"]) for h in history] == [
+            ("pending", "open"),
+            ("open", "partially_filled"),
+            ("partially_filled", "filled"),
+        ]
+        assert ledger.get_order("order-1")["status"] == "filled"
+        assert ledger.get_active_orders() == []
+
+        with pytest.raises(ValueError, match="not found"):
+            ledger.update_order_status("missing", "filled", wait=True)
+        # Order ids the ledger has not seen wait by default, so a typo still fails
+        with pytest.raises(ValueError, match="not found"):
+            ledger.update_order_status("order-l", "filled")
+
+    def test_concurrent_writers(self, ledger):
+        def worker(offset):
+            for i in range(offset, offset + 50):
+                assert ledger.store_order(make_order(i))
+                ledger.update_order_status(f"order-{i}", "open")
+
+        threads = [threading.Thread(target=worker, args=(n * 50,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert ledger.get_statistics()["by_status"] == {"open": 200}
+        assert sum(not ledger.store_order(make_order(i)) for i in range(200)) == 200
+
+
+def test_reopen_recovers_keys_and_pending_updates(tmp_path):
+    path = str(tmp_path / "orders.db")
+    with OrderLedger(path) as ledger:
+        ledger.store_order(make_order(1), idempotency_key="key-1")
+        ledger.update_order_status("order-1", "open")  # Queued, committed on close
+
+    reopened = OrderLedger(path)
+    assert reopened.is_duplicate("key-1") and not reopened.is_duplicate("key-2")
+    assert reopened.get_order("order-1")["status"] == "open"
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    reopened.close()
+
+
+async def test_async_ledger_keeps_event_loop_free(tmp_path):
+    ledger = AsyncOrderLedger(OrderLedger(str(tmp_path / "orders.db")))
+    orders = [make_order(i) for i in range(50)]
+    assert all(await asyncio.gather(*(ledger.store_order(o) for o in orders)))
+    assert await ledger.is_duplicate("order-7") and not await ledger.is_duplicate("order-x")
+    assert not await ledger.store_order(orders[0])
+
+    for order in orders:
+        await ledger.update_order_status(order.order_id, OrderStatus.OPEN)
+    await ledger.flush()
+    assert len(await ledger.get_active_orders()) == 50
+    await ledger.close()
+
+
+async def test_executor_persists_orders_through_ledger(tmp_path):
+    risk_manager = MagicMock(spec=RiskManager)
+    risk_manager.circuit_breaker = MagicMock()
+    risk_manager.circuit_breaker.can_trade.return_value = True
+    ledger = OrderLedger(str(tmp_path / "orders.db"))
+    executor = SmartOrderExecutor(dry_run=True, risk_manager=risk_manager, ledger=ledger)
+    await executor.start()
+
+    order = ChaseLimitOrder(symbol="BTC/USDT", side="buy", quantity=1.0, price=50000.0)
+    await executor.submit_order(order)
+    assert ledger.get_order(order.order_id)["status"] == "submitted"
+    with pytest.raises(RuntimeError, match="Duplicate"):
+        await executor.submit_order(order)
+
+    await executor.cancel_order(order.order_id)
+    await executor.stop()
+    ledger.close()
@@ -0,0 +1,127 @@
+"""
+Tests for the streaming covariance engine and its risk consumers.
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.risk.correlation import CorrelationAnalyzer, CorrelationManager
+from src.risk.covariance import StreamingCovariance
+from src.risk.hrp import get_hrp_weights
+from src.risk.position_sizing import PositionSizer
+
+SYMBOLS = ["BTC/USDT", "ETH/USDT", "SOL/USDT", "ADA/USDT"]
+
+
+def make_prices(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.01, (n, len(SYMBOLS)))
+    returns[:, 1] += returns[:, 0]  # ETH follows BTC
+    index = pd.date_range("2024-01-01", periods=n, freq="h")
+    return pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)), index=index, columns=SYMBOLS)
+
+
+@pytest.mark.parametrize("window", [None, 50])
+def test_streaming_matches_pandas(window):
+    prices = make_prices()
+    prices.iloc[20:40, 2] = np.nan  # Pairwise-complete handling of gaps
+    covariance = StreamingCovariance(window=window)
+    for timestamp, row in prices.iterrows():
+        covariance.update(row.to_dict(), timestamp)
+
+    returns = prices.ffill().pct_change().where(prices.notna())
+    if window is not None:
+        returns = returns.tail(window)
+    np.testing.assert_allclose(covariance.submatrix(SYMBOLS), returns.corr(), atol=1e-12)
+    np.testing.assert_allclose(covariance.submatrix(SYMBOLS, "cov"), returns.cov(), atol=1e-15)
+    assert covariance.correlation("BTC/USDT", "ETH/USDT") == pytest.approx(
+        returns["BTC/USDT"].corr(returns["ETH/USDT"])
+    )
+
+
+def test_block_updates_and_ewm():
+    prices = make_prices()
+    incremental = StreamingCovariance(window=50)
+    incremental.update_frame(prices.iloc[:120])
+    incremental.update_frame(prices)  # Only the new rows are applied
+    incremental.update_frame(prices)
+    expected = prices.pct_change().tail(50).corr()
+    np.testing.assert_allclose(incremental.submatrix(SYMBOLS), expected, atol=1e-12)
+
+    returns = prices.pct_change().iloc[1:]
+    ewm = StreamingCovariance(halflife=20)
+    ewm.update_returns_frame(returns)
+    expected = returns.ewm(halflife=20, adjust=False).corr().loc[returns.index[-1]]
+    np.testing.assert_allclose(ewm.submatrix(SYMBOLS), expected, atol=1e-12)
+
+    restored = pickle.loads(pickle.dumps(ewm))  # noqa: S301
+    assert restored.correlation("BTC/USDT", "ETH/USDT") == ewm.correlation("BTC/USDT", "ETH/USDT")
+
+
+def test_unknown_and_cold_symbols_are_nan():
+    covariance = StreamingCovariance(window=20, initial_capacity=2)
+    prices = make_prices(n=5)
+    covariance.update_frame(prices)  # Grows past the initial capacity
+
+    assert len(covariance) == len(SYMBOLS)
+    assert np.isnan(covariance.correlation("BTC/USDT", "ETH/USDT"))  # < min_periods
+    assert np.isnan(covariance.correlations("BTC/USDT", ["DOGE/USDT"])[0])
+    assert not covariance.is_warm("BTC/USDT")
+
+
+def test_correlation_manager_uses_engine():
+    prices = make_prices()
+    frames = {symbol: prices[[symbol]].rename(columns={symbol: "close"}) for symbol in SYMBOLS}
+    manager = CorrelationManager(correlation_window=48, max_correlation=0.5)
+
+    blocked = manager.check_entry_correlation(
+        "ETH/USDT", frames["ETH/USDT"], [{"pair": "BTC/USDT"}], frames
+    )
+    allowed = manager.check_entry_correlation(
+        "SOL/USDT", frames["SOL/USDT"], [{"pair": "BTC/USDT"}, {"pair": "ADA/USDT"}], frames
+    )
+    assert not blocked and allowed
+    assert manager.covariance.last_timestamp == prices.index[-1]
+
+    # Later candles only need the engine
+    manager.update_prices(prices.iloc[-1].to_dict(), prices.index[-1] + pd.Timedelta("1h"))
+    assert not manager.check_entry_correlation("ETH/USDT", None, [{"pair": "BTC/USDT"}], {})
+
+
+@pytest.mark.parametrize("window", [None, 48])
+def test_correlation_manager_window_is_in_candles(window):
+    prices = make_prices()
+    frames = {symbol: prices[[symbol]].rename(columns={symbol: "close"}) for symbol in SYMBOLS}
+    manager = CorrelationManager(correlation_window=window)
+    manager.covariance.sync(frames)
+
+    # Same value as the direct calculation over the same candles
+    direct = manager.calculate_correlation(frames["BTC/USDT"], frames["SOL/USDT"])
+    assert manager.covariance.correlation("BTC/USDT", "SOL/USDT") == pytest.approx(direct)
+    returns = prices.pct_change().tail(window or len(prices))
+    assert direct == pytest.approx(returns["BTC/USDT"].corr(returns["SOL/USDT"]))
+
+
+def test_shared_engine_feeds_analyzer_sizer_and_hrp():
+    prices = make_prices()
+    covariance = StreamingCovariance(window=100)
+    analyzer = CorrelationAnalyzer(covariance=covariance)
+    matrix = analyzer.calculate_portfolio_correlation(prices.pct_change())
+    assert matrix.loc["BTC/USDT", "ETH/USDT"] > 0.5
+
+    sizer = PositionSizer(covariance=covariance)
+    sizer.update_positions({"BTC/USDT": 1000.0, "SOL/USDT": 1000.0})
+    correlation = covariance.correlation("ETH/USDT", "BTC/USDT")
+    assert sizer._calculate_correlated_exposure("ETH/USDT", 500.0) == pytest.approx(
+        500.0 + 1000.0 * correlation
+    )
+
+    window = prices.tail(101)
+    np.testing.assert_allclose(
+        pd.Series(get_hrp_weights(window, covariance=covariance)),
+        pd.Series(get_hrp_weights(window)),
+        atol=1e-12,
+    )
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.indicator_graph import IndicatorGraph
+from src.utils.indicators import calculate_adx
+
+
+@pytest.fixture
+def candles():
+    """ Provides a sample OHLCV DataFrame. """
+    rng = np.random.default_rng(7)
+    price = 100 + np.cumsum(rng.normal(0, 1, 400))
+    return pd.DataFrame({
+        'open': price,
+        'high': price + rng.uniform(0, 1, 400),
+        'low': price - rng.uniform(0, 1, 400),
+        'close': price,
+        'volume': rng.uniform(100, 1000, 400),
+    }, index=pd.date_range('2024-01-01', periods=400, freq='5min'))
+
+
+def test_matches_direct_formulas(candles):
+    """ Graph nodes reproduce the pandas formulas they replace. """
+    view = IndicatorGraph().bind(candles)
+
+    expected_ema = candles['close'].ewm(span=50, adjust=False).mean()
+    pd.testing.assert_series_equal(view.get('ema', period=50), expected_ema)
+
+    tr = pd.concat([
+        candles['high'] - candles['low'],
+        (candles['high'] - candles['close'].shift()).abs(),
+        (candles['low'] - candles['close'].shift()).abs(),
+    ], axis=1).max(axis=1)
+    pd.testing.assert_series_equal(view.get('atr', period=14), tr.rolling(14).mean())
+
+    adx = view.get('adx', period=14)
+    assert adx.iloc[50:].between(0, 100).all()
+
+    expected_adx = calculate_adx(candles.reset_index(drop=True), 14)['adx_14']
+    wilder = view.get('adx', period=14, wilder=True)
+    np.testing.assert_allclose(wilder.to_numpy(), expected_adx.to_numpy(), equal_nan=True)
+
+
+def test_shared_nodes_computed_once(candles):
+    """ Consumers asking for the same node on the same candles hit the cache. """
+    graph = IndicatorGraph()
+    first = graph.bind(candles).get('ema', period=20)
+    # MACD pulls ema(12)/ema(26); ADX pulls atr(14) which pulls true_range
+    graph.bind(candles).get('macd')
+    graph.bind(candles).get('adx', period=14)
+    second = graph.bind(candles.copy()).get('ema', period=20)
+    graph.bind(candles).get('atr', period=14)
+
+    assert second is first
+    stats = graph.stats().set_index(['indicator', 'params'])
+    assert stats.loc[('ema', 'period=20'), 'computes'] == 1
+    assert stats.loc[('ema', 'period=20'), 'hits'] == 1
+    assert stats.loc[('atr', 'period=14'), 'computes'] == 1
+    assert stats.loc[('true_range', ''), 'computes'] == 1
+    assert (stats['total_ms'] >= 0).all()
+
+
+def test_append_invalidates_only_touched_columns(candles):
+    """ Appending candles recomputes nodes over grown columns only. """
+    graph = IndicatorGraph()
+    base = candles.iloc[:-1]
+    graph.bind(base).get('ema', period=20)
+    graph.bind(base).get('sma', period=20, source='volume')
+
+    grown = base.copy()
+    grown['close'] = candles['close'].iloc[:-1].to_numpy() * 1.01
+    view = graph.bind(grown)
+    ema = view.get('ema', period=20)
+    view.get('sma', period=20, source='volume')
+
+    pd.testing.assert_series_equal(ema, grown['close'].ewm(span=20, adjust=False).mean())
+    stats = graph.stats().set_index(['indicator', 'params'])
+    assert stats.loc[('ema', 'period=20'), 'computes'] == 2
+    assert stats.loc[('sma', 'period=20, source=volume'), 'computes'] == 1
+
+    assert graph.invalidate(['volume']) == 1
+    graph.bind(grown).get('sma', period=20, source='volume')
+    stats = graph.stats().set_index(['indicator', 'params'])
+    assert stats.loc[('sma', 'period=20, source=volume'), 'computes'] == 2
+
+
+def test_edit_preserving_sum_and_endpoints_invalidates(candles):
+    """ Fingerprints identify contents, not just length, endpoints and sum. """
+    graph = IndicatorGraph()
+    graph.bind(candles).get('ema', period=20)
+
+    swapped = candles.copy()
+    swapped.iloc[[100, 200], swapped.columns.get_loc('close')] = candles['close'].iloc[[200, 100]]
+    ema = graph.bind(swapped).get('ema', period=20)
+
+    pd.testing.assert_series_equal(ema, swapped['close'].ewm(span=20, adjust=False).mean())
+    stats = graph.stats().set_index(['indicator', 'params'])
+    assert stats.loc[('ema', 'period=20'), 'computes'] == 2
+
+
+def test_unknown_indicator_raises(candles):
+    with pytest.raises(KeyError):
+        IndicatorGraph().bind(candles).get('nope')
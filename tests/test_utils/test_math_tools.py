@@ -2,7 +2,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from src.utils.math_tools import calculate_hurst, calculate_efficiency_ratio
+from src.utils.math_tools import _rolling_hurst_loop, calculate_hurst, calculate_efficiency_ratio
 
 def test_hurst_random_walk():
     """Test Hurst on random walk (should be approx 0.5)."""
@@ -57,6 +57,22 @@ def test_hurst_mean_reverting():
     # Should be < 0.5
     assert hurst.mean() < 0.45
 
+def test_hurst_matches_per_window_reference():
+    """Prefix-sum kernel and live mode match the per-window R/S loop."""
+    np.random.seed(7)
+    prices = pd.Series(100 * np.exp(np.cumsum(np.random.normal(0, 0.002, 3000))))
+    prices.iloc[1500:1503] = np.nan
+    prices.iloc[2000:2150] = prices.iloc[2000]  # Flat stretch -> 0.5
+
+    expected = _rolling_hurst_loop(prices.values.astype(np.float64), 100)
+    hurst = calculate_hurst(prices, window=100)
+    np.testing.assert_allclose(hurst.values, expected, atol=1e-10)
+    assert hurst.iloc[2149] == 0.5
+
+    live = calculate_hurst(prices, window=100, last_n=25)
+    assert live.iloc[:-25].isna().all()
+    np.testing.assert_allclose(live.iloc[-25:], expected[-25:], atol=1e-10)
+
 def test_efficiency_ratio():
     """Test Efficiency Ratio."""
     # Perfect trend
@@ -59,3 +59,39 @@ async def test_aggregator_multi_exchange_imbalance():
     
     ticker = aggregator.get_aggregated_ticker("BTC/USDT")
     assert ticker.imbalance == 0.0 # Average of 0.5 and -0.5
+
+
+@pytest.mark.asyncio
+async def test_event_driven_emits_only_dirty_symbols():
+    aggregator = DataAggregator(event_driven=True)
+    emitted = []
+
+    @aggregator.on_aggregated_ticker
+    async def on_ticker(ticker):
+        emitted.append(ticker.symbol)
+
+    aggregator._running = True
+    loop_task = asyncio.create_task(aggregator._event_loop())
+
+    await aggregator._process_ticker(TickerData("binance", "BTC/USDT", 50000, 50100, 50050, 100, 0, 0))
+    await aggregator._process_ticker(TickerData("binance", "ETH/USDT", 3000, 3001, 3000, 100, 0, 0))
+    # Burst on the same symbol within one loop turn is coalesced
+    await aggregator._process_ticker(TickerData("bybit", "BTC/USDT", 50001, 50101, 50051, 100, 0, 0))
+    await asyncio.sleep(0.01)
+    assert sorted(emitted) == ["BTC/USDT", "ETH/USDT"]
+
+    emitted.clear()
+    await aggregator._process_orderbook(
+        OrderbookData("binance", "ETH/USDT", bids=[], asks=[], timestamp=0, imbalance=0.2)
+    )
+    await asyncio.sleep(0.01)
+    assert emitted == ["ETH/USDT"]
+
+    stats = aggregator.get_latency_stats()
+    assert stats["BTC/USDT"]["count"] == 1
+    assert stats["ETH/USDT"]["count"] == 2
+    assert aggregator.get_latency_stats("eth-usdt")["p99_ms"] < 100
+
+    aggregator._running = False
+    aggregator._dirty_event.set()
+    await asyncio.wait_for(loop_task, timeout=1)
@@ -0,0 +1,130 @@
+"""Tests for the in-process batch inference engine."""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml.batch_inference import BatchInferenceConfig, BatchInferenceEngine, FeatureSchema
+
+
+class RecordingModel:
+    """Linear model on (a, b, c) that records every batch it receives."""
+
+    def __init__(self):
+        self.batches: list[np.ndarray] = []
+
+    def predict_proba(self, X):
+        self.batches.append(X.copy())
+        p = 1 / (1 + np.exp(-(X[:, 0] - 2 * X[:, 1] + 0.5 * X[:, 2])))
+        return np.column_stack([1 - p, p])
+
+
+def expected(rows):
+    X = np.array([[r["a"], r["b"], r["c"]] for r in rows], dtype=np.float32)
+    return 1 / (1 + np.exp(-(X[:, 0] - 2 * X[:, 1] + 0.5 * X[:, 2])))
+
+
+@pytest.fixture
+def engine():
+    config = BatchInferenceConfig(max_batch_size=8, max_wait_ms=20.0, warmup_rounds=2)
+    engine = BatchInferenceEngine(config)
+    model = RecordingModel()
+    engine.register_model("m", model, ["a", "b", "c"])
+    return engine, model
+
+
+def test_schema_orders_features_independently_of_dict_order():
+    schema = FeatureSchema(["a", "b", "c"])
+    rows = [{"c": 3.0, "a": 1.0, "b": 2.0}, {"b": 5.0, "a": 4.0}]
+    matrix = schema.to_matrix(rows)
+
+    assert matrix.dtype == np.float32
+    np.testing.assert_array_equal(matrix[0], [1.0, 2.0, 3.0])
+    assert matrix[1, 0] == 4.0 and matrix[1, 1] == 5.0 and np.isnan(matrix[1, 2])
+    assert schema.missing == 1
+
+    frame = pd.DataFrame({"c": [3.0], "b": [2.0], "a": [1.0]})
+    np.testing.assert_array_equal(schema.to_matrix(frame), [[1.0, 2.0, 3.0]])
+
+    with pytest.raises(KeyError):
+        FeatureSchema(["a", "b"], strict=True).to_matrix([{"a": 1.0}])
+
+
+def test_register_runs_real_warmup_batches(engine):
+    engine, model = engine
+    sizes = sorted({len(batch) for batch in model.batches})
+    assert sizes == [1, 8]
+    assert len(model.batches) == 4  # 2 rounds x 2 distinct sizes
+    # Warmup is not counted in the statistics
+    assert engine.get_model_stats("m")["rows"] == 0
+
+
+def test_predict_batch_chunks_through_preallocated_buffer(engine):
+    engine, model = engine
+    model.batches.clear()
+    rng = np.random.default_rng(0)
+    rows = [dict(zip("cab", rng.normal(size=3), strict=True)) for _ in range(20)]
+
+    scores = engine.predict_batch("m", rows)
+
+    np.testing.assert_allclose(scores, expected(rows), rtol=1e-6)
+    assert [len(batch) for batch in model.batches] == [8, 8, 4]
+    stats = engine.get_model_stats("m")
+    assert stats["rows"] == 20
+    assert stats["batch_size"]["batches"] == 3
+    assert stats["batch_size"]["max"] == 8
+    assert stats["latency"]["count"] == 3
+
+    results = engine.predict_many("m", {f"P{i}/USDT": row for i, row in enumerate(rows[:3])})
+    assert list(results) == ["P0/USDT", "P1/USDT", "P2/USDT"]
+    assert results["P1/USDT"].probability == pytest.approx(expected(rows[1:2])[0], rel=1e-6)
+
+
+def test_concurrent_requests_share_one_micro_batch(engine):
+    engine, model = engine
+    model.batches.clear()
+    rows = [{"a": float(i), "b": 0.5, "c": -1.0} for i in range(5)]
+
+    async def run():
+        return await asyncio.gather(*(engine.predict("m", row) for row in rows))
+
+    results = asyncio.run(run())
+
+    assert [len(batch) for batch in model.batches] == [5]
+    np.testing.assert_allclose([r.probability for r in results], expected(rows), rtol=1e-6)
+    stats = engine.get_model_stats("m")
+    assert stats["flushes"]["deadline"] == 1
+    assert stats["request_latency"]["count"] == 5
+
+
+def test_full_batch_flushes_before_deadline(engine):
+    engine, model = engine
+    model.batches.clear()
+    rows = [{"a": float(i), "b": 0.0, "c": 0.0} for i in range(8)]
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(engine.predict("m", row) for row in rows)), timeout=0.01
+        )
+
+    asyncio.run(run())
+    assert [len(batch) for batch in model.batches] == [8]
+    assert engine.get_model_stats("m")["flushes"]["size"] == 1
+
+
+def test_adaptive_window_flushes_sparse_requests_immediately(engine):
+    engine, model = engine
+    model.batches.clear()
+
+    async def run():
+        for i in range(3):
+            await engine.predict("m", {"a": float(i), "b": 0.0, "c": 0.0})
+            await asyncio.sleep(0.05)  # Far longer than max_wait_ms
+
+    asyncio.run(run())
+    flushes = engine.get_model_stats("m")["flushes"]
+    # The first request has no arrival history and waits for the deadline
+    assert flushes["deadline"] == 1
+    assert flushes["immediate"] == 2
@@ -0,0 +1,203 @@
+"""Tests for the pipelined Redis inference transport (against an in-memory fake Redis)."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.ml.batch_inference import BatchInferenceConfig, BatchInferenceEngine
+from src.ml.inference_service import MLInferenceService, MLModelConfig
+from src.ml.inference_transport import (
+    InferenceWorker,
+    PipelinedInferenceTransport,
+    TransportConfig,
+    decode_message,
+    encode_message,
+)
+from tests.mocks.fake_redis import FakeRedis
+
+FEATURES = ["rsi", "macd", "volume_ratio"]
+
+
+def score(X):
+    X = np.asarray(X, dtype=np.float64)
+    return 1 / (1 + np.exp(-(0.05 * (X[:, 0] - 50) + 100 * X[:, 1])))
+
+
+class LogisticModel:
+    def predict_proba(self, X):
+        p = score(X)
+        return np.column_stack([1 - p, p])
+
+
+def make_rows(n):
+    rng = np.random.default_rng(1)
+    return [
+        {"volume_ratio": float(v), "rsi": float(r), "macd": float(m)}
+        for r, m, v in zip(
+            rng.uniform(20, 80, n), rng.normal(0, 0.01, n), rng.uniform(0, 3, n), strict=True
+        )
+    ]
+
+
+def make_stack(mode):
+    redis = FakeRedis()
+    config = TransportConfig(mode=mode, block_seconds=0.05)
+    transport = PipelinedInferenceTransport(redis, config=config, client_id="bot1")
+    models = {"m": MLModelConfig("m", "models/m.pkl", FEATURES, timeout_ms=500)}
+    service = MLInferenceService(models=models, transport=transport)
+    engine = BatchInferenceEngine(BatchInferenceConfig(warmup_rounds=1))
+    engine.register_model("m", LogisticModel(), FEATURES)
+    worker = InferenceWorker(redis, engine, ["m"], config)
+    return redis, transport, service, worker
+
+
+def test_codec_round_trips_header_and_arrays():
+    x = np.arange(12, dtype=np.float32).reshape(4, 3)
+    message = encode_message({"ids": [1, 2, 3, 4], "m": "m"}, {"x": x, "d": np.ones(4)})
+    header, arrays = decode_message(message)
+
+    assert isinstance(message, bytes)
+    assert header == {"ids": [1, 2, 3, 4], "m": "m"}
+    np.testing.assert_array_equal(arrays["x"], x)
+    assert arrays["x"].dtype == np.float32 and arrays["d"].dtype == np.float64
+    with pytest.raises(ValueError):
+        decode_message(b"?garbage")
+
+
+@pytest.mark.parametrize("mode", ["list", "stream"])
+def test_gathered_requests_travel_as_one_pipelined_batch(mode):
+    redis, transport, service, worker = make_stack(mode)
+    rows = make_rows(120)
+
+    async def run():
+        await service.start()
+        worker_task = asyncio.create_task(worker.run())
+        results = await asyncio.gather(*(service.predict("m", row) for row in rows))
+        worker.stop()
+        await worker_task
+        await service.stop()
+        return results
+
+    results = asyncio.run(run())
+
+    expected = score([[r[name] for name in FEATURES] for r in rows])
+    np.testing.assert_allclose([r.prediction for r in results], expected, rtol=1e-6)
+    stats = transport.get_stats()
+    assert stats["messages_sent"] == 1 and stats["pipelines"] == 1
+    assert stats["replies"] == 120 and stats["pending"] == 0
+    assert worker.get_stats()["rows"] == 120
+    if mode == "stream":
+        assert asyncio.run(redis.xpending("ml:stream:m", "ml-workers"))["pending"] == 0
+
+
+def test_deadline_index_expires_unanswered_requests():
+    _, transport, _, worker = make_stack("list")
+
+    async def run():
+        await transport.start()
+        _, fast = transport.submit("m", make_rows(1)[0], timeout_s=0.02)
+        _, slow = transport.submit("m", make_rows(1)[0], timeout_s=5.0)
+        with pytest.raises(asyncio.TimeoutError):
+            await fast
+        assert not slow.done()
+        # A worker answering after the deadline only serves the live request
+        await worker.process_once()
+        result = await asyncio.wait_for(slow, 1.0)
+        await transport.stop()
+        return result
+
+    result = asyncio.run(run())
+    assert result.model_name == "m"
+    stats = transport.get_stats()
+    assert stats["expired"] == 1 and stats["replies"] == 1
+    assert worker.get_stats()["expired_rows"] == 1
+
+
+def test_service_falls_back_when_no_worker_answers():
+    _, transport, service, _ = make_stack("list")
+
+    async def run():
+        await service.start()
+        result = await service.predict("m", make_rows(1)[0], timeout_ms=20)
+        await service.stop()
+        return result
+
+    result = asyncio.run(run())
+    assert result.signal == "hold" and result.confidence == 0.0
+    assert service.get_stats()["timeouts"] == 1
+    assert transport.get_stats()["deadline_index"] == 0
+
+
+class FlakyModel(LogisticModel):
+    def __init__(self, failures):
+        self.failures = failures
+
+    def predict_proba(self, X):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("model unavailable")
+        return super().predict_proba(X)
+
+
+def test_stream_entries_of_a_crashed_worker_are_reclaimed():
+    redis, transport, _, crashed = make_stack("stream")
+    config = TransportConfig(mode="stream", block_seconds=0.05, claim_idle_ms=0)
+    survivor = InferenceWorker(redis, crashed.engine, ["m"], config, consumer_name="survivor")
+
+    async def run():
+        await transport.start()
+        _, future = transport.submit("m", make_rows(1)[0], timeout_s=5.0)
+        await asyncio.sleep(0)  # Let the flush send the batch
+        assert len(await crashed._read()) == 1  # Delivered, then the worker dies
+        assert await survivor.process_once() == 1
+        result = await asyncio.wait_for(future, 1.0)
+        await transport.stop()
+        return result
+
+    result = asyncio.run(run())
+    assert result.model_name == "m"
+    assert survivor.get_stats()["claimed"] == 1
+    assert asyncio.run(redis.xpending("ml:stream:m", "ml-workers"))["pending"] == 0
+
+
+def test_failed_predictions_stay_pending_until_retried_or_dead_lettered():
+    redis, transport, _, _ = make_stack("stream")
+    config = TransportConfig(
+        mode="stream",
+        block_seconds=0.05,
+        claim_idle_ms=0,
+        claim_interval_seconds=0.0,
+        max_deliveries=2,
+    )
+    engine = BatchInferenceEngine(BatchInferenceConfig(warmup_rounds=0))
+    engine.register_model("m", FlakyModel(failures=1), FEATURES)
+    worker = InferenceWorker(redis, engine, ["m"], config)
+
+    async def pending():
+        return (await redis.xpending("ml:stream:m", "ml-workers"))["pending"]
+
+    async def run():
+        await transport.start()
+        _, future = transport.submit("m", make_rows(1)[0], timeout_s=5.0)
+        await asyncio.sleep(0)
+        await worker.process_once()  # Model call fails: no reply, no ack
+        assert not future.done() and await pending() == 1
+        await worker.process_once()  # Reclaimed and answered
+        result = await asyncio.wait_for(future, 1.0)
+
+        # A request that never scores is dead-lettered after max_deliveries
+        engine.register_model("m", FlakyModel(failures=10), FEATURES)
+        transport.submit("m", make_rows(1)[0], timeout_s=5.0)
+        await asyncio.sleep(0)
+        for _ in range(2):
+            await worker.process_once()
+        assert await pending() == 1
+        await worker.process_once()  # Third delivery goes to the dead-letter stream
+        await transport.stop()
+        return result, await pending(), await redis.xlen("ml:dead:m")
+
+    result, still_pending, dead = asyncio.run(run())
+    assert result.model_name == "m"
+    assert still_pending == 0 and dead == 1
+    assert worker.get_stats()["dead_lettered"] == 1
@@ -0,0 +1,170 @@
+"""
+Tests for sharded WebSocket ingestion
+"""
+
+import asyncio
+import json
+import multiprocessing
+import threading
+
+import pytest
+
+from src.websocket.data_stream import StreamConfig, WebSocketDataStream
+from src.websocket.exchange_types import Exchange
+from src.websocket.ingestion import (
+    ORDERBOOK,
+    RingBuffer,
+    ShardedDataStream,
+    SharedMemoryRing,
+    _ThreadShard,
+    create_data_stream,
+)
+from src.websocket.orderbook import L2OrderBook, OrderBookRegistry
+
+
+class FakeWebSocket:
+    """Replays Binance trade messages for the symbols it gets subscribed to."""
+
+    def __init__(self, trades_per_symbol: int):
+        self.trades_per_symbol = trades_per_symbol
+        self._messages: list[str] = []
+        self._closed = threading.Event()
+
+    async def send(self, message: str) -> None:
+        for stream in json.loads(message)["params"]:
+            symbol = stream.split("@")[0].upper()
+            for i in range(self.trades_per_symbol):
+                self._messages.append(
+                    json.dumps(
+                        {
+                            "e": "trade",
+                            "s": symbol,
+                            "t": i,
+                            "p": "100.0",
+                            "q": "1.0",
+                            "m": True,
+                            "T": 1_700_000_000_000,
+                        }
+                    )
+                )
+
+    async def recv(self) -> str:
+        if self._messages:
+            return self._messages.pop(0)
+        await asyncio.sleep(0.01)
+        if self._closed.is_set():
+            raise ConnectionError("closed")
+        raise asyncio.TimeoutError
+
+    async def close(self) -> None:
+        self._closed.set()
+
+
+class FakeClient:
+    def __init__(self, trades_per_symbol: int):
+        self.trades_per_symbol = trades_per_symbol
+        self.sockets: list[FakeWebSocket] = []
+
+    async def connect(self, uri, ping_interval=None, ping_timeout=None, close_timeout=None):
+        ws = FakeWebSocket(self.trades_per_symbol)
+        self.sockets.append(ws)
+        return ws
+
+
+def test_ring_buffer_wraparound_and_drops():
+    ring = RingBuffer(capacity=4)
+    assert all(ring.put(i) for i in range(3))
+    assert ring.get_batch(2) == [0, 1]
+    assert all(ring.put(i) for i in range(3, 6))
+    assert not ring.put(6)
+
+    assert ring.get_batch() == [2, 3, 4, 5]
+    stats = ring.get_stats()
+    assert stats["drops"] == 1 and stats["high_water"] == 4 and stats["depth"] == 0
+
+
+def _produce(ring: SharedMemoryRing, n: int) -> None:
+    for i in range(n):
+        while not ring.put(f"record-{i}".encode()):
+            pass
+    ring.put(b"x" * ring.slot_size)  # Oversize, counted and skipped
+    ring.close()
+
+
+def test_shared_memory_ring_across_processes():
+    ring = SharedMemoryRing(capacity=64, slot_size=32)
+    producer = multiprocessing.get_context("spawn").Process(target=_produce, args=(ring, 1000))
+    producer.start()
+
+    received = []
+    while len(received) < 1000:
+        received.extend(ring.get_batch(100))
+    producer.join(10)
+
+    assert received == [f"record-{i}".encode() for i in range(1000)]
+    stats = ring.get_stats()
+    assert stats["oversize"] == 1 and stats["high_water"] <= 64
+    ring.close()
+
+
+@pytest.mark.asyncio
+async def test_sharded_stream_dispatches_on_main_loop():
+    symbols = ["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT"]
+    config = StreamConfig(Exchange.BINANCE, symbols, channels=["trade"], ingestion_shards=2)
+    client = FakeClient(trades_per_symbol=50)
+    stream = create_data_stream(config, websocket_client=client)
+    assert isinstance(stream, ShardedDataStream)
+
+    main_thread = threading.get_ident()
+    received = []
+
+    @stream.on_trade
+    async def on_trade(trade):
+        assert threading.get_ident() == main_thread
+        received.append(trade.symbol)
+
+    task = asyncio.create_task(stream.start())
+    for _ in range(200):
+        if len(received) == 200:
+            break
+        await asyncio.sleep(0.01)
+
+    stats = stream.get_stats()
+    await stream.stop()
+    await asyncio.wait_for(task, timeout=5)
+
+    assert len(client.sockets) == 2
+    assert sorted(set(received)) == ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"]
+    assert len(received) == 200
+    assert stats["records_dispatched"] == 200 and stats["dropped"] == 0
+    assert [s["symbols"] for s in stats["shards"]] == [symbols[0::2], symbols[1::2]]
+
+
+@pytest.mark.asyncio
+async def test_thread_shard_publishes_book_snapshots():
+    config = StreamConfig(Exchange.BINANCE, ["BTC/USDT"], channels=["orderbook"])
+    shard = _ThreadShard(0, config, None, OrderBookRegistry())
+    book = L2OrderBook("binance", "BTCUSDT")
+    book.apply_snapshot([["100", "1"]], [["101", "2"]], sequence=1)
+
+    for handler in shard.stream._orderbook_handlers:
+        await handler(book.to_orderbook_data(5))
+    # The shard keeps updating its live book after publishing
+    book.apply_snapshot([["99", "1"]], [["102", "2"]], sequence=2)
+
+    [(kind, _, orderbook)] = shard.ring.get_batch()
+    assert kind == ORDERBOOK and orderbook.book is None
+    assert orderbook.bids == [[100.0, 1.0]] and orderbook.asks == [[101.0, 2.0]]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_without_blocking():
+    stream = WebSocketDataStream(StreamConfig(Exchange.BINANCE, ["BTC/USDT"], max_queue_size=2))
+
+    for i in range(5):
+        await asyncio.wait_for(stream._handle_incoming_message(str(i)), timeout=1)
+
+    stats = stream.get_stats()
+    assert stats["messages_dropped"] == 3
+    assert stats["queue_high_water"] == 2
+    assert stats["queue_fill_ratio"] == 1.0
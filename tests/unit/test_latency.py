@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from src.monitoring.latency import LatencyHistogram
+
+
+def test_percentiles_within_one_bucket():
+    samples = np.random.default_rng(0).lognormal(mean=np.log(1e-3), sigma=1.0, size=20000)
+    hist = LatencyHistogram()
+    for value in samples:
+        hist.record(float(value))
+
+    assert hist.count == len(samples)
+    assert hist.mean == pytest.approx(samples.mean())
+    for q in (50, 90, 99):
+        assert hist.percentile(q) == pytest.approx(np.percentile(samples, q), rel=0.1)
+    assert hist.percentile(100) == hist.max == samples.max()
+
+
+def test_merge_and_reset():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    a.record(0.001)
+    b.record(0.002)
+    b.record(0.003)
+
+    a.merge(b)
+    assert a.count == 3
+    assert a.summary()["max_ms"] == pytest.approx(3.0)
+
+    with pytest.raises(ValueError):
+        a.merge(LatencyHistogram(base=2.0))
+
+    a.reset()
+    assert a.count == 0 and a.percentile(99) == 0.0
@@ -0,0 +1,140 @@
+"""Tests for the multi-process ML worker pool (single process, against a fake Redis)."""
+
+import asyncio
+import json
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+from src.ml.batch_inference import BatchInferenceConfig
+from src.ml.inference_service import MLInferenceService, MLModelConfig
+from src.ml.inference_transport import PipelinedInferenceTransport, TransportConfig
+from src.ml.model_loader import ModelLoader
+from src.ml.worker_pool import MLWorkerPool, ModelServer, WorkerPoolConfig
+from tests.mocks.fake_redis import FakeRedis
+
+FEATURES = ["rsi", "macd"]
+
+
+class ConstantModel:
+    def __init__(self, p):
+        self.p = p
+
+    def predict_proba(self, X):
+        p = np.full(len(X), self.p)
+        return np.column_stack([1 - p, p])
+
+
+def publish(loader, tmp_path, version, p):
+    path = tmp_path / f"const_{version}.pkl"
+    with open(path, "wb") as f:
+        pickle.dump(ConstantModel(p), f)
+    loader.registry.register_model("m", str(path), version=version, feature_names=FEATURES)
+    loader.registry.validate_model("m", version)
+    loader.registry.promote_to_production("m", version)
+
+
+@pytest.fixture
+def stack(tmp_path):
+    registry_dir = str(tmp_path / "registry")
+    publish(ModelLoader(registry_dir), tmp_path, "v1", 0.7)
+
+    redis = FakeRedis()
+    transport_config = TransportConfig(block_seconds=0.05)
+    config = WorkerPoolConfig(
+        models=["m"],
+        registry_dir=registry_dir,
+        transport=transport_config,
+        batch=BatchInferenceConfig(warmup_rounds=1),
+    )
+    server = ModelServer(redis, config, "w0")
+    transport = PipelinedInferenceTransport(redis, config=transport_config, client_id="bot1")
+    models = {"m": MLModelConfig("m", "unused.pkl", FEATURES, timeout_ms=2000)}
+    service = MLInferenceService(models=models, transport=transport)
+    return tmp_path, registry_dir, redis, server, service
+
+
+def test_server_loads_production_model_and_answers_batches(stack):
+    _, _, _, server, service = stack
+
+    async def run():
+        await server.load_all()
+        await service.start()
+        pending = [service.predict("m", {"rsi": 50.0 + i, "macd": 0.0}) for i in range(40)]
+        gathered = asyncio.gather(*pending)
+        await asyncio.sleep(0.01)
+        await server.worker.process_once()
+        results = await gathered
+        await service.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert server.versions == {"m": "v1"}
+    assert [r.prediction for r in results] == pytest.approx([0.7] * 40)
+    assert server.worker.get_stats()["batches"] == 1
+
+
+def test_promoted_model_is_hot_swapped_without_dropping_requests(stack):
+    tmp_path, registry_dir, _, server, service = stack
+
+    async def run():
+        await server.load_all()
+        await service.start()
+        worker_task = asyncio.create_task(server.worker.run())
+        before = await asyncio.gather(*(service.predict("m", {"rsi": 1.0}) for _ in range(20)))
+
+        # Another process promotes v2 while requests keep flowing
+        publish(ModelLoader(registry_dir), tmp_path, "v2", 0.2)
+        during = asyncio.gather(*(service.predict("m", {"rsi": 2.0}) for _ in range(20)))
+        swapped = await server.check_registry()
+        during = await during
+        after = await asyncio.gather(*(service.predict("m", {"rsi": 3.0}) for _ in range(20)))
+
+        server.worker.stop()
+        await worker_task
+        await service.stop()
+        return swapped, before, during, after
+
+    swapped, before, during, after = asyncio.run(run())
+    assert swapped == ["m"] and server.versions == {"m": "v2"} and server.swaps == 1
+    assert [r.prediction for r in before] == pytest.approx([0.7] * 20)
+    assert all(r.confidence > 0 for r in during)  # Served by v1 or v2, never timed out
+    assert [r.prediction for r in after] == pytest.approx([0.2] * 20)
+    assert service.get_stats()["timeouts"] == 0
+    assert asyncio.run(server.check_registry()) == []  # Unchanged registry: no reload
+
+
+def test_legacy_json_requests_are_answered_on_results_list(stack):
+    _, _, redis, server, _ = stack
+
+    async def run():
+        await server.load_all()
+        for i in range(3):
+            request = {"request_id": f"r{i}", "features": {"rsi": 40.0}, "timestamp": time.time()}
+            await redis.lpush("ml:requests:m", json.dumps(request))
+        await server.worker.process_once()
+        return [json.loads(await redis.rpop("ml:results")) for _ in range(3)]
+
+    replies = asyncio.run(run())
+    assert sorted(r["request_id"] for r in replies) == ["r0", "r1", "r2"]
+    assert all(r["prediction"] == pytest.approx(0.7) and r["signal"] == "buy" for r in replies)
+
+
+def test_pool_assigns_cores_round_robin_and_reports_queue_depth():
+    config = WorkerPoolConfig(models=["a", "b"], n_workers=3, cores=[2, 5])
+    pool = MLWorkerPool(config)
+    redis = FakeRedis()
+
+    async def run():
+        await redis.lpush("ml:requests:a", b"x", b"y")
+        return await pool.report_metrics(redis)
+
+    stats = asyncio.run(run())
+    assert [pool.worker_cores(i) for i in range(3)] == [[2], [5], [2]]
+    assert stats["queue_depth"] == {"a": 2, "b": 0}
+    assert len(stats["workers"]) == 3 and not stats["workers"][0]["alive"]
+    assert MLWorkerPool(WorkerPoolConfig(models=["a"], pin_cores=False)).worker_cores(0) is None
+    with pytest.raises(ValueError):
+        MLWorkerPool(WorkerPoolConfig(models=["a"], n_workers=0))
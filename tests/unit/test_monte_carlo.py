@@ -0,0 +1,170 @@
+"""
+Tests for the CPU Monte Carlo engine (resampling, streaming quantiles, path statistics).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.monte_carlo import (
+    HAVE_NUMBA,
+    METHODS,
+    MonteCarloConfig,
+    MonteCarloEngine,
+    MonteCarloSimulator,
+    StreamingQuantiles,
+)
+
+
+@pytest.fixture
+def profits():
+    return np.random.default_rng(1).normal(0.002, 0.02, 250)
+
+
+def run(profits, **kwargs):
+    defaults = dict(iterations=600, chunk_size=128, seed=11, keep_paths=128)
+    defaults.update(kwargs)
+    return MonteCarloEngine(MonteCarloConfig(**defaults)).run(profits)
+
+
+def curve_stats(curves, ruin_threshold):
+    """Brute-force path statistics from full equity curves."""
+    peaks = np.maximum.accumulate(curves, axis=1)
+    drawdowns = 1 - curves / peaks
+    underwater = curves < peaks
+    durations, ruin = [], []
+    for row, dd in zip(underwater, drawdowns):
+        runs = np.diff(np.flatnonzero(np.r_[True, ~row, True])) - 1
+        durations.append(runs.max())
+        hits = np.flatnonzero(dd >= ruin_threshold - 1e-12)
+        ruin.append(hits[0] if len(hits) else -1)
+    return drawdowns.max(axis=1), np.array(durations), np.array(ruin)
+
+
+class TestStreamingQuantiles:
+    def test_matches_exact_quantiles(self):
+        values = np.random.default_rng(0).beta(2, 8, 50_000)
+        sketch = StreamingQuantiles(0.0, 1.0, bins=4096)
+        for chunk in np.array_split(values, 7):
+            sketch.update(chunk)
+
+        qs = np.array([0.01, 0.5, 0.95, 0.99])
+        np.testing.assert_allclose(sketch.quantile(qs), np.quantile(values, qs), atol=1 / 4096)
+        assert sketch.count == len(values)
+        assert sketch.mean == pytest.approx(values.mean())
+        assert sketch.std == pytest.approx(values.std())
+        assert (sketch.min, sketch.max) == (values.min(), values.max())
+
+    def test_merge_equals_single_stream(self):
+        values = np.expm1(np.random.default_rng(1).normal(0.1, 0.3, 10_000))
+        whole, left, right = (StreamingQuantiles(-0.9, 2.0, scale="log1p") for _ in range(3))
+        whole.update(values)
+        left.update(values[:3000])
+        right.update(values[3000:])
+        left.merge(right)
+
+        np.testing.assert_array_equal(left.counts, whole.counts)
+        assert left.mean == pytest.approx(whole.mean)
+        assert left.std == pytest.approx(whole.std)
+        assert left.quantile(0.5) == pytest.approx(np.median(values), abs=0.01)
+
+    def test_integer_scale_is_exact(self):
+        values = np.random.default_rng(2).integers(0, 300, 5000)
+        sketch = StreamingQuantiles(0, 301, scale="integer")
+        sketch.update(values)
+        for q in (0.1, 0.5, 0.9, 1.0):
+            assert sketch.quantile(q) == np.quantile(values, q, method="inverted_cdf")
+
+
+class TestEngine:
+    @pytest.mark.parametrize("method", METHODS)
+    def test_path_statistics_match_equity_curves(self, profits, method):
+        result = run(profits, iterations=128, method=method, block_size=5, ruin_threshold=0.2)
+        curves = result.equity_curves
+        assert curves.shape == (128, len(profits) + 1)
+        assert np.all(curves[:, 0] == 10000.0)
+
+        max_dd, durations, ruin = curve_stats(curves, 0.2)
+        np.testing.assert_allclose(result.max_drawdown.mean, max_dd.mean(), rtol=1e-9)
+        assert result.drawdown_duration.mean == pytest.approx(durations.mean())
+        assert result.drawdown_duration.max == durations.max()
+        assert result.n_ruined == (ruin > 0).sum()
+        if result.n_ruined:
+            assert result.time_to_ruin.min == ruin[ruin > 0].min()
+        final = curves[:, -1] / 10000.0 - 1
+        assert result.returns.mean == pytest.approx(final.mean())
+
+    @pytest.mark.skipif(not HAVE_NUMBA, reason="Numba not installed")
+    @pytest.mark.parametrize("method", METHODS)
+    def test_numba_and_numpy_paths_agree(self, profits, method):
+        fast = run(profits, method=method, block_size=7, use_numba=True)
+        slow = run(profits, method=method, block_size=7, use_numba=False)
+
+        np.testing.assert_array_equal(fast.max_drawdown.counts, slow.max_drawdown.counts)
+        np.testing.assert_array_equal(fast.drawdown_duration.counts, slow.drawdown_duration.counts)
+        np.testing.assert_array_equal(fast.time_to_ruin.counts, slow.time_to_ruin.counts)
+        np.testing.assert_allclose(fast.equity_curves, slow.equity_curves)
+
+    def test_permutation_reorders_the_same_trades(self, profits):
+        result = run(profits, method="permutation")
+        steps = np.diff(np.log(result.equity_curves), axis=1)
+        expected = np.sort(np.log1p(profits))
+        for row in steps[:10]:
+            np.testing.assert_allclose(np.sort(row), expected, atol=1e-12)
+        # Compounding is order independent, so every path ends at the same equity
+        assert result.returns.max - result.returns.min < 1e-9
+        assert len(np.unique(result.equity_curves[:, 1])) > 1
+
+    def test_block_bootstrap_keeps_autocorrelation(self):
+        rng = np.random.default_rng(3)
+        noise = rng.normal(0, 0.01, 2000)
+        trending = np.empty_like(noise)
+        trending[0] = noise[0]
+        for t in range(1, len(noise)):
+            trending[t] = 0.8 * trending[t - 1] + noise[t]
+
+        def lag1(result):
+            steps = np.diff(np.log(result.equity_curves), axis=1)
+            return np.mean([np.corrcoef(row[:-1], row[1:])[0, 1] for row in steps])
+
+        def resample(method):
+            return run(trending, iterations=32, keep_paths=32, method=method, block_size=50)
+
+        assert lag1(resample("bootstrap")) < 0.1
+        assert lag1(resample("block")) > 0.6
+        assert lag1(resample("stationary")) > 0.6
+
+    def test_seeded_runs_are_reproducible(self, profits):
+        first = run(profits, method="stationary")
+        second = run(profits, method="stationary")
+        other = run(profits, method="stationary", seed=12)
+
+        np.testing.assert_array_equal(first.max_drawdown.counts, second.max_drawdown.counts)
+        assert first.summary() == second.summary()
+        assert not np.array_equal(first.max_drawdown.counts, other.max_drawdown.counts)
+        assert first.iterations == 600
+
+    def test_invalid_method(self):
+        with pytest.raises(ValueError):
+            MonteCarloEngine(MonteCarloConfig(method="shuffle"))
+
+    @pytest.mark.slow
+    def test_workers_match_single_process(self, profits):
+        single = run(profits, method="block", block_size=5)
+        parallel = run(profits, method="block", block_size=5, n_workers=2)
+
+        np.testing.assert_array_equal(single.max_drawdown.counts, parallel.max_drawdown.counts)
+        np.testing.assert_array_equal(single.time_to_ruin.counts, parallel.time_to_ruin.counts)
+        np.testing.assert_array_equal(single.equity_curves, parallel.equity_curves)
+        assert parallel.iterations == single.iterations
+
+
+def test_simulator_summary(profits):
+    trades = pd.DataFrame({"profit_ratio": profits})
+    simulator = MonteCarloSimulator(trades, iterations=300, max_drawdown_limit=0.2, seed=1)
+    summary = simulator.get_summary()
+
+    assert 0 <= summary["probability_of_ruin"] <= 100
+    assert summary["99th_percentile_drawdown"] >= summary["95th_percentile_drawdown"]
+    assert summary["95th_percentile_drawdown"] >= summary["median_max_drawdown"]
+    assert simulator.all_equity_curves.shape == (100, len(profits) + 1)
@@ -0,0 +1,222 @@
+"""
+Tests for the incremental L2 order book
+"""
+
+import numpy as np
+import pytest
+
+from src.websocket.data_stream import StreamConfig
+from src.websocket.data_types import OrderbookData
+from src.websocket.exchange_handlers import BinanceHandler, BybitHandler, OkxHandler
+from src.websocket.exchange_types import Exchange
+from src.websocket.orderbook import L2OrderBook, OrderBookRegistry
+
+
+def _reference_top(levels: dict[float, float], k: int, reverse: bool) -> list[list[float]]:
+    prices = sorted(levels, reverse=reverse)[:k]
+    return [[p, levels[p]] for p in prices]
+
+
+def test_random_updates_match_reference_book():
+    rng = np.random.default_rng(0)
+    book = L2OrderBook("binance", "BTCUSDT")
+    ref_bids: dict[float, float] = {}
+    ref_asks: dict[float, float] = {}
+
+    def random_levels(ref: dict[float, float], sign: int) -> list[list[str]]:
+        levels = []
+        for _ in range(rng.integers(1, 5)):
+            price = float(100 + sign * rng.integers(1, 200) * 0.01)
+            size = float(rng.choice([0.0, rng.uniform(0.1, 5)]))
+            levels.append([str(price), str(size)])
+            if size == 0:
+                ref.pop(price, None)
+            else:
+                ref[price] = size
+        return levels
+
+    book.apply_snapshot([], [], sequence=0)
+    for seq in range(1, 2001):
+        assert book.apply_delta(random_levels(ref_bids, -1), random_levels(ref_asks, 1), seq)
+
+    bids, asks = book.depth(20)
+    assert bids.tolist() == _reference_top(ref_bids, 20, reverse=True)
+    assert asks.tolist() == _reference_top(ref_asks, 20, reverse=False)
+    assert len(book.bids) == len(ref_bids)
+    assert book.best_bid == max(ref_bids)
+    assert book.best_ask == min(ref_asks)
+
+
+def test_microprice_and_imbalance():
+    book = L2OrderBook("binance", "BTCUSDT")
+    book.apply_snapshot(
+        bids=[["100", "3"], ["99", "1"]], asks=[["101", "1"], ["102", "5"]], sequence=1
+    )
+
+    assert book.spread == 1.0
+    assert book.microprice() == pytest.approx((100 * 1 + 101 * 3) / 4)
+    assert book.microprice(depth=2) == pytest.approx((100 * 6 + 101 * 4) / 10)
+    assert book.imbalance(depth=1) == pytest.approx(0.5)
+    assert book.imbalance() == pytest.approx((4 - 6) / 10)
+
+    view = book.to_orderbook_data(depth=1)
+    assert view.bids == [[100.0, 3.0]] and view.asks == [[101.0, 1.0]]
+    assert view.book is book
+
+
+def test_gap_buffers_and_replays_after_snapshot():
+    book = L2OrderBook("binance", "BTCUSDT")
+    book.apply_snapshot([["100", "1"]], [["101", "1"]], sequence=10)
+
+    assert book.apply_delta([["100", "2"]], [], sequence=12, first_sequence=11)
+    # 13-14 never arrives
+    assert not book.apply_delta([["99", "1"]], [], sequence=16, first_sequence=15)
+    assert book.needs_resync and book.gaps == 1
+    assert not book.apply_delta([], [["101", "0"], ["102", "4"]], sequence=18, first_sequence=17)
+
+    # Snapshot covers up to 16: the 15-16 delta is stale, 17-18 is replayed
+    book.apply_snapshot([["100", "2"], ["99", "1"]], [["101", "1"]], sequence=16)
+
+    assert book.synced
+    assert book.sequence == 18
+    assert book.best_ask == 102.0
+    assert book.depth(5)[1].tolist() == [[102.0, 4.0]]
+
+
+def test_trim_keeps_levels_closest_to_top():
+    book = L2OrderBook("binance", "BTCUSDT", max_depth=10)
+    book.apply_snapshot([[str(100 - i), "1"] for i in range(50)], [], sequence=1)
+
+    assert len(book.bids) == 10
+    assert book.depth(10)[0][-1, 0] == 91.0
+
+
+@pytest.mark.asyncio
+async def test_binance_diff_depth_requests_resync_once():
+    registry = OrderBookRegistry()
+    handler = BinanceHandler(registry)
+    resyncs, emitted = [], []
+
+    async def resync(symbol):
+        resyncs.append(symbol)
+
+    async def on_orderbook(orderbook: OrderbookData):
+        emitted.append(orderbook)
+
+    handler.resync_handler = resync
+    update = {"e": "depthUpdate", "E": 1_700_000_000_000, "s": "BTCUSDT"}
+
+    # No snapshot yet: buffered, one resync request
+    for first in (101, 103):
+        msg = {**update, "U": first, "u": first + 1, "b": [["100", "1"]], "a": [["101", "2"]]}
+        await handler.handle_message(msg, [], [], [on_orderbook])
+    assert resyncs == ["BTCUSDT"] and not emitted
+
+    registry.get("binance", "BTCUSDT").apply_snapshot([["99", "1"]], [["102", "1"]], 102)
+    msg = {**update, "U": 105, "u": 105, "b": [["100", "0"]], "a": []}
+    await handler.handle_message(msg, [], [], [on_orderbook])
+
+    assert len(emitted) == 1
+    assert emitted[0].bids == [[99.0, 1.0]]
+    assert emitted[0].asks == [[101.0, 2.0], [102.0, 1.0]]
+
+
+@pytest.mark.asyncio
+async def test_binance_partial_depth_takes_symbol_from_stream_name():
+    registry = OrderBookRegistry()
+    handler = BinanceHandler(registry)
+    emitted = []
+
+    async def on_orderbook(orderbook: OrderbookData):
+        emitted.append(orderbook)
+
+    for stream, price in (("btcusdt@depth5@100ms", "100"), ("ethusdt@depth5@100ms", "10")):
+        payload = {"lastUpdateId": 7, "bids": [[price, "1"]], "asks": []}
+        await handler.handle_message({"stream": stream, "data": payload}, [], [], [on_orderbook])
+
+    assert [o.symbol for o in emitted] == ["BTCUSDT", "ETHUSDT"]
+    assert registry.get("binance", "BTCUSDT").best_bid == 100.0
+    assert registry.get("binance", "ETHUSDT").best_bid == 10.0
+    assert StreamConfig(Exchange.BINANCE, ["BTC/USDT"]).ws_url.endswith("/stream")
+
+
+def test_binance_diff_depth_requires_snapshot_fetcher():
+    async def fetch(symbol):
+        return {"bids": [], "asks": [], "lastUpdateId": 1}
+
+    with pytest.raises(ValueError, match="orderbook_snapshot_fetcher"):
+        StreamConfig(Exchange.BINANCE, ["BTC/USDT"], orderbook_diff=True)
+    StreamConfig(
+        Exchange.BINANCE, ["BTC/USDT"], orderbook_diff=True, orderbook_snapshot_fetcher=fetch
+    )
+    # Snapshot + delta channels resync by resubscribing
+    StreamConfig(Exchange.BYBIT, ["BTC/USDT"], orderbook_diff=True)
+
+
+@pytest.mark.asyncio
+async def test_bybit_and_okx_snapshot_delta_channels():
+    registry = OrderBookRegistry()
+    bybit, okx = BybitHandler(registry), OkxHandler(registry)
+
+    await bybit.handle_message(
+        {
+            "topic": "orderbook.50.BTCUSDT",
+            "type": "snapshot",
+            "ts": 1,
+            "data": {"s": "BTCUSDT", "b": [["100", "1"]], "a": [["101", "1"]], "u": 1},
+        },
+        [],
+        [],
+        [],
+    )
+    await bybit.handle_message(
+        {
+            "topic": "orderbook.50.BTCUSDT",
+            "type": "delta",
+            "ts": 2,
+            "data": {"s": "BTCUSDT", "b": [["100.5", "2"]], "a": [], "u": 2},
+        },
+        [],
+        [],
+        [],
+    )
+    await okx.handle_message(
+        {
+            "arg": {"channel": "books", "instId": "BTC-USDT"},
+            "action": "snapshot",
+            "data": [
+                {
+                    "bids": [["100", "1", "0", "1"]],
+                    "asks": [["101", "1", "0", "1"]],
+                    "ts": "1",
+                    "seqId": 10,
+                    "prevSeqId": -1,
+                }
+            ],
+        },
+        [],
+        [],
+        [],
+    )
+    await okx.handle_message(
+        {
+            "arg": {"channel": "books", "instId": "BTC-USDT"},
+            "action": "update",
+            "data": [
+                {
+                    "bids": [],
+                    "asks": [["100.8", "3", "0", "1"]],
+                    "ts": "2",
+                    "seqId": 15,
+                    "prevSeqId": 10,
+                }
+            ],
+        },
+        [],
+        [],
+        [],
+    )
+
+    assert registry.get("bybit", "BTCUSDT").best_bid == 100.5
+    assert registry.get("okx", "BTC/USDT").best_ask == 100.8
+    assert len(registry) == 2
@@ -0,0 +1,165 @@
+"""Tests for the two-tier prediction cache."""
+
+import asyncio
+import dataclasses
+import json
+import math
+import time
+
+import pytest
+
+import src.ml.prediction_cache as prediction_cache
+from src.ml.inference_service import MLInferenceService, MLModelConfig, PredictionResult
+from src.ml.prediction_cache import PredictionCache, PredictionKeyBuilder, RedisPredictionTier
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(prediction_cache.time, "monotonic", clock)
+    return clock
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+        self.ttls[key] = px
+
+
+def test_keys_are_quantized_ordered_and_versioned():
+    keys = PredictionKeyBuilder(["rsi", "macd"], step=1e-3, steps={"rsi": 0.5})
+
+    base = keys.build("m", "v1", {"rsi": 41.1, "macd": 0.0021})
+    assert keys.build("m", "v1", {"macd": 0.00212, "rsi": 41.2}) == base  # Jitter + dict order
+    assert keys.build("m", "v1", {"rsi": 41.1, "macd": 0.0031}) != base
+    assert keys.build("m", "v2", {"rsi": 41.1, "macd": 0.0021}) != base
+    assert keys.build("m", "v1", {"rsi": 41.1}) != base  # Missing feature is not zero
+
+    # Stable across processes (no dependence on hash())
+    assert base == PredictionKeyBuilder(["rsi", "macd"], 1e-3, {"rsi": 0.5}).build(
+        "m", "v1", {"rsi": 41.1, "macd": 0.0021}
+    )
+
+
+def test_keys_for_huge_and_non_finite_features():
+    keys = PredictionKeyBuilder(["obv", "rsi"], step=1e-4)
+
+    huge = keys.build("m", "v1", {"obv": 1e15, "rsi": 50.0})  # obv / step > 2**63
+    assert keys.build("m", "v1", {"obv": 2e15, "rsi": 50.0}) == huge  # Saturated bucket
+    assert keys.build("m", "v1", {"obv": -1e15, "rsi": 50.0}) != huge
+    assert keys.build("m", "v1", {"obv": 1e308, "rsi": 50.0}) == huge  # value / step -> inf
+
+    inf = keys.build("m", "v1", {"obv": math.inf, "rsi": 50.0})
+    assert keys.build("m", "v1", {"obv": math.nan, "rsi": 50.0}) == inf
+    assert inf != huge
+    assert keys.quantize("obv", -math.inf) != keys.quantize("obv", -1e300)
+
+
+def test_lru_eviction_and_stats(clock):
+    cache = PredictionCache(max_size=3, default_ttl=60)
+    for key in "abc":
+        cache.set(key, key.upper())
+    assert cache.get("a") == "A"  # a becomes most recent
+    cache.set("d", "D")  # evicts b
+
+    assert cache.get("b") is None
+    assert [cache.get(k) for k in "acd"] == ["A", "C", "D"]
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 4 and stats["misses"] == 1
+
+
+def test_ttl_expiry_is_lazy_and_purged_incrementally(clock):
+    cache = PredictionCache(max_size=100, default_ttl=10)
+    for i in range(5):
+        cache.set(f"short{i}", i)
+    cache.set("long", "x", ttl=60)
+    cache.set("short0", "refreshed")  # Re-set extends its expiry
+
+    clock.now += 5
+    cache.set("short0", "refreshed-again")
+    clock.now += 6
+    assert cache.get("short1") is None  # Lazily expired on read
+    assert cache.purge_expired() == 3  # short2..short4; stale queue records skipped
+    assert len(cache) == 2
+    assert cache.get("short0") == "refreshed-again"
+
+    clock.now += 100
+    assert cache.purge_expired() == 2
+    assert len(cache) == 0
+    assert cache.get_stats()["expirations"] == 6
+
+
+def test_redis_tier_serves_other_processes():
+    tier = RedisPredictionTier(FakeRedis())
+    result = PredictionResult("r1", "m", 0.7, 0.7, "buy", 0.4, 1.0, 123.0)
+
+    async def run():
+        await tier.set("k", dataclasses.asdict(result), ttl=2.5)
+        return await tier.get("k"), await tier.get("missing")
+
+    shared, missing = asyncio.run(run())
+    assert PredictionResult(**shared) == result
+    assert missing is None
+    assert tier._redis.ttls["ml:prediction_cache:k"] == 2500
+    assert tier.get_stats() == {"hits": 1, "misses": 1, "errors": 0}
+
+
+def test_service_reads_through_shared_tier_without_queueing():
+    config = MLModelConfig("m", "models/m.pkl", ["rsi", "macd"], model_version="v3")
+    tier = RedisPredictionTier(FakeRedis())
+    service = MLInferenceService(models={"m": config}, cache_tier=tier)
+    features = {"rsi": 41.0, "macd": 0.002}
+    key = service._get_cache_key("m", features)
+    stored = PredictionResult("r1", "m", 0.7, 0.7, "buy", 0.4, 1.0, 123.0)
+
+    async def run():
+        await tier.set(key, dataclasses.asdict(stored), ttl=60)
+        first = await service.predict("m", features, timeout_ms=1)
+        second = await service.predict("m", {"macd": 0.00201, "rsi": 41.00002}, timeout_ms=1)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.cached and second.cached
+    assert first.prediction == 0.7
+    assert tier.get_stats()["hits"] == 1  # Second lookup served from L1
+    assert service.get_stats()["cache"]["hits"] == 1
+    assert not stored.cached  # Cached entries are not mutated
+
+
+def test_shared_tier_hit_keeps_remaining_ttl():
+    config = MLModelConfig("m", "models/m.pkl", ["rsi"], model_version="v3")
+    tier = RedisPredictionTier(FakeRedis())
+    service = MLInferenceService(models={"m": config}, cache_tier=tier)
+    key = service._get_cache_key("m", {"rsi": 41.0})
+    stored = PredictionResult("r1", "m", 0.7, 0.7, "buy", 0.4, 1.0, 123.0)
+
+    async def run():
+        await tier.set(key, dataclasses.asdict(stored), ttl=60)
+        # Written by another worker ~55 s ago
+        entry = json.loads(tier._redis.data[tier.prefix + key])
+        entry["expires_at"] -= 54.5
+        tier._redis.data[tier.prefix + key] = json.dumps(entry)
+        value, remaining = await tier.get_with_ttl(key)
+        return value, remaining, await service.predict("m", {"rsi": 41.0}, timeout_ms=1)
+
+    value, remaining, result = asyncio.run(run())
+    assert value == dataclasses.asdict(stored)
+    assert 5.0 < remaining <= 5.5
+    assert result.cached
+    assert service._prediction_cache._entries[key][1] - time.monotonic() <= 5.0
@@ -0,0 +1,113 @@
+"""
+Tests for the array-backed trade tape
+"""
+
+import numpy as np
+import pytest
+
+from src.websocket.aggregator import DataAggregator
+from src.websocket.data_types import TradeData
+from src.websocket.trade_tape import BUY, TradeTape
+
+
+@pytest.fixture
+def trades():
+    rng = np.random.default_rng(1)
+    n = 20000
+    return {
+        "ts": 1_700_000_000 + np.cumsum(rng.exponential(0.02, n)),
+        "price": 100 + np.cumsum(rng.normal(0, 0.01, n)),
+        "qty": rng.uniform(0.01, 2.0, n),
+        "buy": rng.random(n) < 0.55,
+    }
+
+
+def _expected(trades, horizon, now):
+    mask = (trades["ts"] > now - horizon) & (trades["ts"] <= now)
+    buys, sells = mask & trades["buy"], mask & ~trades["buy"]
+    volume = trades["qty"][mask].sum()
+    return {
+        "buy_volume": trades["qty"][buys].sum(),
+        "sell_volume": trades["qty"][sells].sum(),
+        "trade_count": int(mask.sum()),
+        "vwap": (trades["price"][mask] * trades["qty"][mask]).sum() / volume,
+        "imbalance": (trades["qty"][buys].sum() - trades["qty"][sells].sum()) / volume,
+    }
+
+
+def _fill(tape, trades):
+    for ts, price, qty, buy in zip(
+        trades["ts"], trades["price"], trades["qty"], trades["buy"], strict=True
+    ):
+        tape.append(ts, price, qty, buy)
+
+
+def test_rolling_stats_match_rescan(trades):
+    tape = TradeTape(capacity=65536, horizons=(1, 10, 60, 300))
+    _fill(tape, trades)
+    now = trades["ts"][-1]
+
+    for horizon in (1, 10, 60, 300):
+        stats = tape.stats(horizon)
+        expected = _expected(trades, horizon, now)
+        assert stats["trade_count"] == expected["trade_count"]
+        for key in ("buy_volume", "sell_volume", "vwap", "imbalance"):
+            assert stats[key] == pytest.approx(expected[key], rel=1e-9), (horizon, key)
+        assert not stats["truncated"]
+
+
+def test_expiry_by_wall_clock(trades):
+    tape = TradeTape(horizons=(10,))
+    _fill(tape, trades)
+    now = trades["ts"][-1] + 5
+
+    assert tape.stats(10, now=now)["trade_count"] == _expected(trades, 10, now)["trade_count"]
+    assert tape.stats(10, now=now + 60)["trade_count"] == 0
+    assert tape.stats(10)["volume"] == 0.0
+
+
+def test_capacity_overwrite_marks_window_truncated(trades):
+    tape = TradeTape(capacity=1000, horizons=(1, 300))
+    _fill(tape, trades)
+
+    assert len(tape) == 1000
+    assert tape.stats(300)["trade_count"] == 1000
+    assert tape.stats(300)["truncated"]
+    assert not tape.stats(1)["truncated"]
+
+
+def test_vectorized_export(trades):
+    tape = TradeTape(capacity=5000)
+    _fill(tape, trades)
+
+    array = tape.to_array()
+    np.testing.assert_array_equal(array["ts"], trades["ts"][-5000:])
+    np.testing.assert_array_equal(array["side"] == BUY, trades["buy"][-5000:])
+
+    since = trades["ts"][-100]
+    assert len(tape.to_array(since=since)) == 99
+    assert len(tape.to_array(last=10)) == 10
+    frame = tape.to_frame(since=since)
+    assert list(frame.columns) == ["price", "qty", "side"]
+    assert frame.index.tz is not None
+
+    features = tape.features()
+    assert set(features) >= {"buy_volume_1s", "vwap_60s", "imbalance_300s", "trade_count_10s"}
+
+
+@pytest.mark.asyncio
+async def test_aggregator_rolling_trade_volume():
+    aggregator = DataAggregator()
+    for i, side in enumerate(["buy", "buy", "sell"]):
+        await aggregator._process_trade(
+            TradeData("binance", "BTCUSDT", str(i), 100.0 + i, 1.0, side, 1000.0 + i * 30)
+        )
+
+    volume = aggregator.get_trade_volume("BTCUSDT", now=1065.0)
+    # The t=1000 trade has rolled out of the 60s window
+    assert volume.buy_volume == 1.0 and volume.sell_volume == 1.0
+    assert volume.buy_count == 1 and volume.sell_count == 1
+    assert volume.vwap == pytest.approx(101.5)
+
+    stats = aggregator.get_trade_stats("BTCUSDT", now=1065.0)
+    assert stats[300]["trade_count"] == 3
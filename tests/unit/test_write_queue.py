@@ -0,0 +1,138 @@
+"""
+Tests for the write-behind database queue and async attribution persistence.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, pool
+
+from src.analysis.attribution import AttributionService
+from src.database.db_manager import Base, DatabaseManager
+from src.database.models import ExecutionRecord, SignalRecord, TradeRecord
+from src.database.write_queue import DatabaseWriter
+
+
+class FakeSession:
+    def __init__(self, log):
+        self.log = log
+        self.items = []
+
+    def add(self, item):
+        if item == "bad":
+            raise ValueError("bad record")
+        self.items.append(item)
+
+
+def session_factory(log, delay=0.0):
+    @contextmanager
+    def factory():
+        session = FakeSession(log)
+        yield session
+        time.sleep(delay)
+        log.append(list(session.items))
+
+    return factory
+
+
+def test_batches_commit_together_and_bad_jobs_are_isolated():
+    commits = []
+    writer = DatabaseWriter(session_factory(commits, delay=0.05), max_batch_size=100)
+    writer.submit(lambda s: s.add("first"))
+    futures = [writer.submit(lambda s, i=i: s.add(i)) for i in range(5)]
+    writer.flush(timeout=5)
+    assert [x for batch in commits for x in batch] == ["first", 0, 1, 2, 3, 4]
+    assert len(commits) <= 2  # Queued while the writer was busy -> one commit
+    assert all(f.done() and f.exception() is None for f in futures)
+
+    writer.submit(lambda s: s.add("second"))
+    bad = writer.submit(lambda s: s.add("bad"))
+    writer.submit(lambda s: s.add(5))
+    writer.flush(timeout=5)
+
+    assert isinstance(bad.exception(), ValueError)
+    assert commits[-1] == [5]  # Retried on its own after the batch failed
+    assert writer.stats["failed"] == 1
+    writer.close()
+
+
+def test_close_commits_everything_queued():
+    commits = []
+    writer = DatabaseWriter(session_factory(commits, delay=0.01), max_batch_size=2)
+    for i in range(7):
+        writer.submit(lambda s, i=i: s.add(i))
+    writer.close()
+
+    assert sorted(x for batch in commits for x in batch) == list(range(7))
+    assert writer.stats["committed"] == 7
+    with pytest.raises(RuntimeError):
+        writer.submit(lambda s: None)
+
+
+async def test_full_queue_does_not_block_event_loop():
+    release = threading.Event()
+    commits = []
+
+    @contextmanager
+    def slow_session():
+        release.wait(5)
+        yield FakeSession(commits)
+
+    writer = DatabaseWriter(slow_session, max_queue_size=1)
+    writer.submit(lambda s: None)  # Taken by the writer, which then blocks
+    await asyncio.sleep(0.05)
+    writer.submit(lambda s: None)  # Fills the queue
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while not release.is_set():
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    asyncio.get_running_loop().call_later(0.1, release.set)
+    assert await writer.submit_async(lambda s: "done", wait=True) == "done"
+    await task
+    assert ticks >= 5  # The loop kept running while the producer waited for room
+    writer.close()
+
+
+@pytest.fixture
+def attribution_db():
+    engine = create_engine(
+        "sqlite://", poolclass=pool.StaticPool, connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    saved = DatabaseManager._engine, DatabaseManager._session_factory
+    DatabaseManager._engine, DatabaseManager._session_factory = engine, None
+    yield engine
+    AttributionService.shutdown()
+    DatabaseManager._engine, DatabaseManager._session_factory = saved
+
+
+async def test_attribution_records_are_written_behind(attribution_db):
+    decision = SimpleNamespace(
+        signal="buy", regime="trend", confidence=0.7, metadata={"rsi": 40.0, "close": 100.0}
+    )
+    signal_id = await AttributionService.record_signal_async("BTC/USDT", "s1", decision)
+    assert signal_id == 1
+
+    future = await AttributionService.record_execution_async(
+        {"symbol": "BTC/USDT", "side": "buy", "price": 100.1, "amount": 1.0},
+        {"target_price": 100.0, "slippage_pct": 0.1, "latency_ms": 12.0},
+        signal_id=signal_id,
+    )
+    await AttributionService.flush_async()
+    trade_id = future.result()
+
+    with DatabaseManager.session() as session:
+        assert session.get(TradeRecord, trade_id).entry_price == pytest.approx(100.1)
+        assert session.get(SignalRecord, signal_id).trade_id == trade_id
+        execution = session.query(ExecutionRecord).one()
+        assert execution.trade_id == trade_id and execution.latency_ms == 12.0